@@ -20,6 +20,7 @@ from six import text_type
 from gi.repository import GLib
 
 import datetime
+import json
 
 Modulemd = get_introspection_module("Modulemd")
 
@@ -101,20 +102,77 @@ class ModulemdUtil(object):
         else:
             raise TypeError("Cannot convert unknown type")
 
+    @staticmethod
+    def check_xmd(obj):
+        """ Raises TypeError for any value python_to_variant() cannot convert
+        """
+        if isinstance(obj, (str, text_type, bool)):
+            return
+
+        elif isinstance(obj, list):
+            for item in obj:
+                if item is not None:
+                    ModulemdUtil.check_xmd(item)
+
+        elif isinstance(obj, dict):
+            for k, v in obj.items():
+                if not isinstance(k, (str, text_type)):
+                    raise TypeError("Only strings are supported for keys")
+                if v is not None:
+                    ModulemdUtil.check_xmd(v)
+
+        else:
+            raise TypeError("Cannot convert unknown type")
+
+    @staticmethod
+    def xmd_to_variant(xmd):
+        """ Converts an xmd dictionary to a GLib.Variant
+
+        The conversion is done by the C library from a JSON representation of
+        xmd, which is much faster than python_to_variant() for large values.
+        Values the C library cannot read from JSON, such as very long keys,
+        are converted by python_to_variant() instead.
+        """
+        ModulemdUtil.check_xmd(xmd)
+
+        try:
+            return Modulemd.variant_from_json(
+                json.dumps(xmd, ensure_ascii=False)
+            )
+        except GLib.Error:
+            return ModulemdUtil.python_to_variant(xmd)
+
+    @staticmethod
+    def variant_to_xmd(stream, variant):
+        """ Converts the xmd GLib.Variant of a stream to a dictionary
+
+        The JSON representation of the variant is cached on the stream, so
+        repeated calls only need to decode it. A new dictionary is returned
+        each time, so callers may modify it.
+        """
+        if variant is None:
+            return {}
+
+        cache = getattr(stream, "_xmd_cache", None)
+        if cache is None or not cache[0].equal(variant):
+            cache = (variant, Modulemd.variant_to_json(variant))
+            stream._xmd_cache = cache
+
+        return json.loads(cache[1])
+
 
 if float(Modulemd._version) >= 2:
 
     class ModuleStreamV2(Modulemd.ModuleStreamV2):
         def set_xmd(self, xmd):
             super(ModuleStreamV2, self).set_xmd(
-                ModulemdUtil.python_to_variant(xmd)
+                ModulemdUtil.xmd_to_variant(xmd)
             )
 
         def get_xmd(self):
-            variant_xmd = super(ModuleStreamV2, self).get_xmd()
-            if variant_xmd is None:
-                return {}
-            return variant_xmd.unpack()
+            return ModulemdUtil.variant_to_xmd(
+                self, super(ModuleStreamV2, self).get_xmd()
+            )
 
     ModuleStreamV2 = override(ModuleStreamV2)
     __all__.append(ModuleStreamV2)
@@ -122,18 +180,74 @@ if float(Modulemd._version) >= 2:
     class ModuleStreamV1(Modulemd.ModuleStreamV1):
         def set_xmd(self, xmd):
             super(ModuleStreamV1, self).set_xmd(
-                ModulemdUtil.python_to_variant(xmd)
+                ModulemdUtil.xmd_to_variant(xmd)
             )
 
         def get_xmd(self):
-            variant_xmd = super(ModuleStreamV1, self).get_xmd()
-            if variant_xmd is None:
-                return {}
-            return variant_xmd.unpack()
+            return ModulemdUtil.variant_to_xmd(
+                self, super(ModuleStreamV1, self).get_xmd()
+            )
 
     ModuleStreamV1 = override(ModuleStreamV1)
     __all__.append(ModuleStreamV1)
 
+    class ModuleIndex(Modulemd.ModuleIndex):
+        def to_dicts(self, flags=Modulemd.DumpFlags.NONE):
+            """ Returns the contents of the index as a list of dictionaries
+
+            There is one dictionary per YAML document, laid out as in the
+            output of dump_to_string_ext(). All scalar values are strings.
+            The whole index is converted in a single call to the library.
+            """
+            return json.loads(self.dump_to_json(flags))
+
+        def __iter__(self):
+            """ Yields the modules in the index, sorted by name
+
+            Each module is only looked up when it is reached.
+            """
+            for module_name in self.get_module_names():
+                module = self.get_module(module_name)
+                if module is not None:
+                    yield module
+
+        def iter_streams(
+            self,
+            module=None,
+            stream=None,
+            version=None,
+            context=None,
+            arch=None,
+        ):
+            """ Yields the module streams matching all of the arguments
+
+            Each argument is a glob pattern, as accepted by
+            GLib.pattern_match_simple(), and None matches everything. The
+            version may also be given as an integer. The streams of each
+            module are filtered in a single library call and are only
+            looked up when the iteration reaches that module.
+            """
+            if version is not None:
+                version = str(version)
+
+            for module_name in self.get_module_names():
+                if module is not None and not GLib.pattern_match_simple(
+                    module, module_name
+                ):
+                    continue
+
+                module_obj = self.get_module(module_name)
+                if module_obj is None:
+                    continue
+
+                for stream_obj in module_obj.search_streams_by_glob(
+                    stream, version, context, arch
+                ):
+                    yield stream_obj
+
+    ModuleIndex = override(ModuleIndex)
+    __all__.append(ModuleIndex)
+
     class ServiceLevel(Modulemd.ServiceLevel):
         def set_eol(self, eol):
             if isinstance(eol, datetime.date):
@@ -0,0 +1,164 @@
+/*
+ * This file is part of libmodulemd
+ * Copyright (C) 2020 Red Hat, Inc.
+ *
+ * Fedora-License-Identifier: MIT
+ * SPDX-2.0-License-Identifier: MIT
+ * SPDX-3.0-License-Identifier: MIT
+ *
+ * This program is free software.
+ * For more information on the license, see COPYING.
+ * For more information on free software, see <https://www.gnu.org/philosophy/free-sw.en.html>.
+ */
+
+#pragma once
+
+#include "modulemd-module-index.h"
+#include <glib-object.h>
+
+G_BEGIN_DECLS
+
+/**
+ * SECTION: modulemd-defaults-loader
+ * @title: Modulemd.DefaultsLoader
+ * @stability: stable
+ * @short_description: Keeps a #ModulemdModuleIndex in sync with a directory
+ * of defaults documents.
+ *
+ * #ModulemdDefaultsLoader provides the same result as
+ * modulemd_module_index_update_from_defaults_directory(), but remembers what
+ * it read. Each call to modulemd_defaults_loader_refresh() checks the
+ * modification time and size of every ".yaml" file in the directories and
+ * only reads files that were added or whose content has changed. Only the
+ * modules provided by added, changed or removed files are merged again.
+ *
+ * A long-running service might use it as follows (python example):
+ *
+ * |[<!-- language="Python" -->
+ * loader = Modulemd.DefaultsLoader.new(defaults_path, overrides_path, True)
+ *
+ * while True:
+ *     loader.refresh()
+ *     for module_name in loader.get_changed_modules():
+ *         print("Defaults changed for %s" % module_name)
+ *
+ *     defaults_index = loader.get_index()
+ *     ...
+ * ]|
+ *
+ * A file whose modification time, to the nanosecond, and size are both
+ * unchanged is assumed to be unchanged. If the modification time or size
+ * differs, the SHA-256 checksum of its content is compared with the one
+ * recorded when it was last read, so touching a file does not cause it to be
+ * merged again. The checksum is also compared for a file that was modified
+ * within two seconds of the previous refresh, since a filesystem with coarse
+ * timestamps may not record a second change made in that time.
+ */
+
+#define MODULEMD_TYPE_DEFAULTS_LOADER (modulemd_defaults_loader_get_type ())
+
+G_DECLARE_FINAL_TYPE (ModulemdDefaultsLoader,
+                      modulemd_defaults_loader,
+                      MODULEMD,
+                      DEFAULTS_LOADER,
+                      GObject)
+
+
+/**
+ * modulemd_defaults_loader_new:
+ * @path: (in): The path to a directory containing defaults documents.
+ * @overrides_path: (in) (nullable): If non-NULL, the path to a directory
+ * containing defaults documents that should override those in @path.
+ * @strict: (in): Whether the parser should return failure if it encounters an
+ * unknown mapping key or a conflict in module default streams.
+ *
+ * No files are read until modulemd_defaults_loader_refresh() is called.
+ *
+ * Returns: (transfer full): A newly-allocated #ModulemdDefaultsLoader object.
+ *
+ * Since: 2.9
+ */
+ModulemdDefaultsLoader *
+modulemd_defaults_loader_new (const gchar *path,
+                              const gchar *overrides_path,
+                              gboolean strict);
+
+
+/**
+ * modulemd_defaults_loader_refresh:
+ * @self: (in): This #ModulemdDefaultsLoader object.
+ * @error: (out): A #GError indicating why this function failed.
+ *
+ * Brings the index returned by modulemd_defaults_loader_get_index() up to
+ * date with the current contents of the directories. The first call reads
+ * every ".yaml" file; later calls read only the files that were added or
+ * changed since the previous successful refresh.
+ *
+ * If this function fails, the state of @self is left as it was after the
+ * previous successful refresh.
+ *
+ * Returns: TRUE if all ".yaml" files in the directories were imported
+ * successfully. FALSE if one or more files could not be read or merged and
+ * sets @error appropriately.
+ *
+ * Since: 2.9
+ */
+gboolean
+modulemd_defaults_loader_refresh (ModulemdDefaultsLoader *self,
+                                  GError **error);
+
+
+/**
+ * modulemd_defaults_loader_get_index:
+ * @self: (in): This #ModulemdDefaultsLoader object.
+ *
+ * Returns: (transfer none): A #ModulemdModuleIndex containing the merged
+ * contents of the directories as of the last successful call to
+ * modulemd_defaults_loader_refresh(). The caller must not modify it. Each
+ * successful refresh replaces it with a new index, so take a reference to keep
+ * it beyond the next refresh.
+ *
+ * Since: 2.9
+ */
+ModulemdModuleIndex *
+modulemd_defaults_loader_get_index (ModulemdDefaultsLoader *self);
+
+
+/**
+ * modulemd_defaults_loader_get_changed_modules_as_strv: (rename-to modulemd_defaults_loader_get_changed_modules)
+ * @self: (in): This #ModulemdDefaultsLoader object.
+ *
+ * Returns: (transfer full): An ordered list of the names of the modules that
+ * were merged again during the last successful call to
+ * modulemd_defaults_loader_refresh(), including any that were removed.
+ *
+ * Since: 2.9
+ */
+GStrv
+modulemd_defaults_loader_get_changed_modules_as_strv (
+  ModulemdDefaultsLoader *self);
+
+
+/**
+ * modulemd_defaults_loader_update_index:
+ * @self: (in): This #ModulemdDefaultsLoader object.
+ * @index: (inout): The #ModulemdModuleIndex to update.
+ * @error: (out): A #GError indicating why this function failed.
+ *
+ * Merges the contents loaded by @self into @index, overriding any conflicting
+ * defaults. This has the same result as calling
+ * modulemd_module_index_update_from_defaults_directory() on @index with the
+ * arguments passed to modulemd_defaults_loader_new(), as of the last
+ * successful call to modulemd_defaults_loader_refresh().
+ *
+ * Returns: TRUE if the contents were merged successfully. FALSE and sets
+ * @error appropriately if the merge fails.
+ *
+ * Since: 2.9
+ */
+gboolean
+modulemd_defaults_loader_update_index (ModulemdDefaultsLoader *self,
+                                       ModulemdModuleIndex *index,
+                                       GError **error);
+
+G_END_DECLS
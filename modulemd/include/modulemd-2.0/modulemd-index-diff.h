@@ -0,0 +1,324 @@
+/*
+ * This file is part of libmodulemd
+ * Copyright (C) 2020 Red Hat, Inc.
+ *
+ * Fedora-License-Identifier: MIT
+ * SPDX-2.0-License-Identifier: MIT
+ * SPDX-3.0-License-Identifier: MIT
+ *
+ * This program is free software.
+ * For more information on the license, see COPYING.
+ * For more information on free software, see <https://www.gnu.org/philosophy/free-sw.en.html>.
+ */
+
+#pragma once
+
+#include <glib-object.h>
+
+#include "modulemd-defaults.h"
+#include "modulemd-module-stream.h"
+#include "modulemd-translation.h"
+
+G_BEGIN_DECLS
+
+/**
+ * SECTION: modulemd-index-diff
+ * @title: Modulemd.IndexDiff
+ * @stability: stable
+ * @short_description: The differences between two #ModulemdModuleIndex
+ * objects.
+ *
+ * A #ModulemdIndexDiff lists the streams, defaults and translations that were
+ * added, changed or removed between two versions of a repository. It is
+ * returned by modulemd_module_index_diff() and can be applied to a copy of
+ * the older index with modulemd_module_index_apply_diff().
+ *
+ * Streams are identified by their NSVCA, defaults by their module name and
+ * translations by their module and stream names. Only the added and changed
+ * objects are kept in full, so a diff between two large repositories is
+ * usually small. For example, to publish only the changes between two
+ * versions of a repository (python example):
+ *
+ * |[<!-- language="Python" -->
+ * diff = Modulemd.ModuleIndex.diff(old_idx, new_idx)
+ *
+ * updates = Modulemd.ModuleIndex.new()
+ * for stream in diff.get_added_streams() + diff.get_changed_streams():
+ *     updates.add_module_stream(stream)
+ * publish(updates.dump_to_string(), diff.get_removed_streams_as_strv())
+ * ]|
+ *
+ * A consumer can rebuild the same diff from what was published with
+ * modulemd_index_diff_new(), modulemd_index_diff_change_stream() and
+ * modulemd_index_diff_remove_stream(), and then apply it to its own copy of
+ * the older repository.
+ */
+
+#define MODULEMD_TYPE_INDEX_DIFF (modulemd_index_diff_get_type ())
+
+G_DECLARE_FINAL_TYPE (
+  ModulemdIndexDiff, modulemd_index_diff, MODULEMD, INDEX_DIFF, GObject)
+
+
+/**
+ * modulemd_index_diff_new:
+ *
+ * Returns: (transfer full): A newly-allocated, empty #ModulemdIndexDiff.
+ *
+ * Since: 2.9
+ */
+ModulemdIndexDiff *
+modulemd_index_diff_new (void);
+
+
+/**
+ * modulemd_index_diff_is_empty:
+ * @self: (in): This #ModulemdIndexDiff object.
+ *
+ * Returns: TRUE if @self does not add, change or remove anything.
+ *
+ * Since: 2.9
+ */
+gboolean
+modulemd_index_diff_is_empty (ModulemdIndexDiff *self);
+
+
+/**
+ * modulemd_index_diff_add_stream:
+ * @self: (in): This #ModulemdIndexDiff object.
+ * @stream: (in): A #ModulemdModuleStream that is new in the newer index.
+ * It is copied into @self.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_index_diff_add_stream (ModulemdIndexDiff *self,
+                                ModulemdModuleStream *stream);
+
+
+/**
+ * modulemd_index_diff_change_stream:
+ * @self: (in): This #ModulemdIndexDiff object.
+ * @stream: (in): A #ModulemdModuleStream that replaces the stream with the
+ * same NSVCA in the older index. It is copied into @self.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_index_diff_change_stream (ModulemdIndexDiff *self,
+                                   ModulemdModuleStream *stream);
+
+
+/**
+ * modulemd_index_diff_remove_stream:
+ * @self: (in): This #ModulemdIndexDiff object.
+ * @nsvca: (in): The NSVCA of a stream that is no longer in the newer index,
+ * as returned by modulemd_module_stream_get_NSVCA_as_string().
+ *
+ * Since: 2.9
+ */
+void
+modulemd_index_diff_remove_stream (ModulemdIndexDiff *self,
+                                   const gchar *nsvca);
+
+
+/**
+ * modulemd_index_diff_get_added_streams:
+ * @self: (in): This #ModulemdIndexDiff object.
+ *
+ * Returns: (transfer none) (element-type ModulemdModuleStream): The streams
+ * that are new in the newer index.
+ *
+ * Since: 2.9
+ */
+GPtrArray *
+modulemd_index_diff_get_added_streams (ModulemdIndexDiff *self);
+
+
+/**
+ * modulemd_index_diff_get_changed_streams:
+ * @self: (in): This #ModulemdIndexDiff object.
+ *
+ * Returns: (transfer none) (element-type ModulemdModuleStream): The streams
+ * whose NSVCA is in both indexes but whose content differs, as they are in
+ * the newer index.
+ *
+ * Since: 2.9
+ */
+GPtrArray *
+modulemd_index_diff_get_changed_streams (ModulemdIndexDiff *self);
+
+
+/**
+ * modulemd_index_diff_get_removed_streams_as_strv: (rename-to modulemd_index_diff_get_removed_streams)
+ * @self: (in): This #ModulemdIndexDiff object.
+ *
+ * Returns: (transfer full): An ordered #GStrv list of the NSVCAs of the
+ * streams that are no longer in the newer index.
+ *
+ * Since: 2.9
+ */
+GStrv
+modulemd_index_diff_get_removed_streams_as_strv (ModulemdIndexDiff *self);
+
+
+/**
+ * modulemd_index_diff_add_defaults:
+ * @self: (in): This #ModulemdIndexDiff object.
+ * @defaults: (in): A #ModulemdDefaults object for a module that had none in
+ * the older index. It is copied into @self.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_index_diff_add_defaults (ModulemdIndexDiff *self,
+                                  ModulemdDefaults *defaults);
+
+
+/**
+ * modulemd_index_diff_change_defaults:
+ * @self: (in): This #ModulemdIndexDiff object.
+ * @defaults: (in): A #ModulemdDefaults object that replaces the defaults of
+ * the same module in the older index. It is copied into @self.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_index_diff_change_defaults (ModulemdIndexDiff *self,
+                                     ModulemdDefaults *defaults);
+
+
+/**
+ * modulemd_index_diff_remove_defaults:
+ * @self: (in): This #ModulemdIndexDiff object.
+ * @module_name: (in): The name of a module that no longer has defaults in the
+ * newer index.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_index_diff_remove_defaults (ModulemdIndexDiff *self,
+                                     const gchar *module_name);
+
+
+/**
+ * modulemd_index_diff_get_added_defaults:
+ * @self: (in): This #ModulemdIndexDiff object.
+ *
+ * Returns: (transfer none) (element-type ModulemdDefaults): The defaults of
+ * modules that had none in the older index.
+ *
+ * Since: 2.9
+ */
+GPtrArray *
+modulemd_index_diff_get_added_defaults (ModulemdIndexDiff *self);
+
+
+/**
+ * modulemd_index_diff_get_changed_defaults:
+ * @self: (in): This #ModulemdIndexDiff object.
+ *
+ * Returns: (transfer none) (element-type ModulemdDefaults): The defaults that
+ * differ between the two indexes, as they are in the newer index.
+ *
+ * Since: 2.9
+ */
+GPtrArray *
+modulemd_index_diff_get_changed_defaults (ModulemdIndexDiff *self);
+
+
+/**
+ * modulemd_index_diff_get_removed_defaults_as_strv: (rename-to modulemd_index_diff_get_removed_defaults)
+ * @self: (in): This #ModulemdIndexDiff object.
+ *
+ * Returns: (transfer full): An ordered #GStrv list of the names of the
+ * modules that no longer have defaults in the newer index.
+ *
+ * Since: 2.9
+ */
+GStrv
+modulemd_index_diff_get_removed_defaults_as_strv (ModulemdIndexDiff *self);
+
+
+/**
+ * modulemd_index_diff_add_translation:
+ * @self: (in): This #ModulemdIndexDiff object.
+ * @translation: (in): A #ModulemdTranslation for a module stream that had
+ * none in the older index. It is copied into @self.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_index_diff_add_translation (ModulemdIndexDiff *self,
+                                     ModulemdTranslation *translation);
+
+
+/**
+ * modulemd_index_diff_change_translation:
+ * @self: (in): This #ModulemdIndexDiff object.
+ * @translation: (in): A #ModulemdTranslation that replaces the translation of
+ * the same module stream in the older index. It is copied into @self.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_index_diff_change_translation (ModulemdIndexDiff *self,
+                                        ModulemdTranslation *translation);
+
+
+/**
+ * modulemd_index_diff_remove_translation:
+ * @self: (in): This #ModulemdIndexDiff object.
+ * @module_name: (in): The name of a module.
+ * @module_stream: (in): The name of a stream of @module_name that no longer
+ * has a translation in the newer index.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_index_diff_remove_translation (ModulemdIndexDiff *self,
+                                        const gchar *module_name,
+                                        const gchar *module_stream);
+
+
+/**
+ * modulemd_index_diff_get_added_translations:
+ * @self: (in): This #ModulemdIndexDiff object.
+ *
+ * Returns: (transfer none) (element-type ModulemdTranslation): The
+ * translations of module streams that had none in the older index.
+ *
+ * Since: 2.9
+ */
+GPtrArray *
+modulemd_index_diff_get_added_translations (ModulemdIndexDiff *self);
+
+
+/**
+ * modulemd_index_diff_get_changed_translations:
+ * @self: (in): This #ModulemdIndexDiff object.
+ *
+ * Returns: (transfer none) (element-type ModulemdTranslation): The
+ * translations that differ between the two indexes, as they are in the newer
+ * index.
+ *
+ * Since: 2.9
+ */
+GPtrArray *
+modulemd_index_diff_get_changed_translations (ModulemdIndexDiff *self);
+
+
+/**
+ * modulemd_index_diff_get_removed_translations_as_strv: (rename-to modulemd_index_diff_get_removed_translations)
+ * @self: (in): This #ModulemdIndexDiff object.
+ *
+ * Returns: (transfer full): An ordered #GStrv list of the module streams that
+ * no longer have a translation in the newer index, each in the form
+ * "module_name:module_stream".
+ *
+ * Since: 2.9
+ */
+GStrv
+modulemd_index_diff_get_removed_translations_as_strv (ModulemdIndexDiff *self);
+
+G_END_DECLS
@@ -0,0 +1,224 @@
+/*
+ * This file is part of libmodulemd
+ * Copyright (C) 2020 Red Hat, Inc.
+ *
+ * Fedora-License-Identifier: MIT
+ * SPDX-2.0-License-Identifier: MIT
+ * SPDX-3.0-License-Identifier: MIT
+ *
+ * This program is free software.
+ * For more information on the license, see COPYING.
+ * For more information on free software, see <https://www.gnu.org/philosophy/free-sw.en.html>.
+ */
+
+#pragma once
+
+#include <glib-object.h>
+
+G_BEGIN_DECLS
+
+/**
+ * SECTION: modulemd-index-stats
+ * @title: Modulemd.IndexStats
+ * @stability: stable
+ * @short_description: Statistics about the work done to populate a
+ * #ModulemdModuleIndex.
+ *
+ * Every #ModulemdModuleIndex keeps a #ModulemdIndexStats object, available
+ * from modulemd_module_index_get_stats(). It accumulates counters and timings
+ * from each call to one of the modulemd_module_index_update_from_*()
+ * functions and from each merge into the index, including the merges
+ * performed by modulemd_module_index_merger_resolve().
+ *
+ * For example, to find out where the time goes when loading a repository
+ * (python example):
+ *
+ * |[<!-- language="Python" -->
+ * idx = Modulemd.ModuleIndex.new()
+ * idx.update_from_file(path, True)
+ *
+ * stats = idx.get_stats()
+ * print("Read %d bytes" % stats.get_bytes_read())
+ * for phase in (
+ *     Modulemd.IndexStatsPhaseEnum.SCAN,
+ *     Modulemd.IndexStatsPhaseEnum.PARSE,
+ *     Modulemd.IndexStatsPhaseEnum.VALIDATE,
+ *     Modulemd.IndexStatsPhaseEnum.INSERT,
+ * ):
+ *     print("%s: %d us" % (phase.value_nick, stats.get_phase_time(phase)))
+ * ]|
+ *
+ * When a directory is loaded with
+ * modulemd_module_index_update_from_defaults_directory(), the files are read
+ * and merged on several threads. The phase times are then the sum of the
+ * time spent on each thread, which may exceed the elapsed time.
+ */
+
+/**
+ * ModulemdIndexStatsPhaseEnum:
+ * @MODULEMD_INDEX_STATS_PHASE_SCAN: Reading a YAML document and determining
+ * its type and metadata version.
+ * @MODULEMD_INDEX_STATS_PHASE_PARSE: Converting a YAML document into a
+ * stream, defaults or translation object.
+ * @MODULEMD_INDEX_STATS_PHASE_VALIDATE: Validating the parsed objects.
+ * @MODULEMD_INDEX_STATS_PHASE_INSERT: Adding the parsed objects to the index,
+ * including any metadata version upgrades that this causes.
+ * @MODULEMD_INDEX_STATS_PHASE_MERGE: Merging the contents of another
+ * #ModulemdModuleIndex into the index.
+ *
+ * Since: 2.9
+ */
+typedef enum
+{
+  MODULEMD_INDEX_STATS_PHASE_SCAN,
+  MODULEMD_INDEX_STATS_PHASE_PARSE,
+  MODULEMD_INDEX_STATS_PHASE_VALIDATE,
+  MODULEMD_INDEX_STATS_PHASE_INSERT,
+  MODULEMD_INDEX_STATS_PHASE_MERGE,
+} ModulemdIndexStatsPhaseEnum;
+
+
+#define MODULEMD_TYPE_INDEX_STATS (modulemd_index_stats_get_type ())
+
+G_DECLARE_FINAL_TYPE (
+  ModulemdIndexStats, modulemd_index_stats, MODULEMD, INDEX_STATS, GObject)
+
+
+/**
+ * modulemd_index_stats_copy:
+ * @self: (in): This #ModulemdIndexStats object.
+ *
+ * Returns: (transfer full): A newly-allocated copy of @self. Later updates to
+ * @self do not affect the copy, so it can be kept as a snapshot.
+ *
+ * Since: 2.9
+ */
+ModulemdIndexStats *
+modulemd_index_stats_copy (ModulemdIndexStats *self);
+
+
+/**
+ * modulemd_index_stats_reset:
+ * @self: (in): This #ModulemdIndexStats object.
+ *
+ * Sets all of the counters and timings in @self back to zero.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_index_stats_reset (ModulemdIndexStats *self);
+
+
+/**
+ * modulemd_index_stats_get_stream_documents:
+ * @self: (in): This #ModulemdIndexStats object.
+ * @mdversion: (in): A #ModulemdModuleStreamVersionEnum.
+ *
+ * Returns: The number of module stream documents with metadata version
+ * @mdversion that were read, including any that later failed to parse or
+ * validate.
+ *
+ * Since: 2.9
+ */
+guint64
+modulemd_index_stats_get_stream_documents (ModulemdIndexStats *self,
+                                           guint64 mdversion);
+
+
+/**
+ * modulemd_index_stats_get_defaults_documents:
+ * @self: (in): This #ModulemdIndexStats object.
+ * @mdversion: (in): A #ModulemdDefaultsVersionEnum.
+ *
+ * Returns: The number of defaults documents with metadata version @mdversion
+ * that were read, including any that later failed to parse or validate.
+ *
+ * Since: 2.9
+ */
+guint64
+modulemd_index_stats_get_defaults_documents (ModulemdIndexStats *self,
+                                             guint64 mdversion);
+
+
+/**
+ * modulemd_index_stats_get_translation_documents:
+ * @self: (in): This #ModulemdIndexStats object.
+ *
+ * Returns: The number of translation documents that were read, including any
+ * that later failed to parse or validate.
+ *
+ * Since: 2.9
+ */
+guint64
+modulemd_index_stats_get_translation_documents (ModulemdIndexStats *self);
+
+
+/**
+ * modulemd_index_stats_get_failures:
+ * @self: (in): This #ModulemdIndexStats object.
+ *
+ * Returns: The number of documents that could not be added to the index. This
+ * is the total length of the failures arrays returned by the
+ * modulemd_module_index_update_from_*() functions.
+ *
+ * Since: 2.9
+ */
+guint64
+modulemd_index_stats_get_failures (ModulemdIndexStats *self);
+
+
+/**
+ * modulemd_index_stats_get_bytes_read:
+ * @self: (in): This #ModulemdIndexStats object.
+ *
+ * Returns: The number of bytes of YAML that were read. For compressed files,
+ * this is the size after decompression.
+ *
+ * Since: 2.9
+ */
+guint64
+modulemd_index_stats_get_bytes_read (ModulemdIndexStats *self);
+
+
+/**
+ * modulemd_index_stats_get_streams_deduplicated:
+ * @self: (in): This #ModulemdIndexStats object.
+ *
+ * Returns: The number of module streams that were added to the index when an
+ * identical stream with the same NSVCA was already present, and so replaced
+ * it rather than adding to it.
+ *
+ * Since: 2.9
+ */
+guint64
+modulemd_index_stats_get_streams_deduplicated (ModulemdIndexStats *self);
+
+
+/**
+ * modulemd_index_stats_get_upgrades:
+ * @self: (in): This #ModulemdIndexStats object.
+ *
+ * Returns: The number of module streams and defaults that were upgraded to a
+ * newer metadata version so that everything in the index shares the same
+ * version.
+ *
+ * Since: 2.9
+ */
+guint64
+modulemd_index_stats_get_upgrades (ModulemdIndexStats *self);
+
+
+/**
+ * modulemd_index_stats_get_phase_time:
+ * @self: (in): This #ModulemdIndexStats object.
+ * @phase: (in): The #ModulemdIndexStatsPhaseEnum to look up.
+ *
+ * Returns: The time spent in @phase, in microseconds.
+ *
+ * Since: 2.9
+ */
+gint64
+modulemd_index_stats_get_phase_time (ModulemdIndexStats *self,
+                                     ModulemdIndexStatsPhaseEnum phase);
+
+G_END_DECLS
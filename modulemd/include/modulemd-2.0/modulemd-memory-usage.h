@@ -0,0 +1,155 @@
+/*
+ * This file is part of libmodulemd
+ * Copyright (C) 2020 Red Hat, Inc.
+ *
+ * Fedora-License-Identifier: MIT
+ * SPDX-2.0-License-Identifier: MIT
+ * SPDX-3.0-License-Identifier: MIT
+ *
+ * This program is free software.
+ * For more information on the license, see COPYING.
+ * For more information on free software, see <https://www.gnu.org/philosophy/free-sw.en.html>.
+ */
+
+#pragma once
+
+#include <glib-object.h>
+
+G_BEGIN_DECLS
+
+/**
+ * SECTION: modulemd-memory-usage
+ * @title: Modulemd.MemoryUsage
+ * @stability: stable
+ * @short_description: An estimate of the memory held by libmodulemd objects.
+ *
+ * A #ModulemdMemoryUsage object is returned by
+ * modulemd_module_index_get_memory_usage(),
+ * modulemd_module_get_memory_usage() and
+ * modulemd_module_stream_get_memory_usage(). It breaks down the number of
+ * bytes held by the object and everything it owns.
+ *
+ * The values are estimates. They count the bytes requested from the
+ * allocator for strings and object structures and approximate the internal
+ * layout of #GHashTable and #GPtrArray. They do not include allocator
+ * overhead or memory shared with objects outside of the one measured.
+ *
+ * The total is the sum of modulemd_memory_usage_get_strings(),
+ * modulemd_memory_usage_get_containers(), modulemd_memory_usage_get_objects()
+ * and modulemd_memory_usage_get_xmd(). The rpm artifact map and translation
+ * values show how much of that total is due to those particular fields.
+ *
+ * For example, to find the streams that use the most memory (python
+ * example):
+ *
+ * |[<!-- language="Python" -->
+ * usage = []
+ * for module_name in idx.get_module_names():
+ *     module = idx.get_module(module_name)
+ *     for stream in module.get_all_streams():
+ *         usage.append(
+ *             (stream.get_memory_usage().get_total(), stream.get_NSVCA())
+ *         )
+ *
+ * for total, nsvca in sorted(usage, reverse=True)[:10]:
+ *     print("%s: %d bytes" % (nsvca, total))
+ * ]|
+ */
+
+#define MODULEMD_TYPE_MEMORY_USAGE (modulemd_memory_usage_get_type ())
+
+G_DECLARE_FINAL_TYPE (
+  ModulemdMemoryUsage, modulemd_memory_usage, MODULEMD, MEMORY_USAGE, GObject)
+
+
+/**
+ * modulemd_memory_usage_get_total:
+ * @self: (in): This #ModulemdMemoryUsage object.
+ *
+ * Returns: The estimated number of bytes held by the measured object.
+ *
+ * Since: 2.9
+ */
+guint64
+modulemd_memory_usage_get_total (ModulemdMemoryUsage *self);
+
+
+/**
+ * modulemd_memory_usage_get_strings:
+ * @self: (in): This #ModulemdMemoryUsage object.
+ *
+ * Returns: The number of bytes held by strings, including their terminating
+ * NUL bytes.
+ *
+ * Since: 2.9
+ */
+guint64
+modulemd_memory_usage_get_strings (ModulemdMemoryUsage *self);
+
+
+/**
+ * modulemd_memory_usage_get_containers:
+ * @self: (in): This #ModulemdMemoryUsage object.
+ *
+ * Returns: The estimated number of bytes held by the internal structure of
+ * hash tables and arrays, not including their contents.
+ *
+ * Since: 2.9
+ */
+guint64
+modulemd_memory_usage_get_containers (ModulemdMemoryUsage *self);
+
+
+/**
+ * modulemd_memory_usage_get_objects:
+ * @self: (in): This #ModulemdMemoryUsage object.
+ *
+ * Returns: The number of bytes held by the instance structures of the
+ * measured objects, not including the strings and containers they own.
+ *
+ * Since: 2.9
+ */
+guint64
+modulemd_memory_usage_get_objects (ModulemdMemoryUsage *self);
+
+
+/**
+ * modulemd_memory_usage_get_xmd:
+ * @self: (in): This #ModulemdMemoryUsage object.
+ *
+ * Returns: The number of bytes held by the #GVariant xmd data of module
+ * streams.
+ *
+ * Since: 2.9
+ */
+guint64
+modulemd_memory_usage_get_xmd (ModulemdMemoryUsage *self);
+
+
+/**
+ * modulemd_memory_usage_get_rpm_artifact_map:
+ * @self: (in): This #ModulemdMemoryUsage object.
+ *
+ * Returns: The part of the total that is held by the rpm artifact maps of
+ * module streams.
+ *
+ * Since: 2.9
+ */
+guint64
+modulemd_memory_usage_get_rpm_artifact_map (ModulemdMemoryUsage *self);
+
+
+/**
+ * modulemd_memory_usage_get_translations:
+ * @self: (in): This #ModulemdMemoryUsage object.
+ *
+ * Returns: The part of the total that is held by #ModulemdTranslation
+ * objects. Translations are owned by #ModulemdModule objects, so this is
+ * always zero for a #ModulemdModuleStream.
+ *
+ * Since: 2.9
+ */
+guint64
+modulemd_memory_usage_get_translations (ModulemdMemoryUsage *self);
+
+G_END_DECLS
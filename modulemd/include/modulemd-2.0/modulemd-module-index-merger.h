@@ -206,6 +206,10 @@ modulemd_module_index_merger_resolve (ModulemdModuleIndexMerger *self,
  * #ModulemdModuleIndexMerger is undefined. The only valid action on it after
  * that point is g_object_unref().
  *
+ * The #ModulemdIndexStats of the returned index, available from
+ * modulemd_module_index_get_stats(), describe the work done by the merges.
+ * They do not include the statistics of the associated indexes.
+ *
  * Returns: (transfer full): A newly-allocated #ModulemdModuleIndex object
  * containing the merged results. If this function encounters an unresolvable
  * merge conflict, it will return NULL and set @error appropriately.
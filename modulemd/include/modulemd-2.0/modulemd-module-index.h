@@ -13,9 +13,13 @@
 
 #pragma once
 
+#include "modulemd-index-diff.h"
+#include "modulemd-index-stats.h"
+#include "modulemd-memory-usage.h"
 #include "modulemd-module.h"
 #include "modulemd-subdocument-info.h"
 #include "modulemd-translation.h"
+#include <gio/gio.h>
 #include <glib-object.h>
 
 G_BEGIN_DECLS
@@ -71,6 +75,31 @@ G_DECLARE_FINAL_TYPE (
   ModulemdModuleIndex, modulemd_module_index, MODULEMD, MODULE_INDEX, GObject)
 
 
+/**
+ * ModulemdDumpFlags:
+ * @MODULEMD_DUMP_FLAG_NONE: No flags. The output is validated and sorted.
+ * @MODULEMD_DUMP_FLAG_UNSORTED: Do not sort the output. Modules are emitted in
+ * an unspecified order and the streams of each module in the order they are
+ * stored in the #ModulemdModule. The output is therefore not stable between
+ * runs.
+ *
+ * Flags controlling the behavior of modulemd_module_index_dump_to_string_ext()
+ * and related functions.
+ *
+ * Every module stream and defaults object is always validated before it is
+ * emitted. The result of a successful validation is kept until the object is
+ * modified, so dumping an index whose contents have not changed since they
+ * were last validated does not validate them again.
+ *
+ * Since: 2.9
+ */
+typedef enum /*< flags >*/
+{
+  MODULEMD_DUMP_FLAG_NONE = 0,
+  MODULEMD_DUMP_FLAG_UNSORTED = 1 << 0,
+} ModulemdDumpFlags;
+
+
 /**
  * ModulemdReadHandler:
  * @data: (inout): A private pointer to the data being read.
@@ -126,6 +155,29 @@ typedef gint (*ModulemdWriteHandler) (void *data,
                                       size_t size);
 
 
+/**
+ * ModulemdIndexProgressFunc:
+ * @bytes: The number of bytes of YAML read or written so far.
+ * @documents: The number of YAML subdocuments read or written so far.
+ * @user_data: (closure): The data passed along with the callback.
+ *
+ * The prototype of the progress callback of
+ * modulemd_module_index_update_from_file_async() and
+ * modulemd_module_index_dump_to_file_async().
+ *
+ * The callback is invoked in the thread-default main context of the thread
+ * that started the operation and never after the operation has completed.
+ * Reports are merged while that main context is busy, so it is not invoked
+ * once per subdocument. When reading a compressed file, @bytes counts the
+ * decompressed data.
+ *
+ * Since: 2.9
+ */
+typedef void (*ModulemdIndexProgressFunc) (guint64 bytes,
+                                           guint documents,
+                                           gpointer user_data);
+
+
 /**
  * modulemd_module_index_new:
  *
@@ -164,6 +216,72 @@ modulemd_module_index_update_from_file (ModulemdModuleIndex *self,
                                         GError **error);
 
 
+/**
+ * modulemd_module_index_update_from_file_async:
+ * @self: This #ModulemdModuleIndex object.
+ * @yaml_file: (in): A YAML file containing the module metadata and other
+ * related information such as default streams.
+ * @strict: (in): Whether the parser should return failure if it encounters an
+ * unknown mapping key or if it should ignore it.
+ * @cancellable: (in) (nullable): A #GCancellable, checked before each
+ * subdocument is read.
+ * @progress_callback: (in) (nullable) (scope notified)
+ * (closure progress_data) (destroy progress_data_free): A function to report
+ * progress to.
+ * @progress_data: (in) (nullable): The data to pass to @progress_callback.
+ * @progress_data_free: (in) (nullable): A function to free @progress_data
+ * with. It may be called from any thread.
+ * @callback: (in) (scope async) (closure user_data): A #GAsyncReadyCallback
+ * to call when the update is complete.
+ * @user_data: (in): The data to pass to @callback.
+ *
+ * Starts reading @yaml_file into @self like
+ * modulemd_module_index_update_from_file(), in a worker thread. Call
+ * modulemd_module_index_update_from_file_finish() from @callback to get the
+ * result.
+ *
+ * @self is modified by the worker thread, so it must not be used by anything
+ * else until @callback has been invoked. If the operation is cancelled or
+ * fails, the subdocuments read until then remain in @self.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_module_index_update_from_file_async (
+  ModulemdModuleIndex *self,
+  const gchar *yaml_file,
+  gboolean strict,
+  GCancellable *cancellable,
+  ModulemdIndexProgressFunc progress_callback,
+  gpointer progress_data,
+  GDestroyNotify progress_data_free,
+  GAsyncReadyCallback callback,
+  gpointer user_data);
+
+
+/**
+ * modulemd_module_index_update_from_file_finish:
+ * @self: This #ModulemdModuleIndex object.
+ * @result: (in): The #GAsyncResult passed to the callback of
+ * modulemd_module_index_update_from_file_async().
+ * @failures: (out) (element-type ModulemdSubdocumentInfo) (transfer container):
+ * An array containing any subdocuments from the YAML file that failed to parse.
+ * See #ModulemdSubdocumentInfo for more details.
+ * @error: (out): A #GError containing additional information if the operation
+ * failed in a way that prevents program continuation. If it was cancelled,
+ * this is %G_IO_ERROR_CANCELLED.
+ *
+ * Returns: As for modulemd_module_index_update_from_file().
+ *
+ * Since: 2.9
+ */
+gboolean
+modulemd_module_index_update_from_file_finish (ModulemdModuleIndex *self,
+                                               GAsyncResult *result,
+                                               GPtrArray **failures,
+                                               GError **error);
+
+
 /**
  * modulemd_module_index_update_from_string:
  * @self: This #ModulemdModuleIndex object.
@@ -337,6 +455,264 @@ modulemd_module_index_dump_to_custom (ModulemdModuleIndex *self,
                                       GError **error);
 
 
+/**
+ * modulemd_module_index_dump_to_string_ext:
+ * @self: This #ModulemdModuleIndex object.
+ * @flags: (in): A set of #ModulemdDumpFlags controlling the output.
+ * @error: (out): A #GError containing the reason the function failed, NULL if
+ * the function succeeded.
+ *
+ * Like modulemd_module_index_dump_to_string(), but allows skipping the
+ * validation and sorting steps. With %MODULEMD_DUMP_FLAG_NONE, the output is
+ * identical to that of modulemd_module_index_dump_to_string().
+ *
+ * Returns: (transfer full): A YAML representation of the index as a string. In
+ * the event of an error, sets @error appropriately and returns NULL.
+ *
+ * Since: 2.9
+ */
+gchar *
+modulemd_module_index_dump_to_string_ext (ModulemdModuleIndex *self,
+                                          ModulemdDumpFlags flags,
+                                          GError **error);
+
+
+/**
+ * modulemd_module_index_dump_to_stream_ext: (skip)
+ * @self: This #ModulemdModuleIndex object.
+ * @yaml_stream: (in): A stream to write the module metadata and other related
+ * information to.
+ * @flags: (in): A set of #ModulemdDumpFlags controlling the output.
+ * @error: (out): A #GError containing the reason the function failed, NULL if
+ * the function succeeded.
+ *
+ * Like modulemd_module_index_dump_to_stream(), but allows skipping the
+ * validation and sorting steps.
+ *
+ * Returns: TRUE if written successfully, FALSE and sets @error appropriately in
+ * the event of an error.
+ *
+ * Since: 2.9
+ */
+gboolean
+modulemd_module_index_dump_to_stream_ext (ModulemdModuleIndex *self,
+                                          FILE *yaml_stream,
+                                          ModulemdDumpFlags flags,
+                                          GError **error);
+
+
+/**
+ * modulemd_module_index_dump_to_custom_ext: (skip)
+ * @self: This #ModulemdModuleIndex object.
+ * @custom_write_fn: (in): A #ModulemdWriteHandler
+ * @custom_pvt_data: (inout): The private data needed by the
+ * #ModulemdWriteHandler
+ * @flags: (in): A set of #ModulemdDumpFlags controlling the output.
+ * @error: (out): A #GError containing the reason the function failed, NULL if
+ * the function succeeded
+ *
+ * Like modulemd_module_index_dump_to_custom(), but allows skipping the
+ * validation and sorting steps.
+ *
+ * Returns: TRUE if written successfully, FALSE and sets @error appropriately in
+ * the event of an error.
+ *
+ * Since: 2.9
+ */
+gboolean
+modulemd_module_index_dump_to_custom_ext (ModulemdModuleIndex *self,
+                                          ModulemdWriteHandler custom_write_fn,
+                                          void *custom_pvt_data,
+                                          ModulemdDumpFlags flags,
+                                          GError **error);
+
+
+/**
+ * modulemd_module_index_dump_to_json:
+ * @self: This #ModulemdModuleIndex object.
+ * @flags: (in): A set of #ModulemdDumpFlags controlling the output.
+ * @error: (out): A #GError containing the reason the function failed, NULL if
+ * the function succeeded.
+ *
+ * Exports the whole index in a single call as a JSON array with one object
+ * per YAML document that modulemd_module_index_dump_to_string_ext() would
+ * emit, in the same order and with the same keys. All scalar values are
+ * JSON strings exactly as they appear in the YAML output, so that values such
+ * as a stream named `2.10` are not altered.
+ *
+ * This is intended for language bindings, where reading a large index one
+ * property at a time is dominated by the cost of each call. For example, in
+ * Python:
+ *
+ * |[<!-- language="Python" -->
+ * for document in json.loads(idx.dump_to_json(Modulemd.DumpFlags.NONE)):
+ *     if document["document"] == "modulemd":
+ *         print(document["data"]["name"], document["data"]["stream"])
+ * ]|
+ *
+ * The Python bindings provide this as `ModuleIndex.to_dicts()`.
+ *
+ * Returns: (transfer full): A JSON representation of the index as a string.
+ * In the event of an error, sets @error appropriately and returns NULL.
+ *
+ * Since: 2.9
+ */
+gchar *
+modulemd_module_index_dump_to_json (ModulemdModuleIndex *self,
+                                    ModulemdDumpFlags flags,
+                                    GError **error);
+
+
+/**
+ * modulemd_module_index_dump_to_file_async:
+ * @self: This #ModulemdModuleIndex object.
+ * @yaml_file: (in): The file to write the YAML to. It is created or
+ * replaced.
+ * @flags: (in): A set of #ModulemdDumpFlags.
+ * @cancellable: (in) (nullable): A #GCancellable, checked before the
+ * subdocuments of each module are written.
+ * @progress_callback: (in) (nullable) (scope notified)
+ * (closure progress_data) (destroy progress_data_free): A function to report
+ * progress to.
+ * @progress_data: (in) (nullable): The data to pass to @progress_callback.
+ * @progress_data_free: (in) (nullable): A function to free @progress_data
+ * with. It may be called from any thread.
+ * @callback: (in) (scope async) (closure user_data): A #GAsyncReadyCallback
+ * to call when the dump is complete.
+ * @user_data: (in): The data to pass to @callback.
+ *
+ * Starts writing the contents of @self to @yaml_file as
+ * modulemd_module_index_dump_to_string_ext() would return them, in a worker
+ * thread. Call modulemd_module_index_dump_to_file_finish() from @callback to
+ * get the result.
+ *
+ * @self is read by the worker thread, so it must not be modified until
+ * @callback has been invoked. This includes validating it and calling getters
+ * that return child objects of its streams, since both record state on the
+ * streams. Other getters may be used meanwhile.
+ *
+ * The output is written to a temporary file in the same directory, which
+ * replaces @yaml_file only once the dump has succeeded. If the operation is
+ * cancelled or fails, an existing @yaml_file is left unchanged. If
+ * @yaml_file is a symbolic link, the file it points to is replaced and the
+ * link is kept. The new file gets the permissions and, where allowed, the
+ * owner of the file it replaces, but not its ACLs or other extended
+ * attributes.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_module_index_dump_to_file_async (
+  ModulemdModuleIndex *self,
+  const gchar *yaml_file,
+  ModulemdDumpFlags flags,
+  GCancellable *cancellable,
+  ModulemdIndexProgressFunc progress_callback,
+  gpointer progress_data,
+  GDestroyNotify progress_data_free,
+  GAsyncReadyCallback callback,
+  gpointer user_data);
+
+
+/**
+ * modulemd_module_index_dump_to_file_finish:
+ * @self: This #ModulemdModuleIndex object.
+ * @result: (in): The #GAsyncResult passed to the callback of
+ * modulemd_module_index_dump_to_file_async().
+ * @error: (out): A #GError containing additional information if the
+ * operation failed. If it was cancelled, this is %G_IO_ERROR_CANCELLED.
+ *
+ * Returns: TRUE if @yaml_file was written successfully, FALSE otherwise.
+ *
+ * Since: 2.9
+ */
+gboolean
+modulemd_module_index_dump_to_file_finish (ModulemdModuleIndex *self,
+                                           GAsyncResult *result,
+                                           GError **error);
+
+
+/**
+ * modulemd_module_index_dump_to_string_filtered:
+ * @self: This #ModulemdModuleIndex object.
+ * @module_name: (in) (nullable): A glob pattern that the module names must
+ * match. If NULL, all modules match.
+ * @stream_name: (in) (nullable): A glob pattern that the stream names must
+ * match. If NULL, all streams match.
+ * @arch: (in) (nullable): A glob pattern that the stream architectures must
+ * match. If NULL, all architectures match, including unset ones.
+ * @flags: (in): A set of #ModulemdDumpFlags controlling the output.
+ * @error: (out): A #GError containing the reason the function failed, NULL if
+ * the function succeeded.
+ *
+ * Emits the subset of @self selected by the patterns, without copying it into
+ * a new #ModulemdModuleIndex first. The patterns are matched with
+ * g_pattern_match_simple(), so "*" and "?" are the only wildcards.
+ *
+ * Only the streams matching @stream_name and @arch and the translations for
+ * stream names matching @stream_name are emitted for each module whose name
+ * matches @module_name. If @stream_name or @arch is set, a module is only
+ * emitted, including its defaults, if at least one of its streams matches.
+ *
+ * For example, the repodata for a single architecture can be produced with:
+ *
+ * |[<!-- language="Python" -->
+ * yaml = index.dump_to_string_filtered(
+ *     None, None, "x86_64", Modulemd.DumpFlags.NONE
+ * )
+ * ]|
+ *
+ * Returns: (transfer full): A YAML representation of the selected part of the
+ * index as a string. In the event of an error, including when nothing in the
+ * index matches the patterns, sets @error appropriately and returns NULL.
+ *
+ * Since: 2.9
+ */
+gchar *
+modulemd_module_index_dump_to_string_filtered (ModulemdModuleIndex *self,
+                                               const gchar *module_name,
+                                               const gchar *stream_name,
+                                               const gchar *arch,
+                                               ModulemdDumpFlags flags,
+                                               GError **error);
+
+
+/**
+ * modulemd_module_index_dump_to_custom_filtered: (skip)
+ * @self: This #ModulemdModuleIndex object.
+ * @custom_write_fn: (in): A #ModulemdWriteHandler
+ * @custom_pvt_data: (inout): The private data needed by the
+ * #ModulemdWriteHandler
+ * @module_name: (in) (nullable): A glob pattern that the module names must
+ * match. If NULL, all modules match.
+ * @stream_name: (in) (nullable): A glob pattern that the stream names must
+ * match. If NULL, all streams match.
+ * @arch: (in) (nullable): A glob pattern that the stream architectures must
+ * match. If NULL, all architectures match, including unset ones.
+ * @flags: (in): A set of #ModulemdDumpFlags controlling the output.
+ * @error: (out): A #GError containing the reason the function failed, NULL if
+ * the function succeeded
+ *
+ * Like modulemd_module_index_dump_to_string_filtered(), but writes the output
+ * with @custom_write_fn.
+ *
+ * Returns: TRUE if written successfully, FALSE and sets @error appropriately in
+ * the event of an error.
+ *
+ * Since: 2.9
+ */
+gboolean
+modulemd_module_index_dump_to_custom_filtered (
+  ModulemdModuleIndex *self,
+  ModulemdWriteHandler custom_write_fn,
+  void *custom_pvt_data,
+  const gchar *module_name,
+  const gchar *stream_name,
+  const gchar *arch,
+  ModulemdDumpFlags flags,
+  GError **error);
+
+
 /**
  * modulemd_module_index_get_module_names_as_strv: (rename-to modulemd_module_index_get_module_names)
  * @self: This #ModulemdModuleIndex object.
@@ -529,4 +905,134 @@ modulemd_module_index_upgrade_defaults (ModulemdModuleIndex *self,
                                         ModulemdDefaultsVersionEnum mdversion,
                                         GError **error);
 
+
+/**
+ * modulemd_module_index_get_stats:
+ * @self: (in): This #ModulemdModuleIndex object.
+ *
+ * Returns: (transfer none): The #ModulemdIndexStats object that accumulates
+ * statistics about reading YAML into @self and merging other indexes into
+ * it. Use modulemd_index_stats_copy() to keep a snapshot and
+ * modulemd_index_stats_reset() to start counting again.
+ *
+ * Since: 2.9
+ */
+ModulemdIndexStats *
+modulemd_module_index_get_stats (ModulemdModuleIndex *self);
+
+
+/**
+ * modulemd_module_index_get_memory_usage:
+ * @self: (in): This #ModulemdModuleIndex object.
+ *
+ * Estimates the memory held by this index and all of the modules, streams,
+ * defaults and translations it contains. The #ModulemdIndexStats returned by
+ * modulemd_module_index_get_stats() are not included.
+ *
+ * Returns: (transfer full): A #ModulemdMemoryUsage object describing the
+ * estimate.
+ *
+ * Since: 2.9
+ */
+ModulemdMemoryUsage *
+modulemd_module_index_get_memory_usage (ModulemdModuleIndex *self);
+
+
+/**
+ * modulemd_module_index_freeze:
+ * @self: This #ModulemdModuleIndex object.
+ *
+ * Makes @self and every #ModulemdModule, #ModulemdModuleStream and
+ * #ModulemdDefaults object it contains read-only. Freezing validates each
+ * stream and defaults object once, so that later validation does not need
+ * to record its result.
+ *
+ * Reading a frozen index never writes to it, so it may be shared by any
+ * number of threads without locking. This covers
+ * modulemd_module_index_get_module(), the module and stream lookups such as
+ * modulemd_module_search_streams(), the default streams, translations and
+ * the dump functions.
+ *
+ * Functions that would modify the index, such as
+ * modulemd_module_index_update_from_file() or
+ * modulemd_module_index_add_module_stream(), emit a critical warning and
+ * return FALSE instead. The same applies to the setters of the contained
+ * streams and defaults. Objects returned by the getters of a frozen stream
+ * must not be modified. Translations and the #ModulemdIndexStats of @self
+ * are not frozen. Copies of the contained streams and defaults, for example
+ * those added to another index, are not frozen.
+ *
+ * There is no way to thaw an index. Merge it into a new index with a
+ * #ModulemdModuleIndexMerger to obtain a modifiable copy.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_module_index_freeze (ModulemdModuleIndex *self);
+
+
+/**
+ * modulemd_module_index_is_frozen:
+ * @self: This #ModulemdModuleIndex object.
+ *
+ * Returns: TRUE if modulemd_module_index_freeze() has been called on @self.
+ *
+ * Since: 2.9
+ */
+gboolean
+modulemd_module_index_is_frozen (ModulemdModuleIndex *self);
+
+
+/**
+ * modulemd_module_index_diff:
+ * @old_index: (in): A #ModulemdModuleIndex with an older version of a
+ * repository.
+ * @new_index: (in): A #ModulemdModuleIndex with a newer version of the same
+ * repository.
+ * @error: (out): A #GError that will return the reason for a failure.
+ *
+ * Compares two indexes and lists what has to be added, changed and removed
+ * to turn @old_index into @new_index. Streams are matched by NSVCA, defaults
+ * by module name and translations by module and stream name. Matching
+ * streams and translations are compared by a checksum of their emitted YAML,
+ * so each of them is only walked once. Streams keep their checksum until they
+ * are modified, so diffing against the same index again, or against a frozen
+ * index, does not emit its streams again.
+ *
+ * Returns: (transfer full): A #ModulemdIndexDiff with the differences
+ * between @old_index and @new_index, or NULL and sets @error if a stream or
+ * translation of either index could not be emitted.
+ *
+ * Since: 2.9
+ */
+ModulemdIndexDiff *
+modulemd_module_index_diff (ModulemdModuleIndex *old_index,
+                            ModulemdModuleIndex *new_index,
+                            GError **error);
+
+
+/**
+ * modulemd_module_index_apply_diff:
+ * @self: (in): This #ModulemdModuleIndex object.
+ * @diff: (in): A #ModulemdIndexDiff, usually returned by
+ * modulemd_module_index_diff() with an index equal to @self as the older
+ * index.
+ * @error: (out): A #GError that will return the reason for a failure.
+ *
+ * Removes the streams, defaults and translations that @diff removes or
+ * changes from @self and then adds the new and changed ones. Modules left
+ * without any streams, defaults or translations are dropped from @self.
+ *
+ * If an object of @diff cannot be added, for example because it cannot be
+ * upgraded to the mdversion of @self, @self is left partially updated.
+ *
+ * Returns: TRUE if @diff was applied, FALSE and sets @error otherwise.
+ *
+ * Since: 2.9
+ */
+gboolean
+modulemd_module_index_apply_diff (ModulemdModuleIndex *self,
+                                  ModulemdIndexDiff *diff,
+                                  GError **error);
+
 G_END_DECLS
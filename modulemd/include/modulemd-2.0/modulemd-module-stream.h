@@ -18,6 +18,7 @@
 #include <glib/gstdio.h>
 
 #include "modulemd-deprecated.h"
+#include "modulemd-memory-usage.h"
 
 G_BEGIN_DECLS
 
@@ -86,9 +87,14 @@ struct _ModulemdModuleStreamClass
   gboolean (*equals) (ModulemdModuleStream *self_1,
                       ModulemdModuleStream *self_2);
 
-  /* Padding to allow adding up to 7 new virtual functions without
+  void (*add_memory_usage) (ModulemdModuleStream *self,
+                            ModulemdMemoryUsage *usage);
+
+  void (*compact) (ModulemdModuleStream *self);
+
+  /* Padding to allow adding up to 5 new virtual functions without
    * breaking ABI. */
-  gpointer padding[7];
+  gpointer padding[5];
 };
 
 
@@ -468,4 +474,22 @@ gboolean
 modulemd_module_stream_build_depends_on_stream (ModulemdModuleStream *self,
                                                 const gchar *module_name,
                                                 const gchar *stream_name);
+
+
+/**
+ * modulemd_module_stream_get_memory_usage:
+ * @self: (in): This #ModulemdModuleStream object.
+ *
+ * Estimates the memory held by this stream and everything it owns. The
+ * #ModulemdTranslation associated with the stream is shared with its
+ * #ModulemdModule, so it is not included.
+ *
+ * Returns: (transfer full): A #ModulemdMemoryUsage object describing the
+ * estimate.
+ *
+ * Since: 2.9
+ */
+ModulemdMemoryUsage *
+modulemd_module_stream_get_memory_usage (ModulemdModuleStream *self);
+
 G_END_DECLS
@@ -15,6 +15,7 @@
 
 #include "modulemd-defaults.h"
 #include "modulemd-deprecated.h"
+#include "modulemd-memory-usage.h"
 #include "modulemd-module-stream.h"
 #include "modulemd-translation.h"
 #include <glib-object.h>
@@ -163,6 +164,35 @@ modulemd_module_search_streams (ModulemdModule *self,
                                 const gchar *arch);
 
 
+/**
+ * modulemd_module_search_streams_by_glob:
+ * @self: This #ModulemdModule object.
+ * @stream_name: (nullable): A glob pattern that the stream names must match.
+ * @version: (nullable): A glob pattern that the decimal representation of the
+ * stream versions must match.
+ * @context: (nullable): A glob pattern that the stream contexts must match.
+ * @arch: (nullable): A glob pattern that the stream architectures must match.
+ *
+ * Like modulemd_module_search_streams(), but each argument is a pattern as
+ * accepted by g_pattern_match_simple() and a NULL argument matches every
+ * stream. For example, `modulemd_module_search_streams_by_glob (module,
+ * NULL, NULL, NULL, "x86_64")` returns all the x86_64 streams of @module.
+ *
+ * Returns: (transfer container) (element-type ModulemdModuleStream): The list
+ * of stream objects matching all the patterns, sorted as by
+ * modulemd_module_search_streams(). This function cannot fail, but it may
+ * return a zero-length list if no matches were found.
+ *
+ * Since: 2.9
+ */
+GPtrArray *
+modulemd_module_search_streams_by_glob (ModulemdModule *self,
+                                        const gchar *stream_name,
+                                        const gchar *version,
+                                        const gchar *context,
+                                        const gchar *arch);
+
+
 /**
  * modulemd_module_get_stream_by_NSVCA:
  * @self: This #ModulemdModule object.
@@ -253,4 +283,20 @@ modulemd_module_get_defaults (ModulemdModule *self);
 ModulemdTranslation *
 modulemd_module_get_translation (ModulemdModule *self, const gchar *stream);
 
+
+/**
+ * modulemd_module_get_memory_usage:
+ * @self: (in): This #ModulemdModule object.
+ *
+ * Estimates the memory held by this module, including all of its streams,
+ * its defaults and its translations.
+ *
+ * Returns: (transfer full): A #ModulemdMemoryUsage object describing the
+ * estimate.
+ *
+ * Since: 2.9
+ */
+ModulemdMemoryUsage *
+modulemd_module_get_memory_usage (ModulemdModule *self);
+
 G_END_DECLS
@@ -18,11 +18,15 @@
 #include "modulemd-component-rpm.h"
 #include "modulemd-component.h"
 #include "modulemd-compression.h"
+#include "modulemd-defaults-loader.h"
 #include "modulemd-defaults-v1.h"
 #include "modulemd-defaults.h"
 #include "modulemd-dependencies.h"
 #include "modulemd-deprecated.h"
 #include "modulemd-errors.h"
+#include "modulemd-index-diff.h"
+#include "modulemd-index-stats.h"
+#include "modulemd-memory-usage.h"
 #include "modulemd-module-index-merger.h"
 #include "modulemd-module-index.h"
 #include "modulemd-module-stream-v1.h"
@@ -258,4 +262,57 @@ const gchar *
 modulemd_get_version (void);
 
 
+/**
+ * modulemd_variant_from_json:
+ * @json: (in): A JSON document.
+ * @error: (out): A #GError that will return the reason for a parsing or
+ * conversion failure.
+ *
+ * Converts a JSON document into a #GVariant suitable for
+ * modulemd_module_stream_v2_set_xmd() and
+ * modulemd_module_stream_v1_set_xmd(). Objects become dictionaries of type
+ * `a{sv}`, arrays become arrays of their element type, strings become
+ * strings and `true` and `false` become booleans. `null` becomes an empty
+ * string. Numbers are not supported and all the values of an array must have
+ * the same type. The document is read with libyaml, which does not accept
+ * object keys longer than 1024 characters.
+ *
+ * This builds the whole #GVariant in a single call, which is much faster
+ * than converting large nested values from language bindings one element at
+ * a time. For example, in Python:
+ *
+ * |[<!-- language="Python" -->
+ * stream.set_xmd(Modulemd.variant_from_json(json.dumps(xmd)))
+ * ]|
+ *
+ * Returns: (transfer full): A newly-allocated #GVariant representing @json,
+ * or NULL and sets @error if @json could not be converted.
+ *
+ * Since: 2.9
+ */
+GVariant *
+modulemd_variant_from_json (const gchar *json, GError **error);
+
+
+/**
+ * modulemd_variant_to_json:
+ * @variant: (in): A #GVariant such as the value returned by
+ * modulemd_module_stream_v2_get_xmd().
+ * @error: (out): A #GError that will return the reason for a conversion
+ * failure.
+ *
+ * Converts @variant into a JSON document. This is the inverse of
+ * modulemd_variant_from_json(), except that empty strings are kept as
+ * strings. Only strings, booleans, variants, dictionaries of type `a{sv}`
+ * and arrays of these are supported.
+ *
+ * Returns: (transfer full): A newly-allocated JSON document representing
+ * @variant, or NULL and sets @error if @variant contains an unsupported type.
+ *
+ * Since: 2.9
+ */
+gchar *
+modulemd_variant_to_json (GVariant *variant, GError **error);
+
+
 G_END_DECLS
@@ -53,6 +53,12 @@ modulemd_component_rpm_get_arches (ModulemdComponentRpm *self);
 GStrv
 modulemd_component_rpm_get_multilib_arches (ModulemdComponentRpm *self);
 
+/**
+ * modulemd_defaults_loader_get_changed_modules: (skip)
+ */
+GStrv
+modulemd_defaults_loader_get_changed_modules (ModulemdDefaultsLoader *self);
+
 /**
  * modulemd_defaults_v1_get_streams_with_default_profiles: (skip)
  */
@@ -284,4 +290,22 @@ modulemd_module_index_get_default_streams (ModulemdModuleIndex *self,
 gchar *
 modulemd_rpm_map_entry_get_nevra (ModulemdRpmMapEntry *self);
 
+/**
+ * modulemd_index_diff_get_removed_streams: (skip)
+ */
+GStrv
+modulemd_index_diff_get_removed_streams (ModulemdIndexDiff *self);
+
+/**
+ * modulemd_index_diff_get_removed_defaults: (skip)
+ */
+GStrv
+modulemd_index_diff_get_removed_defaults (ModulemdIndexDiff *self);
+
+/**
+ * modulemd_index_diff_get_removed_translations: (skip)
+ */
+GStrv
+modulemd_index_diff_get_removed_translations (ModulemdIndexDiff *self);
+
 G_END_DECLS
@@ -17,6 +17,7 @@
 #include <yaml.h>
 
 #include "modulemd-buildopts.h"
+#include "modulemd-memory-usage.h"
 
 /**
  * SECTION: modulemd-buildopts-private
@@ -63,3 +64,30 @@ gboolean
 modulemd_buildopts_emit_yaml (ModulemdBuildopts *self,
                               yaml_emitter_t *emitter,
                               GError **error);
+
+
+/**
+ * modulemd_buildopts_add_memory_usage:
+ * @self: (in): This #ModulemdBuildopts object.
+ * @usage: (inout): The #ModulemdMemoryUsage to which the estimated size of
+ * everything owned by @self is added.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_buildopts_add_memory_usage (ModulemdBuildopts *self,
+                                     ModulemdMemoryUsage *usage);
+
+
+/**
+ * modulemd_buildopts_compact:
+ * @self: (in): This #ModulemdBuildopts object.
+ *
+ * Converts the rpm whitelist and the arches of @self into sorted arrays,
+ * which are smaller and can be emitted without sorting them again. Modifying
+ * them converts them back.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_buildopts_compact (ModulemdBuildopts *self);
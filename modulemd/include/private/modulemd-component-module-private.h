@@ -17,6 +17,7 @@
 #include <yaml.h>
 
 #include "modulemd-component-module.h"
+#include "modulemd-memory-usage.h"
 
 /**
  * SECTION: modulemd-component-module-private
@@ -64,3 +65,16 @@ gboolean
 modulemd_component_module_emit_yaml (ModulemdComponentModule *self,
                                      yaml_emitter_t *emitter,
                                      GError **error);
+
+
+/**
+ * modulemd_component_module_add_memory_usage:
+ * @self: (in): This #ModulemdComponentModule object.
+ * @usage: (inout): The #ModulemdMemoryUsage to which the estimated size of
+ * @self and everything it owns is added.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_component_module_add_memory_usage (ModulemdComponentModule *self,
+                                            ModulemdMemoryUsage *usage);
@@ -17,6 +17,7 @@
 #include <yaml.h>
 
 #include "modulemd-component.h"
+#include "modulemd-memory-usage.h"
 
 /**
  * SECTION: modulemd-component-private
@@ -132,3 +133,17 @@ modulemd_component_emit_yaml_build_common (ModulemdComponent *self,
  */
 gboolean
 modulemd_component_equals_wrapper (const void *a, const void *b);
+
+
+/**
+ * modulemd_component_add_memory_usage:
+ * @self: (in): This #ModulemdComponent object.
+ * @usage: (inout): The #ModulemdMemoryUsage to which the estimated size of
+ * the private data of @self and everything
+ * it owns. Subclasses add their own instance structure is added.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_component_add_memory_usage (ModulemdComponent *self,
+                                     ModulemdMemoryUsage *usage);
@@ -17,6 +17,7 @@
 #include <yaml.h>
 
 #include "modulemd-component-rpm.h"
+#include "modulemd-memory-usage.h"
 
 /**
  * SECTION: modulemd-component-rpm-private
@@ -64,3 +65,16 @@ gboolean
 modulemd_component_rpm_emit_yaml (ModulemdComponentRpm *self,
                                   yaml_emitter_t *emitter,
                                   GError **error);
+
+
+/**
+ * modulemd_component_rpm_add_memory_usage:
+ * @self: (in): This #ModulemdComponentRpm object.
+ * @usage: (inout): The #ModulemdMemoryUsage to which the estimated size of
+ * @self and everything it owns is added.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_component_rpm_add_memory_usage (ModulemdComponentRpm *self,
+                                         ModulemdMemoryUsage *usage);
@@ -15,6 +15,8 @@
 
 #include <glib-object.h>
 
+#include "modulemd-memory-usage.h"
+
 G_BEGIN_DECLS
 
 
@@ -41,6 +43,57 @@ void
 modulemd_defaults_set_module_name (ModulemdDefaults *self,
                                    const gchar *module_name);
 
+/**
+ * modulemd_defaults_is_validated:
+ * @self: (in): This #ModulemdDefaults object.
+ *
+ * Returns: TRUE if the last call to modulemd_defaults_validate() on @self
+ * succeeded and @self has not been modified since. While this is TRUE,
+ * modulemd_defaults_validate() returns TRUE without validating again.
+ *
+ * Since: 2.9
+ */
+gboolean
+modulemd_defaults_is_validated (ModulemdDefaults *self);
+
+/**
+ * modulemd_defaults_clear_validated:
+ * @self: (in): This #ModulemdDefaults object.
+ *
+ * Marks @self as modified, so that the next call to
+ * modulemd_defaults_validate() validates it again. This must be called by
+ * every function that modifies the defaults.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_defaults_clear_validated (ModulemdDefaults *self);
+
+/**
+ * modulemd_defaults_freeze:
+ * @self: (in): This #ModulemdDefaults object.
+ *
+ * Validates @self, ignoring the result, and marks it as read-only so that it
+ * may be read from several threads at once. Modifying it afterwards is a
+ * programming error. modulemd_defaults_copy() returns a copy that is not
+ * frozen.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_defaults_freeze (ModulemdDefaults *self);
+
+/**
+ * modulemd_defaults_is_frozen:
+ * @self: (in): This #ModulemdDefaults object.
+ *
+ * Returns: TRUE if modulemd_defaults_freeze() has been called on @self.
+ *
+ * Since: 2.9
+ */
+gboolean
+modulemd_defaults_is_frozen (ModulemdDefaults *self);
+
 /**
  * modulemd_defaults_merge:
  * @from: (in): A #ModulemdDefaults object to merge from.
@@ -66,4 +119,18 @@ modulemd_defaults_merge (ModulemdDefaults *from,
                          gboolean strict_default_streams,
                          GError **error);
 
+
+/**
+ * modulemd_defaults_add_memory_usage:
+ * @self: (in): This #ModulemdDefaults object.
+ * @usage: (inout): The #ModulemdMemoryUsage to which the estimated size of
+ * the private data of @self and everything
+ * it owns. Subclasses add their own instance structure is added.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_defaults_add_memory_usage (ModulemdDefaults *self,
+                                    ModulemdMemoryUsage *usage);
+
 G_END_DECLS
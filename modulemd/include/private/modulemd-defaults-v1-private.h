@@ -15,6 +15,7 @@
 
 #include "modulemd-defaults-v1.h"
 #include "modulemd-subdocument-info.h"
+#include "modulemd-memory-usage.h"
 #include <glib-object.h>
 #include <yaml.h>
 
@@ -96,4 +97,17 @@ modulemd_defaults_v1_merge (ModulemdDefaultsV1 *from,
                             gboolean strict_default_streams,
                             GError **error);
 
+
+/**
+ * modulemd_defaults_v1_add_memory_usage:
+ * @self: (in): This #ModulemdDefaultsV1 object.
+ * @usage: (inout): The #ModulemdMemoryUsage to which the estimated size of
+ * @self and everything it owns is added.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_defaults_v1_add_memory_usage (ModulemdDefaultsV1 *self,
+                                       ModulemdMemoryUsage *usage);
+
 G_END_DECLS
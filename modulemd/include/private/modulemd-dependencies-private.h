@@ -17,6 +17,7 @@
 #include <yaml.h>
 
 #include "modulemd-dependencies.h"
+#include "modulemd-memory-usage.h"
 
 /**
  * SECTION: modulemd-dependencies-private
@@ -120,3 +121,16 @@ modulemd_dependencies_buildrequires_module_and_stream (
   ModulemdDependencies *self,
   const gchar *module_name,
   const gchar *stream_name);
+
+
+/**
+ * modulemd_dependencies_add_memory_usage:
+ * @self: (in): This #ModulemdDependencies object.
+ * @usage: (inout): The #ModulemdMemoryUsage to which the estimated size of
+ * @self and everything it owns is added.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_dependencies_add_memory_usage (ModulemdDependencies *self,
+                                        ModulemdMemoryUsage *usage);
@@ -0,0 +1,139 @@
+/*
+ * This file is part of libmodulemd
+ * Copyright (C) 2020 Red Hat, Inc.
+ *
+ * Fedora-License-Identifier: MIT
+ * SPDX-2.0-License-Identifier: MIT
+ * SPDX-3.0-License-Identifier: MIT
+ *
+ * This program is free software.
+ * For more information on the license, see COPYING.
+ * For more information on free software, see <https://www.gnu.org/philosophy/free-sw.en.html>.
+ */
+
+#pragma once
+
+#include "modulemd-index-stats.h"
+#include "private/modulemd-yaml.h"
+#include <glib-object.h>
+
+G_BEGIN_DECLS
+
+
+/**
+ * SECTION: modulemd-index-stats-private
+ * @title: Modulemd.IndexStats (Private)
+ * @stability: private
+ * @short_description: #ModulemdIndexStats methods that should only be used
+ * by internal consumers.
+ */
+
+
+/**
+ * modulemd_index_stats_new:
+ *
+ * Returns: (transfer full): A newly-allocated #ModulemdIndexStats object with
+ * all counters and timings set to zero.
+ *
+ * Since: 2.9
+ */
+ModulemdIndexStats *
+modulemd_index_stats_new (void);
+
+
+/**
+ * modulemd_index_stats_add_document:
+ * @self: (in): This #ModulemdIndexStats object.
+ * @doctype: (in): The #ModulemdYamlDocumentTypeEnum of the document.
+ * @mdversion: (in): The metadata version of the document.
+ *
+ * Counts one document of type @doctype. Documents with an unknown type or
+ * metadata version are not counted.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_index_stats_add_document (ModulemdIndexStats *self,
+                                   ModulemdYamlDocumentTypeEnum doctype,
+                                   guint64 mdversion);
+
+
+/**
+ * modulemd_index_stats_add_failure:
+ * @self: (in): This #ModulemdIndexStats object.
+ *
+ * Counts one document that could not be added to the index.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_index_stats_add_failure (ModulemdIndexStats *self);
+
+
+/**
+ * modulemd_index_stats_add_bytes_read:
+ * @self: (in): This #ModulemdIndexStats object.
+ * @bytes: (in): The number of bytes of YAML read.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_index_stats_add_bytes_read (ModulemdIndexStats *self, guint64 bytes);
+
+
+/**
+ * modulemd_index_stats_add_deduplicated:
+ * @self: (in): This #ModulemdIndexStats object.
+ *
+ * Counts one module stream that replaced an identical one.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_index_stats_add_deduplicated (ModulemdIndexStats *self);
+
+
+/**
+ * modulemd_index_stats_add_upgrades:
+ * @self: (in): This #ModulemdIndexStats object.
+ * @upgrades: (in): The number of objects upgraded to a newer metadata
+ * version.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_index_stats_add_upgrades (ModulemdIndexStats *self, guint upgrades);
+
+
+/**
+ * modulemd_index_stats_add_phase_time:
+ * @self: (in): This #ModulemdIndexStats object.
+ * @phase: (in): The #ModulemdIndexStatsPhaseEnum the time was spent in.
+ * @start_time: (in): The value of g_get_monotonic_time() when @phase started.
+ *
+ * Adds the time elapsed since @start_time to the total for @phase.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_index_stats_add_phase_time (ModulemdIndexStats *self,
+                                     ModulemdIndexStatsPhaseEnum phase,
+                                     gint64 start_time);
+
+
+/**
+ * modulemd_index_stats_accumulate:
+ * @self: (in): This #ModulemdIndexStats object.
+ * @from: (in): The #ModulemdIndexStats object to add to @self.
+ *
+ * Adds each of the counters and timings in @from to those in @self. This is
+ * used when the contents of an intermediate #ModulemdModuleIndex are merged
+ * into another, so that the work done to build it is not lost.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_index_stats_accumulate (ModulemdIndexStats *self,
+                                 ModulemdIndexStats *from);
+
+G_END_DECLS
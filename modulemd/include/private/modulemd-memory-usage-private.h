@@ -0,0 +1,213 @@
+/*
+ * This file is part of libmodulemd
+ * Copyright (C) 2020 Red Hat, Inc.
+ *
+ * Fedora-License-Identifier: MIT
+ * SPDX-2.0-License-Identifier: MIT
+ * SPDX-3.0-License-Identifier: MIT
+ *
+ * This program is free software.
+ * For more information on the license, see COPYING.
+ * For more information on free software, see <https://www.gnu.org/philosophy/free-sw.en.html>.
+ */
+
+#pragma once
+
+#include "modulemd-memory-usage.h"
+#include "private/modulemd-util.h"
+#include <glib-object.h>
+
+G_BEGIN_DECLS
+
+
+/**
+ * SECTION: modulemd-memory-usage-private
+ * @title: Modulemd.MemoryUsage (Private)
+ * @stability: private
+ * @short_description: #ModulemdMemoryUsage methods that should only be used
+ * by internal consumers.
+ *
+ * Each object type that can be measured provides a private
+ * modulemd_*_add_memory_usage() function that adds its own instance
+ * structure and everything it owns to a #ModulemdMemoryUsage, using the
+ * functions below.
+ */
+
+
+/**
+ * ModulemdMemoryUsageFunc:
+ * @object: (in): An object owned by the object being measured.
+ * @usage: (inout): The #ModulemdMemoryUsage to which the estimated size of
+ * @object is added.
+ *
+ * The signature of the private modulemd_*_add_memory_usage() functions.
+ *
+ * Since: 2.9
+ */
+typedef void (*ModulemdMemoryUsageFunc) (gpointer object,
+                                         ModulemdMemoryUsage *usage);
+
+
+/**
+ * modulemd_memory_usage_new:
+ *
+ * Returns: (transfer full): A newly-allocated #ModulemdMemoryUsage object with
+ * all values set to zero.
+ *
+ * Since: 2.9
+ */
+ModulemdMemoryUsage *
+modulemd_memory_usage_new (void);
+
+
+/**
+ * modulemd_memory_usage_add_object:
+ * @self: (in): This #ModulemdMemoryUsage object.
+ * @size: (in): The size of an object instance structure, including any
+ * private data.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_memory_usage_add_object (ModulemdMemoryUsage *self, gsize size);
+
+
+/**
+ * modulemd_memory_usage_add_string:
+ * @self: (in): This #ModulemdMemoryUsage object.
+ * @str: (in) (nullable): A string owned by the object being measured.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_memory_usage_add_string (ModulemdMemoryUsage *self, const gchar *str);
+
+
+/**
+ * modulemd_memory_usage_add_hash_table:
+ * @self: (in): This #ModulemdMemoryUsage object.
+ * @table: (in) (nullable): A #GHashTable owned by the object being measured.
+ *
+ * Adds the estimated size of the internal structure of @table. The caller is
+ * responsible for adding its keys and values.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_memory_usage_add_hash_table (ModulemdMemoryUsage *self,
+                                      GHashTable *table);
+
+
+/**
+ * modulemd_memory_usage_add_string_set:
+ * @self: (in): This #ModulemdMemoryUsage object.
+ * @set: (in) (nullable): A #GHashTable set of strings owned by the object
+ * being measured.
+ *
+ * Adds the estimated size of @set and of the strings it contains.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_memory_usage_add_string_set (ModulemdMemoryUsage *self,
+                                      GHashTable *set);
+
+
+/**
+ * modulemd_string_set_add_memory_usage:
+ * @set: (in): A #ModulemdStringSet owned by the object being measured.
+ * @usage: (inout): The #ModulemdMemoryUsage to which the estimated size of
+ * @set and of the strings it contains is added.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_string_set_add_memory_usage (ModulemdStringSet *set,
+                                      ModulemdMemoryUsage *usage);
+
+
+/**
+ * modulemd_memory_usage_add_string_map:
+ * @self: (in): This #ModulemdMemoryUsage object.
+ * @map: (in) (nullable): A #GHashTable with string keys and string values
+ * owned by the object being measured.
+ *
+ * Adds the estimated size of @map and of its keys and values.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_memory_usage_add_string_map (ModulemdMemoryUsage *self,
+                                      GHashTable *map);
+
+
+/**
+ * modulemd_memory_usage_add_object_table:
+ * @self: (in): This #ModulemdMemoryUsage object.
+ * @table: (in) (nullable): A #GHashTable with string keys and object values
+ * owned by the object being measured.
+ * @func: (in) (scope call): The #ModulemdMemoryUsageFunc used to measure each
+ * of the values in @table.
+ *
+ * Adds the estimated size of @table, of its keys and of its values.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_memory_usage_add_object_table (ModulemdMemoryUsage *self,
+                                        GHashTable *table,
+                                        ModulemdMemoryUsageFunc func);
+
+
+/**
+ * modulemd_memory_usage_add_ptr_array:
+ * @self: (in): This #ModulemdMemoryUsage object.
+ * @array: (in) (nullable): A #GPtrArray owned by the object being measured.
+ *
+ * Adds the estimated size of the internal structure of @array. The caller is
+ * responsible for adding its elements.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_memory_usage_add_ptr_array (ModulemdMemoryUsage *self,
+                                     GPtrArray *array);
+
+
+/**
+ * modulemd_memory_usage_add_xmd:
+ * @self: (in): This #ModulemdMemoryUsage object.
+ * @xmd: (in) (nullable): The xmd #GVariant of a module stream.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_memory_usage_add_xmd (ModulemdMemoryUsage *self, GVariant *xmd);
+
+
+/**
+ * modulemd_memory_usage_add_rpm_artifact_map:
+ * @self: (in): This #ModulemdMemoryUsage object.
+ * @bytes: (in): The part of the bytes already added to @self that are held
+ * by an rpm artifact map.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_memory_usage_add_rpm_artifact_map (ModulemdMemoryUsage *self,
+                                            guint64 bytes);
+
+
+/**
+ * modulemd_memory_usage_add_translations:
+ * @self: (in): This #ModulemdMemoryUsage object.
+ * @bytes: (in): The part of the bytes already added to @self that are held
+ * by translations.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_memory_usage_add_translations (ModulemdMemoryUsage *self,
+                                        guint64 bytes);
+
+G_END_DECLS
@@ -62,6 +62,87 @@ modulemd_module_index_update_from_parser (ModulemdModuleIndex *self,
                                           GError **error);
 
 
+/**
+ * modulemd_module_index_update_from_parser_ext:
+ * @self: (in): This #ModulemdModuleIndex object.
+ * @parser: (inout): An initialized YAML parser that has not yet processed any
+ * events.
+ * @strict: (in): Whether the parser should return failure if it encounters an
+ * unknown mapping key or if it should ignore it.
+ * @autogen_module_name: (in): When parsing a module stream that contains no
+ * module name or stream name, whether to autogenerate one or not.
+ * @documents: (in) (nullable) (element-type ModulemdSubdocumentInfo): If not
+ * NULL, a #GPtrArray with g_object_unref() as its free function. A
+ * #ModulemdSubdocumentInfo for every subdocument read, whether it was valid or
+ * not, is appended to it in the order of the input. Each records the location
+ * of the subdocument, its type, its error if any, the time spent on it in each
+ * phase and, for module streams, its NSVCA. The YAML contents are not kept, so
+ * the array stays small for large inputs.
+ * @failures: (out) (element-type ModulemdSubdocumentInfo) (transfer container):
+ * As for modulemd_module_index_update_from_parser().
+ * @error: (out): A #GError containing additional information if this function
+ * fails in a way that prevents program continuation.
+ *
+ * Like modulemd_module_index_update_from_parser(), but also reports every
+ * subdocument read. This is intended for tools such as modulemd-validator.
+ *
+ * Returns: As for modulemd_module_index_update_from_parser().
+ *
+ * Since: 2.9
+ */
+gboolean
+modulemd_module_index_update_from_parser_ext (ModulemdModuleIndex *self,
+                                              yaml_parser_t *parser,
+                                              gboolean strict,
+                                              gboolean autogen_module_name,
+                                              GPtrArray *documents,
+                                              GPtrArray **failures,
+                                              GError **error);
+
+
+/**
+ * modulemd_module_index_validate_from_parser:
+ * @self: (in): This #ModulemdModuleIndex object. Its contents are not
+ * modified, but its #ModulemdIndexStats are updated.
+ * @parser: (inout): An initialized YAML parser that has not yet processed any
+ * events.
+ * @strict: (in): Whether the parser should return failure if it encounters an
+ * unknown mapping key or if it should ignore it.
+ * @seen_nsvcas: (in) (nullable): A #GHashTable set of NSVCA strings with
+ * g_free() as the key destroy function. If not NULL, each module stream is
+ * added to it and a stream whose NSVCA is already present is reported as a
+ * failure. Streams without a module or stream name are not checked.
+ * @documents: (in) (nullable) (element-type ModulemdSubdocumentInfo): As for
+ * modulemd_module_index_update_from_parser_ext().
+ * @failures: (out) (element-type ModulemdSubdocumentInfo) (transfer container):
+ * An array containing any subdocuments from the YAML file that failed to parse
+ * or validate. If the array is NULL, it will be allocated by this function. If
+ * it is non-NULL, this function will append to it.
+ * @error: (out): A #GError containing additional information if this function
+ * fails in a way that prevents program continuation.
+ *
+ * Parses and validates each subdocument in turn like
+ * modulemd_module_index_update_from_parser() with @autogen_module_name set,
+ * but discards it instead of adding it to @self. Memory use does not grow
+ * with the number of documents, apart from @seen_nsvcas. Checks that need the
+ * other documents, such as for conflicting defaults, are not performed.
+ *
+ * Returns: TRUE if every subdocument was valid. Returns FALSE and sets
+ * @failures appropriately if any of the YAML subdocuments were invalid or sets
+ * @error if there was a fatal parse error.
+ *
+ * Since: 2.9
+ */
+gboolean
+modulemd_module_index_validate_from_parser (ModulemdModuleIndex *self,
+                                            yaml_parser_t *parser,
+                                            gboolean strict,
+                                            GHashTable *seen_nsvcas,
+                                            GPtrArray *documents,
+                                            GPtrArray **failures,
+                                            GError **error);
+
+
 /**
  * modulemd_module_index_merge:
  * @from: (in) (transfer none): The #ModulemdModuleIndex whose contents are
@@ -90,4 +171,59 @@ modulemd_module_index_merge (ModulemdModuleIndex *from,
                              gboolean strict_default_streams,
                              GError **error);
 
+
+/**
+ * modulemd_module_index_merge_module:
+ * @module: (in) (transfer none): The #ModulemdModule whose contents are being
+ * merged in.
+ * @into: (inout) (transfer none): The #ModulemdModuleIndex whose contents are
+ * being updated by those from @module.
+ * @override: (in): In the event that the contents cannot be merged, this
+ * argument specifies whether the contents of @module will supersede those
+ * from @into.
+ * @strict_default_streams: (in): When merging #ModulemdDefaults, treat
+ * conflicting stream defaults as an error if this is True. Otherwise, on a
+ * conflict, the default stream will be unset.
+ * @error: (out): If the merge fails, this will return a #GError explaining the
+ * reason for it.
+ *
+ * Merges the streams, defaults and translations of a single module into
+ * @into, following the same rules as modulemd_module_index_merge().
+ *
+ * Returns: TRUE if the module could be merged without conflicts. FALSE and
+ * sets @error appropriately if the merge fails.
+ *
+ * Since: 2.9
+ */
+gboolean
+modulemd_module_index_merge_module (ModulemdModule *module,
+                                    ModulemdModuleIndex *into,
+                                    gboolean override,
+                                    gboolean strict_default_streams,
+                                    GError **error);
+
+
+/**
+ * modulemd_module_index_read_files:
+ * @filepaths: (in) (element-type utf8): The paths of the YAML files to read.
+ * @strict: (in): Whether the parser should return failure if it encounters an
+ * unknown mapping key or if it should ignore it.
+ * @error: (out): A #GError containing the reason one of the files could not
+ * be read.
+ *
+ * Reads each of @filepaths into its own #ModulemdModuleIndex. The files are
+ * read concurrently on a pool of worker threads.
+ *
+ * Returns: (transfer container) (element-type ModulemdModuleIndex): An array
+ * of #ModulemdModuleIndex objects in the same order as @filepaths. If any
+ * file fails to be read, returns NULL and sets @error to the error from the
+ * first such file in @filepaths.
+ *
+ * Since: 2.9
+ */
+GPtrArray *
+modulemd_module_index_read_files (GPtrArray *filepaths,
+                                  gboolean strict,
+                                  GError **error);
+
 G_END_DECLS
@@ -89,6 +89,37 @@ modulemd_module_add_translation (ModulemdModule *self,
                                  ModulemdTranslation *translation);
 
 
+/**
+ * modulemd_module_remove_translation:
+ * @self: This #ModulemdModule object.
+ * @module_stream: (in): The name of the stream whose translation is removed.
+ *
+ * Removes the translation of @module_stream from @self and from any of its
+ * streams named @module_stream.
+ *
+ * Returns: TRUE if @self had a translation for @module_stream.
+ *
+ * Since: 2.9
+ */
+gboolean
+modulemd_module_remove_translation (ModulemdModule *self,
+                                    const gchar *module_stream);
+
+
+/**
+ * modulemd_module_remove_streams_in_set:
+ * @self: This #ModulemdModule object.
+ * @nsvcas: (in): A set of NSVCA strings, as returned by
+ * modulemd_module_stream_get_NSVCA_as_string().
+ *
+ * Removes every stream of @self whose NSVCA is in @nsvcas.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_module_remove_streams_in_set (ModulemdModule *self,
+                                       GHashTable *nsvcas);
+
 /**
  * modulemd_module_get_translated_streams:
  * @self: This #ModulemdModule object.
@@ -102,6 +133,32 @@ GPtrArray *
 modulemd_module_get_translated_streams (ModulemdModule *self);
 
 
+/**
+ * modulemd_module_freeze:
+ * @self: This #ModulemdModule object.
+ *
+ * Freezes @self, its streams and its defaults, as described for
+ * modulemd_module_index_freeze(). Functions that add or remove streams,
+ * defaults or translations refuse to modify a frozen module.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_module_freeze (ModulemdModule *self);
+
+
+/**
+ * modulemd_module_is_frozen:
+ * @self: This #ModulemdModule object.
+ *
+ * Returns: TRUE if modulemd_module_freeze() has been called on @self.
+ *
+ * Since: 2.9
+ */
+gboolean
+modulemd_module_is_frozen (ModulemdModule *self);
+
+
 /**
  * modulemd_module_add_stream:
  * @self: This #ModulemdModule object.
@@ -152,4 +209,17 @@ modulemd_module_upgrade_streams (ModulemdModule *self,
                                  ModulemdModuleStreamVersionEnum mdversion,
                                  GError **error);
 
+
+/**
+ * modulemd_module_add_memory_usage:
+ * @self: (in): This #ModulemdModule object.
+ * @usage: (inout): The #ModulemdMemoryUsage to which the estimated size of
+ * @self and everything it owns is added.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_module_add_memory_usage (ModulemdModule *self,
+                                  ModulemdMemoryUsage *usage);
+
 G_END_DECLS
@@ -55,6 +55,133 @@ void
 modulemd_module_stream_set_stream_name (ModulemdModuleStream *self,
                                         const gchar *stream_name);
 
+/**
+ * modulemd_module_stream_is_validated:
+ * @self: (in): This #ModulemdModuleStream object.
+ *
+ * Returns: TRUE if the last call to modulemd_module_stream_validate() on
+ * @self succeeded and @self has not been modified since. While this is TRUE,
+ * modulemd_module_stream_validate() returns TRUE without validating again.
+ * It stays FALSE for a stream that is not frozen once one of its child
+ * objects has been handed out by a getter, because changes made through that
+ * child later cannot be detected.
+ *
+ * Since: 2.9
+ */
+gboolean
+modulemd_module_stream_is_validated (ModulemdModuleStream *self);
+
+/**
+ * modulemd_module_stream_clear_validated:
+ * @self: (in): This #ModulemdModuleStream object.
+ *
+ * Marks @self as modified, so that the next call to
+ * modulemd_module_stream_validate() validates it again and its fingerprint is
+ * computed again. This must be called by every function that modifies the
+ * stream, including those that return a pointer through which one of its
+ * child objects may be modified.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_module_stream_clear_validated (ModulemdModuleStream *self);
+
+/**
+ * modulemd_module_stream_expose_child:
+ * @self: (in): This #ModulemdModuleStream object.
+ *
+ * Called by the getters that return a pointer through which one of the child
+ * objects of @self may be modified. Unless @self is frozen, this marks @self
+ * as modified like modulemd_module_stream_clear_validated() and stops
+ * modulemd_module_stream_validate() from remembering its result, since the
+ * caller may keep the child and modify it at any later time. The children of
+ * a frozen stream must not be modified, so the getters do not write to it.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_module_stream_expose_child (ModulemdModuleStream *self);
+
+/**
+ * modulemd_module_stream_freeze:
+ * @self: (in): This #ModulemdModuleStream object.
+ *
+ * Validates @self, ignoring the result, computes its fingerprint and marks it
+ * as read-only. The getters of a frozen stream do not write to it, so it may
+ * be read from several threads at once. Modifying it afterwards, including
+ * through a child object returned by a getter before @self was frozen, is a
+ * programming error. There is no way to thaw a stream, but
+ * modulemd_module_stream_copy() returns a copy that is not frozen.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_module_stream_freeze (ModulemdModuleStream *self);
+
+/**
+ * modulemd_module_stream_is_frozen:
+ * @self: (in): This #ModulemdModuleStream object.
+ *
+ * Returns: TRUE if modulemd_module_stream_freeze() has been called on @self.
+ *
+ * Since: 2.9
+ */
+gboolean
+modulemd_module_stream_is_frozen (ModulemdModuleStream *self);
+
+/**
+ * modulemd_module_stream_get_fingerprint:
+ * @self: (in): This #ModulemdModuleStream object.
+ * @error: (out): A #GError that will return the reason for a failure.
+ *
+ * Returns the SHA-256 checksum of the YAML document emitted for @self. Two
+ * streams of the same mdversion have the same fingerprint if and only if
+ * they emit the same document. The fingerprint is computed while emitting,
+ * without keeping the YAML in memory, and is cached until @self is modified.
+ * It is not cached once a getter has handed out a child object of @self that
+ * may still be modified. A copy of @self with the same module and stream
+ * names shares it.
+ *
+ * modulemd_module_stream_equals() compares two streams that both have a
+ * cached fingerprint by their fingerprints instead of comparing all of their
+ * fields.
+ *
+ * Returns: (transfer full): The fingerprint of @self as a hexadecimal string,
+ * or NULL and sets @error if @self could not be emitted.
+ *
+ * Since: 2.9
+ */
+gchar *
+modulemd_module_stream_get_fingerprint (ModulemdModuleStream *self,
+                                        GError **error);
+
+/**
+ * modulemd_module_stream_cache_fingerprint:
+ * @self: (in): This #ModulemdModuleStream object.
+ *
+ * Computes and caches the fingerprint of @self if it can be cached and is not
+ * already, so that modulemd_module_stream_equals() can compare @self with
+ * other streams by fingerprint. Nothing is computed for a frozen stream or
+ * for one that has handed out a child object, since the result would not be
+ * kept. A stream that cannot be emitted is left without a fingerprint.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_module_stream_cache_fingerprint (ModulemdModuleStream *self);
+
+/**
+ * modulemd_module_stream_peek_fingerprint:
+ * @self: (in): This #ModulemdModuleStream object.
+ *
+ * Returns: (transfer none) (nullable): The cached fingerprint of @self, or
+ * NULL if none is cached. Nothing is computed.
+ *
+ * Since: 2.9
+ */
+const gchar *
+modulemd_module_stream_peek_fingerprint (ModulemdModuleStream *self);
+
 /**
  * modulemd_module_stream_associate_translation:
  * @self: (in): This #ModulemdModuleStream object.
@@ -349,4 +476,20 @@ modulemd_module_stream_emit_yaml_base (ModulemdModuleStream *self,
                                        yaml_emitter_t *emitter,
                                        GError **error);
 
+
+/**
+ * modulemd_module_stream_add_memory_usage:
+ * @self: (in): This #ModulemdModuleStream object.
+ * @usage: (inout): The #ModulemdMemoryUsage to which the estimated size of
+ * @self and everything it owns is added.
+ *
+ * Adds the private data common to all module streams and then calls the
+ * add_memory_usage() virtual function of the subclass.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_module_stream_add_memory_usage (ModulemdModuleStream *self,
+                                         ModulemdMemoryUsage *usage);
+
 G_END_DECLS
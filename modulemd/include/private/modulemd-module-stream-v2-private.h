@@ -15,6 +15,7 @@
 
 #include "modulemd-module-stream-v2.h"
 #include "modulemd-subdocument-info.h"
+#include "private/modulemd-util.h"
 #include <glib-object.h>
 #include <yaml.h>
 
@@ -45,23 +46,29 @@ struct _ModulemdModuleStreamV2
 
   /* Internal Data Structures */
   GHashTable *module_components; /* <string, Modulemd.ComponentModule */
+  ModulemdOrderedKeys module_component_names;
   GHashTable *rpm_components; /* <string, Modulemd.ComponentRpm> */
+  ModulemdOrderedKeys rpm_component_names;
 
-  GHashTable *content_licenses; /* string set */
-  GHashTable *module_licenses; /* string set */
+  ModulemdStringSet content_licenses;
+  ModulemdStringSet module_licenses;
 
   GHashTable *profiles; /* <string, Modulemd.Profile> */
+  ModulemdOrderedKeys profile_names;
 
-  GHashTable *rpm_api; /* string set */
+  ModulemdStringSet rpm_api;
 
-  GHashTable *rpm_artifacts; /* string set */
+  ModulemdStringSet rpm_artifacts;
 
-  /*  < string, GHashTable <string, Modulemd.RpmMapEntry> > */
-  GHashTable *rpm_artifact_map;
+  /* <RpmMapRecord>, see modulemd-module-stream-v2.c */
+  GArray *rpm_artifact_map;
+  GStringChunk *rpm_artifact_map_strings;
+  gboolean rpm_artifact_map_sorted;
 
-  GHashTable *rpm_filters; /* string set */
+  ModulemdStringSet rpm_filters;
 
   GHashTable *servicelevels; /* <string, Modulemd.ServiceLevel */
+  ModulemdOrderedKeys servicelevel_names;
 
   GPtrArray *dependencies; /* <Modulemd.Dependencies> */
 
@@ -69,6 +76,23 @@ struct _ModulemdModuleStreamV2
 };
 
 
+/**
+ * modulemd_module_stream_v2_compact:
+ * @self: (in): This #ModulemdModuleStreamV2 object.
+ *
+ * Converts the string sets of @self, its profiles and its buildopts into
+ * sorted arrays, sorts any rpm-map entries that were added out of order and
+ * collects the sorted names of its components, profiles and service levels.
+ * After this, reading @self does not modify it, and emitting it does not need
+ * to sort anything. Adding to a compacted set is still allowed. This is called
+ * at the end of parsing and when @self is frozen.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_module_stream_v2_compact (ModulemdModuleStreamV2 *self);
+
+
 /**
  * modulemd_module_stream_v2_parse_yaml:
  * @subdoc: (in): A #ModulemdSubdocumentInfo representing a stream v2
@@ -18,6 +18,7 @@
 
 #include "modulemd-module-stream.h"
 #include "modulemd-profile.h"
+#include "modulemd-memory-usage.h"
 
 /**
  * SECTION: modulemd-profile-private
@@ -92,3 +93,30 @@ modulemd_profile_equals_wrapper (const void *a, const void *b);
 void
 modulemd_profile_set_owner (ModulemdProfile *self,
                             ModulemdModuleStream *owner);
+
+
+/**
+ * modulemd_profile_add_memory_usage:
+ * @self: (in): This #ModulemdProfile object.
+ * @usage: (inout): The #ModulemdMemoryUsage to which the estimated size of
+ * @self and everything it owns is added.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_profile_add_memory_usage (ModulemdProfile *self,
+                                   ModulemdMemoryUsage *usage);
+
+
+/**
+ * modulemd_profile_compact:
+ * @self: (in): This #ModulemdProfile object.
+ *
+ * Converts the set of rpms of @self into a sorted array, which is smaller and
+ * can be emitted without sorting it again. Adding or removing rpms converts
+ * it back.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_profile_compact (ModulemdProfile *self);
@@ -14,6 +14,8 @@
 #include <glib.h>
 #include <yaml.h>
 
+#include "modulemd-memory-usage.h"
+
 /**
  * SECTION: modulemd-rpm-map-entry-private
  * @title: Modulemd.RpmMapEntry (Private)
@@ -22,6 +24,58 @@
  * by internal consumers.
  */
 
+/**
+ * ModulemdRpmMapEntryFields:
+ * @name: The package name.
+ * @epoch: The package epoch.
+ * @version: The package version.
+ * @release: The package release.
+ * @arch: The package architecture.
+ *
+ * The attributes of a #ModulemdRpmMapEntry as a plain structure. It does not
+ * own its strings. #ModulemdModuleStreamV2 stores its rpm-map in this form and
+ * only creates #ModulemdRpmMapEntry objects when they are requested.
+ *
+ * Since: 2.9
+ */
+typedef struct _ModulemdRpmMapEntryFields
+{
+  const gchar *name;
+  guint64 epoch;
+  const gchar *version;
+  const gchar *release;
+  const gchar *arch;
+} ModulemdRpmMapEntryFields;
+
+
+/**
+ * modulemd_rpm_map_entry_get_fields:
+ * @self: (in): This #ModulemdRpmMapEntry object.
+ * @fields: (out caller-allocates): The #ModulemdRpmMapEntryFields to fill in.
+ * The strings in @fields belong to @self and are only valid until @self is
+ * modified or finalized.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_rpm_map_entry_get_fields (ModulemdRpmMapEntry *self,
+                                   ModulemdRpmMapEntryFields *fields);
+
+
+/**
+ * modulemd_rpm_map_entry_fields_equal:
+ * @a: (in): A #ModulemdRpmMapEntryFields.
+ * @b: (in): A #ModulemdRpmMapEntryFields.
+ *
+ * Returns: TRUE if @a and @b describe the same package.
+ *
+ * Since: 2.9
+ */
+gboolean
+modulemd_rpm_map_entry_fields_equal (const ModulemdRpmMapEntryFields *a,
+                                     const ModulemdRpmMapEntryFields *b);
+
+
 /**
  * modulemd_rpm_map_entry_parse_yaml
  * @parser: (inout): A libyaml parser object positioned at the beginning of an
@@ -41,6 +95,33 @@ modulemd_rpm_map_entry_parse_yaml (yaml_parser_t *parser,
                                    GError **error);
 
 
+/**
+ * modulemd_rpm_map_entry_parse_yaml_fields:
+ * @parser: (inout): A libyaml parser object positioned at the beginning of an
+ * RpmMapEntry's mapping entry in the YAML document.
+ * @strict: (in): Whether the parser should return failure if it encounters an
+ * unknown mapping key or if it should ignore it.
+ * @strings: (in): A #GStringChunk that will hold the strings read from the
+ * YAML. Identical strings are only stored once.
+ * @fields: (out caller-allocates): The #ModulemdRpmMapEntryFields to fill in.
+ * @error: (out): A #GError that will return the reason for parsing error.
+ *
+ * Like modulemd_rpm_map_entry_parse_yaml(), but without creating a
+ * #ModulemdRpmMapEntry object.
+ *
+ * Returns: TRUE if the entry was parsed and validated successfully. FALSE and
+ * sets @error appropriately if a parse error occurred.
+ *
+ * Since: 2.9
+ */
+gboolean
+modulemd_rpm_map_entry_parse_yaml_fields (yaml_parser_t *parser,
+                                          gboolean strict,
+                                          GStringChunk *strings,
+                                          ModulemdRpmMapEntryFields *fields,
+                                          GError **error);
+
+
 /**
  * modulemd_rpm_map_entry_emit_yaml:
  * @self: This #ModulemdRpmMapEntry object.
@@ -60,6 +141,29 @@ modulemd_rpm_map_entry_emit_yaml (ModulemdRpmMapEntry *self,
                                   GError **error);
 
 
+/**
+ * modulemd_rpm_map_entry_emit_yaml_fields:
+ * @fields: (in): The #ModulemdRpmMapEntryFields to emit.
+ * @emitter: (inout): A libyaml emitter object positioned where a
+ * #ModulemdRpmMapEntry belongs in the YAML document.
+ * @error: (out): A #GError that will return the reason for an emission or
+ * validation error.
+ *
+ * Like modulemd_rpm_map_entry_emit_yaml(), but for an entry that has not been
+ * turned into a #ModulemdRpmMapEntry object.
+ *
+ * Return: TRUE if the entry was emitted successfully. FALSE and sets @error
+ * appropriately if the YAML could not be emitted.
+ *
+ * Since: 2.9
+ */
+gboolean
+modulemd_rpm_map_entry_emit_yaml_fields (
+  const ModulemdRpmMapEntryFields *fields,
+  yaml_emitter_t *emitter,
+  GError **error);
+
+
 /**
  * modulemd_rpm_map_entry_equals_wrapper:
  * @a: A const void pointer.
@@ -75,15 +179,13 @@ modulemd_rpm_map_entry_equals_wrapper (const void *a, const void *b);
 
 
 /**
- * modulemd_RpmMapEntry_hash_table_equals_wrapper:
- * @a: A const void pointer.
- * @b: A const void pointer.
+ * modulemd_rpm_map_entry_add_memory_usage:
+ * @self: (in): This #ModulemdRpmMapEntry object.
+ * @usage: (inout): The #ModulemdMemoryUsage to which the estimated size of
+ * @self and everything it owns is added.
  *
- * Returns: TRUE if the two entries are equivalent #GHashTable<!-- -->s of
- * pointers to #ModulemdRpmMapEntry objects containing equivalent data. FALSE
- * if they differ.
- *
- * Since: 2.5
+ * Since: 2.9
  */
-gboolean
-modulemd_RpmMapEntry_hash_table_equals_wrapper (const void *a, const void *b);
+void
+modulemd_rpm_map_entry_add_memory_usage (ModulemdRpmMapEntry *self,
+                                         ModulemdMemoryUsage *usage);
@@ -17,6 +17,7 @@
 #include <yaml.h>
 
 #include "modulemd-service-level.h"
+#include "modulemd-memory-usage.h"
 
 /**
  * SECTION: modulemd-service-level-private
@@ -78,3 +79,16 @@ modulemd_service_level_emit_yaml (ModulemdServiceLevel *self,
  */
 gboolean
 modulemd_service_level_equals_wrapper (const void *a, const void *b);
+
+
+/**
+ * modulemd_service_level_add_memory_usage:
+ * @self: (in): This #ModulemdServiceLevel object.
+ * @usage: (inout): The #ModulemdMemoryUsage to which the estimated size of
+ * @self and everything it owns is added.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_service_level_add_memory_usage (ModulemdServiceLevel *self,
+                                         ModulemdMemoryUsage *usage);
@@ -16,6 +16,7 @@
 #include <glib-object.h>
 #include <yaml.h>
 
+#include "modulemd-index-stats.h"
 #include "modulemd-subdocument-info.h"
 #include "private/modulemd-yaml.h"
 
@@ -124,6 +125,102 @@ modulemd_subdocument_info_set_gerror (ModulemdSubdocumentInfo *self,
                                       const GError *error);
 
 
+/**
+ * modulemd_subdocument_info_set_location:
+ * @self: This #ModulemdSubdocumentInfo object.
+ * @line: The line of the input on which the document starts, counting from
+ * one.
+ * @offset: The byte offset in the input at which the document starts.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_subdocument_info_set_location (ModulemdSubdocumentInfo *self,
+                                        gsize line,
+                                        gsize offset);
+
+
+/**
+ * modulemd_subdocument_info_get_line:
+ * @self: This #ModulemdSubdocumentInfo object.
+ *
+ * Returns: The line of the input on which the document starts, counting from
+ * one, or zero if it is not known.
+ *
+ * Since: 2.9
+ */
+gsize
+modulemd_subdocument_info_get_line (ModulemdSubdocumentInfo *self);
+
+
+/**
+ * modulemd_subdocument_info_get_offset:
+ * @self: This #ModulemdSubdocumentInfo object.
+ *
+ * Returns: The byte offset in the input at which the document starts.
+ *
+ * Since: 2.9
+ */
+gsize
+modulemd_subdocument_info_get_offset (ModulemdSubdocumentInfo *self);
+
+
+/**
+ * modulemd_subdocument_info_set_nsvca:
+ * @self: This #ModulemdSubdocumentInfo object.
+ * @nsvca: (nullable): The NSVCA of the module stream read from this document.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_subdocument_info_set_nsvca (ModulemdSubdocumentInfo *self,
+                                     const gchar *nsvca);
+
+
+/**
+ * modulemd_subdocument_info_get_nsvca:
+ * @self: This #ModulemdSubdocumentInfo object.
+ *
+ * Returns: (transfer none): The NSVCA of the module stream read from this
+ * document, or NULL if it is not a module stream or could not be parsed.
+ *
+ * Since: 2.9
+ */
+const gchar *
+modulemd_subdocument_info_get_nsvca (ModulemdSubdocumentInfo *self);
+
+
+/**
+ * modulemd_subdocument_info_add_phase_time:
+ * @self: This #ModulemdSubdocumentInfo object.
+ * @phase: The #ModulemdIndexStatsPhaseEnum the time was spent in.
+ * @start_time: The value of g_get_monotonic_time() when @phase started.
+ *
+ * Adds the time elapsed since @start_time to the time spent on this document
+ * in @phase.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_subdocument_info_add_phase_time (ModulemdSubdocumentInfo *self,
+                                          ModulemdIndexStatsPhaseEnum phase,
+                                          gint64 start_time);
+
+
+/**
+ * modulemd_subdocument_info_get_phase_time:
+ * @self: This #ModulemdSubdocumentInfo object.
+ * @phase: A #ModulemdIndexStatsPhaseEnum.
+ *
+ * Returns: The number of microseconds spent on this document in @phase.
+ *
+ * Since: 2.9
+ */
+gint64
+modulemd_subdocument_info_get_phase_time (ModulemdSubdocumentInfo *self,
+                                          ModulemdIndexStatsPhaseEnum phase);
+
+
 /**
  * modulemd_subdocument_info_get_data_parser:
  * @self: This #ModulemdSubdocumentInfo object.
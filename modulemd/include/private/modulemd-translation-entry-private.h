@@ -17,6 +17,7 @@
 #include <yaml.h>
 
 #include "modulemd-translation-entry.h"
+#include "modulemd-memory-usage.h"
 
 /**
  * SECTION: modulemd-translation-entry-private
@@ -65,3 +66,16 @@ gboolean
 modulemd_translation_entry_emit_yaml (ModulemdTranslationEntry *self,
                                       yaml_emitter_t *emitter,
                                       GError **error);
+
+
+/**
+ * modulemd_translation_entry_add_memory_usage:
+ * @self: (in): This #ModulemdTranslationEntry object.
+ * @usage: (inout): The #ModulemdMemoryUsage to which the estimated size of
+ * @self and everything it owns is added.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_translation_entry_add_memory_usage (ModulemdTranslationEntry *self,
+                                             ModulemdMemoryUsage *usage);
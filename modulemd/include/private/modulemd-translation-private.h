@@ -18,6 +18,7 @@
 
 #include "modulemd-profile.h"
 #include "modulemd-subdocument-info.h"
+#include "modulemd-memory-usage.h"
 
 /**
  * SECTION: modulemd-translation-private
@@ -73,6 +74,22 @@ modulemd_translation_get_module_stream (ModulemdTranslation *self);
 guint64
 modulemd_translation_get_modified (ModulemdTranslation *self);
 
+/**
+ * modulemd_translation_is_validated:
+ * @self: (in): This #ModulemdTranslation object.
+ *
+ * Returns: TRUE if the last call to modulemd_translation_validate() on @self
+ * succeeded and @self has not been modified since. While this is TRUE,
+ * modulemd_translation_validate() returns TRUE without validating again.
+ * It stays FALSE once modulemd_translation_get_translation_entry() has been
+ * called, because changes made through the returned entry later cannot be
+ * detected.
+ *
+ * Since: 2.9
+ */
+gboolean
+modulemd_translation_is_validated (ModulemdTranslation *self);
+
 
 /**
  * modulemd_translation_parse_yaml:
@@ -111,3 +128,16 @@ gboolean
 modulemd_translation_emit_yaml (ModulemdTranslation *self,
                                 yaml_emitter_t *emitter,
                                 GError **error);
+
+
+/**
+ * modulemd_translation_add_memory_usage:
+ * @self: (in): This #ModulemdTranslation object.
+ * @usage: (inout): The #ModulemdMemoryUsage to which the estimated size of
+ * @self and everything it owns is added.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_translation_add_memory_usage (ModulemdTranslation *self,
+                                       ModulemdMemoryUsage *usage);
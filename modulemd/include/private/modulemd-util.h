@@ -48,65 +48,155 @@ modulemd_error_quark (void);
  * modulemd_tracer:
  * @function_name: The name of the function to be tracked by this
  * #modulemd_tracer.
+ * @start_time: The monotonic time in microseconds at which the function was
+ * entered, or zero if tracing was disabled at that time.
  *
  * Since: 2.0
  */
 typedef struct _modulemd_tracer
 {
-  gchar *function_name;
+  const gchar *function_name;
+  gint64 start_time;
 } modulemd_tracer;
 
 /**
- * modulemd_trace_init:
+ * modulemd_trace_state:
+ *
+ * Zero until the tracing configuration has been read from the environment,
+ * then one of %MODULEMD_TRACE_DISABLED or %MODULEMD_TRACE_ENABLED.
+ *
+ * DIRECT USE OF THIS VARIABLE SHOULD BE AVOIDED. Use %MODULEMD_INIT_TRACE
+ * instead.
+ *
+ * Since: 2.9
+ */
+extern gint modulemd_trace_state;
+
+#define MODULEMD_TRACE_DISABLED 1
+#define MODULEMD_TRACE_ENABLED 2
+
+/**
+ * modulemd_trace_read_state:
+ *
+ * Reads the tracing configuration from the environment and stores it in
+ * #modulemd_trace_state. Tracing is enabled if `MMD_TRACE` is set to a
+ * non-empty value other than "0", if `G_MESSAGES_DEBUG` is set to "all" or
+ * includes the libmodulemd log domain, or if the process is being recorded by
+ * sysprof and libmodulemd was built with sysprof support.
+ *
+ * The environment is only read once, so it must be set before the first
+ * traced function is called.
+ *
+ * Returns: TRUE if tracing is enabled.
+ *
+ * Since: 2.9
+ */
+gboolean
+modulemd_trace_read_state (void);
+
+/**
+ * modulemd_trace_enabled:
+ *
+ * Returns: TRUE if tracing is enabled. Once the environment has been read,
+ * this costs a single load and comparison.
+ *
+ * Since: 2.9
+ */
+static inline gboolean
+modulemd_trace_enabled (void)
+{
+  gint state = g_atomic_int_get (&modulemd_trace_state);
+
+  if (G_LIKELY (state == MODULEMD_TRACE_DISABLED))
+    {
+      return FALSE;
+    }
+
+  if (state == MODULEMD_TRACE_ENABLED)
+    {
+      return TRUE;
+    }
+
+  return modulemd_trace_read_state ();
+}
+
+/**
+ * modulemd_trace_enter:
  * @function_name: The name of the function being traced.
  *
- * Returns: (transfer full): A newly-allocated #modulemd_tracer object.
+ * Writes a g_debug() trace message indicating @function_name has been
+ * entered.
  *
- * Allocates and returns a new #modulemd_tracer that tracks the provided
- * @function_name. Also writes a g_debug() trace message indicating
- * @function_name has been entered.
+ * DIRECT USE OF THIS FUNCTION SHOULD BE AVOIDED. Instead use
+ * %MODULEMD_INIT_TRACE--which makes use of this function as part of its
+ * internal implementation.
+ *
+ * Returns: The current monotonic time in microseconds.
+ *
+ * Since: 2.9
+ */
+gint64
+modulemd_trace_enter (const gchar *function_name);
+
+/**
+ * modulemd_trace_exit:
+ * @function_name: The name of the function being traced.
+ * @start_time: The value returned by modulemd_trace_enter() when
+ * @function_name was entered.
+ *
+ * Writes a g_debug() trace message indicating @function_name is being exited
+ * and how long it ran. If libmodulemd was built with sysprof support, also
+ * records a sysprof mark spanning the call.
  *
  * DIRECT USE OF THIS FUNCTION SHOULD BE AVOIDED. Instead use
  * %MODULEMD_INIT_TRACE--which makes use of this function as part of its
  * internal implementation.
  *
- * Since: 2.0
+ * Since: 2.9
  */
-modulemd_tracer *
-modulemd_trace_init (const gchar *function_name);
+void
+modulemd_trace_exit (const gchar *function_name, gint64 start_time);
 
 /**
- * modulemd_trace_free:
+ * modulemd_trace_clear:
  * @tracer: A #modulemd_tracer object representing a function being traced.
  *
- * Writes a g_debug() trace message indicating the function name associated
- * with @tracer is being exited and frees @tracer.
+ * Calls modulemd_trace_exit() if tracing was enabled when the function
+ * associated with @tracer was entered.
  *
  * DIRECT USE OF THIS FUNCTION SHOULD BE AVOIDED. Instead use
  * %MODULEMD_INIT_TRACE--which makes use of this function as part of its
  * internal implementation.
  *
- * Since: 2.0
+ * Since: 2.9
  */
-void
-modulemd_trace_free (modulemd_tracer *tracer);
+static inline void
+modulemd_trace_clear (modulemd_tracer *tracer)
+{
+  if (G_UNLIKELY (tracer->start_time != 0))
+    {
+      modulemd_trace_exit (tracer->function_name, tracer->start_time);
+    }
+}
 
-G_DEFINE_AUTOPTR_CLEANUP_FUNC (modulemd_tracer, modulemd_trace_free);
+G_DEFINE_AUTO_CLEANUP_CLEAR_FUNC (modulemd_tracer, modulemd_trace_clear);
 
 /**
  * MODULEMD_INIT_TRACE:
  *
- * When used at the beginning of a function, automatically writes g_debug()
- * trace messages when entering and leaving that function. Makes use of
- * modulemd_trace_init() and modulemd_trace_free().
+ * When used at the beginning of a function, traces entering and leaving that
+ * function. See modulemd_trace_read_state() for how tracing is enabled.
  *
- * This macro manages the memory of the hidden #modulemd_tracer object it
- * creates, so the caller should not attempt to modify that object in any way.
+ * The hidden #modulemd_tracer object lives on the stack, so when tracing is
+ * disabled this costs one load and comparison on entry and on exit, with no
+ * allocation and no logging.
  *
  * Since: 2.0
  */
 #define MODULEMD_INIT_TRACE()                                                 \
-  g_autoptr (modulemd_tracer) tracer = modulemd_trace_init (__func__);        \
+  g_auto (modulemd_tracer) tracer = {                                         \
+    __func__, modulemd_trace_enabled () ? modulemd_trace_enter (__func__) : 0 \
+  };                                                                          \
   do                                                                          \
     {                                                                         \
       (void)(tracer);                                                         \
@@ -284,6 +374,59 @@ modulemd_variant_deep_copy (GVariant *variant);
 void
 modulemd_hash_table_unref (void *table);
 
+/**
+ * ModulemdNevra:
+ * @name: The package name. It is not NUL-terminated at @name_len.
+ * @name_len: The length of @name.
+ * @epoch: The package epoch.
+ * @epoch_text: The package epoch as written in the NEVRA string. It is not
+ * NUL-terminated at @epoch_len.
+ * @epoch_len: The length of @epoch_text.
+ * @version: The package version. It is not NUL-terminated at @version_len.
+ * @version_len: The length of @version.
+ * @release: The package release. It is not NUL-terminated at @release_len.
+ * @release_len: The length of @release.
+ * @arch: The package architecture. It runs to the end of the NEVRA string.
+ * @arch_len: The length of @arch.
+ *
+ * The parts of a N-E:V-R.A string as found by modulemd_nevra_parse(). The
+ * strings point into the parsed NEVRA string, so that parsing does not
+ * allocate, and are only valid for as long as it is.
+ *
+ * Since: 2.9
+ */
+typedef struct _ModulemdNevra
+{
+  const gchar *name;
+  gsize name_len;
+  guint64 epoch;
+  const gchar *epoch_text;
+  gsize epoch_len;
+  const gchar *version;
+  gsize version_len;
+  const gchar *release;
+  gsize release_len;
+  const gchar *arch;
+  gsize arch_len;
+} ModulemdNevra;
+
+/**
+ * modulemd_nevra_parse:
+ * @nevra: (in): A NEVRA (Name, Epoch, Version, Release, Architecture) string.
+ * @parsed: (out caller-allocates) (optional): A #ModulemdNevra to fill in
+ * with the parts of @nevra.
+ *
+ * Splits @nevra into its parts in a single pass over the string. Nothing is
+ * allocated, so this is cheap enough to call for every artifact of a stream.
+ *
+ * Returns: TRUE if @nevra is in proper N-E:V-R.A format, FALSE otherwise. If
+ * FALSE is returned, @parsed is left unchanged.
+ *
+ * Since: 2.9
+ */
+gboolean
+modulemd_nevra_parse (const gchar *nevra, ModulemdNevra *parsed);
+
 /**
  * modulemd_validate_nevra:
  * @nevra: A NEVRA (Name, Epoch, Version, Release, Architecture) string.
@@ -310,6 +453,329 @@ modulemd_validate_nevra (const gchar *nevra);
 gboolean
 modulemd_boolean_equals (gboolean a, gboolean b);
 
+/**
+ * modulemd_append_json_string:
+ * @json: A #GString holding a JSON document being built.
+ * @str: (nullable): A UTF-8 string.
+ *
+ * Appends @str to @json as a quoted JSON string, escaping it as needed. If
+ * @str is NULL, `null` is appended instead.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_append_json_string (GString *json, const gchar *str);
+
+/**
+ * modulemd_glob_match:
+ * @pattern: (nullable): A glob pattern as accepted by
+ * g_pattern_match_simple().
+ * @value: (nullable): The string to match.
+ *
+ * Returns: TRUE if @pattern is NULL or if @value is not NULL and matches
+ * @pattern, FALSE otherwise.
+ *
+ * Since: 2.9
+ */
+gboolean
+modulemd_glob_match (const gchar *pattern, const gchar *value);
+
+
+/**
+ * ModulemdStringSet:
+ * @table: The strings, as the keys of a #GHashTable. NULL while the set is
+ * compacted.
+ * @sorted: (array zero-terminated=1): The strings in sorted order while the
+ * set is compacted, otherwise NULL.
+ * @n_sorted: The number of strings in @sorted.
+ *
+ * A set of strings. It starts out as a #GHashTable, which is cheap to modify.
+ * Once the set is not expected to change any more, for example after it has
+ * been read from YAML, modulemd_string_set_compact() turns it into a sorted
+ * array. That is smaller, and it can be emitted or returned in order without
+ * sorting it again. Modifying a compacted set turns it back into a
+ * #GHashTable.
+ *
+ * Since: 2.9
+ */
+typedef struct _ModulemdStringSet
+{
+  GHashTable *table;
+  gchar **sorted;
+  guint n_sorted;
+} ModulemdStringSet;
+
+/**
+ * ModulemdStringSetIter:
+ *
+ * An iterator over a #ModulemdStringSet, used like a #GHashTableIter. The set
+ * must not be modified while it is being iterated over.
+ *
+ * Since: 2.9
+ */
+typedef struct _ModulemdStringSetIter
+{
+  /*< private >*/
+  ModulemdStringSet *set;
+  GHashTableIter table_iter;
+  guint index;
+} ModulemdStringSetIter;
+
+/**
+ * modulemd_string_set_init:
+ * @set: (out caller-allocates): A #ModulemdStringSet.
+ *
+ * Initializes @set as an empty set.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_string_set_init (ModulemdStringSet *set);
+
+/**
+ * modulemd_string_set_clear:
+ * @set: (inout): A #ModulemdStringSet.
+ *
+ * Frees all of the memory owned by @set. It must be initialized again with
+ * modulemd_string_set_init() before it can be used.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_string_set_clear (ModulemdStringSet *set);
+
+/**
+ * modulemd_string_set_add:
+ * @set: (inout): A #ModulemdStringSet.
+ * @str: (in): The string to add. It is copied.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_string_set_add (ModulemdStringSet *set, const gchar *str);
+
+/**
+ * modulemd_string_set_remove:
+ * @set: (inout): A #ModulemdStringSet.
+ * @str: (in): The string to remove.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_string_set_remove (ModulemdStringSet *set, const gchar *str);
+
+/**
+ * modulemd_string_set_remove_all:
+ * @set: (inout): A #ModulemdStringSet.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_string_set_remove_all (ModulemdStringSet *set);
+
+/**
+ * modulemd_string_set_replace:
+ * @set: (inout): A #ModulemdStringSet.
+ * @table: (in) (nullable): A #GHashTable whose keys are strings.
+ *
+ * Replaces the contents of @set with copies of the keys of @table. If @table
+ * is NULL, @set is emptied.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_string_set_replace (ModulemdStringSet *set, GHashTable *table);
+
+/**
+ * modulemd_string_set_take:
+ * @set: (inout): A #ModulemdStringSet.
+ * @table: (in) (transfer full): A #GHashTable set of strings that frees its
+ * keys with g_free(), such as one returned by modulemd_yaml_parse_string_set().
+ *
+ * Replaces the contents of @set with @table.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_string_set_take (ModulemdStringSet *set, GHashTable *table);
+
+/**
+ * modulemd_string_set_copy:
+ * @dest: (inout): The #ModulemdStringSet to replace the contents of.
+ * @src: (in): The #ModulemdStringSet to copy.
+ *
+ * Replaces the contents of @dest with a copy of @src. If @src is compacted,
+ * so is @dest.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_string_set_copy (ModulemdStringSet *dest, ModulemdStringSet *src);
+
+/**
+ * modulemd_string_set_compact:
+ * @set: (inout): A #ModulemdStringSet.
+ *
+ * Converts @set into a sorted array. Reading a compacted set never modifies
+ * it.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_string_set_compact (ModulemdStringSet *set);
+
+/**
+ * modulemd_string_set_contains:
+ * @set: (in): A #ModulemdStringSet.
+ * @str: (in): A string.
+ *
+ * Returns: TRUE if @str is in @set.
+ *
+ * Since: 2.9
+ */
+gboolean
+modulemd_string_set_contains (ModulemdStringSet *set, const gchar *str);
+
+/**
+ * modulemd_string_set_size:
+ * @set: (in): A #ModulemdStringSet.
+ *
+ * Returns: The number of strings in @set.
+ *
+ * Since: 2.9
+ */
+guint
+modulemd_string_set_size (ModulemdStringSet *set);
+
+/**
+ * modulemd_string_set_equals:
+ * @a: (in): A #ModulemdStringSet.
+ * @b: (in): A #ModulemdStringSet.
+ *
+ * Returns: TRUE if @a and @b contain the same strings.
+ *
+ * Since: 2.9
+ */
+gboolean
+modulemd_string_set_equals (ModulemdStringSet *a, ModulemdStringSet *b);
+
+/**
+ * modulemd_string_set_as_strv:
+ * @set: (in): A #ModulemdStringSet.
+ *
+ * Returns: (transfer full): A sorted copy of the strings in @set.
+ *
+ * Since: 2.9
+ */
+GStrv
+modulemd_string_set_as_strv (ModulemdStringSet *set);
+
+/**
+ * modulemd_string_set_iter_init:
+ * @iter: (out caller-allocates): An uninitialized #ModulemdStringSetIter.
+ * @set: (in): The #ModulemdStringSet to iterate over.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_string_set_iter_init (ModulemdStringSetIter *iter,
+                               ModulemdStringSet *set);
+
+/**
+ * modulemd_string_set_iter_next:
+ * @iter: (inout): An initialized #ModulemdStringSetIter.
+ * @str: (out) (transfer none): The next string in the set. The order is only
+ * sorted if the set is compacted.
+ *
+ * Returns: FALSE if the end of the set has been reached.
+ *
+ * Since: 2.9
+ */
+gboolean
+modulemd_string_set_iter_next (ModulemdStringSetIter *iter, const gchar **str);
+
+/**
+ * modulemd_validate_nevra_set:
+ * @set: (in): A #ModulemdStringSet of NEVRA strings, such as the rpm
+ * artifacts of a stream.
+ * @invalid: (out) (optional) (transfer none): Set to the first string in @set
+ * that is not a valid NEVRA, if any.
+ *
+ * Validates every string in @set with modulemd_nevra_parse() in one pass over
+ * the set, without allocating.
+ *
+ * Returns: TRUE if all strings in @set are in proper N-E:V-R.A format, FALSE
+ * otherwise.
+ *
+ * Since: 2.9
+ */
+gboolean
+modulemd_validate_nevra_set (ModulemdStringSet *set, const gchar **invalid);
+
+
+/**
+ * ModulemdOrderedKeys:
+ * @keys: (array zero-terminated=1) (nullable): The keys of a #GHashTable in
+ * sorted order, or NULL if they have not been collected since the table was
+ * last modified. The strings belong to the table.
+ *
+ * A cached, sorted view of the string keys of a #GHashTable, for accessors
+ * that return those keys in order. Whoever owns the table must call
+ * modulemd_ordered_keys_invalidate() each time a key is added to or removed
+ * from it.
+ *
+ * Since: 2.9
+ */
+typedef struct _ModulemdOrderedKeys
+{
+  const gchar **keys;
+} ModulemdOrderedKeys;
+
+/**
+ * modulemd_ordered_keys_invalidate:
+ * @cache: (inout): A #ModulemdOrderedKeys.
+ *
+ * Drops the sorted view held by @cache, if any. This must be called when the
+ * keys of the table it belongs to change and when the table is freed.
+ *
+ * Since: 2.9
+ */
+void
+modulemd_ordered_keys_invalidate (ModulemdOrderedKeys *cache);
+
+/**
+ * modulemd_ordered_keys_get:
+ * @cache: (inout): A #ModulemdOrderedKeys.
+ * @htable: (in): The #GHashTable with string keys that @cache belongs to.
+ *
+ * Sorts the keys of @htable the first time it is called after @cache was
+ * invalidated and returns the same view on later calls. This may be called
+ * from several threads at once as long as @htable is not being modified.
+ *
+ * Returns: (transfer none) (array zero-terminated=1): The keys of @htable
+ * sorted according to modulemd_strcmp_sort(). It remains valid until @cache is
+ * next invalidated.
+ *
+ * Since: 2.9
+ */
+const gchar *const *
+modulemd_ordered_keys_get (ModulemdOrderedKeys *cache, GHashTable *htable);
+
+/**
+ * modulemd_ordered_keys_as_strv:
+ * @cache: (inout): A #ModulemdOrderedKeys.
+ * @htable: (in): The #GHashTable with string keys that @cache belongs to.
+ *
+ * A cached version of modulemd_ordered_str_keys_as_strv().
+ *
+ * Returns: (transfer full): A #GStrv list of the keys from @htable sorted
+ * according to modulemd_strcmp_sort().
+ *
+ * Since: 2.9
+ */
+GStrv
+modulemd_ordered_keys_as_strv (ModulemdOrderedKeys *cache, GHashTable *htable);
+
 /**
  * MODULEMD_REPLACE_SET:
  * @_dest: A reference to a #GHashTable.
@@ -100,6 +100,20 @@ typedef struct _modulemd_yaml_string
 int
 write_yaml_string (void *data, unsigned char *buffer, size_t size);
 
+/**
+ * write_yaml_checksum:
+ * @data: (inout): A void pointer to a #GChecksum object.
+ * @buffer: (in): YAML text to add to the checksum in @data.
+ * @size: (in): The number of bytes from @buffer to add to @data.
+ *
+ * A libyaml write handler that feeds the emitted YAML to a #GChecksum instead
+ * of keeping it in memory.
+ *
+ * Since: 2.9
+ */
+int
+write_yaml_checksum (void *data, unsigned char *buffer, size_t size);
+
 /**
  * modulemd_yaml_string_free:
  * @yaml_string: (inout): A pointer to a #modulemd_yaml_string to be freed.
@@ -650,6 +664,27 @@ mmd_emitter_strv (yaml_emitter_t *emitter,
                   GError **error);
 
 
+/**
+ * mmd_emitter_string_set:
+ * @emitter: (inout): A libyaml emitter object positioned at the start of where
+ * a string sequence will be written.
+ * @seq_style: (in): The YAML sequence style for the output.
+ * @set: (in): A #ModulemdStringSet that will be emitted to the YAML emitter
+ * in sorted order.
+ * @error: (out): A #GError that will return the reason for an emitting error.
+ *
+ * Returns: TRUE if the sequence emitted successfully. FALSE if an error was
+ * encountered and sets @error appropriately.
+ *
+ * Since: 2.9
+ */
+gboolean
+mmd_emitter_string_set (yaml_emitter_t *emitter,
+                        yaml_sequence_style_t seq_style,
+                        ModulemdStringSet *set,
+                        GError **error);
+
+
 /**
  * modulemd_yaml_parse_date:
  * @parser: (inout): A libyaml parser object positioned at the beginning of a
@@ -1395,6 +1430,39 @@ skip_unknown_yaml (yaml_parser_t *parser, GError **error);
     }                                                                         \
   while (0)
 
+/**
+ * EMIT_MODULEMD_STRING_SET_IF_NON_EMPTY:
+ * @emitter: (inout): A libyaml emitter object that is positioned at the start
+ * of where a new sequence will be written.
+ * @error: (out): A #GError that will return the reason for any error.
+ * @key: (in): The name to be used as the identifier for the output sequence.
+ * @set: (in): A pointer to the #ModulemdStringSet that is to be output.
+ *
+ * Does nothing if @set is empty. Otherwise, outputs a YAML sequence using
+ * style `YAML_BLOCK_SEQUENCE_STYLE` with the strings from @set in sorted
+ * order, identified as @key.
+ *
+ * NOTE: This macro outputs both a key and an array value for that key, thus it
+ * must only be used from within a YAML mapping.
+ *
+ * Returns: Continues on if the YAML sequence was output successfully. Returns
+ * FALSE if an error occurred and sets @error appropriately.
+ *
+ * Since: 2.9
+ */
+#define EMIT_MODULEMD_STRING_SET_IF_NON_EMPTY(emitter, error, key, set)       \
+  do                                                                          \
+    {                                                                         \
+      if (modulemd_string_set_size (set) != 0)                                \
+        {                                                                     \
+          EMIT_SCALAR (emitter, error, key);                                  \
+          if (!mmd_emitter_string_set (                                       \
+                emitter, YAML_BLOCK_SEQUENCE_STYLE, set, error))              \
+            return FALSE;                                                     \
+        }                                                                     \
+    }                                                                         \
+  while (0)
+
 /**
  * EMIT_ARRAY_VALUES:
  * @emitter: (inout): A libyaml emitter object that is positioned at the start
@@ -17,6 +17,7 @@
 #include "modulemd-buildopts.h"
 #include "private/glib-extensions.h"
 #include "private/modulemd-buildopts-private.h"
+#include "private/modulemd-memory-usage-private.h"
 #include "private/modulemd-util.h"
 #include "private/modulemd-yaml.h"
 
@@ -28,8 +29,8 @@ struct _ModulemdBuildopts
 
   gchar *rpm_macros;
 
-  GHashTable *whitelist;
-  GHashTable *arches;
+  ModulemdStringSet whitelist;
+  ModulemdStringSet arches;
 };
 
 G_DEFINE_TYPE (ModulemdBuildopts, modulemd_buildopts, G_TYPE_OBJECT)
@@ -68,13 +69,12 @@ modulemd_buildopts_equals (ModulemdBuildopts *self_1,
       return FALSE;
     }
 
-  if (!modulemd_hash_table_sets_are_equal (self_1->whitelist,
-                                           self_2->whitelist))
+  if (!modulemd_string_set_equals (&self_1->whitelist, &self_2->whitelist))
     {
       return FALSE;
     }
 
-  if (!modulemd_hash_table_sets_are_equal (self_1->arches, self_2->arches))
+  if (!modulemd_string_set_equals (&self_1->arches, &self_2->arches))
     {
       return FALSE;
     }
@@ -101,8 +101,8 @@ modulemd_buildopts_copy (ModulemdBuildopts *self)
   modulemd_buildopts_set_rpm_macros (copy,
                                      modulemd_buildopts_get_rpm_macros (self));
 
-  MODULEMD_REPLACE_SET (copy->whitelist, self->whitelist);
-  MODULEMD_REPLACE_SET (copy->arches, self->arches);
+  modulemd_string_set_copy (&copy->whitelist, &self->whitelist);
+  modulemd_string_set_copy (&copy->arches, &self->arches);
 
   return g_steal_pointer (&copy);
 }
@@ -114,8 +114,8 @@ modulemd_buildopts_finalize (GObject *object)
   ModulemdBuildopts *self = (ModulemdBuildopts *)object;
 
   g_clear_pointer (&self->rpm_macros, g_free);
-  g_clear_pointer (&self->whitelist, g_hash_table_unref);
-  g_clear_pointer (&self->arches, g_hash_table_unref);
+  modulemd_string_set_clear (&self->whitelist);
+  modulemd_string_set_clear (&self->arches);
 
   G_OBJECT_CLASS (modulemd_buildopts_parent_class)->finalize (object);
 }
@@ -148,7 +148,7 @@ modulemd_buildopts_add_rpm_to_whitelist (ModulemdBuildopts *self,
                                          const gchar *rpm)
 {
   g_return_if_fail (MODULEMD_IS_BUILDOPTS (self));
-  g_hash_table_add (self->whitelist, g_strdup (rpm));
+  modulemd_string_set_add (&self->whitelist, rpm);
 }
 
 
@@ -157,14 +157,14 @@ modulemd_buildopts_remove_rpm_from_whitelist (ModulemdBuildopts *self,
                                               const gchar *rpm)
 {
   g_return_if_fail (MODULEMD_IS_BUILDOPTS (self));
-  g_hash_table_remove (self->whitelist, rpm);
+  modulemd_string_set_remove (&self->whitelist, rpm);
 }
 
 void
 modulemd_buildopts_clear_rpm_whitelist (ModulemdBuildopts *self)
 {
   g_return_if_fail (MODULEMD_IS_BUILDOPTS (self));
-  g_hash_table_remove_all (self->whitelist);
+  modulemd_string_set_remove_all (&self->whitelist);
 }
 
 
@@ -173,7 +173,7 @@ modulemd_buildopts_get_rpm_whitelist_as_strv (ModulemdBuildopts *self)
 {
   g_return_val_if_fail (MODULEMD_IS_BUILDOPTS (self), NULL);
 
-  return modulemd_ordered_str_keys_as_strv (self->whitelist);
+  return modulemd_string_set_as_strv (&self->whitelist);
 }
 
 
@@ -181,7 +181,7 @@ void
 modulemd_buildopts_add_arch (ModulemdBuildopts *self, const gchar *arch)
 {
   g_return_if_fail (MODULEMD_IS_BUILDOPTS (self));
-  g_hash_table_add (self->arches, g_strdup (arch));
+  modulemd_string_set_add (&self->arches, arch);
 }
 
 
@@ -189,7 +189,7 @@ void
 modulemd_buildopts_remove_arch (ModulemdBuildopts *self, const gchar *arch)
 {
   g_return_if_fail (MODULEMD_IS_BUILDOPTS (self));
-  g_hash_table_remove (self->arches, arch);
+  modulemd_string_set_remove (&self->arches, arch);
 }
 
 
@@ -197,7 +197,7 @@ void
 modulemd_buildopts_clear_arches (ModulemdBuildopts *self)
 {
   g_return_if_fail (MODULEMD_IS_BUILDOPTS (self));
-  g_hash_table_remove_all (self->arches);
+  modulemd_string_set_remove_all (&self->arches);
 }
 
 
@@ -206,7 +206,7 @@ modulemd_buildopts_get_arches_as_strv (ModulemdBuildopts *self)
 {
   g_return_val_if_fail (MODULEMD_IS_BUILDOPTS (self), NULL);
 
-  return modulemd_ordered_str_keys_as_strv (self->arches);
+  return modulemd_string_set_as_strv (&self->arches);
 }
 
 
@@ -270,9 +270,8 @@ modulemd_buildopts_class_init (ModulemdBuildoptsClass *klass)
 static void
 modulemd_buildopts_init (ModulemdBuildopts *self)
 {
-  self->whitelist =
-    g_hash_table_new_full (g_str_hash, g_str_equal, g_free, NULL);
-  self->arches = g_hash_table_new_full (g_str_hash, g_str_equal, g_free, NULL);
+  modulemd_string_set_init (&self->whitelist);
+  modulemd_string_set_init (&self->arches);
 }
 
 
@@ -294,6 +293,7 @@ modulemd_buildopts_parse_yaml (yaml_parser_t *parser,
   gboolean done = FALSE;
   gboolean in_map = FALSE;
   g_autoptr (ModulemdBuildopts) buildopts = NULL;
+  g_autoptr (GHashTable) set = NULL;
   g_autoptr (GError) nested_error = NULL;
 
   g_return_val_if_fail (error == NULL || *error == NULL, FALSE);
@@ -331,10 +331,8 @@ modulemd_buildopts_parse_yaml (yaml_parser_t *parser,
             }
           else if (g_str_equal (event.data.scalar.value, "arches"))
             {
-              g_hash_table_unref (buildopts->arches);
-              buildopts->arches =
-                modulemd_yaml_parse_string_set (parser, &nested_error);
-              if (buildopts->arches == NULL)
+              set = modulemd_yaml_parse_string_set (parser, &nested_error);
+              if (set == NULL)
                 {
                   MMD_YAML_ERROR_EVENT_EXIT_BOOL (
                     error,
@@ -342,6 +340,8 @@ modulemd_buildopts_parse_yaml (yaml_parser_t *parser,
                     "Failed to parse arches list in buildopts: %s",
                     nested_error->message);
                 }
+              modulemd_string_set_take (&buildopts->arches,
+                                        g_steal_pointer (&set));
             }
           else
             {
@@ -363,6 +363,9 @@ modulemd_buildopts_parse_yaml (yaml_parser_t *parser,
 
       yaml_event_delete (&event);
     }
+
+  modulemd_buildopts_compact (buildopts);
+
   return g_steal_pointer (&buildopts);
 }
 
@@ -377,6 +380,7 @@ modulemd_buildopts_parse_rpm_buildopts (yaml_parser_t *parser,
   gboolean done = FALSE;
   gboolean in_map = FALSE;
   g_autofree gchar *value = NULL;
+  g_autoptr (GHashTable) set = NULL;
   g_autoptr (GError) nested_error = NULL;
 
   /* Read in RPM attributes */
@@ -402,10 +406,8 @@ modulemd_buildopts_parse_rpm_buildopts (yaml_parser_t *parser,
 
           if (g_str_equal (event.data.scalar.value, "whitelist"))
             {
-              g_hash_table_unref (buildopts->whitelist);
-              buildopts->whitelist =
-                modulemd_yaml_parse_string_set (parser, &nested_error);
-              if (buildopts->whitelist == NULL)
+              set = modulemd_yaml_parse_string_set (parser, &nested_error);
+              if (set == NULL)
                 {
                   MMD_YAML_ERROR_EVENT_EXIT_BOOL (
                     error,
@@ -413,6 +415,8 @@ modulemd_buildopts_parse_rpm_buildopts (yaml_parser_t *parser,
                     "Failed to parse whitelist list in buildopts rpms: %s",
                     nested_error->message);
                 }
+              modulemd_string_set_take (&buildopts->whitelist,
+                                        g_steal_pointer (&set));
             }
           else if (g_str_equal (event.data.scalar.value, "macros"))
             {
@@ -459,7 +463,6 @@ modulemd_buildopts_emit_yaml (ModulemdBuildopts *self,
 {
   MODULEMD_INIT_TRACE ();
   int ret;
-  g_auto (GStrv) list = NULL;
   g_autoptr (GError) nested_error = NULL;
   MMD_INIT_YAML_EVENT (event);
 
@@ -510,7 +513,7 @@ modulemd_buildopts_emit_yaml (ModulemdBuildopts *self,
         }
     }
 
-  if (g_hash_table_size (self->whitelist) != 0)
+  if (modulemd_string_set_size (&self->whitelist) != 0)
     {
       ret = mmd_emitter_scalar (
         emitter, "whitelist", YAML_PLAIN_SCALAR_STYLE, &nested_error);
@@ -523,10 +526,8 @@ modulemd_buildopts_emit_yaml (ModulemdBuildopts *self,
           return FALSE;
         }
 
-      list = modulemd_buildopts_get_rpm_whitelist_as_strv (self);
-
-      ret = mmd_emitter_strv (
-        emitter, YAML_BLOCK_SEQUENCE_STYLE, list, &nested_error);
+      ret = mmd_emitter_string_set (
+        emitter, YAML_BLOCK_SEQUENCE_STYLE, &self->whitelist, &nested_error);
       if (!ret)
         {
           g_propagate_prefixed_error (error,
@@ -534,8 +535,6 @@ modulemd_buildopts_emit_yaml (ModulemdBuildopts *self,
                                       "Failed to emit buildopts whitelist: ");
           return FALSE;
         }
-
-      g_clear_pointer (&list, g_strfreev);
     }
 
   ret = mmd_emitter_end_mapping (emitter, &nested_error);
@@ -547,7 +546,7 @@ modulemd_buildopts_emit_yaml (ModulemdBuildopts *self,
       return FALSE;
     }
 
-  if (g_hash_table_size (self->arches) != 0)
+  if (modulemd_string_set_size (&self->arches) != 0)
     {
       ret = mmd_emitter_scalar (
         emitter, "arches", YAML_PLAIN_SCALAR_STYLE, &nested_error);
@@ -559,10 +558,8 @@ modulemd_buildopts_emit_yaml (ModulemdBuildopts *self,
           return FALSE;
         }
 
-      list = modulemd_buildopts_get_arches_as_strv (self);
-
-      ret = mmd_emitter_strv (
-        emitter, YAML_FLOW_SEQUENCE_STYLE, list, &nested_error);
+      ret = mmd_emitter_string_set (
+        emitter, YAML_FLOW_SEQUENCE_STYLE, &self->arches, &nested_error);
       if (!ret)
         {
           g_propagate_prefixed_error (error,
@@ -570,9 +567,28 @@ modulemd_buildopts_emit_yaml (ModulemdBuildopts *self,
                                       "Failed to emit buildopts arches: ");
           return FALSE;
         }
-
-      g_clear_pointer (&list, g_strfreev);
     }
 
   return TRUE;
 }
+
+
+void
+modulemd_buildopts_add_memory_usage (ModulemdBuildopts *self,
+                                     ModulemdMemoryUsage *usage)
+{
+  modulemd_memory_usage_add_object (usage, sizeof (ModulemdBuildopts));
+  modulemd_memory_usage_add_string (usage, self->rpm_macros);
+  modulemd_string_set_add_memory_usage (&self->whitelist, usage);
+  modulemd_string_set_add_memory_usage (&self->arches, usage);
+}
+
+
+void
+modulemd_buildopts_compact (ModulemdBuildopts *self)
+{
+  g_return_if_fail (MODULEMD_IS_BUILDOPTS (self));
+
+  modulemd_string_set_compact (&self->whitelist);
+  modulemd_string_set_compact (&self->arches);
+}
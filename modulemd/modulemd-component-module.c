@@ -13,6 +13,7 @@
 
 #include "modulemd-component-module.h"
 #include "private/modulemd-component-module-private.h"
+#include "private/modulemd-memory-usage-private.h"
 #include "private/modulemd-component-private.h"
 #include "private/modulemd-util.h"
 #include "private/modulemd-yaml.h"
@@ -439,3 +440,14 @@ modulemd_component_module_parse_yaml (yaml_parser_t *parser,
 
   return g_steal_pointer (&m);
 }
+
+
+void
+modulemd_component_module_add_memory_usage (ModulemdComponentModule *self,
+                                            ModulemdMemoryUsage *usage)
+{
+  modulemd_memory_usage_add_object (usage, sizeof (ModulemdComponentModule));
+  modulemd_component_add_memory_usage (MODULEMD_COMPONENT (self), usage);
+  modulemd_memory_usage_add_string (usage, self->ref);
+  modulemd_memory_usage_add_string (usage, self->repository);
+}
@@ -14,6 +14,7 @@
 #include "modulemd-component-rpm.h"
 #include "private/modulemd-component-private.h"
 #include "private/modulemd-component-rpm-private.h"
+#include "private/modulemd-memory-usage-private.h"
 #include "private/modulemd-util.h"
 #include "private/modulemd-yaml.h"
 
@@ -876,3 +877,18 @@ modulemd_component_rpm_parse_yaml (yaml_parser_t *parser,
 
   return g_steal_pointer (&r);
 }
+
+
+void
+modulemd_component_rpm_add_memory_usage (ModulemdComponentRpm *self,
+                                         ModulemdMemoryUsage *usage)
+{
+  modulemd_memory_usage_add_object (usage, sizeof (ModulemdComponentRpm));
+  modulemd_component_add_memory_usage (MODULEMD_COMPONENT (self), usage);
+  modulemd_memory_usage_add_string (usage, self->override_name);
+  modulemd_memory_usage_add_string (usage, self->ref);
+  modulemd_memory_usage_add_string (usage, self->repository);
+  modulemd_memory_usage_add_string (usage, self->cache);
+  modulemd_memory_usage_add_string_set (usage, self->arches);
+  modulemd_memory_usage_add_string_set (usage, self->multilib);
+}
@@ -16,6 +16,7 @@
 #include "modulemd-component.h"
 #include "modulemd-errors.h"
 #include "private/modulemd-component-private.h"
+#include "private/modulemd-memory-usage-private.h"
 #include "private/modulemd-util.h"
 #include "private/modulemd-yaml.h"
 
@@ -711,3 +712,17 @@ modulemd_component_emit_yaml_build_common (ModulemdComponent *self,
 
   return TRUE;
 }
+
+
+void
+modulemd_component_add_memory_usage (ModulemdComponent *self,
+                                     ModulemdMemoryUsage *usage)
+{
+  ModulemdComponentPrivate *priv =
+    modulemd_component_get_instance_private (self);
+
+  modulemd_memory_usage_add_object (usage, sizeof (ModulemdComponentPrivate));
+  modulemd_memory_usage_add_string (usage, priv->name);
+  modulemd_memory_usage_add_string (usage, priv->rationale);
+  modulemd_memory_usage_add_string_set (usage, priv->buildafter);
+}
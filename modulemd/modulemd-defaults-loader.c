@@ -0,0 +1,603 @@
+/*
+ * This file is part of libmodulemd
+ * Copyright (C) 2020 Red Hat, Inc.
+ *
+ * Fedora-License-Identifier: MIT
+ * SPDX-2.0-License-Identifier: MIT
+ * SPDX-3.0-License-Identifier: MIT
+ *
+ * This program is free software.
+ * For more information on the license, see COPYING.
+ * For more information on free software, see <https://www.gnu.org/philosophy/free-sw.en.html>.
+ */
+
+#include <gio/gio.h>
+#include <glib.h>
+
+#include "modulemd-defaults-loader.h"
+#include "modulemd-errors.h"
+#include "modulemd-module-index.h"
+#include "private/modulemd-module-index-private.h"
+#include "private/modulemd-util.h"
+
+
+#define MMD_YAML_SUFFIX ".yaml"
+
+/* Some filesystems only record modification times in whole seconds, and
+ * others lag the system clock slightly. A file modified this shortly before
+ * it was last checked may have been changed again without a new mtime, so
+ * its contents are compared on the next refresh as well.
+ */
+#define MMD_RACY_WINDOW_USEC (2 * G_USEC_PER_SEC)
+
+
+/*
+ * DefaultsFileState:
+ * @mtime: The modification time of the file in microseconds when it was last
+ * checked.
+ * @size: The size of the file when it was last checked.
+ * @checked: The time in microseconds at which the scan that last checked the
+ * file started.
+ * @checksum: The SHA-256 checksum of the file contents when it was last read.
+ * @index: The #ModulemdModuleIndex read from the file.
+ */
+typedef struct _DefaultsFileState
+{
+  gint64 mtime;
+  goffset size;
+  gint64 checked;
+  gchar *checksum;
+  ModulemdModuleIndex *index;
+} DefaultsFileState;
+
+
+struct _ModulemdDefaultsLoader
+{
+  GObject parent_instance;
+
+  gchar *path;
+  gchar *overrides_path;
+  gboolean strict;
+
+  /* filename -> DefaultsFileState */
+  GHashTable *defaults_files;
+  GHashTable *override_files;
+
+  ModulemdModuleIndex *index;
+
+  /* Set of module names merged during the last refresh */
+  GHashTable *changed_modules;
+};
+
+G_DEFINE_TYPE (ModulemdDefaultsLoader, modulemd_defaults_loader, G_TYPE_OBJECT)
+
+
+static void
+defaults_file_state_free (gpointer data)
+{
+  DefaultsFileState *state = (DefaultsFileState *)data;
+
+  g_clear_pointer (&state->checksum, g_free);
+  g_clear_object (&state->index);
+  g_free (state);
+}
+
+
+static DefaultsFileState *
+defaults_file_state_copy (DefaultsFileState *state)
+{
+  DefaultsFileState *copy = g_new0 (DefaultsFileState, 1);
+
+  copy->mtime = state->mtime;
+  copy->size = state->size;
+  copy->checked = state->checked;
+  copy->checksum = g_strdup (state->checksum);
+  copy->index = state->index ? g_object_ref (state->index) : NULL;
+
+  return copy;
+}
+
+
+static GHashTable *
+defaults_file_table_new (void)
+{
+  return g_hash_table_new_full (
+    g_str_hash, g_str_equal, g_free, defaults_file_state_free);
+}
+
+
+ModulemdDefaultsLoader *
+modulemd_defaults_loader_new (const gchar *path,
+                              const gchar *overrides_path,
+                              gboolean strict)
+{
+  ModulemdDefaultsLoader *self = NULL;
+
+  g_return_val_if_fail (path, NULL);
+
+  self = g_object_new (MODULEMD_TYPE_DEFAULTS_LOADER, NULL);
+  self->path = g_strdup (path);
+  self->overrides_path = g_strdup (overrides_path);
+  self->strict = strict;
+
+  return self;
+}
+
+
+static void
+modulemd_defaults_loader_finalize (GObject *object)
+{
+  ModulemdDefaultsLoader *self = (ModulemdDefaultsLoader *)object;
+
+  g_clear_pointer (&self->path, g_free);
+  g_clear_pointer (&self->overrides_path, g_free);
+  g_clear_pointer (&self->defaults_files, g_hash_table_unref);
+  g_clear_pointer (&self->override_files, g_hash_table_unref);
+  g_clear_object (&self->index);
+  g_clear_pointer (&self->changed_modules, g_hash_table_unref);
+
+  G_OBJECT_CLASS (modulemd_defaults_loader_parent_class)->finalize (object);
+}
+
+
+static void
+modulemd_defaults_loader_get_property (GObject *object,
+                                       guint prop_id,
+                                       GValue *value,
+                                       GParamSpec *pspec)
+{
+  switch (prop_id)
+    {
+    default: G_OBJECT_WARN_INVALID_PROPERTY_ID (object, prop_id, pspec);
+    }
+}
+
+
+static void
+modulemd_defaults_loader_set_property (GObject *object,
+                                       guint prop_id,
+                                       const GValue *value,
+                                       GParamSpec *pspec)
+{
+  switch (prop_id)
+    {
+    default: G_OBJECT_WARN_INVALID_PROPERTY_ID (object, prop_id, pspec);
+    }
+}
+
+
+static void
+modulemd_defaults_loader_class_init (ModulemdDefaultsLoaderClass *klass)
+{
+  GObjectClass *object_class = G_OBJECT_CLASS (klass);
+
+  object_class->finalize = modulemd_defaults_loader_finalize;
+  object_class->get_property = modulemd_defaults_loader_get_property;
+  object_class->set_property = modulemd_defaults_loader_set_property;
+}
+
+
+static void
+modulemd_defaults_loader_init (ModulemdDefaultsLoader *self)
+{
+  self->defaults_files = defaults_file_table_new ();
+  self->override_files = defaults_file_table_new ();
+  self->index = modulemd_module_index_new ();
+  self->changed_modules =
+    g_hash_table_new_full (g_str_hash, g_str_equal, g_free, NULL);
+}
+
+
+static void
+add_module_names (GHashTable *module_names, ModulemdModuleIndex *index)
+{
+  g_auto (GStrv) names = NULL;
+
+  if (!index)
+    {
+      return;
+    }
+
+  names = modulemd_module_index_get_module_names_as_strv (index);
+  for (guint i = 0; names[i]; i++)
+    {
+      g_hash_table_add (module_names, g_strdup (names[i]));
+    }
+}
+
+
+/*
+ * query_file_state:
+ * @filepath: The file to query.
+ * @mtime: (out): The modification time of @filepath in microseconds.
+ * @size: (out): The size of @filepath.
+ * @error: Error return value
+ *
+ * Reads the modification time through GIO, which provides the sub-second
+ * part on every platform that records it.
+ */
+static gboolean
+query_file_state (const gchar *filepath,
+                  gint64 *mtime,
+                  goffset *size,
+                  GError **error)
+{
+  g_autoptr (GFile) file = g_file_new_for_path (filepath);
+  g_autoptr (GFileInfo) info = NULL;
+
+  info = g_file_query_info (file,
+                            G_FILE_ATTRIBUTE_STANDARD_SIZE
+                            "," G_FILE_ATTRIBUTE_TIME_MODIFIED
+                            "," G_FILE_ATTRIBUTE_TIME_MODIFIED_USEC,
+                            G_FILE_QUERY_INFO_NONE,
+                            NULL,
+                            error);
+  if (!info)
+    {
+      return FALSE;
+    }
+
+  *mtime = (gint64)g_file_info_get_attribute_uint64 (
+             info, G_FILE_ATTRIBUTE_TIME_MODIFIED) *
+             G_USEC_PER_SEC +
+           g_file_info_get_attribute_uint32 (
+             info, G_FILE_ATTRIBUTE_TIME_MODIFIED_USEC);
+  *size = g_file_info_get_size (info);
+
+  return TRUE;
+}
+
+
+/*
+ * scan_directory:
+ * @path: A directory containing defaults documents.
+ * @previous: The #DefaultsFileState table from the previous refresh of @path.
+ * @strict: Whether to fail on unknown fields
+ * @affected: A set to which the names of all modules provided by added,
+ * changed or removed files will be added.
+ * @error: Error return value
+ *
+ * Returns: (transfer full): A new #DefaultsFileState table describing the
+ * current contents of @path. Files that are unchanged since @previous share
+ * its #ModulemdModuleIndex; all others are read again.
+ */
+static GHashTable *
+scan_directory (const gchar *path,
+                GHashTable *previous,
+                gboolean strict,
+                GHashTable *affected,
+                GError **error)
+{
+  const gchar *filename = NULL;
+  g_autoptr (GDir) dir = NULL;
+  g_autoptr (GHashTable) current = NULL;
+  g_autoptr (GPtrArray) changed_names = NULL;
+  g_autoptr (GPtrArray) changed_paths = NULL;
+  g_autoptr (GPtrArray) indexes = NULL;
+  g_autoptr (GError) nested_error = NULL;
+  g_autofree gchar *filepath = NULL;
+  g_autofree gchar *contents = NULL;
+  g_autofree gchar *checksum = NULL;
+  DefaultsFileState *state = NULL;
+  DefaultsFileState *old = NULL;
+  GHashTableIter iter;
+  gpointer key;
+  gpointer value;
+  gsize len;
+  gint64 mtime;
+  goffset size;
+  gint64 scan_start = g_get_real_time ();
+
+  dir = g_dir_open (path, 0, &nested_error);
+  if (!dir)
+    {
+      g_propagate_error (error, g_steal_pointer (&nested_error));
+      return NULL;
+    }
+
+  current = defaults_file_table_new ();
+  changed_names = g_ptr_array_new_with_free_func (g_free);
+  changed_paths = g_ptr_array_new_with_free_func (g_free);
+
+  while ((filename = g_dir_read_name (dir)) != NULL)
+    {
+      if (!g_str_has_suffix (filename, MMD_YAML_SUFFIX))
+        {
+          continue;
+        }
+
+      filepath = g_build_path ("/", path, filename, NULL);
+      if (!query_file_state (filepath, &mtime, &size, error))
+        {
+          return NULL;
+        }
+
+      old = g_hash_table_lookup (previous, filename);
+      if (old && old->mtime == mtime && old->size == size &&
+          old->mtime < old->checked - MMD_RACY_WINDOW_USEC)
+        {
+          g_hash_table_insert (
+            current, g_strdup (filename), defaults_file_state_copy (old));
+          g_clear_pointer (&filepath, g_free);
+          continue;
+        }
+
+      /* The file is new or has been touched. Only read it again if its
+       * content has actually changed.
+       */
+      if (!g_file_get_contents (filepath, &contents, &len, error))
+        {
+          return NULL;
+        }
+      checksum = g_compute_checksum_for_data (
+        G_CHECKSUM_SHA256, (const guchar *)contents, len);
+      g_clear_pointer (&contents, g_free);
+
+      if (old && g_str_equal (old->checksum, checksum))
+        {
+          state = defaults_file_state_copy (old);
+        }
+      else
+        {
+          state = g_new0 (DefaultsFileState, 1);
+          g_ptr_array_add (changed_names, g_strdup (filename));
+          g_ptr_array_add (changed_paths, g_steal_pointer (&filepath));
+        }
+
+      state->mtime = mtime;
+      state->size = size;
+      state->checked = scan_start;
+      g_clear_pointer (&state->checksum, g_free);
+      state->checksum = g_steal_pointer (&checksum);
+      g_hash_table_insert (current, g_strdup (filename), state);
+
+      g_clear_pointer (&filepath, g_free);
+    }
+
+  if (changed_paths->len > 0)
+    {
+      g_debug (
+        "Reading %u new or changed files from %s", changed_paths->len, path);
+      indexes =
+        modulemd_module_index_read_files (changed_paths, strict, error);
+      if (!indexes)
+        {
+          return NULL;
+        }
+
+      for (guint i = 0; i < changed_names->len; i++)
+        {
+          filename = g_ptr_array_index (changed_names, i);
+          state = g_hash_table_lookup (current, filename);
+          state->index = g_object_ref (g_ptr_array_index (indexes, i));
+
+          /* Both the modules it used to provide and the ones it provides now
+           * need to be merged again.
+           */
+          add_module_names (affected, state->index);
+          old = g_hash_table_lookup (previous, filename);
+          if (old)
+            {
+              add_module_names (affected, old->index);
+            }
+        }
+    }
+
+  /* Any modules provided by removed files also need to be merged again */
+  g_hash_table_iter_init (&iter, previous);
+  while (g_hash_table_iter_next (&iter, &key, &value))
+    {
+      if (!g_hash_table_contains (current, key))
+        {
+          add_module_names (affected, ((DefaultsFileState *)value)->index);
+        }
+    }
+
+  return g_steal_pointer (&current);
+}
+
+
+/*
+ * merge_module_from_files:
+ * @files: A #DefaultsFileState table.
+ * @filenames: The keys of @files, sorted.
+ * @module_name: The module to merge.
+ * @into: The #ModulemdModuleIndex to merge into.
+ * @strict_default_streams: Whether to fail on default stream merges.
+ * @error: Error return value
+ *
+ * Merges the contents of @module_name from each file in @files into @into, in
+ * filename order, without overriding.
+ */
+static gboolean
+merge_module_from_files (GHashTable *files,
+                         GPtrArray *filenames,
+                         const gchar *module_name,
+                         ModulemdModuleIndex *into,
+                         gboolean strict_default_streams,
+                         GError **error)
+{
+  DefaultsFileState *state = NULL;
+  ModulemdModule *module = NULL;
+
+  for (guint i = 0; i < filenames->len; i++)
+    {
+      state = g_hash_table_lookup (files, g_ptr_array_index (filenames, i));
+      module = modulemd_module_index_get_module (state->index, module_name);
+      if (!module)
+        {
+          continue;
+        }
+
+      if (!modulemd_module_index_merge_module (
+            module, into, FALSE, strict_default_streams, error))
+        {
+          return FALSE;
+        }
+    }
+
+  return TRUE;
+}
+
+
+gboolean
+modulemd_defaults_loader_refresh (ModulemdDefaultsLoader *self, GError **error)
+{
+  g_autoptr (GHashTable) affected = NULL;
+  g_autoptr (GHashTable) defaults_files = NULL;
+  g_autoptr (GHashTable) override_files = NULL;
+  g_autoptr (GPtrArray) module_names = NULL;
+  g_autoptr (GPtrArray) defaults_filenames = NULL;
+  g_autoptr (GPtrArray) override_filenames = NULL;
+  g_autoptr (ModulemdModuleIndex) updates = NULL;
+  g_autoptr (ModulemdModuleIndex) overrides = NULL;
+  g_autoptr (ModulemdModuleIndex) replacement = NULL;
+  g_auto (GStrv) current_names = NULL;
+  g_autoptr (GError) nested_error = NULL;
+  ModulemdModule *module = NULL;
+  const gchar *module_name = NULL;
+  guint i;
+
+  g_return_val_if_fail (MODULEMD_IS_DEFAULTS_LOADER (self), FALSE);
+
+  affected = g_hash_table_new_full (g_str_hash, g_str_equal, g_free, NULL);
+
+  defaults_files = scan_directory (
+    self->path, self->defaults_files, self->strict, affected, &nested_error);
+  if (!defaults_files)
+    {
+      g_propagate_error (error, g_steal_pointer (&nested_error));
+      return FALSE;
+    }
+
+  if (self->overrides_path)
+    {
+      override_files = scan_directory (self->overrides_path,
+                                       self->override_files,
+                                       self->strict,
+                                       affected,
+                                       &nested_error);
+      if (!override_files)
+        {
+          g_propagate_error (error, g_steal_pointer (&nested_error));
+          return FALSE;
+        }
+    }
+  else
+    {
+      override_files = defaults_file_table_new ();
+    }
+
+  /* Recompute each affected module from scratch into a separate index, so
+   * that a conflict leaves the current state untouched.
+   */
+  module_names = modulemd_ordered_str_keys (affected, modulemd_strcmp_sort);
+  defaults_filenames =
+    modulemd_ordered_str_keys (defaults_files, modulemd_strcmp_sort);
+  override_filenames =
+    modulemd_ordered_str_keys (override_files, modulemd_strcmp_sort);
+  updates = modulemd_module_index_new ();
+  overrides = modulemd_module_index_new ();
+  for (i = 0; i < module_names->len; i++)
+    {
+      module_name = g_ptr_array_index (module_names, i);
+
+      if (!merge_module_from_files (defaults_files,
+                                    defaults_filenames,
+                                    module_name,
+                                    updates,
+                                    self->strict,
+                                    &nested_error) ||
+          !merge_module_from_files (override_files,
+                                    override_filenames,
+                                    module_name,
+                                    overrides,
+                                    self->strict,
+                                    &nested_error))
+        {
+          g_propagate_error (error, g_steal_pointer (&nested_error));
+          return FALSE;
+        }
+
+      module = modulemd_module_index_get_module (overrides, module_name);
+      if (module && !modulemd_module_index_merge_module (
+                      module, updates, TRUE, self->strict, &nested_error))
+        {
+          g_propagate_error (error, g_steal_pointer (&nested_error));
+          return FALSE;
+        }
+    }
+
+  /* Build the new index from the modules that were not affected and the
+   * updated ones, and only replace the current one if all of it succeeded.
+   */
+  replacement = modulemd_module_index_new ();
+  current_names = modulemd_module_index_get_module_names_as_strv (self->index);
+  for (i = 0; current_names[i]; i++)
+    {
+      if (g_hash_table_contains (affected, current_names[i]))
+        {
+          continue;
+        }
+
+      module =
+        modulemd_module_index_get_module (self->index, current_names[i]);
+      if (!modulemd_module_index_merge_module (
+            module, replacement, FALSE, self->strict, &nested_error))
+        {
+          g_propagate_error (error, g_steal_pointer (&nested_error));
+          return FALSE;
+        }
+    }
+
+  if (!modulemd_module_index_merge (
+        updates, replacement, FALSE, self->strict, &nested_error))
+    {
+      g_propagate_error (error, g_steal_pointer (&nested_error));
+      return FALSE;
+    }
+
+  /* Everything was read and merged successfully, so commit the results */
+  g_clear_object (&self->index);
+  self->index = g_steal_pointer (&replacement);
+  g_clear_pointer (&self->defaults_files, g_hash_table_unref);
+  self->defaults_files = g_steal_pointer (&defaults_files);
+  g_clear_pointer (&self->override_files, g_hash_table_unref);
+  self->override_files = g_steal_pointer (&override_files);
+  g_clear_pointer (&self->changed_modules, g_hash_table_unref);
+  self->changed_modules = g_steal_pointer (&affected);
+
+  return TRUE;
+}
+
+
+ModulemdModuleIndex *
+modulemd_defaults_loader_get_index (ModulemdDefaultsLoader *self)
+{
+  g_return_val_if_fail (MODULEMD_IS_DEFAULTS_LOADER (self), NULL);
+
+  return self->index;
+}
+
+
+GStrv
+modulemd_defaults_loader_get_changed_modules_as_strv (
+  ModulemdDefaultsLoader *self)
+{
+  g_return_val_if_fail (MODULEMD_IS_DEFAULTS_LOADER (self), NULL);
+
+  return modulemd_ordered_str_keys_as_strv (self->changed_modules);
+}
+
+
+gboolean
+modulemd_defaults_loader_update_index (ModulemdDefaultsLoader *self,
+                                       ModulemdModuleIndex *index,
+                                       GError **error)
+{
+  g_return_val_if_fail (MODULEMD_IS_DEFAULTS_LOADER (self), FALSE);
+  g_return_val_if_fail (MODULEMD_IS_MODULE_INDEX (index), FALSE);
+
+  return modulemd_module_index_merge (
+    self->index, index, TRUE, self->strict, error);
+}
@@ -15,6 +15,7 @@
 #include "modulemd-errors.h"
 #include "private/modulemd-defaults-private.h"
 #include "private/modulemd-defaults-v1-private.h"
+#include "private/modulemd-memory-usage-private.h"
 #include "private/modulemd-subdocument-info-private.h"
 #include "private/modulemd-util.h"
 #include "private/modulemd-yaml.h"
@@ -190,6 +191,9 @@ modulemd_defaults_v1_set_default_stream (ModulemdDefaultsV1 *self,
                                          const gchar *intent)
 {
   g_return_if_fail (MODULEMD_IS_DEFAULTS_V1 (self));
+  g_return_if_fail (!modulemd_defaults_is_frozen (MODULEMD_DEFAULTS (self)));
+
+  modulemd_defaults_clear_validated (MODULEMD_DEFAULTS (self));
 
   if (default_stream)
     {
@@ -333,6 +337,7 @@ modulemd_defaults_v1_add_or_clear_default_profile_for_stream (
   g_return_if_fail (MODULEMD_IS_DEFAULTS_V1 (self));
   g_return_if_fail (stream_name);
 
+  modulemd_defaults_clear_validated (MODULEMD_DEFAULTS (self));
 
   profile_table = g_hash_table_ref (
     modulemd_defaults_v1_get_or_create_profile_table (self, intent));
@@ -379,6 +384,7 @@ modulemd_defaults_v1_add_default_profile_for_stream (ModulemdDefaultsV1 *self,
   g_return_if_fail (MODULEMD_IS_DEFAULTS_V1 (self));
   g_return_if_fail (stream_name);
   g_return_if_fail (profile_name);
+  g_return_if_fail (!modulemd_defaults_is_frozen (MODULEMD_DEFAULTS (self)));
 
   return modulemd_defaults_v1_add_or_clear_default_profile_for_stream (
     self, stream_name, profile_name, intent);
@@ -391,6 +397,7 @@ modulemd_defaults_v1_set_empty_default_profiles_for_stream (
 {
   g_return_if_fail (MODULEMD_IS_DEFAULTS_V1 (self));
   g_return_if_fail (stream_name);
+  g_return_if_fail (!modulemd_defaults_is_frozen (MODULEMD_DEFAULTS (self)));
 
   return modulemd_defaults_v1_add_or_clear_default_profile_for_stream (
     self, stream_name, NULL, intent);
@@ -405,6 +412,9 @@ modulemd_defaults_v1_remove_default_profiles_for_stream (
 
   g_return_if_fail (MODULEMD_IS_DEFAULTS_V1 (self));
   g_return_if_fail (stream_name);
+  g_return_if_fail (!modulemd_defaults_is_frozen (MODULEMD_DEFAULTS (self)));
+
+  modulemd_defaults_clear_validated (MODULEMD_DEFAULTS (self));
 
   profile_table = g_hash_table_ref (
     modulemd_defaults_v1_get_or_create_profile_table (self, intent));
@@ -1298,6 +1308,9 @@ modulemd_defaults_v1_merge (ModulemdDefaultsV1 *from,
   merged =
     MODULEMD_DEFAULTS_V1 (modulemd_defaults_copy (MODULEMD_DEFAULTS (into)));
 
+  /* Some of the merging below modifies the tables of the copy directly */
+  modulemd_defaults_clear_validated (MODULEMD_DEFAULTS (merged));
+
   /* Merge the default streams */
   if (from->default_stream && !merged->default_stream)
     {
@@ -1562,3 +1575,46 @@ modulemd_defaults_v1_merge_default_profiles (
 
   return TRUE;
 }
+
+
+static void
+add_profile_defaults_memory_usage (GHashTable *profile_defaults,
+                                   ModulemdMemoryUsage *usage)
+{
+  GHashTableIter iter;
+  gpointer key;
+  gpointer value;
+
+  modulemd_memory_usage_add_hash_table (usage, profile_defaults);
+
+  g_hash_table_iter_init (&iter, profile_defaults);
+  while (g_hash_table_iter_next (&iter, &key, &value))
+    {
+      modulemd_memory_usage_add_string (usage, (const gchar *)key);
+      modulemd_memory_usage_add_string_set (usage, (GHashTable *)value);
+    }
+}
+
+
+void
+modulemd_defaults_v1_add_memory_usage (ModulemdDefaultsV1 *self,
+                                       ModulemdMemoryUsage *usage)
+{
+  GHashTableIter iter;
+  gpointer key;
+  gpointer value;
+
+  modulemd_memory_usage_add_object (usage, sizeof (ModulemdDefaultsV1));
+  modulemd_defaults_add_memory_usage (MODULEMD_DEFAULTS (self), usage);
+  modulemd_memory_usage_add_string (usage, self->default_stream);
+  add_profile_defaults_memory_usage (self->profile_defaults, usage);
+  modulemd_memory_usage_add_string_map (usage, self->intent_default_streams);
+  modulemd_memory_usage_add_hash_table (usage, self->intent_default_profiles);
+
+  g_hash_table_iter_init (&iter, self->intent_default_profiles);
+  while (g_hash_table_iter_next (&iter, &key, &value))
+    {
+      modulemd_memory_usage_add_string (usage, (const gchar *)key);
+      add_profile_defaults_memory_usage ((GHashTable *)value, usage);
+    }
+}
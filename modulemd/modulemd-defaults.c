@@ -16,6 +16,7 @@
 #include "modulemd-defaults-v1.h"
 #include "modulemd-errors.h"
 #include "private/modulemd-defaults-private.h"
+#include "private/modulemd-memory-usage-private.h"
 #include "private/modulemd-defaults-v1-private.h"
 #include "private/modulemd-util.h"
 #include <inttypes.h>
@@ -26,6 +27,14 @@ typedef struct
 {
   gchar *module_name;
   guint64 modified;
+
+  /* TRUE if the last call to modulemd_defaults_validate() succeeded and the
+   * defaults have not been modified since.
+   */
+  gboolean validated;
+
+  /* TRUE once modulemd_defaults_freeze() has been called */
+  gboolean frozen;
 } ModulemdDefaultsPrivate;
 
 G_DEFINE_ABSTRACT_TYPE_WITH_PRIVATE (ModulemdDefaults,
@@ -129,6 +138,7 @@ ModulemdDefaults *
 modulemd_defaults_copy (ModulemdDefaults *self)
 {
   ModulemdDefaultsClass *klass;
+  ModulemdDefaults *copy = NULL;
 
   if (!self)
     {
@@ -140,7 +150,16 @@ modulemd_defaults_copy (ModulemdDefaults *self)
   klass = MODULEMD_DEFAULTS_GET_CLASS (self);
   g_return_val_if_fail (klass->copy, NULL);
 
-  return klass->copy (self);
+  copy = klass->copy (self);
+
+  if (copy && modulemd_defaults_is_validated (self))
+    {
+      ModulemdDefaultsPrivate *copy_priv =
+        modulemd_defaults_get_instance_private (copy);
+      copy_priv->validated = TRUE;
+    }
+
+  return copy;
 }
 
 
@@ -162,6 +181,7 @@ gboolean
 modulemd_defaults_validate (ModulemdDefaults *self, GError **error)
 {
   ModulemdDefaultsClass *klass;
+  ModulemdDefaultsPrivate *priv = NULL;
 
   if (!self)
     {
@@ -170,10 +190,76 @@ modulemd_defaults_validate (ModulemdDefaults *self, GError **error)
 
   g_return_val_if_fail (MODULEMD_IS_DEFAULTS (self), FALSE);
 
+  priv = modulemd_defaults_get_instance_private (self);
+  if (priv->validated)
+    {
+      return TRUE;
+    }
+
   klass = MODULEMD_DEFAULTS_GET_CLASS (self);
   g_return_val_if_fail (klass->validate, FALSE);
 
-  return klass->validate (self, error);
+  if (!klass->validate (self, error))
+    {
+      return FALSE;
+    }
+
+  priv->validated = TRUE;
+  return TRUE;
+}
+
+
+gboolean
+modulemd_defaults_is_validated (ModulemdDefaults *self)
+{
+  g_return_val_if_fail (MODULEMD_IS_DEFAULTS (self), FALSE);
+
+  ModulemdDefaultsPrivate *priv =
+    modulemd_defaults_get_instance_private (self);
+
+  return priv->validated;
+}
+
+
+void
+modulemd_defaults_clear_validated (ModulemdDefaults *self)
+{
+  g_return_if_fail (MODULEMD_IS_DEFAULTS (self));
+
+  ModulemdDefaultsPrivate *priv =
+    modulemd_defaults_get_instance_private (self);
+
+  g_return_if_fail (!priv->frozen);
+
+  priv->validated = FALSE;
+}
+
+
+void
+modulemd_defaults_freeze (ModulemdDefaults *self)
+{
+  g_return_if_fail (MODULEMD_IS_DEFAULTS (self));
+
+  ModulemdDefaultsPrivate *priv =
+    modulemd_defaults_get_instance_private (self);
+
+  /* Validate now, so that later calls to modulemd_defaults_validate() do
+   * not write to the defaults.
+   */
+  modulemd_defaults_validate (self, NULL);
+  priv->frozen = TRUE;
+}
+
+
+gboolean
+modulemd_defaults_is_frozen (ModulemdDefaults *self)
+{
+  g_return_val_if_fail (MODULEMD_IS_DEFAULTS (self), FALSE);
+
+  ModulemdDefaultsPrivate *priv =
+    modulemd_defaults_get_instance_private (self);
+
+  return priv->frozen;
 }
 
 
@@ -278,6 +364,10 @@ modulemd_defaults_set_modified (ModulemdDefaults *self, guint64 modified)
 
   ModulemdDefaultsPrivate *priv =
     modulemd_defaults_get_instance_private (self);
+
+  g_return_if_fail (!priv->frozen);
+
+  priv->validated = FALSE;
   priv->modified = modified;
 }
 
@@ -309,6 +399,9 @@ modulemd_defaults_set_module_name (ModulemdDefaults *self,
   ModulemdDefaultsPrivate *priv =
     modulemd_defaults_get_instance_private (self);
 
+  g_return_if_fail (!priv->frozen);
+
+  priv->validated = FALSE;
   g_clear_pointer (&priv->module_name, g_free);
   priv->module_name = g_strdup (module_name);
 
@@ -454,3 +547,15 @@ modulemd_defaults_merge (ModulemdDefaults *from,
 
   return g_steal_pointer (&merged_defaults);
 }
+
+
+void
+modulemd_defaults_add_memory_usage (ModulemdDefaults *self,
+                                    ModulemdMemoryUsage *usage)
+{
+  ModulemdDefaultsPrivate *priv =
+    modulemd_defaults_get_instance_private (self);
+
+  modulemd_memory_usage_add_object (usage, sizeof (ModulemdDefaultsPrivate));
+  modulemd_memory_usage_add_string (usage, priv->module_name);
+}
@@ -18,6 +18,7 @@
 #include "modulemd-errors.h"
 #include "private/glib-extensions.h"
 #include "private/modulemd-dependencies-private.h"
+#include "private/modulemd-memory-usage-private.h"
 #include "private/modulemd-util.h"
 #include "private/modulemd-yaml.h"
 
@@ -751,3 +752,31 @@ modulemd_dependencies_buildrequires_module_and_stream (
   return requires_module_and_stream (
     self->buildtime_deps, module_name, stream_name);
 }
+
+
+static void
+add_deps_memory_usage (GHashTable *deps, ModulemdMemoryUsage *usage)
+{
+  GHashTableIter iter;
+  gpointer key;
+  gpointer value;
+
+  modulemd_memory_usage_add_hash_table (usage, deps);
+
+  g_hash_table_iter_init (&iter, deps);
+  while (g_hash_table_iter_next (&iter, &key, &value))
+    {
+      modulemd_memory_usage_add_string (usage, (const gchar *)key);
+      modulemd_memory_usage_add_string_set (usage, (GHashTable *)value);
+    }
+}
+
+
+void
+modulemd_dependencies_add_memory_usage (ModulemdDependencies *self,
+                                        ModulemdMemoryUsage *usage)
+{
+  modulemd_memory_usage_add_object (usage, sizeof (ModulemdDependencies));
+  add_deps_memory_usage (self->buildtime_deps, usage);
+  add_deps_memory_usage (self->runtime_deps, usage);
+}
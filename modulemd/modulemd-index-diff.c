@@ -0,0 +1,304 @@
+/*
+ * This file is part of libmodulemd
+ * Copyright (C) 2020 Red Hat, Inc.
+ *
+ * Fedora-License-Identifier: MIT
+ * SPDX-2.0-License-Identifier: MIT
+ * SPDX-3.0-License-Identifier: MIT
+ *
+ * This program is free software.
+ * For more information on the license, see COPYING.
+ * For more information on free software, see <https://www.gnu.org/philosophy/free-sw.en.html>.
+ */
+
+#include <glib.h>
+
+#include "modulemd-defaults.h"
+#include "modulemd-index-diff.h"
+#include "modulemd-module-stream.h"
+#include "modulemd-translation.h"
+#include "private/modulemd-util.h"
+
+
+struct _ModulemdIndexDiff
+{
+  GObject parent_instance;
+
+  /* ModulemdModuleStream objects */
+  GPtrArray *added_streams;
+  GPtrArray *changed_streams;
+  /* Set of NSVCA strings */
+  GHashTable *removed_streams;
+
+  /* ModulemdDefaults objects */
+  GPtrArray *added_defaults;
+  GPtrArray *changed_defaults;
+  /* Set of module names */
+  GHashTable *removed_defaults;
+
+  /* ModulemdTranslation objects */
+  GPtrArray *added_translations;
+  GPtrArray *changed_translations;
+  /* Set of "module_name:module_stream" strings */
+  GHashTable *removed_translations;
+};
+
+G_DEFINE_TYPE (ModulemdIndexDiff, modulemd_index_diff, G_TYPE_OBJECT)
+
+
+ModulemdIndexDiff *
+modulemd_index_diff_new (void)
+{
+  return g_object_new (MODULEMD_TYPE_INDEX_DIFF, NULL);
+}
+
+
+static void
+modulemd_index_diff_finalize (GObject *object)
+{
+  ModulemdIndexDiff *self = (ModulemdIndexDiff *)object;
+
+  g_clear_pointer (&self->added_streams, g_ptr_array_unref);
+  g_clear_pointer (&self->changed_streams, g_ptr_array_unref);
+  g_clear_pointer (&self->removed_streams, g_hash_table_unref);
+
+  g_clear_pointer (&self->added_defaults, g_ptr_array_unref);
+  g_clear_pointer (&self->changed_defaults, g_ptr_array_unref);
+  g_clear_pointer (&self->removed_defaults, g_hash_table_unref);
+
+  g_clear_pointer (&self->added_translations, g_ptr_array_unref);
+  g_clear_pointer (&self->changed_translations, g_ptr_array_unref);
+  g_clear_pointer (&self->removed_translations, g_hash_table_unref);
+
+  G_OBJECT_CLASS (modulemd_index_diff_parent_class)->finalize (object);
+}
+
+
+static void
+modulemd_index_diff_class_init (ModulemdIndexDiffClass *klass)
+{
+  GObjectClass *object_class = G_OBJECT_CLASS (klass);
+
+  object_class->finalize = modulemd_index_diff_finalize;
+}
+
+
+static void
+modulemd_index_diff_init (ModulemdIndexDiff *self)
+{
+  self->added_streams = g_ptr_array_new_with_free_func (g_object_unref);
+  self->changed_streams = g_ptr_array_new_with_free_func (g_object_unref);
+  self->removed_streams =
+    g_hash_table_new_full (g_str_hash, g_str_equal, g_free, NULL);
+
+  self->added_defaults = g_ptr_array_new_with_free_func (g_object_unref);
+  self->changed_defaults = g_ptr_array_new_with_free_func (g_object_unref);
+  self->removed_defaults =
+    g_hash_table_new_full (g_str_hash, g_str_equal, g_free, NULL);
+
+  self->added_translations = g_ptr_array_new_with_free_func (g_object_unref);
+  self->changed_translations = g_ptr_array_new_with_free_func (g_object_unref);
+  self->removed_translations =
+    g_hash_table_new_full (g_str_hash, g_str_equal, g_free, NULL);
+}
+
+
+gboolean
+modulemd_index_diff_is_empty (ModulemdIndexDiff *self)
+{
+  g_return_val_if_fail (MODULEMD_IS_INDEX_DIFF (self), TRUE);
+
+  return self->added_streams->len == 0 && self->changed_streams->len == 0 &&
+         g_hash_table_size (self->removed_streams) == 0 &&
+         self->added_defaults->len == 0 && self->changed_defaults->len == 0 &&
+         g_hash_table_size (self->removed_defaults) == 0 &&
+         self->added_translations->len == 0 &&
+         self->changed_translations->len == 0 &&
+         g_hash_table_size (self->removed_translations) == 0;
+}
+
+
+void
+modulemd_index_diff_add_stream (ModulemdIndexDiff *self,
+                                ModulemdModuleStream *stream)
+{
+  g_return_if_fail (MODULEMD_IS_INDEX_DIFF (self));
+  g_return_if_fail (MODULEMD_IS_MODULE_STREAM (stream));
+
+  g_ptr_array_add (self->added_streams,
+                   modulemd_module_stream_copy (stream, NULL, NULL));
+}
+
+
+void
+modulemd_index_diff_change_stream (ModulemdIndexDiff *self,
+                                   ModulemdModuleStream *stream)
+{
+  g_return_if_fail (MODULEMD_IS_INDEX_DIFF (self));
+  g_return_if_fail (MODULEMD_IS_MODULE_STREAM (stream));
+
+  g_ptr_array_add (self->changed_streams,
+                   modulemd_module_stream_copy (stream, NULL, NULL));
+}
+
+
+void
+modulemd_index_diff_remove_stream (ModulemdIndexDiff *self, const gchar *nsvca)
+{
+  g_return_if_fail (MODULEMD_IS_INDEX_DIFF (self));
+  g_return_if_fail (nsvca);
+
+  g_hash_table_add (self->removed_streams, g_strdup (nsvca));
+}
+
+
+GPtrArray *
+modulemd_index_diff_get_added_streams (ModulemdIndexDiff *self)
+{
+  g_return_val_if_fail (MODULEMD_IS_INDEX_DIFF (self), NULL);
+
+  return self->added_streams;
+}
+
+
+GPtrArray *
+modulemd_index_diff_get_changed_streams (ModulemdIndexDiff *self)
+{
+  g_return_val_if_fail (MODULEMD_IS_INDEX_DIFF (self), NULL);
+
+  return self->changed_streams;
+}
+
+
+GStrv
+modulemd_index_diff_get_removed_streams_as_strv (ModulemdIndexDiff *self)
+{
+  g_return_val_if_fail (MODULEMD_IS_INDEX_DIFF (self), NULL);
+
+  return modulemd_ordered_str_keys_as_strv (self->removed_streams);
+}
+
+
+void
+modulemd_index_diff_add_defaults (ModulemdIndexDiff *self,
+                                  ModulemdDefaults *defaults)
+{
+  g_return_if_fail (MODULEMD_IS_INDEX_DIFF (self));
+  g_return_if_fail (MODULEMD_IS_DEFAULTS (defaults));
+
+  g_ptr_array_add (self->added_defaults, modulemd_defaults_copy (defaults));
+}
+
+
+void
+modulemd_index_diff_change_defaults (ModulemdIndexDiff *self,
+                                     ModulemdDefaults *defaults)
+{
+  g_return_if_fail (MODULEMD_IS_INDEX_DIFF (self));
+  g_return_if_fail (MODULEMD_IS_DEFAULTS (defaults));
+
+  g_ptr_array_add (self->changed_defaults, modulemd_defaults_copy (defaults));
+}
+
+
+void
+modulemd_index_diff_remove_defaults (ModulemdIndexDiff *self,
+                                     const gchar *module_name)
+{
+  g_return_if_fail (MODULEMD_IS_INDEX_DIFF (self));
+  g_return_if_fail (module_name);
+
+  g_hash_table_add (self->removed_defaults, g_strdup (module_name));
+}
+
+
+GPtrArray *
+modulemd_index_diff_get_added_defaults (ModulemdIndexDiff *self)
+{
+  g_return_val_if_fail (MODULEMD_IS_INDEX_DIFF (self), NULL);
+
+  return self->added_defaults;
+}
+
+
+GPtrArray *
+modulemd_index_diff_get_changed_defaults (ModulemdIndexDiff *self)
+{
+  g_return_val_if_fail (MODULEMD_IS_INDEX_DIFF (self), NULL);
+
+  return self->changed_defaults;
+}
+
+
+GStrv
+modulemd_index_diff_get_removed_defaults_as_strv (ModulemdIndexDiff *self)
+{
+  g_return_val_if_fail (MODULEMD_IS_INDEX_DIFF (self), NULL);
+
+  return modulemd_ordered_str_keys_as_strv (self->removed_defaults);
+}
+
+
+void
+modulemd_index_diff_add_translation (ModulemdIndexDiff *self,
+                                     ModulemdTranslation *translation)
+{
+  g_return_if_fail (MODULEMD_IS_INDEX_DIFF (self));
+  g_return_if_fail (MODULEMD_IS_TRANSLATION (translation));
+
+  g_ptr_array_add (self->added_translations,
+                   modulemd_translation_copy (translation));
+}
+
+
+void
+modulemd_index_diff_change_translation (ModulemdIndexDiff *self,
+                                        ModulemdTranslation *translation)
+{
+  g_return_if_fail (MODULEMD_IS_INDEX_DIFF (self));
+  g_return_if_fail (MODULEMD_IS_TRANSLATION (translation));
+
+  g_ptr_array_add (self->changed_translations,
+                   modulemd_translation_copy (translation));
+}
+
+
+void
+modulemd_index_diff_remove_translation (ModulemdIndexDiff *self,
+                                        const gchar *module_name,
+                                        const gchar *module_stream)
+{
+  g_return_if_fail (MODULEMD_IS_INDEX_DIFF (self));
+  g_return_if_fail (module_name);
+  g_return_if_fail (module_stream);
+
+  g_hash_table_add (self->removed_translations,
+                    g_strdup_printf ("%s:%s", module_name, module_stream));
+}
+
+
+GPtrArray *
+modulemd_index_diff_get_added_translations (ModulemdIndexDiff *self)
+{
+  g_return_val_if_fail (MODULEMD_IS_INDEX_DIFF (self), NULL);
+
+  return self->added_translations;
+}
+
+
+GPtrArray *
+modulemd_index_diff_get_changed_translations (ModulemdIndexDiff *self)
+{
+  g_return_val_if_fail (MODULEMD_IS_INDEX_DIFF (self), NULL);
+
+  return self->changed_translations;
+}
+
+
+GStrv
+modulemd_index_diff_get_removed_translations_as_strv (ModulemdIndexDiff *self)
+{
+  g_return_val_if_fail (MODULEMD_IS_INDEX_DIFF (self), NULL);
+
+  return modulemd_ordered_str_keys_as_strv (self->removed_translations);
+}
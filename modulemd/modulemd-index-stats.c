@@ -0,0 +1,289 @@
+/*
+ * This file is part of libmodulemd
+ * Copyright (C) 2020 Red Hat, Inc.
+ *
+ * Fedora-License-Identifier: MIT
+ * SPDX-2.0-License-Identifier: MIT
+ * SPDX-3.0-License-Identifier: MIT
+ *
+ * This program is free software.
+ * For more information on the license, see COPYING.
+ * For more information on free software, see <https://www.gnu.org/philosophy/free-sw.en.html>.
+ */
+
+#include <glib.h>
+#include <string.h>
+
+#include "modulemd-defaults.h"
+#include "modulemd-index-stats.h"
+#include "modulemd-module-stream.h"
+#include "private/modulemd-index-stats-private.h"
+#include "private/modulemd-util.h"
+
+
+#define N_PHASES (MODULEMD_INDEX_STATS_PHASE_MERGE + 1)
+
+
+typedef struct _IndexStatsCounters
+{
+  /* Indexed by mdversion */
+  guint64 stream_documents[MD_MODULESTREAM_VERSION_LATEST + 1];
+  guint64 defaults_documents[MD_DEFAULTS_VERSION_LATEST + 1];
+  guint64 translation_documents;
+
+  guint64 failures;
+  guint64 bytes_read;
+  guint64 streams_deduplicated;
+  guint64 upgrades;
+
+  /* Microseconds, indexed by ModulemdIndexStatsPhaseEnum */
+  gint64 phase_time[N_PHASES];
+} IndexStatsCounters;
+
+
+struct _ModulemdIndexStats
+{
+  GObject parent_instance;
+
+  IndexStatsCounters counters;
+};
+
+G_DEFINE_TYPE (ModulemdIndexStats, modulemd_index_stats, G_TYPE_OBJECT)
+
+
+ModulemdIndexStats *
+modulemd_index_stats_new (void)
+{
+  return g_object_new (MODULEMD_TYPE_INDEX_STATS, NULL);
+}
+
+
+ModulemdIndexStats *
+modulemd_index_stats_copy (ModulemdIndexStats *self)
+{
+  ModulemdIndexStats *copy = NULL;
+
+  g_return_val_if_fail (MODULEMD_IS_INDEX_STATS (self), NULL);
+
+  copy = modulemd_index_stats_new ();
+  copy->counters = self->counters;
+
+  return copy;
+}
+
+
+static void
+modulemd_index_stats_finalize (GObject *object)
+{
+  G_OBJECT_CLASS (modulemd_index_stats_parent_class)->finalize (object);
+}
+
+
+static void
+modulemd_index_stats_class_init (ModulemdIndexStatsClass *klass)
+{
+  GObjectClass *object_class = G_OBJECT_CLASS (klass);
+
+  object_class->finalize = modulemd_index_stats_finalize;
+}
+
+
+static void
+modulemd_index_stats_init (ModulemdIndexStats *self)
+{
+  memset (&self->counters, 0, sizeof (IndexStatsCounters));
+}
+
+
+void
+modulemd_index_stats_reset (ModulemdIndexStats *self)
+{
+  g_return_if_fail (MODULEMD_IS_INDEX_STATS (self));
+
+  memset (&self->counters, 0, sizeof (IndexStatsCounters));
+}
+
+
+guint64
+modulemd_index_stats_get_stream_documents (ModulemdIndexStats *self,
+                                           guint64 mdversion)
+{
+  g_return_val_if_fail (MODULEMD_IS_INDEX_STATS (self), 0);
+
+  if (mdversion > MD_MODULESTREAM_VERSION_LATEST)
+    {
+      return 0;
+    }
+
+  return self->counters.stream_documents[mdversion];
+}
+
+
+guint64
+modulemd_index_stats_get_defaults_documents (ModulemdIndexStats *self,
+                                             guint64 mdversion)
+{
+  g_return_val_if_fail (MODULEMD_IS_INDEX_STATS (self), 0);
+
+  if (mdversion > MD_DEFAULTS_VERSION_LATEST)
+    {
+      return 0;
+    }
+
+  return self->counters.defaults_documents[mdversion];
+}
+
+
+guint64
+modulemd_index_stats_get_translation_documents (ModulemdIndexStats *self)
+{
+  g_return_val_if_fail (MODULEMD_IS_INDEX_STATS (self), 0);
+
+  return self->counters.translation_documents;
+}
+
+
+guint64
+modulemd_index_stats_get_failures (ModulemdIndexStats *self)
+{
+  g_return_val_if_fail (MODULEMD_IS_INDEX_STATS (self), 0);
+
+  return self->counters.failures;
+}
+
+
+guint64
+modulemd_index_stats_get_bytes_read (ModulemdIndexStats *self)
+{
+  g_return_val_if_fail (MODULEMD_IS_INDEX_STATS (self), 0);
+
+  return self->counters.bytes_read;
+}
+
+
+guint64
+modulemd_index_stats_get_streams_deduplicated (ModulemdIndexStats *self)
+{
+  g_return_val_if_fail (MODULEMD_IS_INDEX_STATS (self), 0);
+
+  return self->counters.streams_deduplicated;
+}
+
+
+guint64
+modulemd_index_stats_get_upgrades (ModulemdIndexStats *self)
+{
+  g_return_val_if_fail (MODULEMD_IS_INDEX_STATS (self), 0);
+
+  return self->counters.upgrades;
+}
+
+
+gint64
+modulemd_index_stats_get_phase_time (ModulemdIndexStats *self,
+                                     ModulemdIndexStatsPhaseEnum phase)
+{
+  g_return_val_if_fail (MODULEMD_IS_INDEX_STATS (self), 0);
+  g_return_val_if_fail (phase < N_PHASES, 0);
+
+  return self->counters.phase_time[phase];
+}
+
+
+void
+modulemd_index_stats_add_document (ModulemdIndexStats *self,
+                                   ModulemdYamlDocumentTypeEnum doctype,
+                                   guint64 mdversion)
+{
+  switch (doctype)
+    {
+    case MODULEMD_YAML_DOC_MODULESTREAM:
+      if (mdversion <= MD_MODULESTREAM_VERSION_LATEST)
+        {
+          self->counters.stream_documents[mdversion]++;
+        }
+      break;
+
+    case MODULEMD_YAML_DOC_DEFAULTS:
+      if (mdversion <= MD_DEFAULTS_VERSION_LATEST)
+        {
+          self->counters.defaults_documents[mdversion]++;
+        }
+      break;
+
+    case MODULEMD_YAML_DOC_TRANSLATIONS:
+      self->counters.translation_documents++;
+      break;
+
+    default:
+      /* Unknown documents are only counted as failures */
+      break;
+    }
+}
+
+
+void
+modulemd_index_stats_add_failure (ModulemdIndexStats *self)
+{
+  self->counters.failures++;
+}
+
+
+void
+modulemd_index_stats_add_bytes_read (ModulemdIndexStats *self, guint64 bytes)
+{
+  self->counters.bytes_read += bytes;
+}
+
+
+void
+modulemd_index_stats_add_deduplicated (ModulemdIndexStats *self)
+{
+  self->counters.streams_deduplicated++;
+}
+
+
+void
+modulemd_index_stats_add_upgrades (ModulemdIndexStats *self, guint upgrades)
+{
+  self->counters.upgrades += upgrades;
+}
+
+
+void
+modulemd_index_stats_add_phase_time (ModulemdIndexStats *self,
+                                     ModulemdIndexStatsPhaseEnum phase,
+                                     gint64 start_time)
+{
+  self->counters.phase_time[phase] += g_get_monotonic_time () - start_time;
+}
+
+
+void
+modulemd_index_stats_accumulate (ModulemdIndexStats *self,
+                                 ModulemdIndexStats *from)
+{
+  guint i;
+
+  for (i = 0; i <= MD_MODULESTREAM_VERSION_LATEST; i++)
+    {
+      self->counters.stream_documents[i] += from->counters.stream_documents[i];
+    }
+
+  for (i = 0; i <= MD_DEFAULTS_VERSION_LATEST; i++)
+    {
+      self->counters.defaults_documents[i] +=
+        from->counters.defaults_documents[i];
+    }
+
+  self->counters.translation_documents += from->counters.translation_documents;
+  self->counters.failures += from->counters.failures;
+  self->counters.bytes_read += from->counters.bytes_read;
+  self->counters.streams_deduplicated += from->counters.streams_deduplicated;
+  self->counters.upgrades += from->counters.upgrades;
+
+  for (i = 0; i < N_PHASES; i++)
+    {
+      self->counters.phase_time[i] += from->counters.phase_time[i];
+    }
+}
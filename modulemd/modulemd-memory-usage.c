@@ -0,0 +1,329 @@
+/*
+ * This file is part of libmodulemd
+ * Copyright (C) 2020 Red Hat, Inc.
+ *
+ * Fedora-License-Identifier: MIT
+ * SPDX-2.0-License-Identifier: MIT
+ * SPDX-3.0-License-Identifier: MIT
+ *
+ * This program is free software.
+ * For more information on the license, see COPYING.
+ * For more information on free software, see <https://www.gnu.org/philosophy/free-sw.en.html>.
+ */
+
+#include <glib.h>
+#include <string.h>
+
+#include "modulemd-memory-usage.h"
+#include "private/modulemd-memory-usage-private.h"
+#include "private/modulemd-util.h"
+
+
+/* Approximations of the private GLib structures, which are not available to
+ * us. They only need to be close enough to compare objects with each other.
+ */
+#define HASH_TABLE_STRUCT_SIZE (12 * sizeof (gpointer))
+#define HASH_TABLE_MIN_BUCKETS 8
+#define PTR_ARRAY_STRUCT_SIZE (4 * sizeof (gpointer))
+#define PTR_ARRAY_MIN_ALLOC 16
+#define VARIANT_STRUCT_SIZE (8 * sizeof (gpointer))
+
+
+struct _ModulemdMemoryUsage
+{
+  GObject parent_instance;
+
+  guint64 strings;
+  guint64 containers;
+  guint64 objects;
+  guint64 xmd;
+
+  guint64 rpm_artifact_map;
+  guint64 translations;
+};
+
+G_DEFINE_TYPE (ModulemdMemoryUsage, modulemd_memory_usage, G_TYPE_OBJECT)
+
+
+ModulemdMemoryUsage *
+modulemd_memory_usage_new (void)
+{
+  return g_object_new (MODULEMD_TYPE_MEMORY_USAGE, NULL);
+}
+
+
+static void
+modulemd_memory_usage_finalize (GObject *object)
+{
+  G_OBJECT_CLASS (modulemd_memory_usage_parent_class)->finalize (object);
+}
+
+
+static void
+modulemd_memory_usage_class_init (ModulemdMemoryUsageClass *klass)
+{
+  GObjectClass *object_class = G_OBJECT_CLASS (klass);
+
+  object_class->finalize = modulemd_memory_usage_finalize;
+}
+
+
+static void
+modulemd_memory_usage_init (ModulemdMemoryUsage *self)
+{
+}
+
+
+guint64
+modulemd_memory_usage_get_total (ModulemdMemoryUsage *self)
+{
+  g_return_val_if_fail (MODULEMD_IS_MEMORY_USAGE (self), 0);
+
+  return self->strings + self->containers + self->objects + self->xmd;
+}
+
+
+guint64
+modulemd_memory_usage_get_strings (ModulemdMemoryUsage *self)
+{
+  g_return_val_if_fail (MODULEMD_IS_MEMORY_USAGE (self), 0);
+
+  return self->strings;
+}
+
+
+guint64
+modulemd_memory_usage_get_containers (ModulemdMemoryUsage *self)
+{
+  g_return_val_if_fail (MODULEMD_IS_MEMORY_USAGE (self), 0);
+
+  return self->containers;
+}
+
+
+guint64
+modulemd_memory_usage_get_objects (ModulemdMemoryUsage *self)
+{
+  g_return_val_if_fail (MODULEMD_IS_MEMORY_USAGE (self), 0);
+
+  return self->objects;
+}
+
+
+guint64
+modulemd_memory_usage_get_xmd (ModulemdMemoryUsage *self)
+{
+  g_return_val_if_fail (MODULEMD_IS_MEMORY_USAGE (self), 0);
+
+  return self->xmd;
+}
+
+
+guint64
+modulemd_memory_usage_get_rpm_artifact_map (ModulemdMemoryUsage *self)
+{
+  g_return_val_if_fail (MODULEMD_IS_MEMORY_USAGE (self), 0);
+
+  return self->rpm_artifact_map;
+}
+
+
+guint64
+modulemd_memory_usage_get_translations (ModulemdMemoryUsage *self)
+{
+  g_return_val_if_fail (MODULEMD_IS_MEMORY_USAGE (self), 0);
+
+  return self->translations;
+}
+
+
+void
+modulemd_memory_usage_add_object (ModulemdMemoryUsage *self, gsize size)
+{
+  self->objects += size;
+}
+
+
+void
+modulemd_memory_usage_add_string (ModulemdMemoryUsage *self, const gchar *str)
+{
+  if (str)
+    {
+      self->strings += strlen (str) + 1;
+    }
+}
+
+
+/*
+ * hash_table_size:
+ * @table: A #GHashTable.
+ * @is_set: Whether @table was only ever populated with g_hash_table_add(),
+ * in which case GLib does not allocate a separate array of values.
+ *
+ * GLib keeps the number of buckets at a power of two between roughly one and
+ * four times the number of entries. Assume the middle of that range.
+ */
+static gsize
+hash_table_size (GHashTable *table, gboolean is_set)
+{
+  gsize n_buckets = HASH_TABLE_MIN_BUCKETS;
+  gsize bucket_size = sizeof (guint) + sizeof (gpointer);
+
+  while (n_buckets < 2 * (gsize)g_hash_table_size (table))
+    {
+      n_buckets <<= 1;
+    }
+
+  if (!is_set)
+    {
+      bucket_size += sizeof (gpointer);
+    }
+
+  return HASH_TABLE_STRUCT_SIZE + n_buckets * bucket_size;
+}
+
+
+void
+modulemd_memory_usage_add_hash_table (ModulemdMemoryUsage *self,
+                                      GHashTable *table)
+{
+  if (table)
+    {
+      self->containers += hash_table_size (table, FALSE);
+    }
+}
+
+
+void
+modulemd_memory_usage_add_string_set (ModulemdMemoryUsage *self,
+                                      GHashTable *set)
+{
+  GHashTableIter iter;
+  gpointer key;
+
+  if (!set)
+    {
+      return;
+    }
+
+  self->containers += hash_table_size (set, TRUE);
+
+  g_hash_table_iter_init (&iter, set);
+  while (g_hash_table_iter_next (&iter, &key, NULL))
+    {
+      modulemd_memory_usage_add_string (self, (const gchar *)key);
+    }
+}
+
+
+void
+modulemd_string_set_add_memory_usage (ModulemdStringSet *set,
+                                      ModulemdMemoryUsage *usage)
+{
+  if (set->table)
+    {
+      modulemd_memory_usage_add_string_set (usage, set->table);
+      return;
+    }
+
+  usage->containers += (set->n_sorted + 1) * sizeof (gchar *);
+  for (guint i = 0; i < set->n_sorted; i++)
+    {
+      modulemd_memory_usage_add_string (usage, set->sorted[i]);
+    }
+}
+
+
+void
+modulemd_memory_usage_add_string_map (ModulemdMemoryUsage *self,
+                                      GHashTable *map)
+{
+  GHashTableIter iter;
+  gpointer key;
+  gpointer value;
+
+  if (!map)
+    {
+      return;
+    }
+
+  self->containers += hash_table_size (map, FALSE);
+
+  g_hash_table_iter_init (&iter, map);
+  while (g_hash_table_iter_next (&iter, &key, &value))
+    {
+      modulemd_memory_usage_add_string (self, (const gchar *)key);
+      modulemd_memory_usage_add_string (self, (const gchar *)value);
+    }
+}
+
+
+void
+modulemd_memory_usage_add_object_table (ModulemdMemoryUsage *self,
+                                        GHashTable *table,
+                                        ModulemdMemoryUsageFunc func)
+{
+  GHashTableIter iter;
+  gpointer key;
+  gpointer value;
+
+  if (!table)
+    {
+      return;
+    }
+
+  self->containers += hash_table_size (table, FALSE);
+
+  g_hash_table_iter_init (&iter, table);
+  while (g_hash_table_iter_next (&iter, &key, &value))
+    {
+      modulemd_memory_usage_add_string (self, (const gchar *)key);
+      func (value, self);
+    }
+}
+
+
+void
+modulemd_memory_usage_add_ptr_array (ModulemdMemoryUsage *self,
+                                     GPtrArray *array)
+{
+  gsize alloc = PTR_ARRAY_MIN_ALLOC;
+
+  if (!array)
+    {
+      return;
+    }
+
+  while (alloc < array->len)
+    {
+      alloc <<= 1;
+    }
+
+  self->containers += PTR_ARRAY_STRUCT_SIZE + alloc * sizeof (gpointer);
+}
+
+
+void
+modulemd_memory_usage_add_xmd (ModulemdMemoryUsage *self, GVariant *xmd)
+{
+  if (xmd)
+    {
+      self->xmd += VARIANT_STRUCT_SIZE + g_variant_get_size (xmd);
+    }
+}
+
+
+void
+modulemd_memory_usage_add_rpm_artifact_map (ModulemdMemoryUsage *self,
+                                            guint64 bytes)
+{
+  self->rpm_artifact_map += bytes;
+}
+
+
+void
+modulemd_memory_usage_add_translations (ModulemdMemoryUsage *self,
+                                        guint64 bytes)
+{
+  self->translations += bytes;
+}
@@ -12,10 +12,12 @@
  */
 
 #include "modulemd-defaults.h"
+#include "modulemd-index-stats.h"
 #include "modulemd-module-index-merger.h"
 #include "modulemd-module-index.h"
 #include "modulemd-module-stream.h"
 #include "modulemd-module.h"
+#include "private/modulemd-index-stats-private.h"
 #include "private/modulemd-module-index-private.h"
 #include "private/modulemd-util.h"
 #include <glib.h>
@@ -225,6 +227,11 @@ modulemd_module_index_merger_resolve_ext (ModulemdModuleIndexMerger *self,
           return NULL;
         }
 
+      /* Keep the statistics for the merges within this level */
+      modulemd_index_stats_accumulate (
+        modulemd_module_index_get_stats (final),
+        modulemd_module_index_get_stats (thislevel));
+
       g_clear_object (&thislevel);
     }
   return g_steal_pointer (&final);
@@ -12,9 +12,15 @@
  */
 
 #include <errno.h>
+#include <fcntl.h>
+#include <gio/gio.h>
 #include <glib.h>
+#include <glib/gstdio.h>
 #include <inttypes.h>
 #include <stdio.h>
+#include <string.h>
+#include <sys/stat.h>
+#include <unistd.h>
 #include <yaml.h>
 
 #ifdef HAVE_RPMIO
@@ -23,12 +29,15 @@
 
 #include "modulemd-compression.h"
 #include "modulemd-errors.h"
+#include "modulemd-index-stats.h"
 #include "modulemd-module-index.h"
 #include "modulemd-subdocument-info.h"
 #include "private/glib-extensions.h"
 #include "private/modulemd-compression-private.h"
 #include "private/modulemd-defaults-private.h"
 #include "private/modulemd-defaults-v1-private.h"
+#include "private/modulemd-index-stats-private.h"
+#include "private/modulemd-memory-usage-private.h"
 #include "private/modulemd-module-index-private.h"
 #include "private/modulemd-module-private.h"
 #include "private/modulemd-module-stream-private.h"
@@ -48,9 +57,23 @@ struct _ModulemdModuleIndex
   GObject parent_instance;
 
   GHashTable *modules;
+  ModulemdOrderedKeys module_names;
 
   ModulemdDefaultsVersionEnum defaults_mdversion;
   ModulemdModuleStreamVersionEnum stream_mdversion;
+
+  /* While read_documents() is inserting, a stream of a higher mdversion
+   * raises stream_mdversion without upgrading the streams already in the
+   * index. upgrade_pending records that some of them are still older, so
+   * that they are upgraded once, after the last document.
+   */
+  gboolean defer_upgrades;
+  gboolean upgrade_pending;
+
+  ModulemdIndexStats *stats;
+
+  /* TRUE once modulemd_module_index_freeze() has been called */
+  gboolean frozen;
 };
 
 G_DEFINE_TYPE (ModulemdModuleIndex, modulemd_module_index, G_TYPE_OBJECT)
@@ -69,6 +92,8 @@ modulemd_module_index_finalize (GObject *object)
   ModulemdModuleIndex *self = (ModulemdModuleIndex *)object;
 
   g_clear_pointer (&self->modules, g_hash_table_unref);
+  modulemd_ordered_keys_invalidate (&self->module_names);
+  g_clear_object (&self->stats);
 
   G_OBJECT_CLASS (modulemd_module_index_parent_class)->finalize (object);
 }
@@ -115,6 +140,7 @@ modulemd_module_index_init (ModulemdModuleIndex *self)
 {
   self->modules =
     g_hash_table_new_full (g_str_hash, g_str_equal, g_free, g_object_unref);
+  self->stats = modulemd_index_stats_new ();
 }
 
 
@@ -126,23 +152,236 @@ get_or_create_module (ModulemdModuleIndex *self, const gchar *module_name)
     {
       module = modulemd_module_new (module_name);
       g_hash_table_insert (self->modules, g_strdup (module_name), module);
+      modulemd_ordered_keys_invalidate (&self->module_names);
     }
   return module;
 }
 
 
+/*
+ * add_phase_time:
+ *
+ * Records the time spent on @subdoc in @phase both in the statistics of
+ * @self and in @subdoc itself.
+ */
+static void
+add_phase_time (ModulemdModuleIndex *self,
+                ModulemdSubdocumentInfo *subdoc,
+                ModulemdIndexStatsPhaseEnum phase,
+                gint64 start_time)
+{
+  modulemd_index_stats_add_phase_time (self->stats, phase, start_time);
+  modulemd_subdocument_info_add_phase_time (subdoc, phase, start_time);
+}
+
+
+/*
+ * IndexJob:
+ * @task: The #GTask running this job. It is not referenced, since the job is
+ * its task data.
+ * @yaml_file: The file being read or written.
+ * @strict: Whether an update uses strict parsing.
+ * @flags: The #ModulemdDumpFlags of a dump.
+ * @failures: The subdocuments that failed to parse during an update.
+ * @yaml_stream: The file being written by a dump.
+ * @bytes_written: The number of bytes written by a dump so far. Only used by
+ * the worker thread.
+ * @progress_callback: (nullable): The progress callback of the caller.
+ * @progress_data: The data passed to @progress_callback.
+ * @progress_data_free: (nullable): The function freeing @progress_data.
+ * @lock: Protects @bytes, @documents and @report_pending.
+ * @bytes: The number of bytes processed so far.
+ * @documents: The number of subdocuments processed so far.
+ * @report_pending: Whether a progress report has been scheduled on the main
+ * context of @task and has not run yet.
+ *
+ * The state of an asynchronous update or dump, shared between the worker
+ * thread and the thread that started it.
+ */
+typedef struct
+{
+  GTask *task;
+  gchar *yaml_file;
+  gboolean strict;
+  ModulemdDumpFlags flags;
+  GPtrArray *failures;
+  FILE *yaml_stream;
+  guint64 bytes_written;
+
+  ModulemdIndexProgressFunc progress_callback;
+  gpointer progress_data;
+  GDestroyNotify progress_data_free;
+
+  GMutex lock;
+  guint64 bytes;
+  guint documents;
+  gboolean report_pending;
+} IndexJob;
+
+
+static IndexJob *
+index_job_new (const gchar *yaml_file,
+               ModulemdIndexProgressFunc progress_callback,
+               gpointer progress_data,
+               GDestroyNotify progress_data_free)
+{
+  IndexJob *job = g_new0 (IndexJob, 1);
+
+  job->yaml_file = g_strdup (yaml_file);
+  job->progress_callback = progress_callback;
+  job->progress_data = progress_data;
+  job->progress_data_free = progress_data_free;
+  g_mutex_init (&job->lock);
+
+  return job;
+}
+
+
+static void
+index_job_free (IndexJob *job)
+{
+  if (job->progress_data_free)
+    {
+      job->progress_data_free (job->progress_data);
+    }
+
+  g_clear_pointer (&job->failures, g_ptr_array_unref);
+  g_clear_pointer (&job->yaml_file, g_free);
+  g_mutex_clear (&job->lock);
+  g_free (job);
+}
+
+
+/*
+ * index_job_cancelled:
+ * @job: (nullable): The #IndexJob of the current operation.
+ *
+ * Returns: TRUE and sets @error if @job is not NULL and its task has been
+ * cancelled.
+ */
+static gboolean
+index_job_cancelled (IndexJob *job, GError **error)
+{
+  if (job == NULL)
+    {
+      return FALSE;
+    }
+
+  return g_cancellable_set_error_if_cancelled (
+    g_task_get_cancellable (job->task), error);
+}
+
+
 static gboolean
-add_subdoc (ModulemdModuleIndex *self,
-            ModulemdSubdocumentInfo *subdoc,
-            gboolean strict,
-            gboolean autogen_module_name,
-            GError **error)
+index_job_dispatch_progress (gpointer user_data)
+{
+  GTask *task = G_TASK (user_data);
+  IndexJob *job = g_task_get_task_data (task);
+  guint64 bytes;
+  guint documents;
+
+  g_mutex_lock (&job->lock);
+  bytes = job->bytes;
+  documents = job->documents;
+  job->report_pending = FALSE;
+  g_mutex_unlock (&job->lock);
+
+  if (!g_task_get_completed (task))
+    {
+      job->progress_callback (bytes, documents, job->progress_data);
+    }
+
+  return G_SOURCE_REMOVE;
+}
+
+
+/*
+ * index_job_set_progress:
+ * @job: (nullable): The #IndexJob of the current operation.
+ *
+ * Called from the worker thread. Schedules a report on the main context of
+ * the task unless one is already pending, in which case that report will
+ * pick up the new values.
+ */
+static void
+index_job_set_progress (IndexJob *job, guint64 bytes, guint documents)
+{
+  gboolean report_pending;
+  g_autoptr (GSource) source = NULL;
+
+  if (job == NULL || job->progress_callback == NULL)
+    {
+      return;
+    }
+
+  g_mutex_lock (&job->lock);
+  job->bytes = bytes;
+  job->documents = documents;
+  report_pending = job->report_pending;
+  job->report_pending = TRUE;
+  g_mutex_unlock (&job->lock);
+
+  if (report_pending)
+    {
+      return;
+    }
+
+  /* Use the priority of the task so that the reports are dispatched before
+   * its completion.
+   */
+  source = g_idle_source_new ();
+  g_source_set_priority (source, g_task_get_priority (job->task));
+  g_source_set_callback (source,
+                         index_job_dispatch_progress,
+                         g_object_ref (job->task),
+                         g_object_unref);
+  g_source_attach (source, g_task_get_context (job->task));
+}
+
+
+/*
+ * PhaseTimer:
+ *
+ * Tracks the phase that the processing of @subdoc is in and when it started,
+ * so that the time can be recorded with add_phase_time() however the
+ * processing ends.
+ */
+typedef struct _PhaseTimer
+{
+  ModulemdModuleIndex *self;
+  ModulemdSubdocumentInfo *subdoc;
+  ModulemdIndexStatsPhaseEnum phase;
+  gint64 start_time;
+} PhaseTimer;
+
+
+/* Records the time spent in the current phase and starts @phase */
+static void
+phase_timer_next (PhaseTimer *timer, ModulemdIndexStatsPhaseEnum phase)
+{
+  add_phase_time (timer->self, timer->subdoc, timer->phase, timer->start_time);
+  timer->phase = phase;
+  timer->start_time = g_get_monotonic_time ();
+}
+
+
+/* Does the work of add_subdoc(), moving @timer from phase to phase */
+static gboolean
+add_subdoc_timed (ModulemdModuleIndex *self,
+                  ModulemdSubdocumentInfo *subdoc,
+                  gboolean strict,
+                  gboolean autogen_module_name,
+                  gboolean insert,
+                  GHashTable *seen_nsvcas,
+                  PhaseTimer *timer,
+                  GError **error)
 {
   g_autoptr (GError) nested_error = NULL;
   g_autoptr (ModulemdModuleStream) stream = NULL;
   g_autoptr (ModulemdTranslation) translation = NULL;
   g_autoptr (ModulemdDefaults) defaults = NULL;
   g_autofree gchar *name = NULL;
+  gboolean autogenerated = FALSE;
 
   switch (modulemd_subdocument_info_get_doctype (subdoc))
     {
@@ -180,6 +419,7 @@ add_subdoc (ModulemdModuleIndex *self,
                                   g_hash_table_size (self->modules) + 1);
           modulemd_module_stream_set_module_name (stream, name);
           g_clear_pointer (&name, g_free);
+          autogenerated = TRUE;
         }
 
       if (autogen_module_name &&
@@ -189,14 +429,46 @@ add_subdoc (ModulemdModuleIndex *self,
                                   g_hash_table_size (self->modules) + 1);
           modulemd_module_stream_set_stream_name (stream, name);
           g_clear_pointer (&name, g_free);
+          autogenerated = TRUE;
         }
 
+      name = modulemd_module_stream_get_NSVCA_as_string (stream);
+      modulemd_subdocument_info_set_nsvca (subdoc, name);
+      g_clear_pointer (&name, g_free);
+
+      phase_timer_next (timer, MODULEMD_INDEX_STATS_PHASE_VALIDATE);
+
       if (!modulemd_module_stream_validate (stream, &nested_error))
         {
           g_propagate_error (error, g_steal_pointer (&nested_error));
           return FALSE;
         }
 
+      /* Generated names are not unique when the streams are not inserted, so
+       * only check streams that were named in the document.
+       */
+      if (seen_nsvcas != NULL && !autogenerated)
+        {
+          name = modulemd_module_stream_get_NSVCA_as_string (stream);
+          if (g_hash_table_contains (seen_nsvcas, name))
+            {
+              g_set_error (error,
+                           MODULEMD_ERROR,
+                           MODULEMD_ERROR_VALIDATE,
+                           "Duplicate module stream %s",
+                           name);
+              return FALSE;
+            }
+          g_hash_table_add (seen_nsvcas, g_steal_pointer (&name));
+        }
+
+      if (!insert)
+        {
+          break;
+        }
+
+      phase_timer_next (timer, MODULEMD_INDEX_STATS_PHASE_INSERT);
+
       if (!modulemd_module_index_add_module_stream (self, stream, error))
         {
           return FALSE;
@@ -215,12 +487,21 @@ add_subdoc (ModulemdModuleIndex *self,
               return FALSE;
             }
 
+          phase_timer_next (timer, MODULEMD_INDEX_STATS_PHASE_VALIDATE);
+
           if (!modulemd_defaults_validate (defaults, &nested_error))
             {
               g_propagate_error (error, g_steal_pointer (&nested_error));
               return FALSE;
             }
 
+          if (!insert)
+            {
+              break;
+            }
+
+          phase_timer_next (timer, MODULEMD_INDEX_STATS_PHASE_INSERT);
+
           if (!modulemd_module_index_add_defaults (self, defaults, error))
             {
               return FALSE;
@@ -243,12 +524,21 @@ add_subdoc (ModulemdModuleIndex *self,
           return FALSE;
         }
 
+      phase_timer_next (timer, MODULEMD_INDEX_STATS_PHASE_VALIDATE);
+
       if (!modulemd_translation_validate (translation, &nested_error))
         {
           g_propagate_error (error, g_steal_pointer (&nested_error));
           return FALSE;
         }
 
+      if (!insert)
+        {
+          break;
+        }
+
+      phase_timer_next (timer, MODULEMD_INDEX_STATS_PHASE_INSERT);
+
       if (!modulemd_module_index_add_translation (self, translation, error))
         {
           return FALSE;
@@ -267,17 +557,82 @@ add_subdoc (ModulemdModuleIndex *self,
 }
 
 
-gboolean
-modulemd_module_index_update_from_parser (ModulemdModuleIndex *self,
-                                          yaml_parser_t *parser,
-                                          gboolean strict,
-                                          gboolean autogen_module_name,
-                                          GPtrArray **failures,
-                                          GError **error)
+/*
+ * add_subdoc:
+ * @insert: Whether to add the parsed object to @self. If FALSE, the object is
+ * only parsed and validated, then discarded.
+ * @seen_nsvcas: (nullable): A set of the NSVCA strings of the module streams
+ * read so far. If not NULL, a module stream that is already in the set is
+ * reported as a duplicate.
+ *
+ * The time spent is recorded for each phase reached, including the one in
+ * which a failure occurred.
+ */
+static gboolean
+add_subdoc (ModulemdModuleIndex *self,
+            ModulemdSubdocumentInfo *subdoc,
+            gboolean strict,
+            gboolean autogen_module_name,
+            gboolean insert,
+            GHashTable *seen_nsvcas,
+            GError **error)
+{
+  PhaseTimer timer = {
+    self, subdoc, MODULEMD_INDEX_STATS_PHASE_PARSE, g_get_monotonic_time ()
+  };
+  gboolean ret;
+
+  ret = add_subdoc_timed (self,
+                          subdoc,
+                          strict,
+                          autogen_module_name,
+                          insert,
+                          seen_nsvcas,
+                          &timer,
+                          error);
+
+  add_phase_time (self, subdoc, timer.phase, timer.start_time);
+
+  return ret;
+}
+
+
+/* Appends a copy of @subdoc without its YAML contents to @documents, if set,
+ * so that the records kept for a whole file stay small.
+ */
+static void
+append_document_record (GPtrArray *documents, ModulemdSubdocumentInfo *subdoc)
+{
+  ModulemdSubdocumentInfo *record = NULL;
+
+  if (documents == NULL)
+    {
+      return;
+    }
+
+  record = modulemd_subdocument_info_copy (subdoc);
+  modulemd_subdocument_info_set_yaml (record, NULL);
+  g_ptr_array_add (documents, record);
+}
+
+
+static gboolean
+read_subdocuments (ModulemdModuleIndex *self,
+                   yaml_parser_t *parser,
+                   gboolean strict,
+                   gboolean autogen_module_name,
+                   gboolean insert,
+                   GHashTable *seen_nsvcas,
+                   GPtrArray *documents,
+                   IndexJob *job,
+                   GPtrArray **failures,
+                   GError **error)
 {
   gboolean done = FALSE;
   gboolean all_passed = TRUE;
+  guint n_documents = 0;
   g_autoptr (ModulemdSubdocumentInfo) subdoc = NULL;
+  gint64 start_time;
   MMD_INIT_YAML_EVENT (event);
 
   if (*failures == NULL)
@@ -299,28 +654,51 @@ modulemd_module_index_update_from_parser (ModulemdModuleIndex *self,
       switch (event.type)
         {
         case YAML_DOCUMENT_START_EVENT:
-          /* One more subdocument to parse */
-          subdoc = modulemd_yaml_parse_document_type (parser);
-          if (modulemd_subdocument_info_get_gerror (subdoc) != NULL)
+          if (index_job_cancelled (job, error))
             {
-              /* Add to failures and ignore */
-              g_ptr_array_add (*failures, g_steal_pointer (&subdoc));
-              all_passed = FALSE;
+              return FALSE;
             }
-          else
+
+          /* One more subdocument to parse */
+          start_time = g_get_monotonic_time ();
+          subdoc = modulemd_yaml_parse_document_type (parser);
+          add_phase_time (
+            self, subdoc, MODULEMD_INDEX_STATS_PHASE_SCAN, start_time);
+          modulemd_subdocument_info_set_location (
+            subdoc, event.start_mark.line + 1, event.start_mark.index);
+
+          if (modulemd_subdocument_info_get_gerror (subdoc) == NULL)
             {
+              modulemd_index_stats_add_document (
+                self->stats,
+                modulemd_subdocument_info_get_doctype (subdoc),
+                modulemd_subdocument_info_get_mdversion (subdoc));
+
               /* Initial parsing worked, parse further */
-              if (!add_subdoc (
-                    self, subdoc, strict, autogen_module_name, error))
+              if (!add_subdoc (self,
+                               subdoc,
+                               strict,
+                               autogen_module_name,
+                               insert,
+                               seen_nsvcas,
+                               error))
                 {
                   modulemd_subdocument_info_set_gerror (subdoc, *error);
                   g_clear_pointer (error, g_error_free);
-                  /* Add to failures and ignore */
-                  g_ptr_array_add (*failures, g_steal_pointer (&subdoc));
-                  all_passed = FALSE;
                 }
             }
+
+          append_document_record (documents, subdoc);
+
+          if (modulemd_subdocument_info_get_gerror (subdoc) != NULL)
+            {
+              /* Add to failures and ignore */
+              g_ptr_array_add (*failures, g_steal_pointer (&subdoc));
+              modulemd_index_stats_add_failure (self->stats);
+              all_passed = FALSE;
+            }
           g_clear_pointer (&subdoc, g_object_unref);
+          index_job_set_progress (job, parser->offset, ++n_documents);
           break;
 
         case YAML_STREAM_END_EVENT: done = TRUE; break;
@@ -334,10 +712,199 @@ modulemd_module_index_update_from_parser (ModulemdModuleIndex *self,
       yaml_event_delete (&event);
     }
 
+  modulemd_index_stats_add_bytes_read (self->stats, parser->offset);
+
+  return all_passed;
+}
+
+
+/*
+ * read_documents:
+ *
+ * Reads every document from @parser with read_subdocuments(). While it
+ * inserts, a stream of a higher mdversion than the index does not upgrade the
+ * streams read before it. Those are upgraded at most once, after the last
+ * document, whether or not the whole stream could be read.
+ */
+static gboolean
+read_documents (ModulemdModuleIndex *self,
+                yaml_parser_t *parser,
+                gboolean strict,
+                gboolean autogen_module_name,
+                gboolean insert,
+                GHashTable *seen_nsvcas,
+                GPtrArray *documents,
+                IndexJob *job,
+                GPtrArray **failures,
+                GError **error)
+{
+  gboolean all_passed;
+  g_autoptr (GError) nested_error = NULL;
+
+  g_return_val_if_fail (!insert || !self->frozen, FALSE);
+
+  self->defer_upgrades = insert;
+  all_passed = read_subdocuments (self,
+                                  parser,
+                                  strict,
+                                  autogen_module_name,
+                                  insert,
+                                  seen_nsvcas,
+                                  documents,
+                                  job,
+                                  failures,
+                                  error);
+  self->defer_upgrades = FALSE;
+
+  if (!self->upgrade_pending)
+    {
+      return all_passed;
+    }
+
+  self->upgrade_pending = FALSE;
+  g_debug ("Upgrading all streams to version %i", self->stream_mdversion);
+  if (!modulemd_module_index_upgrade_streams (
+        self, self->stream_mdversion, &nested_error))
+    {
+      g_clear_error (error);
+      g_propagate_error (error, g_steal_pointer (&nested_error));
+      return FALSE;
+    }
+
   return all_passed;
 }
 
 
+gboolean
+modulemd_module_index_update_from_parser (ModulemdModuleIndex *self,
+                                          yaml_parser_t *parser,
+                                          gboolean strict,
+                                          gboolean autogen_module_name,
+                                          GPtrArray **failures,
+                                          GError **error)
+{
+  return read_documents (self,
+                         parser,
+                         strict,
+                         autogen_module_name,
+                         TRUE,
+                         NULL,
+                         NULL,
+                         NULL,
+                         failures,
+                         error);
+}
+
+
+gboolean
+modulemd_module_index_update_from_parser_ext (ModulemdModuleIndex *self,
+                                              yaml_parser_t *parser,
+                                              gboolean strict,
+                                              gboolean autogen_module_name,
+                                              GPtrArray *documents,
+                                              GPtrArray **failures,
+                                              GError **error)
+{
+  return read_documents (self,
+                         parser,
+                         strict,
+                         autogen_module_name,
+                         TRUE,
+                         NULL,
+                         documents,
+                         NULL,
+                         failures,
+                         error);
+}
+
+
+gboolean
+modulemd_module_index_validate_from_parser (ModulemdModuleIndex *self,
+                                            yaml_parser_t *parser,
+                                            gboolean strict,
+                                            GHashTable *seen_nsvcas,
+                                            GPtrArray *documents,
+                                            GPtrArray **failures,
+                                            GError **error)
+{
+  return read_documents (self,
+                         parser,
+                         strict,
+                         TRUE,
+                         FALSE,
+                         seen_nsvcas,
+                         documents,
+                         NULL,
+                         failures,
+                         error);
+}
+
+
+/* Glob patterns restricting what is emitted. A NULL pattern matches
+ * everything.
+ */
+typedef struct
+{
+  const gchar *module_name;
+  const gchar *stream_name;
+  const gchar *arch;
+} DumpFilter;
+
+
+static gboolean
+filter_matches_stream (const DumpFilter *filter, ModulemdModuleStream *stream)
+{
+  if (filter == NULL)
+    {
+      return TRUE;
+    }
+
+  return modulemd_glob_match (
+           filter->stream_name,
+           modulemd_module_stream_get_stream_name (stream)) &&
+         modulemd_glob_match (filter->arch,
+                              modulemd_module_stream_get_arch (stream));
+}
+
+
+static gboolean
+filter_matches_module (const DumpFilter *filter, ModulemdModule *module)
+{
+  GPtrArray *streams = NULL;
+  gsize i;
+
+  if (filter == NULL)
+    {
+      return TRUE;
+    }
+
+  if (!modulemd_glob_match (filter->module_name,
+                            modulemd_module_get_module_name (module)))
+    {
+      return FALSE;
+    }
+
+  /* Without a stream or architecture filter, every module with a matching
+   * name is emitted, even if it only carries defaults.
+   */
+  if (filter->stream_name == NULL && filter->arch == NULL)
+    {
+      return TRUE;
+    }
+
+  streams = modulemd_module_get_all_streams (module);
+  for (i = 0; i < streams->len; i++)
+    {
+      if (filter_matches_stream (filter, g_ptr_array_index (streams, i)))
+        {
+          return TRUE;
+        }
+    }
+
+  return FALSE;
+}
+
+
 static gboolean
 dump_defaults (ModulemdModule *module, yaml_emitter_t *emitter, GError **error)
 {
@@ -381,6 +948,7 @@ dump_defaults (ModulemdModule *module, yaml_emitter_t *emitter, GError **error)
 static gboolean
 dump_translations (ModulemdModule *module,
                    yaml_emitter_t *emitter,
+                   const DumpFilter *filter,
                    GError **error)
 {
   ModulemdTranslation *translation = NULL;
@@ -390,6 +958,12 @@ dump_translations (ModulemdModule *module,
 
   for (i = 0; i < streams->len; i++)
     {
+      if (filter && !modulemd_glob_match (filter->stream_name,
+                                          g_ptr_array_index (streams, i)))
+        {
+          continue;
+        }
+
       translation = modulemd_module_get_translation (
         module, g_ptr_array_index (streams, i));
 
@@ -415,54 +989,93 @@ compare_stream_SVCA (gconstpointer a, gconstpointer b)
 
 
 static gboolean
-dump_streams (ModulemdModule *module, yaml_emitter_t *emitter, GError **error)
+emit_stream_document (ModulemdModuleStream *stream,
+                      yaml_emitter_t *emitter,
+                      GError **error)
 {
-  ModulemdModuleStream *stream = NULL;
-  gsize i = 0;
-  GPtrArray *streams = modulemd_module_get_all_streams (module);
   g_autoptr (GError) nested_error = NULL;
 
-  /*
-   * Make sure we get a stable sorting by sorting just before dumping.
-   */
-  g_ptr_array_sort (streams, compare_stream_SVCA);
-
-  for (i = 0; i < streams->len; i++)
+  if (!modulemd_module_stream_validate (stream, &nested_error))
     {
-      stream = (ModulemdModuleStream *)g_ptr_array_index (streams, i);
-
-      if (!modulemd_module_stream_validate (stream, &nested_error))
-        {
-          g_propagate_prefixed_error (error,
-                                      g_steal_pointer (&nested_error),
-                                      "Could not validate stream to emit: ");
-          return FALSE;
-        }
+      g_propagate_prefixed_error (error,
+                                  g_steal_pointer (&nested_error),
+                                  "Could not validate stream to emit: ");
+      return FALSE;
+    }
+
+  if (modulemd_module_stream_get_mdversion (stream) ==
+      MD_MODULESTREAM_VERSION_ONE)
+    {
+      return modulemd_module_stream_v1_emit_yaml (
+        MODULEMD_MODULE_STREAM_V1 (stream), emitter, error);
+    }
+
+  if (modulemd_module_stream_get_mdversion (stream) ==
+      MD_MODULESTREAM_VERSION_TWO)
+    {
+      return modulemd_module_stream_v2_emit_yaml (
+        MODULEMD_MODULE_STREAM_V2 (stream), emitter, error);
+    }
+
+  g_set_error_literal (error,
+                       MODULEMD_ERROR,
+                       MODULEMD_ERROR_VALIDATE,
+                       "Provided stream is not a recognized version");
+  return FALSE;
+}
+
+
+/*
+ * dump_streams:
+ * @in_worker: Whether this runs in the worker thread of an asynchronous dump,
+ * while other threads may read @module.
+ */
+static gboolean
+dump_streams (ModulemdModule *module,
+              yaml_emitter_t *emitter,
+              ModulemdDumpFlags flags,
+              const DumpFilter *filter,
+              gboolean in_worker,
+              GError **error)
+{
+  ModulemdModuleStream *stream = NULL;
+  gsize i = 0;
+  GPtrArray *streams = modulemd_module_get_all_streams (module);
+  g_autoptr (GPtrArray) sorted_streams = NULL;
 
-      if (modulemd_module_stream_get_mdversion (stream) ==
-          MD_MODULESTREAM_VERSION_ONE)
+  /*
+   * Make sure we get a stable sorting by sorting just before dumping.
+   */
+  if (!(flags & MODULEMD_DUMP_FLAG_UNSORTED))
+    {
+      if (in_worker || modulemd_module_is_frozen (module))
         {
-          if (!modulemd_module_stream_v1_emit_yaml (
-                MODULEMD_MODULE_STREAM_V1 (stream), emitter, error))
+          /* A frozen module may be dumped from several threads at once, and
+           * any module may be read by the caller while a worker dumps it, so
+           * leave its own array alone.
+           */
+          sorted_streams = g_ptr_array_sized_new (streams->len);
+          for (i = 0; i < streams->len; i++)
             {
-              return FALSE;
+              g_ptr_array_add (sorted_streams, g_ptr_array_index (streams, i));
             }
+          streams = sorted_streams;
         }
-      else if (modulemd_module_stream_get_mdversion (stream) ==
-               MD_MODULESTREAM_VERSION_TWO)
+
+      g_ptr_array_sort (streams, compare_stream_SVCA);
+    }
+
+  for (i = 0; i < streams->len; i++)
+    {
+      stream = (ModulemdModuleStream *)g_ptr_array_index (streams, i);
+
+      if (!filter_matches_stream (filter, stream))
         {
-          if (!modulemd_module_stream_v2_emit_yaml (
-                MODULEMD_MODULE_STREAM_V2 (stream), emitter, error))
-            {
-              return FALSE;
-            }
+          continue;
         }
-      else
+
+      if (!emit_stream_document (stream, emitter, error))
         {
-          g_set_error_literal (error,
-                               MODULEMD_ERROR,
-                               MODULEMD_ERROR_VALIDATE,
-                               "Provided stream is not a recognized version");
           return FALSE;
         }
     }
@@ -471,17 +1084,34 @@ dump_streams (ModulemdModule *module, yaml_emitter_t *emitter, GError **error)
 }
 
 
+static gint
+compare_module_names (gconstpointer a, gconstpointer b)
+{
+  ModulemdModule *a_ = *(ModulemdModule **)a;
+  ModulemdModule *b_ = *(ModulemdModule **)b;
+
+  return g_strcmp0 (modulemd_module_get_module_name (a_),
+                    modulemd_module_get_module_name (b_));
+}
+
+
 static gboolean
 modulemd_module_index_dump_to_emitter (ModulemdModuleIndex *self,
                                        yaml_emitter_t *emitter,
+                                       ModulemdDumpFlags flags,
+                                       const DumpFilter *filter,
+                                       IndexJob *job,
                                        GError **error)
 {
   ModulemdModule *module = NULL;
   gsize i;
+  guint n_documents = 0;
+  GHashTableIter iter;
+  gpointer value;
   g_autoptr (GPtrArray) modules =
-    modulemd_ordered_str_keys (self->modules, modulemd_strcmp_sort);
+    g_ptr_array_sized_new (g_hash_table_size (self->modules));
 
-  if (modules->len == 0)
+  if (g_hash_table_size (self->modules) == 0)
     {
       g_set_error_literal (error,
                            MODULEMD_ERROR,
@@ -490,6 +1120,29 @@ modulemd_module_index_dump_to_emitter (ModulemdModuleIndex *self,
       return FALSE;
     }
 
+  g_hash_table_iter_init (&iter, self->modules);
+  while (g_hash_table_iter_next (&iter, NULL, &value))
+    {
+      if (filter_matches_module (filter, value))
+        {
+          g_ptr_array_add (modules, value);
+        }
+    }
+
+  if (modules->len == 0)
+    {
+      g_set_error_literal (error,
+                           MODULEMD_ERROR,
+                           MODULEMD_ERROR_VALIDATE,
+                           "No modules in the index matched the filter.");
+      return FALSE;
+    }
+
+  if (!(flags & MODULEMD_DUMP_FLAG_UNSORTED))
+    {
+      g_ptr_array_sort (modules, compare_module_names);
+    }
+
   if (!mmd_emitter_start_stream (emitter, error))
     {
       return FALSE;
@@ -497,23 +1150,41 @@ modulemd_module_index_dump_to_emitter (ModulemdModuleIndex *self,
 
   for (i = 0; i < modules->len; i++)
     {
-      module = modulemd_module_index_get_module (
-        self, g_ptr_array_index (modules, i));
+      module = g_ptr_array_index (modules, i);
+
+      if (index_job_cancelled (job, error))
+        {
+          return FALSE;
+        }
 
       if (!dump_defaults (module, emitter, error))
         {
           return FALSE;
         }
 
-      if (!dump_translations (module, emitter, error))
+      if (!dump_translations (module, emitter, filter, error))
         {
           return FALSE;
         }
 
-      if (!dump_streams (module, emitter, error))
+      if (!dump_streams (module, emitter, flags, filter, job != NULL, error))
         {
           return FALSE;
         }
+
+      if (job != NULL)
+        {
+          /* Asynchronous dumps are not filtered, so every subdocument of the
+           * module has been emitted.
+           */
+          g_autoptr (GPtrArray) translated_streams =
+            modulemd_module_get_translated_streams (module);
+
+          n_documents += (modulemd_module_get_defaults (module) != NULL) +
+                         translated_streams->len +
+                         modulemd_module_get_all_streams (module)->len;
+          index_job_set_progress (job, job->bytes_written, n_documents);
+        }
     }
 
   if (!mmd_emitter_end_stream (emitter, error))
@@ -525,20 +1196,21 @@ modulemd_module_index_dump_to_emitter (ModulemdModuleIndex *self,
 }
 
 
-gboolean
-modulemd_module_index_update_from_file (ModulemdModuleIndex *self,
-                                        const gchar *yaml_file,
-                                        gboolean strict,
-                                        GPtrArray **failures,
-                                        GError **error)
+/*
+ * update_from_file:
+ * @job: (nullable): The #IndexJob of an asynchronous update.
+ *
+ * The implementation of modulemd_module_index_update_from_file() and of its
+ * asynchronous variant.
+ */
+static gboolean
+update_from_file (ModulemdModuleIndex *self,
+                  const gchar *yaml_file,
+                  gboolean strict,
+                  IndexJob *job,
+                  GPtrArray **failures,
+                  GError **error)
 {
-  if (*failures == NULL)
-    {
-      *failures = g_ptr_array_new_full (0, g_object_unref);
-    }
-
-  g_return_val_if_fail (MODULEMD_IS_MODULE_INDEX (self), FALSE);
-
   int saved_errno;
   g_autoptr (FILE) yaml_stream = NULL;
   g_autoptr (GError) nested_error = NULL;
@@ -578,8 +1250,11 @@ modulemd_module_index_update_from_file (ModulemdModuleIndex *self,
        * use), just use the libyaml function. It's fast and will fail quickly
        * if the file is unreadable.
        */
-      return modulemd_module_index_update_from_stream (
-        self, yaml_stream, strict, failures, error);
+      MMD_INIT_YAML_PARSER (parser);
+      yaml_parser_set_input_file (&parser, yaml_stream);
+
+      return read_documents (
+        self, &parser, strict, FALSE, TRUE, NULL, NULL, job, failures, error);
     }
 
 #ifdef HAVE_RPMIO
@@ -634,8 +1309,11 @@ modulemd_module_index_update_from_file (ModulemdModuleIndex *self,
 
   g_debug ("rpmio::Fdopen (%p, %s) succeeded", fd_dup, fmode);
 
-  return modulemd_module_index_update_from_custom (
-    self, compressed_stream_read_fn, rpmio_fd, strict, failures, error);
+  MMD_INIT_YAML_PARSER (parser);
+  yaml_parser_set_input (&parser, compressed_stream_read_fn, rpmio_fd);
+
+  return read_documents (
+    self, &parser, strict, FALSE, TRUE, NULL, NULL, job, failures, error);
 
 #else /* HAVE_RPMIO */
   g_set_error_literal (
@@ -649,6 +1327,111 @@ modulemd_module_index_update_from_file (ModulemdModuleIndex *self,
 }
 
 
+gboolean
+modulemd_module_index_update_from_file (ModulemdModuleIndex *self,
+                                        const gchar *yaml_file,
+                                        gboolean strict,
+                                        GPtrArray **failures,
+                                        GError **error)
+{
+  if (*failures == NULL)
+    {
+      *failures = g_ptr_array_new_full (0, g_object_unref);
+    }
+
+  g_return_val_if_fail (MODULEMD_IS_MODULE_INDEX (self), FALSE);
+
+  return update_from_file (self, yaml_file, strict, NULL, failures, error);
+}
+
+
+static void
+update_from_file_thread (GTask *task,
+                         gpointer source_object,
+                         gpointer task_data,
+                         GCancellable *cancellable)
+{
+  ModulemdModuleIndex *self = MODULEMD_MODULE_INDEX (source_object);
+  IndexJob *job = task_data;
+  g_autoptr (GError) error = NULL;
+  gboolean ret;
+
+  job->failures = g_ptr_array_new_full (0, g_object_unref);
+
+  ret = update_from_file (
+    self, job->yaml_file, job->strict, job, &job->failures, &error);
+  if (error)
+    {
+      g_task_return_error (task, g_steal_pointer (&error));
+      return;
+    }
+
+  g_task_return_boolean (task, ret);
+}
+
+
+void
+modulemd_module_index_update_from_file_async (
+  ModulemdModuleIndex *self,
+  const gchar *yaml_file,
+  gboolean strict,
+  GCancellable *cancellable,
+  ModulemdIndexProgressFunc progress_callback,
+  gpointer progress_data,
+  GDestroyNotify progress_data_free,
+  GAsyncReadyCallback callback,
+  gpointer user_data)
+{
+  g_autoptr (GTask) task = NULL;
+  IndexJob *job = NULL;
+
+  g_return_if_fail (MODULEMD_IS_MODULE_INDEX (self));
+  g_return_if_fail (!self->frozen);
+  g_return_if_fail (yaml_file);
+
+  job = index_job_new (
+    yaml_file, progress_callback, progress_data, progress_data_free);
+  job->strict = strict;
+
+  task = g_task_new (self, cancellable, callback, user_data);
+  g_task_set_source_tag (task, modulemd_module_index_update_from_file_async);
+  g_task_set_task_data (task, job, (GDestroyNotify)index_job_free);
+  job->task = task;
+
+  g_task_run_in_thread (task, update_from_file_thread);
+}
+
+
+gboolean
+modulemd_module_index_update_from_file_finish (ModulemdModuleIndex *self,
+                                               GAsyncResult *result,
+                                               GPtrArray **failures,
+                                               GError **error)
+{
+  IndexJob *job = NULL;
+
+  if (*failures == NULL)
+    {
+      *failures = g_ptr_array_new_full (0, g_object_unref);
+    }
+
+  g_return_val_if_fail (g_task_is_valid (result, self), FALSE);
+  g_return_val_if_fail (
+    g_async_result_is_tagged (result,
+                              modulemd_module_index_update_from_file_async),
+    FALSE);
+
+  job = g_task_get_task_data (G_TASK (result));
+  for (guint i = 0; job->failures && i < job->failures->len; i++)
+    {
+      g_ptr_array_add (*failures,
+                       g_object_ref (g_ptr_array_index (job->failures, i)));
+    }
+
+  return g_task_propagate_boolean (G_TASK (result), error);
+}
+
+
 gboolean
 modulemd_module_index_update_from_string (ModulemdModuleIndex *self,
                                           const gchar *yaml_string,
@@ -735,6 +1518,198 @@ modulemd_module_index_update_from_custom (ModulemdModuleIndex *self,
 }
 
 
+/*
+ * DirectoryLoadSlot:
+ * @filepath: The file this slot was loaded from.
+ * @index: The #ModulemdModuleIndex read from @filepath. During the reduction
+ * phase, this accumulates the contents of the slots to its right.
+ * @error: Any error encountered while loading or merging this slot.
+ */
+typedef struct _DirectoryLoadSlot
+{
+  gchar *filepath;
+  ModulemdModuleIndex *index;
+  GError *error;
+} DirectoryLoadSlot;
+
+
+typedef struct _DirectoryLoadContext
+{
+  DirectoryLoadSlot *slots;
+  guint n_slots;
+
+  gboolean strict;
+  gboolean strict_default_streams;
+
+  /* Distance between the pairs of slots merged in the current reduction
+   * pass. Zero while the files are being read.
+   */
+  guint stride;
+} DirectoryLoadContext;
+
+
+static void
+directory_load_context_clear (DirectoryLoadContext *ctx)
+{
+  for (guint i = 0; i < ctx->n_slots; i++)
+    {
+      g_clear_pointer (&ctx->slots[i].filepath, g_free);
+      g_clear_object (&ctx->slots[i].index);
+      g_clear_error (&ctx->slots[i].error);
+    }
+  g_clear_pointer (&ctx->slots, g_free);
+  ctx->n_slots = 0;
+}
+
+
+static void
+load_directory_slot (gpointer data, gpointer user_data)
+{
+  DirectoryLoadContext *ctx = (DirectoryLoadContext *)user_data;
+  DirectoryLoadSlot *slot = &ctx->slots[GPOINTER_TO_UINT (data) - 1];
+  g_autoptr (GPtrArray) failures = NULL;
+  const GError *subdoc_error = NULL;
+
+  g_debug ("Reading modulemd from %s", slot->filepath);
+
+  slot->index = modulemd_module_index_new ();
+  if (!modulemd_module_index_update_from_file (
+        slot->index, slot->filepath, ctx->strict, &failures, &slot->error) &&
+      slot->error == NULL)
+    {
+      /* The file could be read, but one or more of its subdocuments was
+       * invalid. Report the first of them.
+       */
+      if (failures->len > 0)
+        {
+          subdoc_error = modulemd_subdocument_info_get_gerror (
+            g_ptr_array_index (failures, 0));
+        }
+
+      g_set_error (&slot->error,
+                   MODULEMD_ERROR,
+                   MODULEMD_ERROR_VALIDATE,
+                   "Could not read %s: %s",
+                   slot->filepath,
+                   subdoc_error ? subdoc_error->message : "unknown error");
+    }
+}
+
+
+static void
+merge_directory_slots (gpointer data, gpointer user_data)
+{
+  DirectoryLoadContext *ctx = (DirectoryLoadContext *)user_data;
+  guint i = GPOINTER_TO_UINT (data) - 1;
+  DirectoryLoadSlot *into = &ctx->slots[i];
+  DirectoryLoadSlot *from = &ctx->slots[i + ctx->stride];
+
+  /* Files later in the directory listing are merged into earlier ones, the
+   * same as if they had been merged one at a time in that order.
+   */
+  modulemd_module_index_merge (from->index,
+                               into->index,
+                               FALSE,
+                               ctx->strict_default_streams,
+                               &into->error);
+
+  modulemd_index_stats_accumulate (into->index->stats, from->index->stats);
+  g_clear_object (&from->index);
+}
+
+
+/*
+ * run_directory_pass:
+ * @ctx: The #DirectoryLoadContext to operate on.
+ * @func: The function to run for each slot. It is passed the slot's offset
+ * plus one (so that it is never NULL) and @ctx.
+ * @error: Error return value
+ *
+ * Runs @func on every slot that is the left-hand side of a pair @ctx->stride
+ * apart, or on every slot if @ctx->stride is zero, then waits for all of them
+ * to complete.
+ *
+ * Returns: TRUE if none of the slots reported an error. Otherwise, returns
+ * FALSE and sets @error to the error from the lowest-numbered failing slot.
+ */
+static gboolean
+run_directory_pass (DirectoryLoadContext *ctx, GFunc func, GError **error)
+{
+  GThreadPool *pool = NULL;
+  guint n_threads = g_get_num_processors ();
+  guint step = ctx->stride ? 2 * ctx->stride : 1;
+  guint i;
+
+  if (n_threads > 1 && ctx->n_slots > step)
+    {
+      /* If no pool can be created, just do the work on this thread */
+      pool = g_thread_pool_new (func, ctx, n_threads, FALSE, NULL);
+    }
+
+  for (i = 0; i + ctx->stride < ctx->n_slots; i += step)
+    {
+      if (pool)
+        {
+          g_thread_pool_push (pool, GUINT_TO_POINTER (i + 1), NULL);
+        }
+      else
+        {
+          func (GUINT_TO_POINTER (i + 1), ctx);
+        }
+    }
+
+  if (pool)
+    {
+      /* Wait for all of the queued work to complete */
+      g_thread_pool_free (pool, FALSE, TRUE);
+    }
+
+  for (i = 0; i < ctx->n_slots; i++)
+    {
+      if (ctx->slots[i].error)
+        {
+          g_propagate_error (error, g_steal_pointer (&ctx->slots[i].error));
+          return FALSE;
+        }
+    }
+
+  return TRUE;
+}
+
+
+GPtrArray *
+modulemd_module_index_read_files (GPtrArray *filepaths,
+                                  gboolean strict,
+                                  GError **error)
+{
+  DirectoryLoadContext ctx = { NULL, 0, strict, strict, 0 };
+  g_autoptr (GPtrArray) indexes = NULL;
+  guint i;
+
+  ctx.n_slots = filepaths->len;
+  ctx.slots = g_new0 (DirectoryLoadSlot, ctx.n_slots);
+  for (i = 0; i < ctx.n_slots; i++)
+    {
+      ctx.slots[i].filepath = g_strdup (g_ptr_array_index (filepaths, i));
+    }
+
+  if (!run_directory_pass (&ctx, load_directory_slot, error))
+    {
+      directory_load_context_clear (&ctx);
+      return NULL;
+    }
+
+  indexes = g_ptr_array_new_full (ctx.n_slots, g_object_unref);
+  for (i = 0; i < ctx.n_slots; i++)
+    {
+      g_ptr_array_add (indexes, g_steal_pointer (&ctx.slots[i].index));
+    }
+
+  directory_load_context_clear (&ctx);
+  return g_steal_pointer (&indexes);
+}
+
+
 /*
  * modules_from_directory:
  * @path: A directory containing one or more modulemd YAML documents
@@ -743,6 +1718,10 @@ modulemd_module_index_update_from_custom (ModulemdModuleIndex *self,
  * @strict: Whether to fail on unknown fields
  * @strict_default_streams: Whether to fail on default stream merges.
  * @error: Error return value
+ *
+ * Each file is read into its own intermediate #ModulemdModuleIndex on a pool
+ * of worker threads. The results are then combined pairwise, in filename
+ * order, until only one remains.
  */
 static ModulemdModuleIndex *
 modules_from_directory (const gchar *path,
@@ -753,52 +1732,71 @@ modules_from_directory (const gchar *path,
 {
   const gchar *filename = NULL;
   g_autoptr (GDir) dir = NULL;
-  g_autofree gchar *filepath = NULL;
+  g_autoptr (GPtrArray) filepaths = NULL;
+  g_autoptr (GPtrArray) indexes = NULL;
   g_autoptr (ModulemdModuleIndex) index = NULL;
-  g_autoptr (ModulemdModuleIndex) intermediate = NULL;
-  g_autoptr (GPtrArray) failures = NULL;
   g_autoptr (GError) nested_error = NULL;
-
-  index = modulemd_module_index_new ();
+  DirectoryLoadContext ctx = { NULL, 0, strict, strict_default_streams, 0 };
+  gboolean ret = TRUE;
+  guint i;
 
   /* Open the directory */
   dir = g_dir_open (path, 0, &nested_error);
   if (!dir)
     {
       g_propagate_error (error, g_steal_pointer (&nested_error));
-      return FALSE;
+      return NULL;
     }
 
+  filepaths = g_ptr_array_new_with_free_func (g_free);
   while ((filename = g_dir_read_name (dir)) != NULL)
     {
       if (g_str_has_suffix (filename, file_suffix))
         {
-          intermediate = modulemd_module_index_new ();
+          g_ptr_array_add (filepaths,
+                           g_build_path ("/", path, filename, NULL));
+        }
+    }
 
-          filepath = g_build_path ("/", path, filename, NULL);
-          g_debug ("Reading modulemd from %s", filepath);
-          if (!modulemd_module_index_update_from_file (
-                intermediate, filepath, strict, &failures, error))
-            {
-              return FALSE;
-            }
+  /* The directory listing order is arbitrary. Sort it so that the merge
+   * order (and therefore any conflict reported) is reproducible.
+   */
+  g_ptr_array_sort (filepaths, modulemd_strcmp_sort);
 
-          if (!modulemd_module_index_merge (intermediate,
-                                            index,
-                                            FALSE,
-                                            strict_default_streams,
-                                            &nested_error))
-            {
-              g_propagate_error (error, g_steal_pointer (&nested_error));
-              return FALSE;
-            }
+  if (filepaths->len == 0)
+    {
+      return modulemd_module_index_new ();
+    }
 
-          g_clear_pointer (&failures, g_ptr_array_unref);
-          g_clear_pointer (&filepath, g_free);
-          g_clear_object (&intermediate);
-        }
+  indexes = modulemd_module_index_read_files (filepaths, strict, error);
+  if (!indexes)
+    {
+      return NULL;
+    }
+
+  ctx.n_slots = indexes->len;
+  ctx.slots = g_new0 (DirectoryLoadSlot, ctx.n_slots);
+  for (i = 0; i < ctx.n_slots; i++)
+    {
+      ctx.slots[i].index = g_object_ref (g_ptr_array_index (indexes, i));
+    }
+  g_clear_pointer (&indexes, g_ptr_array_unref);
+
+  /* Tree reduction: merge each slot into its neighbour @stride to the left,
+   * doubling the stride each pass. Merges within a pass touch disjoint
+   * indexes, so they can run concurrently.
+   */
+  for (ctx.stride = 1; ret && ctx.stride < ctx.n_slots; ctx.stride *= 2)
+    {
+      ret = run_directory_pass (&ctx, merge_directory_slots, error);
+    }
+
+  if (ret)
+    {
+      index = g_steal_pointer (&ctx.slots[0].index);
     }
 
+  directory_load_context_clear (&ctx);
   return g_steal_pointer (&index);
 }
 
@@ -815,6 +1813,9 @@ modulemd_module_index_update_from_defaults_directory (
   g_autoptr (ModulemdModuleIndex) override_idx = NULL;
   g_autoptr (GError) nested_error = NULL;
 
+  g_return_val_if_fail (MODULEMD_IS_MODULE_INDEX (self), FALSE);
+  g_return_val_if_fail (!self->frozen, FALSE);
+
   /* Read the regular path first */
   defaults_idx = modules_from_directory (
     path, MMD_YAML_SUFFIX, strict, strict, &nested_error);
@@ -841,6 +1842,9 @@ modulemd_module_index_update_from_defaults_directory (
           g_propagate_error (error, g_steal_pointer (&nested_error));
           return FALSE;
         }
+
+      modulemd_index_stats_accumulate (defaults_idx->stats,
+                                       override_idx->stats);
     }
 
   /* Now that we've verified that the content in the two paths is compatible,
@@ -853,6 +1857,7 @@ modulemd_module_index_update_from_defaults_directory (
       return FALSE;
     }
 
+  modulemd_index_stats_accumulate (self->stats, defaults_idx->stats);
 
   return TRUE;
 }
@@ -861,13 +1866,24 @@ modulemd_module_index_update_from_defaults_directory (
 gchar *
 modulemd_module_index_dump_to_string (ModulemdModuleIndex *self,
                                       GError **error)
+{
+  return modulemd_module_index_dump_to_string_ext (
+    self, MODULEMD_DUMP_FLAG_NONE, error);
+}
+
+
+gchar *
+modulemd_module_index_dump_to_string_ext (ModulemdModuleIndex *self,
+                                          ModulemdDumpFlags flags,
+                                          GError **error)
 {
   g_return_val_if_fail (MODULEMD_IS_MODULE_INDEX (self), NULL);
 
   MMD_INIT_YAML_EMITTER (emitter);
   MMD_INIT_YAML_STRING (&emitter, yaml_string);
 
-  if (!modulemd_module_index_dump_to_emitter (self, &emitter, error))
+  if (!modulemd_module_index_dump_to_emitter (
+        self, &emitter, flags, NULL, NULL, error))
     {
       return NULL;
     }
@@ -876,17 +1892,151 @@ modulemd_module_index_dump_to_string (ModulemdModuleIndex *self,
 }
 
 
+static gboolean
+append_json_node (yaml_parser_t *parser,
+                  yaml_event_t *start,
+                  GString *json,
+                  GError **error)
+{
+  MMD_INIT_YAML_EVENT (event);
+  gboolean is_mapping = start->type == YAML_MAPPING_START_EVENT;
+  guint n_children = 0;
+
+  switch (start->type)
+    {
+    case YAML_SCALAR_EVENT:
+      modulemd_append_json_string (json,
+                                   (const gchar *)start->data.scalar.value);
+      return TRUE;
+
+    case YAML_MAPPING_START_EVENT: g_string_append_c (json, '{'); break;
+
+    case YAML_SEQUENCE_START_EVENT: g_string_append_c (json, '['); break;
+
+    default:
+      g_set_error (error,
+                   MODULEMD_YAML_ERROR,
+                   MODULEMD_YAML_ERROR_PARSE,
+                   "Unexpected YAML event in index output: %s",
+                   mmd_yaml_get_event_name (start->type));
+      return FALSE;
+    }
+
+  while (TRUE)
+    {
+      YAML_PARSER_PARSE_WITH_EXIT_BOOL (parser, &event, error);
+      if (event.type == YAML_MAPPING_END_EVENT ||
+          event.type == YAML_SEQUENCE_END_EVENT)
+        {
+          break;
+        }
+
+      /* Mapping keys and values alternate */
+      if (n_children > 0)
+        {
+          g_string_append (json,
+                           is_mapping && n_children % 2 == 1 ? ": " : ", ");
+        }
+      n_children++;
+
+      if (!append_json_node (parser, &event, json, error))
+        {
+          return FALSE;
+        }
+      yaml_event_delete (&event);
+    }
+
+  g_string_append_c (json, is_mapping ? '}' : ']');
+  return TRUE;
+}
+
+
+gchar *
+modulemd_module_index_dump_to_json (ModulemdModuleIndex *self,
+                                    ModulemdDumpFlags flags,
+                                    GError **error)
+{
+  MMD_INIT_YAML_PARSER (parser);
+  MMD_INIT_YAML_EVENT (event);
+  g_autofree gchar *yaml = NULL;
+  g_autoptr (GString) json = NULL;
+  gboolean first = TRUE;
+  gboolean done = FALSE;
+
+  g_return_val_if_fail (MODULEMD_IS_MODULE_INDEX (self), NULL);
+
+  /* Reuse the YAML emitters so that the layout of the output always matches
+   * the specification, then translate the events into JSON.
+   */
+  yaml = modulemd_module_index_dump_to_string_ext (self, flags, error);
+  if (yaml == NULL)
+    {
+      return NULL;
+    }
+
+  yaml_parser_set_input_string (
+    &parser, (const unsigned char *)yaml, strlen (yaml));
+  json = g_string_sized_new (strlen (yaml));
+  g_string_append_c (json, '[');
+
+  while (!done)
+    {
+      YAML_PARSER_PARSE_WITH_EXIT (&parser, &event, error);
+
+      switch (event.type)
+        {
+        case YAML_MAPPING_START_EVENT:
+          if (!first)
+            {
+              g_string_append (json, ", ");
+            }
+          first = FALSE;
+
+          if (!append_json_node (&parser, &event, json, error))
+            {
+              return NULL;
+            }
+          break;
+
+        case YAML_STREAM_END_EVENT: done = TRUE; break;
+
+        default:
+          /* Stream and document boundaries */
+          break;
+        }
+
+      yaml_event_delete (&event);
+    }
+
+  g_string_append_c (json, ']');
+
+  return g_string_free (g_steal_pointer (&json), FALSE);
+}
+
+
 gboolean
 modulemd_module_index_dump_to_stream (ModulemdModuleIndex *self,
                                       FILE *yaml_stream,
                                       GError **error)
+{
+  return modulemd_module_index_dump_to_stream_ext (
+    self, yaml_stream, MODULEMD_DUMP_FLAG_NONE, error);
+}
+
+
+gboolean
+modulemd_module_index_dump_to_stream_ext (ModulemdModuleIndex *self,
+                                          FILE *yaml_stream,
+                                          ModulemdDumpFlags flags,
+                                          GError **error)
 {
   g_return_val_if_fail (MODULEMD_IS_MODULE_INDEX (self), FALSE);
 
   MMD_INIT_YAML_EMITTER (emitter);
   yaml_emitter_set_output_file (&emitter, yaml_stream);
 
-  return modulemd_module_index_dump_to_emitter (self, &emitter, error);
+  return modulemd_module_index_dump_to_emitter (
+    self, &emitter, flags, NULL, NULL, error);
 }
 
 
@@ -896,12 +2046,283 @@ modulemd_module_index_dump_to_custom (ModulemdModuleIndex *self,
                                       void *custom_pvt_data,
                                       GError **error)
 {
+  return modulemd_module_index_dump_to_custom_ext (
+    self, custom_write_fn, custom_pvt_data, MODULEMD_DUMP_FLAG_NONE, error);
+}
+
+
+gboolean
+modulemd_module_index_dump_to_custom_ext (ModulemdModuleIndex *self,
+                                          ModulemdWriteHandler custom_write_fn,
+                                          void *custom_pvt_data,
+                                          ModulemdDumpFlags flags,
+                                          GError **error)
+{
+  g_return_val_if_fail (MODULEMD_IS_MODULE_INDEX (self), FALSE);
+
+  MMD_INIT_YAML_EMITTER (emitter);
+  yaml_emitter_set_output (&emitter, custom_write_fn, custom_pvt_data);
+
+  return modulemd_module_index_dump_to_emitter (
+    self, &emitter, flags, NULL, NULL, error);
+}
+
+
+static int
+index_job_write (void *data, unsigned char *buffer, size_t size)
+{
+  IndexJob *job = data;
+
+  if (fwrite (buffer, 1, size, job->yaml_stream) != size)
+    {
+      return 0;
+    }
+
+  job->bytes_written += size;
+  return 1;
+}
+
+
+/*
+ * resolve_symlinks:
+ *
+ * Returns: (transfer full): The path that @path refers to once every
+ * symbolic link in its last component has been followed, even if the final
+ * target does not exist yet. @path itself is returned if it is not a link.
+ */
+static gchar *
+resolve_symlinks (const gchar *path)
+{
+  g_autofree gchar *resolved = g_strdup (path);
+  g_autofree gchar *link_target = NULL;
+  g_autofree gchar *dirname = NULL;
+
+  /* Stop after as many links as Linux follows, in case of a loop */
+  for (guint i = 0; i < 40; i++)
+    {
+      link_target = g_file_read_link (resolved, NULL);
+      if (link_target == NULL)
+        {
+          break;
+        }
+
+      if (!g_path_is_absolute (link_target))
+        {
+          dirname = g_path_get_dirname (resolved);
+          g_free (resolved);
+          resolved = g_build_filename (dirname, link_target, NULL);
+          g_clear_pointer (&dirname, g_free);
+          g_clear_pointer (&link_target, g_free);
+        }
+      else
+        {
+          g_free (resolved);
+          resolved = g_steal_pointer (&link_target);
+        }
+    }
+
+  return g_steal_pointer (&resolved);
+}
+
+
+static void
+dump_to_file_thread (GTask *task,
+                     gpointer source_object,
+                     gpointer task_data,
+                     GCancellable *cancellable)
+{
+  ModulemdModuleIndex *self = MODULEMD_MODULE_INDEX (source_object);
+  IndexJob *job = task_data;
+  g_autoptr (GError) error = NULL;
+  g_autofree gchar *target = NULL;
+  g_autofree gchar *tmp_file = NULL;
+  GStatBuf statbuf;
+  int saved_errno;
+  int fd;
+  gboolean ret;
+
+  /* Write to a temporary file next to the target and only move it into
+   * place once everything was written, so that a failed or cancelled dump
+   * leaves an existing file alone. If @yaml_file is a symbolic link, the
+   * file it points to is replaced and the link is kept.
+   */
+  target = resolve_symlinks (job->yaml_file);
+  tmp_file = g_strdup_printf ("%s.XXXXXX", target);
+  fd = g_mkstemp_full (tmp_file, O_WRONLY | O_CLOEXEC, 0666);
+  saved_errno = errno;
+
+  if (fd >= 0 && g_stat (target, &statbuf) == 0)
+    {
+      /* Keep the owner and permissions of the file being replaced, as far as
+       * we are allowed to. Only root can give a file away, so a failure to
+       * change the owner is not an error. The owner is set first, since
+       * changing it clears the set-user-ID and set-group-ID bits.
+       */
+      if (fchown (fd, statbuf.st_uid, statbuf.st_gid) != 0)
+        {
+          g_debug (
+            "Could not keep the owner of %s: %s", target, g_strerror (errno));
+        }
+      if (fchmod (fd, statbuf.st_mode & 07777) != 0)
+        {
+          saved_errno = errno;
+          g_close (fd, NULL);
+          g_unlink (tmp_file);
+          fd = -1;
+        }
+    }
+
+  if (fd >= 0)
+    {
+      job->yaml_stream = fdopen (fd, "w");
+      saved_errno = errno;
+      if (job->yaml_stream == NULL)
+        {
+          g_close (fd, NULL);
+          g_unlink (tmp_file);
+        }
+    }
+
+  if (job->yaml_stream == NULL)
+    {
+      g_task_return_new_error (task,
+                               MODULEMD_ERROR,
+                               MODULEMD_YAML_ERROR_OPEN,
+                               "Failed to open file: %s",
+                               g_strerror (saved_errno));
+      return;
+    }
+
+  MMD_INIT_YAML_EMITTER (emitter);
+  yaml_emitter_set_output (&emitter, index_job_write, job);
+
+  ret = modulemd_module_index_dump_to_emitter (
+    self, &emitter, job->flags, NULL, job, &error);
+
+  if (fclose (job->yaml_stream) != 0 && ret)
+    {
+      saved_errno = errno;
+      g_set_error (&error,
+                   MODULEMD_ERROR,
+                   MODULEMD_ERROR_FILE_ACCESS,
+                   "Failed to write file: %s",
+                   g_strerror (saved_errno));
+      ret = FALSE;
+    }
+  job->yaml_stream = NULL;
+
+  if (ret && g_rename (tmp_file, target) != 0)
+    {
+      saved_errno = errno;
+      g_set_error (&error,
+                   MODULEMD_ERROR,
+                   MODULEMD_ERROR_FILE_ACCESS,
+                   "Failed to replace file: %s",
+                   g_strerror (saved_errno));
+      ret = FALSE;
+    }
+
+  if (!ret)
+    {
+      g_unlink (tmp_file);
+      g_task_return_error (task, g_steal_pointer (&error));
+      return;
+    }
+
+  g_task_return_boolean (task, TRUE);
+}
+
+
+void
+modulemd_module_index_dump_to_file_async (
+  ModulemdModuleIndex *self,
+  const gchar *yaml_file,
+  ModulemdDumpFlags flags,
+  GCancellable *cancellable,
+  ModulemdIndexProgressFunc progress_callback,
+  gpointer progress_data,
+  GDestroyNotify progress_data_free,
+  GAsyncReadyCallback callback,
+  gpointer user_data)
+{
+  g_autoptr (GTask) task = NULL;
+  IndexJob *job = NULL;
+
+  g_return_if_fail (MODULEMD_IS_MODULE_INDEX (self));
+  g_return_if_fail (yaml_file);
+
+  job = index_job_new (
+    yaml_file, progress_callback, progress_data, progress_data_free);
+  job->flags = flags;
+
+  task = g_task_new (self, cancellable, callback, user_data);
+  g_task_set_source_tag (task, modulemd_module_index_dump_to_file_async);
+  g_task_set_task_data (task, job, (GDestroyNotify)index_job_free);
+  job->task = task;
+
+  g_task_run_in_thread (task, dump_to_file_thread);
+}
+
+
+gboolean
+modulemd_module_index_dump_to_file_finish (ModulemdModuleIndex *self,
+                                           GAsyncResult *result,
+                                           GError **error)
+{
+  g_return_val_if_fail (g_task_is_valid (result, self), FALSE);
+  g_return_val_if_fail (g_async_result_is_tagged (
+                          result, modulemd_module_index_dump_to_file_async),
+                        FALSE);
+
+  return g_task_propagate_boolean (G_TASK (result), error);
+}
+
+
+gchar *
+modulemd_module_index_dump_to_string_filtered (ModulemdModuleIndex *self,
+                                               const gchar *module_name,
+                                               const gchar *stream_name,
+                                               const gchar *arch,
+                                               ModulemdDumpFlags flags,
+                                               GError **error)
+{
+  DumpFilter filter = { module_name, stream_name, arch };
+
+  g_return_val_if_fail (MODULEMD_IS_MODULE_INDEX (self), NULL);
+
+  MMD_INIT_YAML_EMITTER (emitter);
+  MMD_INIT_YAML_STRING (&emitter, yaml_string);
+
+  if (!modulemd_module_index_dump_to_emitter (
+        self, &emitter, flags, &filter, NULL, error))
+    {
+      return NULL;
+    }
+
+  return g_steal_pointer (&yaml_string->str);
+}
+
+
+gboolean
+modulemd_module_index_dump_to_custom_filtered (
+  ModulemdModuleIndex *self,
+  ModulemdWriteHandler custom_write_fn,
+  void *custom_pvt_data,
+  const gchar *module_name,
+  const gchar *stream_name,
+  const gchar *arch,
+  ModulemdDumpFlags flags,
+  GError **error)
+{
+  DumpFilter filter = { module_name, stream_name, arch };
+
   g_return_val_if_fail (MODULEMD_IS_MODULE_INDEX (self), FALSE);
 
   MMD_INIT_YAML_EMITTER (emitter);
   yaml_emitter_set_output (&emitter, custom_write_fn, custom_pvt_data);
 
-  return modulemd_module_index_dump_to_emitter (self, &emitter, error);
+  return modulemd_module_index_dump_to_emitter (
+    self, &emitter, flags, &filter, NULL, error);
 }
 
 
@@ -910,7 +2331,7 @@ modulemd_module_index_get_module_names_as_strv (ModulemdModuleIndex *self)
 {
   g_return_val_if_fail (MODULEMD_IS_MODULE_INDEX (self), NULL);
 
-  return modulemd_ordered_str_keys_as_strv (self->modules);
+  return modulemd_ordered_keys_as_strv (&self->module_names, self->modules);
 }
 
 
@@ -929,8 +2350,15 @@ modulemd_module_index_remove_module (ModulemdModuleIndex *self,
                                      const gchar *module_name)
 {
   g_return_val_if_fail (MODULEMD_IS_MODULE_INDEX (self), FALSE);
+  g_return_val_if_fail (!self->frozen, FALSE);
+
+  if (!g_hash_table_remove (self->modules, module_name))
+    {
+      return FALSE;
+    }
 
-  return g_hash_table_remove (self->modules, module_name);
+  modulemd_ordered_keys_invalidate (&self->module_names);
+  return TRUE;
 }
 
 
@@ -941,7 +2369,10 @@ modulemd_module_index_add_module_stream (ModulemdModuleIndex *self,
 {
   g_autoptr (GError) nested_error = NULL;
   ModulemdModuleStreamVersionEnum mdversion = MD_MODULESTREAM_VERSION_UNSET;
+  ModulemdModule *module = NULL;
+  guint n_streams;
   g_return_val_if_fail (MODULEMD_IS_MODULE_INDEX (self), FALSE);
+  g_return_val_if_fail (!self->frozen, FALSE);
 
   if (!modulemd_module_stream_get_module_name (stream) ||
       !modulemd_module_stream_get_stream_name (stream))
@@ -954,12 +2385,12 @@ modulemd_module_index_add_module_stream (ModulemdModuleIndex *self,
       return FALSE;
     }
 
+  module = get_or_create_module (
+    self, modulemd_module_stream_get_module_name (stream));
+  n_streams = modulemd_module_get_all_streams (module)->len;
+
   mdversion = modulemd_module_add_stream (
-    get_or_create_module (self,
-                          modulemd_module_stream_get_module_name (stream)),
-    stream,
-    self->stream_mdversion,
-    &nested_error);
+    module, stream, self->stream_mdversion, &nested_error);
 
   if (mdversion == MD_MODULESTREAM_VERSION_ERROR)
     {
@@ -967,7 +2398,28 @@ modulemd_module_index_add_module_stream (ModulemdModuleIndex *self,
       return FALSE;
     }
 
-  if (mdversion > self->stream_mdversion)
+  /* An identical stream with the same NSVCA is replaced rather than added */
+  if (modulemd_module_get_all_streams (module)->len == n_streams)
+    {
+      modulemd_index_stats_add_deduplicated (self->stats);
+    }
+
+  if (modulemd_module_stream_get_mdversion (stream) < self->stream_mdversion)
+    {
+      modulemd_index_stats_add_upgrades (self->stats, 1);
+    }
+
+  if (mdversion > self->stream_mdversion && self->defer_upgrades)
+    {
+      /* Later streams are upgraded as they are added, and the ones already
+       * seen are upgraded when read_documents() is done.
+       */
+      g_debug ("Deferring the upgrade of all streams to version %i",
+               mdversion);
+      self->stream_mdversion = mdversion;
+      self->upgrade_pending = TRUE;
+    }
+  else if (mdversion > self->stream_mdversion)
     {
       /* Upgrade any streams we've already seen to this version */
       g_debug ("Upgrading all streams to version %i", mdversion);
@@ -994,6 +2446,12 @@ modulemd_module_index_upgrade_streams (
   gpointer value;
   g_autoptr (ModulemdModule) module = NULL;
   g_autoptr (GError) nested_error = NULL;
+  GPtrArray *streams = NULL;
+  guint upgrades = 0;
+  guint module_upgrades;
+
+  g_return_val_if_fail (MODULEMD_IS_MODULE_INDEX (self), FALSE);
+  g_return_val_if_fail (!self->frozen, FALSE);
 
   if (mdversion < self->stream_mdversion)
     {
@@ -1018,7 +2476,26 @@ modulemd_module_index_upgrade_streams (
           continue;
         }
 
-      if (!modulemd_module_upgrade_streams (module, mdversion, &nested_error))
+      streams = modulemd_module_get_all_streams (module);
+      module_upgrades = 0;
+      for (guint i = 0; i < streams->len; i++)
+        {
+          if (modulemd_module_stream_get_mdversion (
+                g_ptr_array_index (streams, i)) < mdversion)
+            {
+              module_upgrades++;
+            }
+        }
+
+      /* Leave the stream list of an up-to-date module alone */
+      if (module_upgrades == 0)
+        {
+          g_clear_object (&module);
+          continue;
+        }
+      upgrades += module_upgrades;
+
+      if (!modulemd_module_upgrade_streams (module, mdversion, &nested_error))
         {
           g_propagate_prefixed_error (
             error,
@@ -1031,6 +2508,7 @@ modulemd_module_index_upgrade_streams (
       g_clear_object (&module);
     }
 
+  modulemd_index_stats_add_upgrades (self->stats, upgrades);
   self->stream_mdversion = mdversion;
 
   return TRUE;
@@ -1046,6 +2524,12 @@ modulemd_module_index_add_defaults (ModulemdModuleIndex *self,
   ModulemdDefaultsVersionEnum mdversion = MD_DEFAULTS_VERSION_UNSET;
 
   g_return_val_if_fail (MODULEMD_IS_MODULE_INDEX (self), FALSE);
+  g_return_val_if_fail (!self->frozen, FALSE);
+
+  if (modulemd_defaults_get_mdversion (defaults) < self->defaults_mdversion)
+    {
+      modulemd_index_stats_add_upgrades (self->stats, 1);
+    }
 
   mdversion = modulemd_module_set_defaults (
     get_or_create_module (self, modulemd_defaults_get_module_name (defaults)),
@@ -1134,6 +2618,10 @@ modulemd_module_index_upgrade_defaults (ModulemdModuleIndex *self,
   g_autoptr (ModulemdDefaults) defaults = NULL;
   ModulemdDefaultsVersionEnum returned_mdversion = MD_DEFAULTS_VERSION_UNSET;
   g_autoptr (GError) nested_error = NULL;
+  guint upgrades = 0;
+
+  g_return_val_if_fail (MODULEMD_IS_MODULE_INDEX (self), FALSE);
+  g_return_val_if_fail (!self->frozen, FALSE);
 
   if (mdversion < self->defaults_mdversion)
     {
@@ -1171,6 +2659,11 @@ modulemd_module_index_upgrade_defaults (ModulemdModuleIndex *self,
 
       g_object_ref (defaults);
 
+      if (modulemd_defaults_get_mdversion (defaults) < mdversion)
+        {
+          upgrades++;
+        }
+
       returned_mdversion = modulemd_module_set_defaults (
         module, defaults, self->defaults_mdversion, &nested_error);
       if (returned_mdversion != mdversion)
@@ -1185,6 +2678,7 @@ modulemd_module_index_upgrade_defaults (ModulemdModuleIndex *self,
       g_clear_object (&module);
     }
 
+  modulemd_index_stats_add_upgrades (self->stats, upgrades);
   self->defaults_mdversion = mdversion;
 
   return TRUE;
@@ -1197,6 +2691,7 @@ modulemd_module_index_add_translation (ModulemdModuleIndex *self,
                                        GError **error)
 {
   g_return_val_if_fail (MODULEMD_IS_MODULE_INDEX (self), FALSE);
+  g_return_val_if_fail (!self->frozen, FALSE);
 
   modulemd_module_add_translation (
     get_or_create_module (self,
@@ -1207,23 +2702,17 @@ modulemd_module_index_add_translation (ModulemdModuleIndex *self,
 
 
 gboolean
-modulemd_module_index_merge (ModulemdModuleIndex *from,
-                             ModulemdModuleIndex *into,
-                             gboolean override,
-                             gboolean strict_default_streams,
-                             GError **error)
+modulemd_module_index_merge_module (ModulemdModule *module,
+                                    ModulemdModuleIndex *into,
+                                    gboolean override,
+                                    gboolean strict_default_streams,
+                                    GError **error)
 {
-  MODULEMD_INIT_TRACE ();
-  GHashTableIter iter;
-  gpointer key;
-  gpointer value;
-  const gchar *module_name = NULL;
+  const gchar *module_name = modulemd_module_get_module_name (module);
   const gchar *trans_stream = NULL;
-  ModulemdModule *module = NULL;
   ModulemdModule *into_module = NULL;
   GPtrArray *streams = NULL;
   ModulemdModuleStream *stream = NULL;
-  g_autoptr (GPtrArray) translations = NULL;
   ModulemdTranslation *translation = NULL;
   ModulemdTranslation *current_translation = NULL;
   ModulemdDefaults *defaults = NULL;
@@ -1234,128 +2723,777 @@ modulemd_module_index_merge (ModulemdModuleIndex *from,
   g_autoptr (GPtrArray) translated_stream_names = NULL;
   gchar *translated_stream_name = NULL;
 
+  g_debug ("Merging module %s", module_name);
 
-  /* Loop through each module in the Index */
-  g_hash_table_iter_init (&iter, from->modules);
-  while (g_hash_table_iter_next (&iter, &key, &value))
+  into_module = get_or_create_module (into, module_name);
+
+  /* Copy all module streams for this module
+   * The module streams have "version" and "context" to disambiguate them,
+   * so we have documented that if there are two modules with differing
+   * content and the same NSVC, the operation is undefined.
+   * As such, we'll just assume it's safe to add every stream. If there are
+   * duplicates, they'll be deduplicated by replacing the previously-
+   * existing entry.
+   */
+  g_debug ("Prioritizer: merging streams for %s", module_name);
+  streams = modulemd_module_get_all_streams (module);
+  for (i = 0; i < streams->len; i++)
     {
-      module_name = (const gchar *)key;
-      g_debug ("Merging module %s", module_name);
+      stream = g_ptr_array_index (streams, i);
+
+      if (!modulemd_module_index_add_module_stream (
+            into, stream, &nested_error))
+        {
+          g_propagate_error (error, g_steal_pointer (&nested_error));
+          return FALSE;
+        }
+    }
 
-      module = MODULEMD_MODULE (value);
-      into_module = get_or_create_module (into, module_name);
 
-      /* Copy all module streams for this module
-       * The module streams have "version" and "context" to disambiguate them,
-       * so we have documented that if there are two modules with differing
-       * content and the same NSVC, the operation is undefined.
-       * As such, we'll just assume it's safe to add every stream. If there are
-       * duplicates, they'll be deduplicated by replacing the previously-
-       * existing entry.
+  /* Merge any defaults entry for this module */
+  g_debug ("Prioritizer: merging defaults for %s", module_name);
+  defaults = modulemd_module_get_defaults (module);
+  into_defaults = modulemd_module_get_defaults (into_module);
+  if (override && defaults)
+    {
+      /* If we've been told to override (we're at a higher priority level),
+       * then just replace the current defaults with the new one
        */
-      g_debug ("Prioritizer: merging streams for %s", module_name);
-      streams = modulemd_module_get_all_streams (module);
-      for (i = 0; i < streams->len; i++)
+      if (!modulemd_module_index_add_defaults (into, defaults, &nested_error))
         {
-          stream = g_ptr_array_index (streams, i);
-
-          if (!modulemd_module_index_add_module_stream (
-                into, stream, &nested_error))
-            {
-              g_propagate_error (error, g_steal_pointer (&nested_error));
-              return FALSE;
-            }
+          g_propagate_error (error, g_steal_pointer (&nested_error));
+          return FALSE;
+        }
+    }
+  else if (!defaults)
+    {
+      /* No defaults to merge in right now, just continue */
+    }
+  else if (defaults && !into_defaults)
+    {
+      /* There are no defaults on the target module yet. Copy these */
+      if (!modulemd_module_index_add_defaults (into, defaults, &nested_error))
+        {
+          g_propagate_error (error, g_steal_pointer (&nested_error));
+          return FALSE;
+        }
+    }
+  else
+    {
+      merged_defaults = modulemd_defaults_merge (
+        defaults, into_defaults, strict_default_streams, &nested_error);
+      if (!merged_defaults)
+        {
+          g_propagate_error (error, g_steal_pointer (&nested_error));
+          return FALSE;
         }
 
+      /* Add the new, merged defaults to the index */
+      if (!modulemd_module_index_add_defaults (
+            into, merged_defaults, &nested_error))
+        {
+          g_propagate_error (error, g_steal_pointer (&nested_error));
+          return FALSE;
+        }
+      g_clear_object (&merged_defaults);
+    }
 
-      /* Merge any defaults entry for this module */
-      g_debug ("Prioritizer: merging defaults for %s", module_name);
-      defaults = modulemd_module_get_defaults (module);
-      into_defaults = modulemd_module_get_defaults (into_module);
-      if (override && defaults)
+  /* Merge translations for this module */
+  g_debug ("Prioritizer: merging translations for %s", module_name);
+  translated_stream_names = modulemd_module_get_translated_streams (module);
+  for (i = 0; i < translated_stream_names->len; i++)
+    {
+      translated_stream_name = g_ptr_array_index (translated_stream_names, i);
+      translation =
+        modulemd_module_get_translation (module, translated_stream_name);
+      trans_stream = modulemd_translation_get_module_stream (translation);
+      current_translation =
+        modulemd_module_get_translation (into_module, trans_stream);
+
+      if (!current_translation ||
+          modulemd_translation_get_modified (translation) >
+            modulemd_translation_get_modified (current_translation))
         {
-          /* If we've been told to override (we're at a higher priority level),
-           * then just replace the current defaults with the new one
+          /* There was no translation for this stream name or we just found
+           * a newer version of it, so set it on the index.
            */
-          if (!modulemd_module_index_add_defaults (
-                into, defaults, &nested_error))
+          if (!modulemd_module_index_add_translation (
+                into, translation, &nested_error))
             {
               g_propagate_error (error, g_steal_pointer (&nested_error));
               return FALSE;
             }
         }
-      else if (!defaults)
+    }
+  g_clear_pointer (&translated_stream_names, g_ptr_array_unref);
+
+  g_debug ("Prioritizer: all documents merged for %s", module_name);
+  return TRUE;
+}
+
+
+gboolean
+modulemd_module_index_merge (ModulemdModuleIndex *from,
+                             ModulemdModuleIndex *into,
+                             gboolean override,
+                             gboolean strict_default_streams,
+                             GError **error)
+{
+  MODULEMD_INIT_TRACE ();
+  GHashTableIter iter;
+  gpointer value;
+  g_autoptr (GError) nested_error = NULL;
+  gint64 start_time = g_get_monotonic_time ();
+
+  g_return_val_if_fail (!into->frozen, FALSE);
+
+  /* Loop through each module in the Index */
+  g_hash_table_iter_init (&iter, from->modules);
+  while (g_hash_table_iter_next (&iter, NULL, &value))
+    {
+      if (!modulemd_module_index_merge_module (MODULEMD_MODULE (value),
+                                               into,
+                                               override,
+                                               strict_default_streams,
+                                               &nested_error))
         {
-          /* No defaults to merge in right now, just continue */
+          g_propagate_error (error, g_steal_pointer (&nested_error));
+          return FALSE;
         }
-      else if (defaults && !into_defaults)
+    }
+
+  modulemd_index_stats_add_phase_time (
+    into->stats, MODULEMD_INDEX_STATS_PHASE_MERGE, start_time);
+  return TRUE;
+}
+
+
+/*
+ * translation_checksum:
+ *
+ * Returns: (transfer full): The SHA-256 checksum of the YAML document that is
+ * emitted for @translation, like modulemd_module_stream_get_fingerprint()
+ * does for streams.
+ */
+static gchar *
+translation_checksum (ModulemdTranslation *translation, GError **error)
+{
+  g_autoptr (GChecksum) checksum = g_checksum_new (G_CHECKSUM_SHA256);
+  MMD_INIT_YAML_EMITTER (emitter);
+  yaml_emitter_set_output (&emitter, write_yaml_checksum, checksum);
+
+  if (!mmd_emitter_start_stream (&emitter, error))
+    {
+      return NULL;
+    }
+
+  if (!modulemd_translation_emit_yaml (translation, &emitter, error))
+    {
+      return NULL;
+    }
+
+  if (!mmd_emitter_end_stream (&emitter, error))
+    {
+      return NULL;
+    }
+
+  return g_strdup (g_checksum_get_string (checksum));
+}
+
+
+/*
+ * streams_match:
+ * @match: (out): Whether the two streams have the same content.
+ *
+ * Compares two streams by their fingerprints. Streams of different
+ * mdversions never match.
+ */
+static gboolean
+streams_match (ModulemdModuleStream *old_stream,
+               ModulemdModuleStream *new_stream,
+               gboolean *match,
+               GError **error)
+{
+  g_autofree gchar *old_fingerprint = NULL;
+  g_autofree gchar *new_fingerprint = NULL;
+
+  if (modulemd_module_stream_get_mdversion (old_stream) !=
+      modulemd_module_stream_get_mdversion (new_stream))
+    {
+      *match = FALSE;
+      return TRUE;
+    }
+
+  old_fingerprint = modulemd_module_stream_get_fingerprint (old_stream, error);
+  if (old_fingerprint == NULL)
+    {
+      return FALSE;
+    }
+
+  new_fingerprint = modulemd_module_stream_get_fingerprint (new_stream, error);
+  if (new_fingerprint == NULL)
+    {
+      return FALSE;
+    }
+
+  *match = g_str_equal (old_fingerprint, new_fingerprint);
+  return TRUE;
+}
+
+
+/*
+ * translations_match:
+ * @match: (out): Whether the two translations have the same content.
+ */
+static gboolean
+translations_match (ModulemdTranslation *old_translation,
+                    ModulemdTranslation *new_translation,
+                    gboolean *match,
+                    GError **error)
+{
+  g_autofree gchar *old_checksum = NULL;
+  g_autofree gchar *new_checksum = NULL;
+
+  old_checksum = translation_checksum (old_translation, error);
+  if (old_checksum == NULL)
+    {
+      return FALSE;
+    }
+
+  new_checksum = translation_checksum (new_translation, error);
+  if (new_checksum == NULL)
+    {
+      return FALSE;
+    }
+
+  *match = g_str_equal (old_checksum, new_checksum);
+  return TRUE;
+}
+
+
+static gboolean
+diff_streams (ModulemdModule *old_module,
+              ModulemdModule *new_module,
+              ModulemdIndexDiff *diff,
+              GError **error)
+{
+  gsize i;
+  gboolean match;
+  GPtrArray *streams = NULL;
+  ModulemdModuleStream *stream = NULL;
+  ModulemdModuleStream *old_stream = NULL;
+  GHashTableIter iter;
+  gpointer key;
+  g_autoptr (GHashTable) old_streams =
+    g_hash_table_new_full (g_str_hash, g_str_equal, g_free, NULL);
+
+  if (old_module != NULL)
+    {
+      streams = modulemd_module_get_all_streams (old_module);
+      for (i = 0; i < streams->len; i++)
+        {
+          stream = g_ptr_array_index (streams, i);
+          g_hash_table_replace (
+            old_streams,
+            modulemd_module_stream_get_NSVCA_as_string (stream),
+            stream);
+        }
+    }
+
+  if (new_module != NULL)
+    {
+      streams = modulemd_module_get_all_streams (new_module);
+      for (i = 0; i < streams->len; i++)
         {
-          /* There are no defaults on the target module yet. Copy these */
-          if (!modulemd_module_index_add_defaults (
-                into, defaults, &nested_error))
+          g_autofree gchar *nsvca = NULL;
+
+          stream = g_ptr_array_index (streams, i);
+          nsvca = modulemd_module_stream_get_NSVCA_as_string (stream);
+          old_stream = g_hash_table_lookup (old_streams, nsvca);
+
+          if (old_stream == NULL)
+            {
+              modulemd_index_diff_add_stream (diff, stream);
+              continue;
+            }
+
+          if (!streams_match (old_stream, stream, &match, error))
             {
-              g_propagate_error (error, g_steal_pointer (&nested_error));
               return FALSE;
             }
+
+          if (!match)
+            {
+              modulemd_index_diff_change_stream (diff, stream);
+            }
+
+          g_hash_table_remove (old_streams, nsvca);
         }
-      else
+    }
+
+  /* Whatever was not matched by a stream of the new module is gone */
+  g_hash_table_iter_init (&iter, old_streams);
+  while (g_hash_table_iter_next (&iter, &key, NULL))
+    {
+      modulemd_index_diff_remove_stream (diff, (const gchar *)key);
+    }
+
+  return TRUE;
+}
+
+
+static void
+diff_defaults (ModulemdModule *old_module,
+               ModulemdModule *new_module,
+               ModulemdIndexDiff *diff)
+{
+  ModulemdDefaults *old_defaults = NULL;
+  ModulemdDefaults *new_defaults = NULL;
+
+  if (old_module != NULL)
+    {
+      old_defaults = modulemd_module_get_defaults (old_module);
+    }
+
+  if (new_module != NULL)
+    {
+      new_defaults = modulemd_module_get_defaults (new_module);
+    }
+
+  if (new_defaults == NULL)
+    {
+      if (old_defaults != NULL)
+        {
+          modulemd_index_diff_remove_defaults (
+            diff, modulemd_defaults_get_module_name (old_defaults));
+        }
+    }
+  else if (old_defaults == NULL)
+    {
+      modulemd_index_diff_add_defaults (diff, new_defaults);
+    }
+  else if (!modulemd_defaults_equals (old_defaults, new_defaults))
+    {
+      modulemd_index_diff_change_defaults (diff, new_defaults);
+    }
+}
+
+
+static gboolean
+diff_translations (ModulemdModule *old_module,
+                   ModulemdModule *new_module,
+                   ModulemdIndexDiff *diff,
+                   GError **error)
+{
+  gsize i;
+  gboolean match;
+  const gchar *stream_name = NULL;
+  ModulemdTranslation *old_translation = NULL;
+  ModulemdTranslation *new_translation = NULL;
+  g_autoptr (GPtrArray) stream_names = NULL;
+
+  if (new_module != NULL)
+    {
+      stream_names = modulemd_module_get_translated_streams (new_module);
+      for (i = 0; i < stream_names->len; i++)
         {
-          merged_defaults = modulemd_defaults_merge (
-            defaults, into_defaults, strict_default_streams, &nested_error);
-          if (!merged_defaults)
+          stream_name = g_ptr_array_index (stream_names, i);
+          new_translation =
+            modulemd_module_get_translation (new_module, stream_name);
+          old_translation = NULL;
+          if (old_module != NULL)
             {
-              g_propagate_error (error, g_steal_pointer (&nested_error));
-              return FALSE;
+              old_translation =
+                modulemd_module_get_translation (old_module, stream_name);
             }
 
-          /* Add the new, merged defaults to the index */
-          if (!modulemd_module_index_add_defaults (
-                into, merged_defaults, &nested_error))
+          if (old_translation == NULL)
+            {
+              modulemd_index_diff_add_translation (diff, new_translation);
+              continue;
+            }
+
+          if (!translations_match (
+                old_translation, new_translation, &match, error))
             {
-              g_propagate_error (error, g_steal_pointer (&nested_error));
               return FALSE;
             }
-          g_clear_object (&merged_defaults);
-        }
-
-      /* Merge translations for this module */
-      g_debug ("Prioritizer: merging translations for %s", module_name);
-      translated_stream_names =
-        modulemd_module_get_translated_streams (module);
-      for (i = 0; i < translated_stream_names->len; i++)
-        {
-          translated_stream_name =
-            g_ptr_array_index (translated_stream_names, i);
-          translation =
-            modulemd_module_get_translation (module, translated_stream_name);
-          trans_stream = modulemd_translation_get_module_stream (translation);
-          current_translation =
-            modulemd_module_get_translation (into_module, trans_stream);
-
-          if (!current_translation ||
-              modulemd_translation_get_modified (translation) >
-                modulemd_translation_get_modified (current_translation))
+
+          if (!match)
             {
-              /* There was no translation for this stream name or we just found
-               * a newer version of it, so set it on the index.
-               */
-              if (!modulemd_module_index_add_translation (
-                    into, translation, &nested_error))
-                {
-                  g_propagate_error (error, g_steal_pointer (&nested_error));
-                  return FALSE;
-                }
+              modulemd_index_diff_change_translation (diff, new_translation);
             }
         }
-      g_clear_pointer (&translated_stream_names, g_ptr_array_unref);
+      g_clear_pointer (&stream_names, g_ptr_array_unref);
+    }
+
+  if (old_module == NULL)
+    {
+      return TRUE;
+    }
+
+  stream_names = modulemd_module_get_translated_streams (old_module);
+  for (i = 0; i < stream_names->len; i++)
+    {
+      stream_name = g_ptr_array_index (stream_names, i);
+      if (new_module == NULL ||
+          modulemd_module_get_translation (new_module, stream_name) == NULL)
+        {
+          modulemd_index_diff_remove_translation (
+            diff, modulemd_module_get_module_name (old_module), stream_name);
+        }
+    }
+
+  return TRUE;
+}
+
+
+static gboolean
+diff_module (ModulemdModule *old_module,
+             ModulemdModule *new_module,
+             ModulemdIndexDiff *diff,
+             GError **error)
+{
+  if (!diff_streams (old_module, new_module, diff, error))
+    {
+      return FALSE;
+    }
+
+  diff_defaults (old_module, new_module, diff);
+
+  return diff_translations (old_module, new_module, diff, error);
+}
+
+
+ModulemdIndexDiff *
+modulemd_module_index_diff (ModulemdModuleIndex *old_index,
+                            ModulemdModuleIndex *new_index,
+                            GError **error)
+{
+  gsize i;
+  const gchar *module_name = NULL;
+  g_autoptr (ModulemdIndexDiff) diff = NULL;
+  g_autoptr (GPtrArray) module_names = NULL;
+
+  g_return_val_if_fail (MODULEMD_IS_MODULE_INDEX (old_index), NULL);
+  g_return_val_if_fail (MODULEMD_IS_MODULE_INDEX (new_index), NULL);
+
+  diff = modulemd_index_diff_new ();
+
+  module_names =
+    modulemd_ordered_str_keys (new_index->modules, modulemd_strcmp_sort);
+  for (i = 0; i < module_names->len; i++)
+    {
+      module_name = g_ptr_array_index (module_names, i);
+      if (!diff_module (g_hash_table_lookup (old_index->modules, module_name),
+                        g_hash_table_lookup (new_index->modules, module_name),
+                        diff,
+                        error))
+        {
+          return NULL;
+        }
+    }
+  g_clear_pointer (&module_names, g_ptr_array_unref);
+
+  module_names =
+    modulemd_ordered_str_keys (old_index->modules, modulemd_strcmp_sort);
+  for (i = 0; i < module_names->len; i++)
+    {
+      module_name = g_ptr_array_index (module_names, i);
+      if (g_hash_table_contains (new_index->modules, module_name))
+        {
+          continue;
+        }
+
+      if (!diff_module (g_hash_table_lookup (old_index->modules, module_name),
+                        NULL,
+                        diff,
+                        error))
+        {
+          return NULL;
+        }
+    }
+
+  return g_steal_pointer (&diff);
+}
+
+
+/*
+ * add_to_module_set:
+ * @sets: A #GHashTable mapping module names to sets of strings.
+ * @module_name: The name of the module that @value belongs to.
+ * @value: (transfer full): The string to add to the set of @module_name.
+ */
+static void
+add_to_module_set (GHashTable *sets, const gchar *module_name, gchar *value)
+{
+  GHashTable *set = g_hash_table_lookup (sets, module_name);
+
+  if (set == NULL)
+    {
+      set = g_hash_table_new_full (g_str_hash, g_str_equal, g_free, NULL);
+      g_hash_table_insert (sets, g_strdup (module_name), set);
+    }
+
+  g_hash_table_add (set, value);
+}
+
+
+static gboolean
+add_streams_to_module_sets (GHashTable *sets,
+                            GPtrArray *streams,
+                            GError **error)
+{
+  gsize i;
+  ModulemdModuleStream *stream = NULL;
+
+  for (i = 0; i < streams->len; i++)
+    {
+      stream = g_ptr_array_index (streams, i);
+      if (!modulemd_module_stream_get_module_name (stream) ||
+          !modulemd_module_stream_get_stream_name (stream))
+        {
+          g_set_error (error,
+                       MODULEMD_ERROR,
+                       MODULEMD_YAML_ERROR_MISSING_REQUIRED,
+                       "The module and stream names are required when "
+                       "adding to ModuleIndex.");
+          return FALSE;
+        }
 
-      g_debug ("Prioritizer: all documents merged for %s", module_name);
-      g_clear_pointer (&translations, g_ptr_array_unref);
+      add_to_module_set (sets,
+                         modulemd_module_stream_get_module_name (stream),
+                         modulemd_module_stream_get_NSVCA_as_string (stream));
     }
+
   return TRUE;
 }
 
 
+static gboolean
+module_is_empty (ModulemdModule *module)
+{
+  g_autoptr (GPtrArray) translated_streams = NULL;
+
+  if (modulemd_module_get_all_streams (module)->len > 0 ||
+      modulemd_module_get_defaults (module) != NULL)
+    {
+      return FALSE;
+    }
+
+  translated_streams = modulemd_module_get_translated_streams (module);
+  return translated_streams->len == 0;
+}
+
+
+gboolean
+modulemd_module_index_apply_diff (ModulemdModuleIndex *self,
+                                  ModulemdIndexDiff *diff,
+                                  GError **error)
+{
+  gsize i;
+  gchar *separator = NULL;
+  GPtrArray *objects = NULL;
+  ModulemdModule *module = NULL;
+  GHashTableIter iter;
+  gpointer key;
+  gpointer value;
+  g_auto (GStrv) removed = NULL;
+  g_autoptr (GHashTable) dropped_streams = NULL;
+  g_autoptr (GHashTable) touched_modules = NULL;
+
+  g_return_val_if_fail (MODULEMD_IS_MODULE_INDEX (self), FALSE);
+  g_return_val_if_fail (MODULEMD_IS_INDEX_DIFF (diff), FALSE);
+  g_return_val_if_fail (!self->frozen, FALSE);
+
+  /* Module name -> set of NSVCAs to drop before anything is added */
+  dropped_streams = g_hash_table_new_full (
+    g_str_hash, g_str_equal, g_free, (GDestroyNotify)g_hash_table_unref);
+  touched_modules =
+    g_hash_table_new_full (g_str_hash, g_str_equal, g_free, NULL);
+
+  removed = modulemd_index_diff_get_removed_streams_as_strv (diff);
+  for (i = 0; removed[i] != NULL; i++)
+    {
+      g_autofree gchar *module_name = NULL;
+
+      separator = strchr (removed[i], ':');
+      if (separator == NULL)
+        {
+          continue;
+        }
+
+      module_name = g_strndup (removed[i], separator - removed[i]);
+      add_to_module_set (dropped_streams, module_name, g_strdup (removed[i]));
+      g_hash_table_add (touched_modules, g_steal_pointer (&module_name));
+    }
+  g_clear_pointer (&removed, g_strfreev);
+
+  /* Nothing has been changed yet, so a stream that cannot be added leaves
+   * the index as it was.
+   */
+  if (!add_streams_to_module_sets (
+        dropped_streams,
+        modulemd_index_diff_get_added_streams (diff),
+        error) ||
+      !add_streams_to_module_sets (
+        dropped_streams,
+        modulemd_index_diff_get_changed_streams (diff),
+        error))
+    {
+      return FALSE;
+    }
+
+  g_hash_table_iter_init (&iter, dropped_streams);
+  while (g_hash_table_iter_next (&iter, &key, &value))
+    {
+      module = g_hash_table_lookup (self->modules, key);
+      if (module != NULL)
+        {
+          modulemd_module_remove_streams_in_set (module, value);
+        }
+    }
+
+  removed = modulemd_index_diff_get_removed_defaults_as_strv (diff);
+  for (i = 0; removed[i] != NULL; i++)
+    {
+      module = g_hash_table_lookup (self->modules, removed[i]);
+      if (module != NULL)
+        {
+          modulemd_module_set_defaults (
+            module, NULL, self->defaults_mdversion, NULL);
+          g_hash_table_add (touched_modules, g_strdup (removed[i]));
+        }
+    }
+  g_clear_pointer (&removed, g_strfreev);
+
+  removed = modulemd_index_diff_get_removed_translations_as_strv (diff);
+  for (i = 0; removed[i] != NULL; i++)
+    {
+      separator = strchr (removed[i], ':');
+      if (separator == NULL)
+        {
+          continue;
+        }
+
+      *separator = '\0';
+      module = g_hash_table_lookup (self->modules, removed[i]);
+      if (module != NULL &&
+          modulemd_module_remove_translation (module, separator + 1))
+        {
+          g_hash_table_add (touched_modules, g_strdup (removed[i]));
+        }
+    }
+  g_clear_pointer (&removed, g_strfreev);
+
+  objects = modulemd_index_diff_get_added_streams (diff);
+  for (i = 0; i < objects->len; i++)
+    {
+      if (!modulemd_module_index_add_module_stream (
+            self, g_ptr_array_index (objects, i), error))
+        {
+          return FALSE;
+        }
+    }
+
+  objects = modulemd_index_diff_get_changed_streams (diff);
+  for (i = 0; i < objects->len; i++)
+    {
+      if (!modulemd_module_index_add_module_stream (
+            self, g_ptr_array_index (objects, i), error))
+        {
+          return FALSE;
+        }
+    }
+
+  objects = modulemd_index_diff_get_added_defaults (diff);
+  for (i = 0; i < objects->len; i++)
+    {
+      if (!modulemd_module_index_add_defaults (
+            self, g_ptr_array_index (objects, i), error))
+        {
+          return FALSE;
+        }
+    }
+
+  objects = modulemd_index_diff_get_changed_defaults (diff);
+  for (i = 0; i < objects->len; i++)
+    {
+      if (!modulemd_module_index_add_defaults (
+            self, g_ptr_array_index (objects, i), error))
+        {
+          return FALSE;
+        }
+    }
+
+  objects = modulemd_index_diff_get_added_translations (diff);
+  for (i = 0; i < objects->len; i++)
+    {
+      if (!modulemd_module_index_add_translation (
+            self, g_ptr_array_index (objects, i), error))
+        {
+          return FALSE;
+        }
+    }
+
+  objects = modulemd_index_diff_get_changed_translations (diff);
+  for (i = 0; i < objects->len; i++)
+    {
+      if (!modulemd_module_index_add_translation (
+            self, g_ptr_array_index (objects, i), error))
+        {
+          return FALSE;
+        }
+    }
+
+  /* Drop the modules whose last stream, defaults or translation went away */
+  g_hash_table_iter_init (&iter, touched_modules);
+  while (g_hash_table_iter_next (&iter, &key, NULL))
+    {
+      module = g_hash_table_lookup (self->modules, key);
+      if (module != NULL && module_is_empty (module))
+        {
+          modulemd_module_index_remove_module (self, key);
+        }
+    }
+
+  return TRUE;
+}
+
+
+void
+modulemd_module_index_freeze (ModulemdModuleIndex *self)
+{
+  GHashTableIter iter;
+  gpointer value;
+
+  g_return_if_fail (MODULEMD_IS_MODULE_INDEX (self));
+
+  if (self->frozen)
+    {
+      return;
+    }
+
+  g_hash_table_iter_init (&iter, self->modules);
+  while (g_hash_table_iter_next (&iter, NULL, &value))
+    {
+      modulemd_module_freeze (MODULEMD_MODULE (value));
+    }
+  modulemd_ordered_keys_get (&self->module_names, self->modules);
+
+  self->frozen = TRUE;
+}
+
+
+gboolean
+modulemd_module_index_is_frozen (ModulemdModuleIndex *self)
+{
+  g_return_val_if_fail (MODULEMD_IS_MODULE_INDEX (self), FALSE);
+
+  return self->frozen;
+}
+
+
 ModulemdDefaultsVersionEnum
 modulemd_module_index_get_defaults_mdversion (ModulemdModuleIndex *self)
 {
@@ -1368,3 +3506,31 @@ modulemd_module_index_get_stream_mdversion (ModulemdModuleIndex *self)
 {
   return self->stream_mdversion;
 }
+
+
+ModulemdIndexStats *
+modulemd_module_index_get_stats (ModulemdModuleIndex *self)
+{
+  g_return_val_if_fail (MODULEMD_IS_MODULE_INDEX (self), NULL);
+
+  return self->stats;
+}
+
+
+ModulemdMemoryUsage *
+modulemd_module_index_get_memory_usage (ModulemdModuleIndex *self)
+{
+  g_autoptr (ModulemdMemoryUsage) usage = NULL;
+
+  g_return_val_if_fail (MODULEMD_IS_MODULE_INDEX (self), NULL);
+
+  usage = modulemd_memory_usage_new ();
+
+  modulemd_memory_usage_add_object (usage, sizeof (ModulemdModuleIndex));
+  modulemd_memory_usage_add_object_table (
+    usage,
+    self->modules,
+    (ModulemdMemoryUsageFunc)modulemd_module_add_memory_usage);
+
+  return g_steal_pointer (&usage);
+}
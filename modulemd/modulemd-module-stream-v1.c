@@ -27,6 +27,7 @@
 #include "private/modulemd-component-private.h"
 #include "private/modulemd-component-rpm-private.h"
 #include "private/modulemd-dependencies-private.h"
+#include "private/modulemd-memory-usage-private.h"
 #include "private/modulemd-module-stream-private.h"
 #include "private/modulemd-module-stream-v1-private.h"
 #include "private/modulemd-profile-private.h"
@@ -119,6 +120,8 @@ modulemd_module_stream_v1_set_arch (ModulemdModuleStreamV1 *self,
                                     const gchar *arch)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
 
   modulemd_module_stream_set_arch (MODULEMD_MODULE_STREAM (self), arch);
 
@@ -140,6 +143,10 @@ modulemd_module_stream_v1_set_buildopts (ModulemdModuleStreamV1 *self,
                                          ModulemdBuildopts *buildopts)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_clear_object (&self->buildopts);
   self->buildopts = modulemd_buildopts_copy (buildopts);
@@ -153,6 +160,8 @@ modulemd_module_stream_v1_get_buildopts (ModulemdModuleStreamV1 *self)
 {
   g_return_val_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self), NULL);
 
+  modulemd_module_stream_expose_child (MODULEMD_MODULE_STREAM (self));
+
   return self->buildopts;
 }
 
@@ -162,6 +171,10 @@ modulemd_module_stream_v1_set_community (ModulemdModuleStreamV1 *self,
                                          const gchar *community)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_clear_pointer (&self->community, g_free);
   self->community = g_strdup (community);
@@ -184,6 +197,10 @@ modulemd_module_stream_v1_set_description (ModulemdModuleStreamV1 *self,
                                            const gchar *description)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_clear_pointer (&self->description, g_free);
   self->description = g_strdup (description);
@@ -214,6 +231,10 @@ modulemd_module_stream_v1_set_documentation (ModulemdModuleStreamV1 *self,
                                              const gchar *documentation)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_clear_pointer (&self->documentation, g_free);
   self->documentation = g_strdup (documentation);
@@ -236,6 +257,10 @@ modulemd_module_stream_v1_set_summary (ModulemdModuleStreamV1 *self,
                                        const gchar *summary)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_clear_pointer (&self->summary, g_free);
   self->summary = g_strdup (summary);
@@ -265,6 +290,10 @@ modulemd_module_stream_v1_set_tracker (ModulemdModuleStreamV1 *self,
                                        const gchar *tracker)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_clear_pointer (&self->tracker, g_free);
   self->tracker = g_strdup (tracker);
@@ -299,6 +328,10 @@ modulemd_module_stream_v1_add_component (ModulemdModuleStreamV1 *self,
 
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
   g_return_if_fail (MODULEMD_IS_COMPONENT (component));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   if (MODULEMD_IS_COMPONENT_RPM (component))
     {
@@ -334,6 +367,10 @@ modulemd_module_stream_v1_remove_module_component (
     }
 
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_hash_table_remove (self->module_components, component_name);
 }
@@ -344,6 +381,10 @@ modulemd_module_stream_v1_clear_module_components (
   ModulemdModuleStreamV1 *self)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_hash_table_remove_all (self->module_components);
 }
@@ -360,6 +401,10 @@ modulemd_module_stream_v1_remove_rpm_component (ModulemdModuleStreamV1 *self,
     }
 
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_hash_table_remove (self->rpm_components, component_name);
 }
@@ -369,6 +414,10 @@ void
 modulemd_module_stream_v1_clear_rpm_components (ModulemdModuleStreamV1 *self)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_hash_table_remove_all (self->rpm_components);
 }
@@ -400,6 +449,8 @@ modulemd_module_stream_v1_get_module_component (ModulemdModuleStreamV1 *self,
 {
   g_return_val_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self), NULL);
 
+  modulemd_module_stream_expose_child (MODULEMD_MODULE_STREAM (self));
+
   return g_hash_table_lookup (self->module_components, component_name);
 }
 
@@ -410,6 +461,8 @@ modulemd_module_stream_v1_get_rpm_component (ModulemdModuleStreamV1 *self,
 {
   g_return_val_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self), NULL);
 
+  modulemd_module_stream_expose_child (MODULEMD_MODULE_STREAM (self));
+
   return g_hash_table_lookup (self->rpm_components, component_name);
 }
 
@@ -424,6 +477,10 @@ modulemd_module_stream_v1_add_content_license (ModulemdModuleStreamV1 *self,
     }
 
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_hash_table_add (self->content_licenses, g_strdup (license));
 }
@@ -435,6 +492,8 @@ modulemd_module_stream_v1_replace_content_licenses (
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
 
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
+
   MODULEMD_REPLACE_SET (self->content_licenses, set);
 }
 
@@ -443,6 +502,10 @@ void
 modulemd_module_stream_v1_clear_content_licenses (ModulemdModuleStreamV1 *self)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_hash_table_remove_all (self->content_licenses);
 }
@@ -458,6 +521,10 @@ modulemd_module_stream_v1_add_module_license (ModulemdModuleStreamV1 *self,
     }
 
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_hash_table_add (self->module_licenses, g_strdup (license));
 }
@@ -469,6 +536,8 @@ modulemd_module_stream_v1_replace_module_licenses (
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
 
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
+
   MODULEMD_REPLACE_SET (self->module_licenses, set);
 }
 
@@ -477,6 +546,10 @@ void
 modulemd_module_stream_v1_clear_module_licenses (ModulemdModuleStreamV1 *self)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_hash_table_remove_all (self->module_licenses);
 }
@@ -492,6 +565,10 @@ modulemd_module_stream_v1_remove_content_license (ModulemdModuleStreamV1 *self,
     }
 
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_hash_table_remove (self->content_licenses, license);
 }
@@ -507,6 +584,10 @@ modulemd_module_stream_v1_remove_module_license (ModulemdModuleStreamV1 *self,
     }
 
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_hash_table_remove (self->module_licenses, license);
 }
@@ -542,6 +623,10 @@ modulemd_module_stream_v1_add_profile (ModulemdModuleStreamV1 *self,
     }
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
   g_return_if_fail (MODULEMD_IS_PROFILE (profile));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   ModulemdProfile *copied_profile = modulemd_profile_copy (profile);
   modulemd_profile_set_owner (copied_profile, MODULEMD_MODULE_STREAM (self));
@@ -556,6 +641,10 @@ void
 modulemd_module_stream_v1_clear_profiles (ModulemdModuleStreamV1 *self)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_hash_table_remove_all (self->profiles);
 }
@@ -577,6 +666,8 @@ modulemd_module_stream_v1_get_profile (ModulemdModuleStreamV1 *self,
 {
   g_return_val_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self), NULL);
 
+  modulemd_module_stream_expose_child (MODULEMD_MODULE_STREAM (self));
+
   return g_hash_table_lookup (self->profiles, profile_name);
 }
 
@@ -591,6 +682,10 @@ modulemd_module_stream_v1_add_rpm_api (ModulemdModuleStreamV1 *self,
     }
 
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_hash_table_add (self->rpm_api, g_strdup (rpm));
 }
@@ -602,6 +697,8 @@ modulemd_module_stream_v1_replace_rpm_api (ModulemdModuleStreamV1 *self,
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
 
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
+
   MODULEMD_REPLACE_SET (self->rpm_api, set);
 }
 
@@ -616,6 +713,10 @@ modulemd_module_stream_v1_remove_rpm_api (ModulemdModuleStreamV1 *self,
     }
 
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_hash_table_remove (self->rpm_api, rpm);
 }
@@ -625,6 +726,10 @@ void
 modulemd_module_stream_v1_clear_rpm_api (ModulemdModuleStreamV1 *self)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_hash_table_remove_all (self->rpm_api);
 }
@@ -649,6 +754,10 @@ modulemd_module_stream_v1_add_rpm_artifact (ModulemdModuleStreamV1 *self,
     }
 
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_hash_table_add (self->rpm_artifacts, g_strdup (nevr));
 }
@@ -660,6 +769,8 @@ modulemd_module_stream_v1_replace_rpm_artifacts (ModulemdModuleStreamV1 *self,
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
 
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
+
   MODULEMD_REPLACE_SET (self->rpm_artifacts, set);
 }
 
@@ -674,6 +785,10 @@ modulemd_module_stream_v1_remove_rpm_artifact (ModulemdModuleStreamV1 *self,
     }
 
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_hash_table_remove (self->rpm_artifacts, nevr);
 }
@@ -683,6 +798,10 @@ void
 modulemd_module_stream_v1_clear_rpm_artifacts (ModulemdModuleStreamV1 *self)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_hash_table_remove_all (self->rpm_artifacts);
 }
@@ -708,6 +827,10 @@ modulemd_module_stream_v1_add_rpm_filter (ModulemdModuleStreamV1 *self,
     }
 
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_hash_table_add (self->rpm_filters, g_strdup (rpm));
 }
@@ -719,6 +842,8 @@ modulemd_module_stream_v1_replace_rpm_filters (ModulemdModuleStreamV1 *self,
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
 
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
+
   MODULEMD_REPLACE_SET (self->rpm_filters, set);
 }
 
@@ -733,6 +858,10 @@ modulemd_module_stream_v1_remove_rpm_filter (ModulemdModuleStreamV1 *self,
     }
 
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_hash_table_remove (self->rpm_filters, rpm);
 }
@@ -742,6 +871,10 @@ void
 modulemd_module_stream_v1_clear_rpm_filters (ModulemdModuleStreamV1 *self)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_hash_table_remove_all (self->rpm_filters);
 }
@@ -767,6 +900,10 @@ modulemd_module_stream_v1_add_servicelevel (ModulemdModuleStreamV1 *self,
     }
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
   g_return_if_fail (MODULEMD_IS_SERVICE_LEVEL (servicelevel));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_hash_table_replace (
     self->servicelevels,
@@ -779,6 +916,10 @@ void
 modulemd_module_stream_v1_clear_servicelevels (ModulemdModuleStreamV1 *self)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_hash_table_remove_all (self->servicelevels);
 }
@@ -800,6 +941,8 @@ modulemd_module_stream_v1_get_servicelevel (ModulemdModuleStreamV1 *self,
 {
   g_return_val_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self), NULL);
 
+  modulemd_module_stream_expose_child (MODULEMD_MODULE_STREAM (self));
+
   return g_hash_table_lookup (self->servicelevels, servicelevel_name);
 }
 
@@ -808,6 +951,10 @@ void
 modulemd_module_stream_v1_set_eol (ModulemdModuleStreamV1 *self, GDate *eol)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   /* The "eol" field in the YAML is a relic of an early iteration and has been
    * entirely replaced by the ServiceLevel concept. If we encounter it, we just
@@ -826,7 +973,7 @@ modulemd_module_stream_v1_get_eol (ModulemdModuleStreamV1 *self)
   g_return_val_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self), NULL);
 
   ModulemdServiceLevel *sl =
-    modulemd_module_stream_v1_get_servicelevel (self, "rawhide");
+    g_hash_table_lookup (self->servicelevels, "rawhide");
 
   return modulemd_service_level_get_eol (sl);
 }
@@ -840,6 +987,10 @@ modulemd_module_stream_v1_add_buildtime_requirement (
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
   g_return_if_fail (module_name && module_stream);
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_hash_table_replace (
     self->buildtime_deps, g_strdup (module_name), g_strdup (module_stream));
@@ -852,6 +1003,8 @@ modulemd_module_stream_v1_replace_buildtime_deps (ModulemdModuleStreamV1 *self,
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
 
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
+
   if (deps)
     {
       g_hash_table_unref (self->buildtime_deps);
@@ -872,6 +1025,10 @@ modulemd_module_stream_v1_add_runtime_requirement (
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
   g_return_if_fail (module_name && module_stream);
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_hash_table_replace (
     self->runtime_deps, g_strdup (module_name), g_strdup (module_stream));
@@ -884,6 +1041,8 @@ modulemd_module_stream_v1_replace_runtime_deps (ModulemdModuleStreamV1 *self,
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
 
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
+
   if (deps)
     {
       g_hash_table_unref (self->runtime_deps);
@@ -902,6 +1061,10 @@ modulemd_module_stream_v1_remove_buildtime_requirement (
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
   g_return_if_fail (module_name);
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_hash_table_remove (self->buildtime_deps, module_name);
 }
@@ -913,6 +1076,10 @@ modulemd_module_stream_v1_remove_runtime_requirement (
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
   g_return_if_fail (module_name);
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_hash_table_remove (self->runtime_deps, module_name);
 }
@@ -923,6 +1090,10 @@ modulemd_module_stream_v1_clear_buildtime_requirements (
   ModulemdModuleStreamV1 *self)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_hash_table_remove_all (self->buildtime_deps);
 }
@@ -933,6 +1104,10 @@ modulemd_module_stream_v1_clear_runtime_requirements (
   ModulemdModuleStreamV1 *self)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_hash_table_remove_all (self->runtime_deps);
 }
@@ -982,6 +1157,10 @@ void
 modulemd_module_stream_v1_set_xmd (ModulemdModuleStreamV1 *self, GVariant *xmd)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V1 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   /* Do nothing if we were passed the same pointer */
   if (self->xmd == xmd)
@@ -1388,6 +1567,58 @@ modulemd_module_stream_v1_build_depends_on_stream (ModulemdModuleStream *self,
 }
 
 
+static void
+modulemd_module_stream_v1_add_memory_usage (ModulemdModuleStream *self,
+                                            ModulemdMemoryUsage *usage)
+{
+  ModulemdModuleStreamV1 *v1_self = MODULEMD_MODULE_STREAM_V1 (self);
+
+  modulemd_memory_usage_add_object (usage, sizeof (ModulemdModuleStreamV1));
+
+  if (v1_self->buildopts)
+    {
+      modulemd_buildopts_add_memory_usage (v1_self->buildopts, usage);
+    }
+
+  modulemd_memory_usage_add_string (usage, v1_self->community);
+  modulemd_memory_usage_add_string (usage, v1_self->description);
+  modulemd_memory_usage_add_string (usage, v1_self->documentation);
+  modulemd_memory_usage_add_string (usage, v1_self->summary);
+  modulemd_memory_usage_add_string (usage, v1_self->tracker);
+
+  modulemd_memory_usage_add_object_table (
+    usage,
+    v1_self->rpm_components,
+    (ModulemdMemoryUsageFunc)modulemd_component_rpm_add_memory_usage);
+  modulemd_memory_usage_add_object_table (
+    usage,
+    v1_self->module_components,
+    (ModulemdMemoryUsageFunc)modulemd_component_module_add_memory_usage);
+
+  modulemd_memory_usage_add_string_set (usage, v1_self->content_licenses);
+  modulemd_memory_usage_add_string_set (usage, v1_self->module_licenses);
+
+  modulemd_memory_usage_add_object_table (
+    usage,
+    v1_self->profiles,
+    (ModulemdMemoryUsageFunc)modulemd_profile_add_memory_usage);
+
+  modulemd_memory_usage_add_string_set (usage, v1_self->rpm_api);
+  modulemd_memory_usage_add_string_set (usage, v1_self->rpm_artifacts);
+  modulemd_memory_usage_add_string_set (usage, v1_self->rpm_filters);
+
+  modulemd_memory_usage_add_object_table (
+    usage,
+    v1_self->servicelevels,
+    (ModulemdMemoryUsageFunc)modulemd_service_level_add_memory_usage);
+
+  modulemd_memory_usage_add_string_map (usage, v1_self->buildtime_deps);
+  modulemd_memory_usage_add_string_map (usage, v1_self->runtime_deps);
+
+  modulemd_memory_usage_add_xmd (usage, v1_self->xmd);
+}
+
+
 static void
 modulemd_module_stream_v1_class_init (ModulemdModuleStreamV1Class *klass)
 {
@@ -1407,6 +1638,7 @@ modulemd_module_stream_v1_class_init (ModulemdModuleStreamV1Class *klass)
     modulemd_module_stream_v1_depends_on_stream;
   stream_class->build_depends_on_stream =
     modulemd_module_stream_v1_build_depends_on_stream;
+  stream_class->add_memory_usage = modulemd_module_stream_v1_add_memory_usage;
 
   properties[PROP_ARCH] = g_param_spec_string (
     "arch",
@@ -11,6 +11,9 @@
  * For more information on free software, see <https://www.gnu.org/philosophy/free-sw.en.html>.
  */
 
+#include <stdlib.h>
+#include <string.h>
+
 #include "modulemd-buildopts.h"
 #include "modulemd-component-module.h"
 #include "modulemd-component-rpm.h"
@@ -27,6 +30,7 @@
 #include "private/modulemd-component-private.h"
 #include "private/modulemd-component-rpm-private.h"
 #include "private/modulemd-dependencies-private.h"
+#include "private/modulemd-memory-usage-private.h"
 #include "private/modulemd-module-stream-private.h"
 #include "private/modulemd-module-stream-v2-private.h"
 #include "private/modulemd-profile-private.h"
@@ -67,6 +71,230 @@ modulemd_module_stream_v2_new (const gchar *module_name,
 }
 
 
+/* The rpm-map of a stream can hold many thousands of entries, so it is not
+ * stored as ModulemdRpmMapEntry objects. Each entry is an RpmMapRecord in
+ * self->rpm_artifact_map, kept sorted by digest and then checksum, and all
+ * of their strings live in self->rpm_artifact_map_strings. Since package
+ * names, versions, releases and architectures repeat a lot, each of them is
+ * stored only once.
+ *
+ * A ModulemdRpmMapEntry is only created when a caller asks for it with
+ * modulemd_module_stream_v2_get_rpm_artifact_map_entry(). The caller may
+ * modify that object, so from then on it replaces the fields of the record.
+ */
+typedef struct
+{
+  const gchar *digest;
+  const gchar *checksum;
+  ModulemdRpmMapEntryFields fields;
+  ModulemdRpmMapEntry *entry;
+} RpmMapRecord;
+
+
+static void
+rpm_map_record_clear (gpointer data)
+{
+  RpmMapRecord *record = data;
+
+  g_clear_object (&record->entry);
+}
+
+
+static void
+rpm_map_record_get_fields (RpmMapRecord *record,
+                           ModulemdRpmMapEntryFields *fields)
+{
+  ModulemdRpmMapEntry *entry = g_atomic_pointer_get (&record->entry);
+
+  if (entry)
+    {
+      modulemd_rpm_map_entry_get_fields (entry, fields);
+    }
+  else
+    {
+      *fields = record->fields;
+    }
+}
+
+
+static gint
+rpm_map_record_compare (gconstpointer a, gconstpointer b)
+{
+  const RpmMapRecord *record_a = a;
+  const RpmMapRecord *record_b = b;
+  gint cmp;
+
+  cmp = strcmp (record_a->digest, record_b->digest);
+  if (cmp != 0)
+    {
+      return cmp;
+    }
+
+  return strcmp (record_a->checksum, record_b->checksum);
+}
+
+
+static const gchar *
+rpm_map_strings_insert (ModulemdModuleStreamV2 *self, const gchar *str)
+{
+  if (!str)
+    {
+      return NULL;
+    }
+
+  return g_string_chunk_insert_const (self->rpm_artifact_map_strings, str);
+}
+
+
+static void
+sort_rpm_artifact_map (ModulemdModuleStreamV2 *self)
+{
+  GArray *map = self->rpm_artifact_map;
+  RpmMapRecord *record = NULL;
+  guint i;
+  guint len = 0;
+
+  if (self->rpm_artifact_map_sorted)
+    {
+      return;
+    }
+
+  /* g_array_sort() is stable, so if an entry was set more than once, the
+   * record that was set last is also the last of its run.
+   */
+  g_array_sort (map, rpm_map_record_compare);
+
+  for (i = 0; i < map->len; i++)
+    {
+      record = &g_array_index (map, RpmMapRecord, i);
+      if (i + 1 < map->len && rpm_map_record_compare (record, record + 1) == 0)
+        {
+          g_clear_object (&record->entry);
+          continue;
+        }
+
+      if (i != len)
+        {
+          g_array_index (map, RpmMapRecord, len) = *record;
+          record->entry = NULL;
+        }
+      len++;
+    }
+  g_array_set_size (map, len);
+
+  self->rpm_artifact_map_sorted = TRUE;
+}
+
+
+static RpmMapRecord *
+find_rpm_map_record (ModulemdModuleStreamV2 *self,
+                     const gchar *digest,
+                     const gchar *checksum)
+{
+  RpmMapRecord key = { 0 };
+
+  g_return_val_if_fail (self->rpm_artifact_map_sorted, NULL);
+
+  if (self->rpm_artifact_map->len == 0)
+    {
+      return NULL;
+    }
+
+  key.digest = digest;
+  key.checksum = checksum;
+
+  return bsearch (&key,
+                  self->rpm_artifact_map->data,
+                  self->rpm_artifact_map->len,
+                  sizeof (RpmMapRecord),
+                  rpm_map_record_compare);
+}
+
+
+static void
+set_rpm_map_fields (ModulemdModuleStreamV2 *self,
+                    const gchar *digest,
+                    const gchar *checksum,
+                    const ModulemdRpmMapEntryFields *fields)
+{
+  RpmMapRecord new_record = { 0 };
+  RpmMapRecord *record = NULL;
+  GArray *map = self->rpm_artifact_map;
+
+  new_record.fields.name = rpm_map_strings_insert (self, fields->name);
+  new_record.fields.epoch = fields->epoch;
+  new_record.fields.version = rpm_map_strings_insert (self, fields->version);
+  new_record.fields.release = rpm_map_strings_insert (self, fields->release);
+  new_record.fields.arch = rpm_map_strings_insert (self, fields->arch);
+
+  if (self->rpm_artifact_map_sorted)
+    {
+      record = find_rpm_map_record (self, digest, checksum);
+      if (record)
+        {
+          record->fields = new_record.fields;
+          g_clear_object (&record->entry);
+          return;
+        }
+    }
+
+  new_record.digest = rpm_map_strings_insert (self, digest);
+  new_record.checksum =
+    g_string_chunk_insert (self->rpm_artifact_map_strings, checksum);
+
+  /* Entries read from YAML arrive in order, which keeps the map sorted
+   * without any further work.
+   */
+  if (self->rpm_artifact_map_sorted && map->len > 0 &&
+      rpm_map_record_compare (&g_array_index (map, RpmMapRecord, map->len - 1),
+                              &new_record) > 0)
+    {
+      self->rpm_artifact_map_sorted = FALSE;
+    }
+
+  g_array_append_val (map, new_record);
+}
+
+
+static gboolean
+rpm_artifact_maps_equal (ModulemdModuleStreamV2 *self_1,
+                         ModulemdModuleStreamV2 *self_2)
+{
+  RpmMapRecord *record_1 = NULL;
+  RpmMapRecord *record_2 = NULL;
+  ModulemdRpmMapEntryFields fields_1;
+  ModulemdRpmMapEntryFields fields_2;
+
+  sort_rpm_artifact_map (self_1);
+  sort_rpm_artifact_map (self_2);
+
+  if (self_1->rpm_artifact_map->len != self_2->rpm_artifact_map->len)
+    {
+      return FALSE;
+    }
+
+  for (guint i = 0; i < self_1->rpm_artifact_map->len; i++)
+    {
+      record_1 = &g_array_index (self_1->rpm_artifact_map, RpmMapRecord, i);
+      record_2 = &g_array_index (self_2->rpm_artifact_map, RpmMapRecord, i);
+
+      if (rpm_map_record_compare (record_1, record_2) != 0)
+        {
+          return FALSE;
+        }
+
+      rpm_map_record_get_fields (record_1, &fields_1);
+      rpm_map_record_get_fields (record_2, &fields_2);
+      if (!modulemd_rpm_map_entry_fields_equal (&fields_1, &fields_2))
+        {
+          return FALSE;
+        }
+    }
+
+  return TRUE;
+}
+
+
 static void
 modulemd_module_stream_v2_finalize (GObject *object)
 {
@@ -82,22 +310,27 @@ modulemd_module_stream_v2_finalize (GObject *object)
 
   /* Internal Data Structures */
   g_clear_pointer (&self->module_components, g_hash_table_unref);
+  modulemd_ordered_keys_invalidate (&self->module_component_names);
   g_clear_pointer (&self->rpm_components, g_hash_table_unref);
+  modulemd_ordered_keys_invalidate (&self->rpm_component_names);
 
-  g_clear_pointer (&self->content_licenses, g_hash_table_unref);
-  g_clear_pointer (&self->module_licenses, g_hash_table_unref);
+  modulemd_string_set_clear (&self->content_licenses);
+  modulemd_string_set_clear (&self->module_licenses);
 
   g_clear_pointer (&self->profiles, g_hash_table_unref);
+  modulemd_ordered_keys_invalidate (&self->profile_names);
 
-  g_clear_pointer (&self->rpm_api, g_hash_table_unref);
+  modulemd_string_set_clear (&self->rpm_api);
 
-  g_clear_pointer (&self->rpm_artifacts, g_hash_table_unref);
+  modulemd_string_set_clear (&self->rpm_artifacts);
 
-  g_clear_pointer (&self->rpm_artifact_map, g_hash_table_unref);
+  g_clear_pointer (&self->rpm_artifact_map, g_array_unref);
+  g_clear_pointer (&self->rpm_artifact_map_strings, g_string_chunk_free);
 
-  g_clear_pointer (&self->rpm_filters, g_hash_table_unref);
+  modulemd_string_set_clear (&self->rpm_filters);
 
   g_clear_pointer (&self->servicelevels, g_hash_table_unref);
+  modulemd_ordered_keys_invalidate (&self->servicelevel_names);
 
   g_clear_pointer (&self->dependencies, g_ptr_array_unref);
 
@@ -170,14 +403,14 @@ modulemd_module_stream_v2_equals (ModulemdModuleStream *self_1,
       return FALSE;
     }
 
-  if (!modulemd_hash_table_sets_are_equal (v2_self_1->module_licenses,
-                                           v2_self_2->module_licenses))
+  if (!modulemd_string_set_equals (&v2_self_1->module_licenses,
+                                   &v2_self_2->module_licenses))
     {
       return FALSE;
     }
 
-  if (!modulemd_hash_table_sets_are_equal (v2_self_1->content_licenses,
-                                           v2_self_2->content_licenses))
+  if (!modulemd_string_set_equals (&v2_self_1->content_licenses,
+                                   &v2_self_2->content_licenses))
     {
       return FALSE;
     }
@@ -189,20 +422,19 @@ modulemd_module_stream_v2_equals (ModulemdModuleStream *self_1,
       return FALSE;
     }
 
-  if (!modulemd_hash_table_sets_are_equal (v2_self_1->rpm_api,
-                                           v2_self_2->rpm_api))
+  if (!modulemd_string_set_equals (&v2_self_1->rpm_api, &v2_self_2->rpm_api))
     {
       return FALSE;
     }
 
-  if (!modulemd_hash_table_sets_are_equal (v2_self_1->rpm_artifacts,
-                                           v2_self_2->rpm_artifacts))
+  if (!modulemd_string_set_equals (&v2_self_1->rpm_artifacts,
+                                   &v2_self_2->rpm_artifacts))
     {
       return FALSE;
     }
 
-  if (!modulemd_hash_table_sets_are_equal (v2_self_1->rpm_filters,
-                                           v2_self_2->rpm_filters))
+  if (!modulemd_string_set_equals (&v2_self_1->rpm_filters,
+                                   &v2_self_2->rpm_filters))
     {
       return FALSE;
     }
@@ -215,11 +447,7 @@ modulemd_module_stream_v2_equals (ModulemdModuleStream *self_1,
     }
 
 
-  /* < string, GHashTable <string, Modulemd.RpmMapEntry> > */
-  if (!modulemd_hash_table_equals (
-        v2_self_1->rpm_artifact_map,
-        v2_self_2->rpm_artifact_map,
-        modulemd_RpmMapEntry_hash_table_equals_wrapper))
+  if (!rpm_artifact_maps_equal (v2_self_1, v2_self_2))
     {
       return FALSE;
     }
@@ -273,6 +501,8 @@ modulemd_module_stream_v2_set_arch (ModulemdModuleStreamV2 *self,
                                     const gchar *arch)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
 
   modulemd_module_stream_set_arch (MODULEMD_MODULE_STREAM (self), arch);
 
@@ -294,6 +524,10 @@ modulemd_module_stream_v2_set_buildopts (ModulemdModuleStreamV2 *self,
                                          ModulemdBuildopts *buildopts)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_clear_object (&self->buildopts);
   self->buildopts = modulemd_buildopts_copy (buildopts);
@@ -307,6 +541,8 @@ modulemd_module_stream_v2_get_buildopts (ModulemdModuleStreamV2 *self)
 {
   g_return_val_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self), NULL);
 
+  modulemd_module_stream_expose_child (MODULEMD_MODULE_STREAM (self));
+
   return self->buildopts;
 }
 
@@ -316,6 +552,10 @@ modulemd_module_stream_v2_set_community (ModulemdModuleStreamV2 *self,
                                          const gchar *community)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_clear_pointer (&self->community, g_free);
   self->community = g_strdup (community);
@@ -338,6 +578,10 @@ modulemd_module_stream_v2_set_description (ModulemdModuleStreamV2 *self,
                                            const gchar *description)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_clear_pointer (&self->description, g_free);
   self->description = g_strdup (description);
@@ -368,6 +612,10 @@ modulemd_module_stream_v2_set_documentation (ModulemdModuleStreamV2 *self,
                                              const gchar *documentation)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_clear_pointer (&self->documentation, g_free);
   self->documentation = g_strdup (documentation);
@@ -390,6 +638,10 @@ modulemd_module_stream_v2_set_summary (ModulemdModuleStreamV2 *self,
                                        const gchar *summary)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_clear_pointer (&self->summary, g_free);
   self->summary = g_strdup (summary);
@@ -419,6 +671,10 @@ modulemd_module_stream_v2_set_tracker (ModulemdModuleStreamV2 *self,
                                        const gchar *tracker)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_clear_pointer (&self->tracker, g_free);
   self->tracker = g_strdup (tracker);
@@ -443,6 +699,7 @@ modulemd_module_stream_v2_add_component (ModulemdModuleStreamV2 *self,
                                          ModulemdComponent *component)
 {
   GHashTable *table = NULL;
+  ModulemdOrderedKeys *names = NULL;
 
   /* Do nothing if we were passed a NULL component */
   if (!component)
@@ -452,14 +709,20 @@ modulemd_module_stream_v2_add_component (ModulemdModuleStreamV2 *self,
 
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self));
   g_return_if_fail (MODULEMD_IS_COMPONENT (component));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   if (MODULEMD_IS_COMPONENT_RPM (component))
     {
       table = self->rpm_components;
+      names = &self->rpm_component_names;
     }
   else if (MODULEMD_IS_COMPONENT_MODULE (component))
     {
       table = self->module_components;
+      names = &self->module_component_names;
     }
   else
     {
@@ -473,6 +736,7 @@ modulemd_module_stream_v2_add_component (ModulemdModuleStreamV2 *self,
   g_hash_table_replace (table,
                         g_strdup (modulemd_component_get_key (component)),
                         modulemd_component_copy (component, NULL));
+  modulemd_ordered_keys_invalidate (names);
 }
 
 
@@ -487,8 +751,13 @@ modulemd_module_stream_v2_remove_module_component (
     }
 
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_hash_table_remove (self->module_components, component_name);
+  modulemd_ordered_keys_invalidate (&self->module_component_names);
 }
 
 
@@ -497,8 +766,13 @@ modulemd_module_stream_v2_clear_module_components (
   ModulemdModuleStreamV2 *self)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_hash_table_remove_all (self->module_components);
+  modulemd_ordered_keys_invalidate (&self->module_component_names);
 }
 
 
@@ -513,8 +787,13 @@ modulemd_module_stream_v2_remove_rpm_component (ModulemdModuleStreamV2 *self,
     }
 
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_hash_table_remove (self->rpm_components, component_name);
+  modulemd_ordered_keys_invalidate (&self->rpm_component_names);
 }
 
 
@@ -522,8 +801,13 @@ void
 modulemd_module_stream_v2_clear_rpm_components (ModulemdModuleStreamV2 *self)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_hash_table_remove_all (self->rpm_components);
+  modulemd_ordered_keys_invalidate (&self->rpm_component_names);
 }
 
 
@@ -533,7 +817,8 @@ modulemd_module_stream_v2_get_module_component_names_as_strv (
 {
   g_return_val_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self), NULL);
 
-  return modulemd_ordered_str_keys_as_strv (self->module_components);
+  return modulemd_ordered_keys_as_strv (&self->module_component_names,
+                                        self->module_components);
 }
 
 
@@ -543,7 +828,8 @@ modulemd_module_stream_v2_get_rpm_component_names_as_strv (
 {
   g_return_val_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self), NULL);
 
-  return modulemd_ordered_str_keys_as_strv (self->rpm_components);
+  return modulemd_ordered_keys_as_strv (&self->rpm_component_names,
+                                        self->rpm_components);
 }
 
 
@@ -553,6 +839,8 @@ modulemd_module_stream_v2_get_module_component (ModulemdModuleStreamV2 *self,
 {
   g_return_val_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self), NULL);
 
+  modulemd_module_stream_expose_child (MODULEMD_MODULE_STREAM (self));
+
   return g_hash_table_lookup (self->module_components, component_name);
 }
 
@@ -563,6 +851,8 @@ modulemd_module_stream_v2_get_rpm_component (ModulemdModuleStreamV2 *self,
 {
   g_return_val_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self), NULL);
 
+  modulemd_module_stream_expose_child (MODULEMD_MODULE_STREAM (self));
+
   return g_hash_table_lookup (self->rpm_components, component_name);
 }
 
@@ -577,8 +867,12 @@ modulemd_module_stream_v2_add_content_license (ModulemdModuleStreamV2 *self,
     }
 
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
 
-  g_hash_table_add (self->content_licenses, g_strdup (license));
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
+
+  modulemd_string_set_add (&self->content_licenses, license);
 }
 
 
@@ -587,8 +881,12 @@ modulemd_module_stream_v2_replace_content_licenses (
   ModulemdModuleStreamV2 *self, GHashTable *set)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
-  MODULEMD_REPLACE_SET (self->content_licenses, set);
+  modulemd_string_set_replace (&self->content_licenses, set);
 }
 
 
@@ -602,8 +900,12 @@ modulemd_module_stream_v2_add_module_license (ModulemdModuleStreamV2 *self,
     }
 
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
 
-  g_hash_table_add (self->module_licenses, g_strdup (license));
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
+
+  modulemd_string_set_add (&self->module_licenses, license);
 }
 
 
@@ -612,8 +914,12 @@ modulemd_module_stream_v2_replace_module_licenses (
   ModulemdModuleStreamV2 *self, GHashTable *set)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
-  MODULEMD_REPLACE_SET (self->module_licenses, set);
+  modulemd_string_set_replace (&self->module_licenses, set);
 }
 
 
@@ -627,8 +933,12 @@ modulemd_module_stream_v2_remove_content_license (ModulemdModuleStreamV2 *self,
     }
 
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
 
-  g_hash_table_remove (self->content_licenses, license);
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
+
+  modulemd_string_set_remove (&self->content_licenses, license);
 }
 
 
@@ -642,8 +952,12 @@ modulemd_module_stream_v2_remove_module_license (ModulemdModuleStreamV2 *self,
     }
 
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
-  g_hash_table_remove (self->module_licenses, license);
+  modulemd_string_set_remove (&self->module_licenses, license);
 }
 
 
@@ -651,8 +965,12 @@ void
 modulemd_module_stream_v2_clear_content_licenses (ModulemdModuleStreamV2 *self)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
 
-  g_hash_table_remove_all (self->content_licenses);
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
+
+  modulemd_string_set_remove_all (&self->content_licenses);
 }
 
 
@@ -660,8 +978,12 @@ void
 modulemd_module_stream_v2_clear_module_licenses (ModulemdModuleStreamV2 *self)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
-  g_hash_table_remove_all (self->module_licenses);
+  modulemd_string_set_remove_all (&self->module_licenses);
 }
 
 
@@ -671,7 +993,7 @@ modulemd_module_stream_v2_get_content_licenses_as_strv (
 {
   g_return_val_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self), NULL);
 
-  return modulemd_ordered_str_keys_as_strv (self->content_licenses);
+  return modulemd_string_set_as_strv (&self->content_licenses);
 }
 
 
@@ -681,7 +1003,7 @@ modulemd_module_stream_v2_get_module_licenses_as_strv (
 {
   g_return_val_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self), NULL);
 
-  return modulemd_ordered_str_keys_as_strv (self->module_licenses);
+  return modulemd_string_set_as_strv (&self->module_licenses);
 }
 
 
@@ -695,6 +1017,10 @@ modulemd_module_stream_v2_add_profile (ModulemdModuleStreamV2 *self,
     }
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self));
   g_return_if_fail (MODULEMD_IS_PROFILE (profile));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   ModulemdProfile *copied_profile = modulemd_profile_copy (profile);
   modulemd_profile_set_owner (copied_profile, MODULEMD_MODULE_STREAM (self));
@@ -702,6 +1028,7 @@ modulemd_module_stream_v2_add_profile (ModulemdModuleStreamV2 *self,
   g_hash_table_replace (self->profiles,
                         g_strdup (modulemd_profile_get_name (profile)),
                         copied_profile);
+  modulemd_ordered_keys_invalidate (&self->profile_names);
 }
 
 
@@ -709,8 +1036,13 @@ void
 modulemd_module_stream_v2_clear_profiles (ModulemdModuleStreamV2 *self)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_hash_table_remove_all (self->profiles);
+  modulemd_ordered_keys_invalidate (&self->profile_names);
 }
 
 
@@ -720,7 +1052,7 @@ modulemd_module_stream_v2_get_profile_names_as_strv (
 {
   g_return_val_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self), NULL);
 
-  return modulemd_ordered_str_keys_as_strv (self->profiles);
+  return modulemd_ordered_keys_as_strv (&self->profile_names, self->profiles);
 }
 
 
@@ -730,6 +1062,8 @@ modulemd_module_stream_v2_get_profile (ModulemdModuleStreamV2 *self,
 {
   g_return_val_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self), NULL);
 
+  modulemd_module_stream_expose_child (MODULEMD_MODULE_STREAM (self));
+
   return g_hash_table_lookup (self->profiles, profile_name);
 }
 
@@ -744,8 +1078,12 @@ modulemd_module_stream_v2_add_rpm_api (ModulemdModuleStreamV2 *self,
     }
 
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
-  g_hash_table_add (self->rpm_api, g_strdup (rpm));
+  modulemd_string_set_add (&self->rpm_api, rpm);
 }
 
 
@@ -754,8 +1092,12 @@ modulemd_module_stream_v2_replace_rpm_api (ModulemdModuleStreamV2 *self,
                                            GHashTable *set)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
-  MODULEMD_REPLACE_SET (self->rpm_api, set);
+  modulemd_string_set_replace (&self->rpm_api, set);
 }
 
 
@@ -769,8 +1111,12 @@ modulemd_module_stream_v2_remove_rpm_api (ModulemdModuleStreamV2 *self,
     }
 
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
 
-  g_hash_table_remove (self->rpm_api, rpm);
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
+
+  modulemd_string_set_remove (&self->rpm_api, rpm);
 }
 
 
@@ -778,8 +1124,12 @@ void
 modulemd_module_stream_v2_clear_rpm_api (ModulemdModuleStreamV2 *self)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
-  g_hash_table_remove_all (self->rpm_api);
+  modulemd_string_set_remove_all (&self->rpm_api);
 }
 
 
@@ -788,7 +1138,7 @@ modulemd_module_stream_v2_get_rpm_api_as_strv (ModulemdModuleStreamV2 *self)
 {
   g_return_val_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self), NULL);
 
-  return modulemd_ordered_str_keys_as_strv (self->rpm_api);
+  return modulemd_string_set_as_strv (&self->rpm_api);
 }
 
 
@@ -802,8 +1152,12 @@ modulemd_module_stream_v2_add_rpm_artifact (ModulemdModuleStreamV2 *self,
     }
 
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
 
-  g_hash_table_add (self->rpm_artifacts, g_strdup (nevr));
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
+
+  modulemd_string_set_add (&self->rpm_artifacts, nevr);
 }
 
 
@@ -812,8 +1166,12 @@ modulemd_module_stream_v2_replace_rpm_artifacts (ModulemdModuleStreamV2 *self,
                                                  GHashTable *set)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
-  MODULEMD_REPLACE_SET (self->rpm_artifacts, set);
+  modulemd_string_set_replace (&self->rpm_artifacts, set);
 }
 
 
@@ -827,8 +1185,12 @@ modulemd_module_stream_v2_remove_rpm_artifact (ModulemdModuleStreamV2 *self,
     }
 
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
 
-  g_hash_table_remove (self->rpm_artifacts, nevr);
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
+
+  modulemd_string_set_remove (&self->rpm_artifacts, nevr);
 }
 
 
@@ -836,8 +1198,12 @@ void
 modulemd_module_stream_v2_clear_rpm_artifacts (ModulemdModuleStreamV2 *self)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
-  g_hash_table_remove_all (self->rpm_artifacts);
+  modulemd_string_set_remove_all (&self->rpm_artifacts);
 }
 
 
@@ -847,24 +1213,7 @@ modulemd_module_stream_v2_get_rpm_artifacts_as_strv (
 {
   g_return_val_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self), NULL);
 
-  return modulemd_ordered_str_keys_as_strv (self->rpm_artifacts);
-}
-
-
-static GHashTable *
-get_or_create_digest_table (ModulemdModuleStreamV2 *self, const gchar *digest)
-{
-  GHashTable *digest_table =
-    g_hash_table_lookup (self->rpm_artifact_map, digest);
-  if (digest_table == NULL)
-    {
-      digest_table = g_hash_table_new_full (
-        g_str_hash, g_str_equal, g_free, g_object_unref);
-      g_hash_table_insert (
-        self->rpm_artifact_map, g_strdup (digest), digest_table);
-    }
-
-  return digest_table;
+  return modulemd_string_set_as_strv (&self->rpm_artifacts);
 }
 
 
@@ -875,15 +1224,17 @@ modulemd_module_stream_v2_set_rpm_artifact_map_entry (
   const gchar *digest,
   const gchar *checksum)
 {
-  GHashTable *digest_table = NULL;
+  ModulemdRpmMapEntryFields fields;
 
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self));
   g_return_if_fail (entry && digest && checksum);
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
 
-  digest_table = get_or_create_digest_table (self, digest);
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
-  g_hash_table_insert (
-    digest_table, g_strdup (checksum), modulemd_rpm_map_entry_copy (entry));
+  modulemd_rpm_map_entry_get_fields (entry, &fields);
+  set_rpm_map_fields (self, digest, checksum, &fields);
 }
 
 
@@ -891,17 +1242,40 @@ ModulemdRpmMapEntry *
 modulemd_module_stream_v2_get_rpm_artifact_map_entry (
   ModulemdModuleStreamV2 *self, const gchar *digest, const gchar *checksum)
 {
-  GHashTable *digest_table = NULL;
+  RpmMapRecord *record = NULL;
+  ModulemdRpmMapEntry *entry = NULL;
+
   g_return_val_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self), NULL);
   g_return_val_if_fail (digest && checksum, NULL);
 
-  digest_table = g_hash_table_lookup (self->rpm_artifact_map, digest);
-  if (!digest_table)
+  modulemd_module_stream_expose_child (MODULEMD_MODULE_STREAM (self));
+
+  sort_rpm_artifact_map (self);
+  record = find_rpm_map_record (self, digest, checksum);
+  if (!record)
     {
       return NULL;
     }
 
-  return g_hash_table_lookup (digest_table, checksum);
+  entry = g_atomic_pointer_get (&record->entry);
+  if (!entry)
+    {
+      /* A frozen stream may be read from several threads at once, so only
+       * the first object created for this record is kept.
+       */
+      entry = modulemd_rpm_map_entry_new (record->fields.name,
+                                          record->fields.epoch,
+                                          record->fields.version,
+                                          record->fields.release,
+                                          record->fields.arch);
+      if (!g_atomic_pointer_compare_and_exchange (&record->entry, NULL, entry))
+        {
+          g_object_unref (entry);
+          entry = g_atomic_pointer_get (&record->entry);
+        }
+    }
+
+  return entry;
 }
 
 
@@ -915,8 +1289,12 @@ modulemd_module_stream_v2_add_rpm_filter (ModulemdModuleStreamV2 *self,
     }
 
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
-  g_hash_table_add (self->rpm_filters, g_strdup (rpm));
+  modulemd_string_set_add (&self->rpm_filters, rpm);
 }
 
 
@@ -925,8 +1303,12 @@ modulemd_module_stream_v2_replace_rpm_filters (ModulemdModuleStreamV2 *self,
                                                GHashTable *set)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
 
-  MODULEMD_REPLACE_SET (self->rpm_filters, set);
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
+
+  modulemd_string_set_replace (&self->rpm_filters, set);
 }
 
 
@@ -940,8 +1322,12 @@ modulemd_module_stream_v2_remove_rpm_filter (ModulemdModuleStreamV2 *self,
     }
 
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
-  g_hash_table_remove (self->rpm_filters, rpm);
+  modulemd_string_set_remove (&self->rpm_filters, rpm);
 }
 
 
@@ -949,8 +1335,12 @@ void
 modulemd_module_stream_v2_clear_rpm_filters (ModulemdModuleStreamV2 *self)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
 
-  g_hash_table_remove_all (self->rpm_filters);
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
+
+  modulemd_string_set_remove_all (&self->rpm_filters);
 }
 
 
@@ -960,7 +1350,7 @@ modulemd_module_stream_v2_get_rpm_filters_as_strv (
 {
   g_return_val_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self), NULL);
 
-  return modulemd_ordered_str_keys_as_strv (self->rpm_filters);
+  return modulemd_string_set_as_strv (&self->rpm_filters);
 }
 
 
@@ -974,11 +1364,16 @@ modulemd_module_stream_v2_add_servicelevel (ModulemdModuleStreamV2 *self,
     }
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self));
   g_return_if_fail (MODULEMD_IS_SERVICE_LEVEL (servicelevel));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_hash_table_replace (
     self->servicelevels,
     g_strdup (modulemd_service_level_get_name (servicelevel)),
     modulemd_service_level_copy (servicelevel));
+  modulemd_ordered_keys_invalidate (&self->servicelevel_names);
 }
 
 
@@ -986,8 +1381,13 @@ void
 modulemd_module_stream_v2_clear_servicelevels (ModulemdModuleStreamV2 *self)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_hash_table_remove_all (self->servicelevels);
+  modulemd_ordered_keys_invalidate (&self->servicelevel_names);
 }
 
 
@@ -997,7 +1397,8 @@ modulemd_module_stream_v2_get_servicelevel_names_as_strv (
 {
   g_return_val_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self), NULL);
 
-  return modulemd_ordered_str_keys_as_strv (self->servicelevels);
+  return modulemd_ordered_keys_as_strv (&self->servicelevel_names,
+                                        self->servicelevels);
 }
 
 
@@ -1007,6 +1408,8 @@ modulemd_module_stream_v2_get_servicelevel (ModulemdModuleStreamV2 *self,
 {
   g_return_val_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self), NULL);
 
+  modulemd_module_stream_expose_child (MODULEMD_MODULE_STREAM (self));
+
   return g_hash_table_lookup (self->servicelevels, servicelevel_name);
 }
 
@@ -1016,6 +1419,10 @@ modulemd_module_stream_v2_add_dependencies (ModulemdModuleStreamV2 *self,
                                             ModulemdDependencies *deps)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_ptr_array_add (self->dependencies, modulemd_dependencies_copy (deps));
 }
@@ -1027,6 +1434,10 @@ modulemd_module_stream_v2_replace_dependencies (ModulemdModuleStreamV2 *self,
 {
   gsize i;
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   for (i = 0; i < array->len; i++)
     {
@@ -1040,6 +1451,10 @@ void
 modulemd_module_stream_v2_clear_dependencies (ModulemdModuleStreamV2 *self)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   g_ptr_array_set_size (self->dependencies, 0);
 }
@@ -1059,6 +1474,10 @@ modulemd_module_stream_v2_remove_dependencies (ModulemdModuleStreamV2 *self,
 {
   guint index;
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   while (g_ptr_array_find_with_equal_func (
     self->dependencies, deps, dep_equal_wrapper, &index))
@@ -1073,6 +1492,8 @@ modulemd_module_stream_v2_get_dependencies (ModulemdModuleStreamV2 *self)
 {
   g_return_val_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self), NULL);
 
+  modulemd_module_stream_expose_child (MODULEMD_MODULE_STREAM (self));
+
   return self->dependencies;
 }
 
@@ -1081,6 +1502,10 @@ void
 modulemd_module_stream_v2_set_xmd (ModulemdModuleStreamV2 *self, GVariant *xmd)
 {
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self));
+  g_return_if_fail (
+    !modulemd_module_stream_is_frozen (MODULEMD_MODULE_STREAM (self)));
+
+  modulemd_module_stream_clear_validated (MODULEMD_MODULE_STREAM (self));
 
   /* Do nothing if we were passed the same pointer */
   if (self->xmd == xmd)
@@ -1103,10 +1528,7 @@ modulemd_module_stream_v2_get_xmd (ModulemdModuleStreamV2 *self)
 static gboolean
 modulemd_module_stream_v2_validate (ModulemdModuleStream *self, GError **error)
 {
-  GHashTableIter iter;
-  gpointer key;
-  gpointer value;
-  gchar *nevra = NULL;
+  const gchar *nevra = NULL;
   ModulemdModuleStreamV2 *v2_self = NULL;
   ModulemdDependencies *deps = NULL;
   g_autoptr (GError) nested_error = NULL;
@@ -1140,7 +1562,7 @@ modulemd_module_stream_v2_validate (ModulemdModuleStream *self, GError **error)
       return FALSE;
     }
 
-  if (!g_hash_table_size (v2_self->module_licenses))
+  if (!modulemd_string_set_size (&v2_self->module_licenses))
     {
       g_set_error (error,
                    MODULEMD_YAML_ERROR,
@@ -1177,19 +1599,14 @@ modulemd_module_stream_v2_validate (ModulemdModuleStream *self, GError **error)
   /* Iterate through the artifacts and validate that they are in the proper
    * NEVRA format
    */
-  g_hash_table_iter_init (&iter, v2_self->rpm_artifacts);
-  while (g_hash_table_iter_next (&iter, &key, &value))
+  if (!modulemd_validate_nevra_set (&v2_self->rpm_artifacts, &nevra))
     {
-      nevra = (gchar *)key;
-      if (!modulemd_validate_nevra (nevra))
-        {
-          g_set_error (error,
-                       MODULEMD_ERROR,
-                       MODULEMD_ERROR_VALIDATE,
-                       "Artifact '%s' was not in valid N-E:V-R.A format.",
-                       nevra);
-          return FALSE;
-        }
+      g_set_error (error,
+                   MODULEMD_ERROR,
+                   MODULEMD_ERROR_VALIDATE,
+                   "Artifact '%s' was not in valid N-E:V-R.A format.",
+                   nevra);
+      return FALSE;
     }
 
   /* Iterate through the Dependencies and validate them */
@@ -1287,29 +1704,19 @@ static void
 copy_rpm_artifact_map (ModulemdModuleStreamV2 *from,
                        ModulemdModuleStreamV2 *to)
 {
-  GHashTableIter outer;
-  GHashTableIter inner;
-  gpointer outer_key;
-  gpointer outer_value;
-  gpointer inner_key;
-  gpointer inner_value;
-  GHashTable *to_digest_table = NULL;
+  RpmMapRecord *record = NULL;
+  ModulemdRpmMapEntryFields fields;
 
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (from));
   g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (to));
 
-  g_hash_table_iter_init (&outer, from->rpm_artifact_map);
-  while (g_hash_table_iter_next (&outer, &outer_key, &outer_value))
-    {
-      to_digest_table = get_or_create_digest_table (to, outer_key);
+  sort_rpm_artifact_map (from);
 
-      g_hash_table_iter_init (&inner, (GHashTable *)outer_value);
-      while (g_hash_table_iter_next (&inner, &inner_key, &inner_value))
-        {
-          g_hash_table_insert (to_digest_table,
-                               g_strdup (inner_key),
-                               modulemd_rpm_map_entry_copy (inner_value));
-        }
+  for (guint i = 0; i < from->rpm_artifact_map->len; i++)
+    {
+      record = &g_array_index (from->rpm_artifact_map, RpmMapRecord, i);
+      rpm_map_record_get_fields (record, &fields);
+      set_rpm_map_fields (to, record->digest, record->checksum, &fields);
     }
 }
 
@@ -1337,11 +1744,12 @@ modulemd_module_stream_v2_copy (ModulemdModuleStream *self,
   STREAM_COPY_IF_SET (v2, copy, v2_self, tracker);
 
   /* Internal Data Structures: With replace function */
-  STREAM_REPLACE_HASHTABLE (v2, copy, v2_self, content_licenses);
-  STREAM_REPLACE_HASHTABLE (v2, copy, v2_self, module_licenses);
-  STREAM_REPLACE_HASHTABLE (v2, copy, v2_self, rpm_api);
-  STREAM_REPLACE_HASHTABLE (v2, copy, v2_self, rpm_artifacts);
-  STREAM_REPLACE_HASHTABLE (v2, copy, v2_self, rpm_filters);
+  modulemd_string_set_copy (&copy->content_licenses,
+                            &v2_self->content_licenses);
+  modulemd_string_set_copy (&copy->module_licenses, &v2_self->module_licenses);
+  modulemd_string_set_copy (&copy->rpm_api, &v2_self->rpm_api);
+  modulemd_string_set_copy (&copy->rpm_artifacts, &v2_self->rpm_artifacts);
+  modulemd_string_set_copy (&copy->rpm_filters, &v2_self->rpm_filters);
 
   /* Internal Data Structures: With add on value */
   COPY_HASHTABLE_BY_VALUE_ADDER (
@@ -1422,6 +1830,119 @@ modulemd_module_stream_v2_build_depends_on_stream (ModulemdModuleStream *self,
 }
 
 
+static void
+add_rpm_map_string_memory_usage (GHashTable *seen,
+                                 const gchar *str,
+                                 ModulemdMemoryUsage *usage)
+{
+  /* Count each of the shared strings only once */
+  if (str && g_hash_table_add (seen, (gpointer)str))
+    {
+      modulemd_memory_usage_add_string (usage, str);
+    }
+}
+
+
+static void
+add_rpm_map_memory_usage (ModulemdModuleStreamV2 *self,
+                          ModulemdMemoryUsage *usage)
+{
+  g_autoptr (GHashTable) seen = g_hash_table_new (NULL, NULL);
+  RpmMapRecord *record = NULL;
+
+  modulemd_memory_usage_add_object (
+    usage,
+    sizeof (GArray) + self->rpm_artifact_map->len * sizeof (RpmMapRecord));
+
+  for (guint i = 0; i < self->rpm_artifact_map->len; i++)
+    {
+      record = &g_array_index (self->rpm_artifact_map, RpmMapRecord, i);
+      add_rpm_map_string_memory_usage (seen, record->digest, usage);
+      add_rpm_map_string_memory_usage (seen, record->checksum, usage);
+      add_rpm_map_string_memory_usage (seen, record->fields.name, usage);
+      add_rpm_map_string_memory_usage (seen, record->fields.version, usage);
+      add_rpm_map_string_memory_usage (seen, record->fields.release, usage);
+      add_rpm_map_string_memory_usage (seen, record->fields.arch, usage);
+
+      if (record->entry)
+        {
+          modulemd_rpm_map_entry_add_memory_usage (record->entry, usage);
+        }
+    }
+}
+
+
+static void
+modulemd_module_stream_v2_add_memory_usage (ModulemdModuleStream *self,
+                                            ModulemdMemoryUsage *usage)
+{
+  ModulemdModuleStreamV2 *v2_self = MODULEMD_MODULE_STREAM_V2 (self);
+  guint64 before_rpm_map;
+  guint i;
+
+  modulemd_memory_usage_add_object (usage, sizeof (ModulemdModuleStreamV2));
+
+  if (v2_self->buildopts)
+    {
+      modulemd_buildopts_add_memory_usage (v2_self->buildopts, usage);
+    }
+
+  modulemd_memory_usage_add_string (usage, v2_self->community);
+  modulemd_memory_usage_add_string (usage, v2_self->description);
+  modulemd_memory_usage_add_string (usage, v2_self->documentation);
+  modulemd_memory_usage_add_string (usage, v2_self->summary);
+  modulemd_memory_usage_add_string (usage, v2_self->tracker);
+
+  modulemd_memory_usage_add_object_table (
+    usage,
+    v2_self->module_components,
+    (ModulemdMemoryUsageFunc)modulemd_component_module_add_memory_usage);
+  modulemd_memory_usage_add_object_table (
+    usage,
+    v2_self->rpm_components,
+    (ModulemdMemoryUsageFunc)modulemd_component_rpm_add_memory_usage);
+
+  modulemd_string_set_add_memory_usage (&v2_self->content_licenses, usage);
+  modulemd_string_set_add_memory_usage (&v2_self->module_licenses, usage);
+
+  modulemd_memory_usage_add_object_table (
+    usage,
+    v2_self->profiles,
+    (ModulemdMemoryUsageFunc)modulemd_profile_add_memory_usage);
+
+  modulemd_string_set_add_memory_usage (&v2_self->rpm_api, usage);
+  modulemd_string_set_add_memory_usage (&v2_self->rpm_artifacts, usage);
+
+  before_rpm_map = modulemd_memory_usage_get_total (usage);
+  add_rpm_map_memory_usage (v2_self, usage);
+  modulemd_memory_usage_add_rpm_artifact_map (
+    usage, modulemd_memory_usage_get_total (usage) - before_rpm_map);
+
+  modulemd_string_set_add_memory_usage (&v2_self->rpm_filters, usage);
+
+  modulemd_memory_usage_add_object_table (
+    usage,
+    v2_self->servicelevels,
+    (ModulemdMemoryUsageFunc)modulemd_service_level_add_memory_usage);
+
+  modulemd_memory_usage_add_ptr_array (usage, v2_self->dependencies);
+  for (i = 0; i < v2_self->dependencies->len; i++)
+    {
+      modulemd_dependencies_add_memory_usage (
+        g_ptr_array_index (v2_self->dependencies, i), usage);
+    }
+
+  modulemd_memory_usage_add_xmd (usage, v2_self->xmd);
+}
+
+
+static void
+modulemd_module_stream_v2_compact_stream (ModulemdModuleStream *self)
+{
+  modulemd_module_stream_v2_compact (MODULEMD_MODULE_STREAM_V2 (self));
+}
+
+
 static void
 modulemd_module_stream_v2_class_init (ModulemdModuleStreamV2Class *klass)
 {
@@ -1441,6 +1962,8 @@ modulemd_module_stream_v2_class_init (ModulemdModuleStreamV2Class *klass)
     modulemd_module_stream_v2_depends_on_stream;
   stream_class->build_depends_on_stream =
     modulemd_module_stream_v2_build_depends_on_stream;
+  stream_class->add_memory_usage = modulemd_module_stream_v2_add_memory_usage;
+  stream_class->compact = modulemd_module_stream_v2_compact_stream;
 
 
   properties[PROP_ARCH] = g_param_spec_string (
@@ -1493,25 +2016,22 @@ modulemd_module_stream_v2_init (ModulemdModuleStreamV2 *self)
     g_hash_table_new_full (g_str_hash, g_str_equal, g_free, g_object_unref);
 
 
-  self->content_licenses =
-    g_hash_table_new_full (g_str_hash, g_str_equal, g_free, NULL);
-  self->module_licenses =
-    g_hash_table_new_full (g_str_hash, g_str_equal, g_free, NULL);
+  modulemd_string_set_init (&self->content_licenses);
+  modulemd_string_set_init (&self->module_licenses);
 
   self->profiles =
     g_hash_table_new_full (g_str_hash, g_str_equal, g_free, g_object_unref);
 
-  self->rpm_api =
-    g_hash_table_new_full (g_str_hash, g_str_equal, g_free, NULL);
+  modulemd_string_set_init (&self->rpm_api);
 
-  self->rpm_artifacts =
-    g_hash_table_new_full (g_str_hash, g_str_equal, g_free, NULL);
+  modulemd_string_set_init (&self->rpm_artifacts);
 
-  self->rpm_artifact_map = g_hash_table_new_full (
-    g_str_hash, g_str_equal, g_free, modulemd_hash_table_unref);
+  self->rpm_artifact_map = g_array_new (FALSE, FALSE, sizeof (RpmMapRecord));
+  g_array_set_clear_func (self->rpm_artifact_map, rpm_map_record_clear);
+  self->rpm_artifact_map_strings = g_string_chunk_new (4096);
+  self->rpm_artifact_map_sorted = TRUE;
 
-  self->rpm_filters =
-    g_hash_table_new_full (g_str_hash, g_str_equal, g_free, NULL);
+  modulemd_string_set_init (&self->rpm_filters);
 
   self->servicelevels =
     g_hash_table_new_full (g_str_hash, g_str_equal, g_free, g_object_unref);
@@ -1856,10 +2376,47 @@ modulemd_module_stream_v2_parse_yaml (ModulemdSubdocumentInfo *subdoc,
       yaml_event_delete (&event);
     }
 
+  modulemd_module_stream_v2_compact (modulestream);
+
   return g_steal_pointer (&modulestream);
 }
 
 
+void
+modulemd_module_stream_v2_compact (ModulemdModuleStreamV2 *self)
+{
+  GHashTableIter iter;
+  gpointer value;
+
+  g_return_if_fail (MODULEMD_IS_MODULE_STREAM_V2 (self));
+
+  modulemd_string_set_compact (&self->content_licenses);
+  modulemd_string_set_compact (&self->module_licenses);
+  modulemd_string_set_compact (&self->rpm_api);
+  modulemd_string_set_compact (&self->rpm_artifacts);
+  modulemd_string_set_compact (&self->rpm_filters);
+
+  sort_rpm_artifact_map (self);
+
+  if (self->buildopts != NULL)
+    {
+      modulemd_buildopts_compact (self->buildopts);
+    }
+
+  g_hash_table_iter_init (&iter, self->profiles);
+  while (g_hash_table_iter_next (&iter, NULL, &value))
+    {
+      modulemd_profile_compact (MODULEMD_PROFILE (value));
+    }
+
+  modulemd_ordered_keys_get (&self->module_component_names,
+                             self->module_components);
+  modulemd_ordered_keys_get (&self->rpm_component_names, self->rpm_components);
+  modulemd_ordered_keys_get (&self->profile_names, self->profiles);
+  modulemd_ordered_keys_get (&self->servicelevel_names, self->servicelevels);
+}
+
+
 static gboolean
 modulemd_module_stream_v2_parse_licenses (yaml_parser_t *parser,
                                           ModulemdModuleStreamV2 *modulestream,
@@ -2660,7 +3217,7 @@ modulemd_module_stream_v2_parse_rpm_map_digest (
   gboolean done = FALSE;
   g_autoptr (GError) nested_error = NULL;
   const gchar *checksum = NULL;
-  g_autoptr (ModulemdRpmMapEntry) entry = NULL;
+  ModulemdRpmMapEntryFields fields;
 
   g_return_val_if_fail (error == NULL || *error == NULL, FALSE);
 
@@ -2689,18 +3246,18 @@ modulemd_module_stream_v2_parse_rpm_map_digest (
            */
           checksum = (const gchar *)event.data.scalar.value;
 
-          entry =
-            modulemd_rpm_map_entry_parse_yaml (parser, strict, &nested_error);
-          if (!entry)
+          if (!modulemd_rpm_map_entry_parse_yaml_fields (
+                parser,
+                strict,
+                modulestream->rpm_artifact_map_strings,
+                &fields,
+                &nested_error))
             {
               g_propagate_error (error, g_steal_pointer (&nested_error));
               return FALSE;
             }
 
-          modulemd_module_stream_v2_set_rpm_artifact_map_entry (
-            modulestream, entry, digest, checksum);
-
-          g_clear_object (&entry);
+          set_rpm_map_fields (modulestream, digest, checksum, &fields);
           break;
 
         default:
@@ -2787,7 +3344,7 @@ modulemd_module_stream_v2_emit_yaml (ModulemdModuleStreamV2 *self,
                                       self->servicelevels,
                                       modulemd_service_level_emit_yaml);
 
-  if (!NON_EMPTY_TABLE (self->module_licenses))
+  if (modulemd_string_set_size (&self->module_licenses) == 0)
     {
       g_set_error (error,
                    MODULEMD_YAML_ERROR,
@@ -2798,9 +3355,10 @@ modulemd_module_stream_v2_emit_yaml (ModulemdModuleStreamV2 *self,
 
   EMIT_SCALAR (emitter, error, "license");
   EMIT_MAPPING_START (emitter, error);
-  EMIT_STRING_SET (emitter, error, "module", self->module_licenses);
-  EMIT_STRING_SET_IF_NON_EMPTY (
-    emitter, error, "content", self->content_licenses);
+  EMIT_MODULEMD_STRING_SET_IF_NON_EMPTY (
+    emitter, error, "module", &self->module_licenses);
+  EMIT_MODULEMD_STRING_SET_IF_NON_EMPTY (
+    emitter, error, "content", &self->content_licenses);
   EMIT_MAPPING_END (emitter, error);
 
   if (self->xmd != NULL)
@@ -2832,19 +3390,21 @@ modulemd_module_stream_v2_emit_yaml (ModulemdModuleStreamV2 *self,
   EMIT_HASHTABLE_VALUES_IF_NON_EMPTY (
     emitter, error, "profiles", self->profiles, modulemd_profile_emit_yaml);
 
-  if (NON_EMPTY_TABLE (self->rpm_api))
+  if (modulemd_string_set_size (&self->rpm_api) != 0)
     {
       EMIT_SCALAR (emitter, error, "api");
       EMIT_MAPPING_START (emitter, error);
-      EMIT_STRING_SET (emitter, error, "rpms", self->rpm_api);
+      EMIT_MODULEMD_STRING_SET_IF_NON_EMPTY (
+        emitter, error, "rpms", &self->rpm_api);
       EMIT_MAPPING_END (emitter, error);
     }
 
-  if (NON_EMPTY_TABLE (self->rpm_filters))
+  if (modulemd_string_set_size (&self->rpm_filters) != 0)
     {
       EMIT_SCALAR (emitter, error, "filter");
       EMIT_MAPPING_START (emitter, error);
-      EMIT_STRING_SET (emitter, error, "rpms", self->rpm_filters);
+      EMIT_MODULEMD_STRING_SET_IF_NON_EMPTY (
+        emitter, error, "rpms", &self->rpm_filters);
       EMIT_MAPPING_END (emitter, error);
     }
 
@@ -2877,15 +3437,15 @@ modulemd_module_stream_v2_emit_yaml (ModulemdModuleStreamV2 *self,
       EMIT_MAPPING_END (emitter, error);
     }
 
-  if (NON_EMPTY_TABLE (self->rpm_artifacts) ||
-      NON_EMPTY_TABLE (self->rpm_artifact_map))
+  if (modulemd_string_set_size (&self->rpm_artifacts) != 0 ||
+      self->rpm_artifact_map->len > 0)
     {
       EMIT_SCALAR (emitter, error, "artifacts");
       EMIT_MAPPING_START (emitter, error);
 
       /* Emit the rpm artifacts */
-      EMIT_STRING_SET_IF_NON_EMPTY (
-        emitter, error, "rpms", self->rpm_artifacts);
+      EMIT_MODULEMD_STRING_SET_IF_NON_EMPTY (
+        emitter, error, "rpms", &self->rpm_artifacts);
 
       /* Emit the rpm-map */
       if (!modulemd_module_stream_v2_emit_rpm_map (self, emitter, error))
@@ -2914,55 +3474,50 @@ modulemd_module_stream_v2_emit_rpm_map (ModulemdModuleStreamV2 *self,
                                         yaml_emitter_t *emitter,
                                         GError **error)
 {
-  GHashTable *digest_table = NULL;
-  g_autoptr (GPtrArray) digests = NULL;
+  RpmMapRecord *record = NULL;
   const gchar *digest = NULL;
-  g_autoptr (GPtrArray) checksums = NULL;
-  const gchar *checksum = NULL;
-  ModulemdRpmMapEntry *entry = NULL;
+  ModulemdRpmMapEntryFields fields;
 
-  if (!NON_EMPTY_TABLE (self->rpm_artifact_map))
+  if (self->rpm_artifact_map->len == 0)
     {
       /* Nothing to output here */
       return TRUE;
     }
 
-  digests =
-    modulemd_ordered_str_keys (self->rpm_artifact_map, modulemd_strcmp_sort);
+  sort_rpm_artifact_map (self);
 
   EMIT_SCALAR (emitter, error, "rpm-map");
   EMIT_MAPPING_START (emitter, error);
 
-  for (guint i = 0; i < digests->len; i++)
+  for (guint i = 0; i < self->rpm_artifact_map->len; i++)
     {
-      digest = g_ptr_array_index (digests, i);
-      EMIT_SCALAR (emitter, error, digest);
-
-      digest_table = g_hash_table_lookup (self->rpm_artifact_map, digest);
-
-      EMIT_MAPPING_START (emitter, error);
-
-      checksums =
-        modulemd_ordered_str_keys (digest_table, modulemd_strcmp_sort);
+      record = &g_array_index (self->rpm_artifact_map, RpmMapRecord, i);
 
-      for (guint j = 0; j < digests->len; j++)
+      /* The records are sorted, so each digest is one contiguous run */
+      if (!digest || !g_str_equal (digest, record->digest))
         {
-          checksum = g_ptr_array_index (checksums, j);
-          EMIT_SCALAR (emitter, error, checksum);
-
-          entry = g_hash_table_lookup (digest_table, checksum);
-
-          if (!modulemd_rpm_map_entry_emit_yaml (entry, emitter, error))
+          if (digest)
             {
-              return FALSE;
+              EMIT_MAPPING_END (emitter, error);
             }
+
+          digest = record->digest;
+          EMIT_SCALAR (emitter, error, digest);
+          EMIT_MAPPING_START (emitter, error);
         }
 
-      EMIT_MAPPING_END (emitter, error);
+      EMIT_SCALAR (emitter, error, record->checksum);
 
-      g_clear_pointer (&checksums, g_ptr_array_unref);
+      rpm_map_record_get_fields (record, &fields);
+      if (!modulemd_rpm_map_entry_emit_yaml_fields (&fields, emitter, error))
+        {
+          return FALSE;
+        }
     }
 
+  /* The last digest */
+  EMIT_MAPPING_END (emitter, error);
+
   EMIT_MAPPING_END (emitter, error);
 
   return TRUE;
@@ -16,6 +16,7 @@
 #include "modulemd-module-stream-v2.h"
 #include "modulemd-module-stream.h"
 #include "private/modulemd-component-private.h"
+#include "private/modulemd-memory-usage-private.h"
 #include "private/modulemd-module-stream-private.h"
 #include "private/modulemd-module-stream-v1-private.h"
 #include "private/modulemd-module-stream-v2-private.h"
@@ -33,12 +34,39 @@ typedef struct
   gchar *context;
   gchar *arch;
   ModulemdTranslation *translation;
+
+  /* TRUE if the last call to modulemd_module_stream_validate() succeeded and
+   * the stream has not been modified since.
+   */
+  gboolean validated;
+
+  /* TRUE once a child object that the caller may modify has been handed out.
+   * Changes made through it cannot be seen here, so the result of a
+   * validation is no longer remembered.
+   */
+  gboolean children_exposed;
+
+  /* The SHA-256 checksum of the emitted YAML document, or NULL if it has not
+   * been computed since the stream was last modified.
+   */
+  gchar *fingerprint;
+
+  /* TRUE once modulemd_module_stream_freeze() has been called */
+  gboolean frozen;
 } ModulemdModuleStreamPrivate;
 
 G_DEFINE_ABSTRACT_TYPE_WITH_PRIVATE (ModulemdModuleStream,
                                      modulemd_module_stream,
                                      G_TYPE_OBJECT)
 
+
+static void
+stream_modified (ModulemdModuleStreamPrivate *priv)
+{
+  priv->validated = FALSE;
+  g_clear_pointer (&priv->fingerprint, g_free);
+}
+
 enum
 {
   PROP_0,
@@ -310,6 +338,7 @@ modulemd_module_stream_finalize (GObject *object)
   g_clear_pointer (&priv->context, g_free);
   g_clear_pointer (&priv->arch, g_free);
   g_clear_pointer (&priv->translation, g_object_unref);
+  g_clear_pointer (&priv->fingerprint, g_free);
 
   G_OBJECT_CLASS (modulemd_module_stream_parent_class)->finalize (object);
 }
@@ -358,6 +387,8 @@ modulemd_module_stream_equals (ModulemdModuleStream *self_1,
                                ModulemdModuleStream *self_2)
 {
   ModulemdModuleStreamClass *klass;
+  ModulemdModuleStreamPrivate *priv_1 = NULL;
+  ModulemdModuleStreamPrivate *priv_2 = NULL;
 
   if (!self_1 && !self_2)
     {
@@ -372,6 +403,19 @@ modulemd_module_stream_equals (ModulemdModuleStream *self_1,
   g_return_val_if_fail (MODULEMD_IS_MODULE_STREAM (self_1), FALSE);
   g_return_val_if_fail (MODULEMD_IS_MODULE_STREAM (self_2), FALSE);
 
+  /* A cached fingerprint is dropped whenever the stream is modified and is
+   * never kept once a child has been handed out, so two streams that both
+   * have one are compared by their fingerprints alone.
+   */
+  priv_1 = modulemd_module_stream_get_instance_private (self_1);
+  priv_2 = modulemd_module_stream_get_instance_private (self_2);
+  if (priv_1->fingerprint && priv_2->fingerprint &&
+      modulemd_module_stream_get_mdversion (self_1) ==
+        modulemd_module_stream_get_mdversion (self_2))
+    {
+      return g_str_equal (priv_1->fingerprint, priv_2->fingerprint);
+    }
+
   klass = MODULEMD_MODULE_STREAM_GET_CLASS (self_1);
   g_return_val_if_fail (klass->equals, FALSE);
 
@@ -436,6 +480,9 @@ modulemd_module_stream_copy (ModulemdModuleStream *self,
                              const gchar *module_stream)
 {
   ModulemdModuleStreamClass *klass;
+  ModulemdModuleStreamPrivate *priv = NULL;
+  ModulemdModuleStream *copy = NULL;
+  g_autofree gchar *fingerprint = NULL;
 
   if (!self)
     {
@@ -447,7 +494,36 @@ modulemd_module_stream_copy (ModulemdModuleStream *self,
   klass = MODULEMD_MODULE_STREAM_GET_CLASS (self);
   g_return_val_if_fail (klass->copy, NULL);
 
-  return klass->copy (self, module_name, module_stream);
+  priv = modulemd_module_stream_get_instance_private (self);
+  fingerprint = g_strdup (priv->fingerprint);
+
+  copy = klass->copy (self, module_name, module_stream);
+
+  /* The module and stream names are not subject to validation, so an exact
+   * copy of a validated stream is still valid.
+   */
+  if (copy && modulemd_module_stream_is_validated (self))
+    {
+      ModulemdModuleStreamPrivate *copy_priv =
+        modulemd_module_stream_get_instance_private (copy);
+      copy_priv->validated = TRUE;
+    }
+
+  /* The names are part of the emitted document, so the fingerprint only
+   * carries over to a copy that keeps them.
+   */
+  if (copy && fingerprint &&
+      g_strcmp0 (modulemd_module_stream_get_module_name (copy),
+                 priv->module_name) == 0 &&
+      g_strcmp0 (modulemd_module_stream_get_stream_name (copy),
+                 priv->stream_name) == 0)
+    {
+      ModulemdModuleStreamPrivate *copy_priv =
+        modulemd_module_stream_get_instance_private (copy);
+      copy_priv->fingerprint = g_steal_pointer (&fingerprint);
+    }
+
+  return copy;
 }
 
 
@@ -798,6 +874,7 @@ gboolean
 modulemd_module_stream_validate (ModulemdModuleStream *self, GError **error)
 {
   ModulemdModuleStreamClass *klass;
+  ModulemdModuleStreamPrivate *priv = NULL;
 
   if (!self)
     {
@@ -806,10 +883,207 @@ modulemd_module_stream_validate (ModulemdModuleStream *self, GError **error)
 
   g_return_val_if_fail (MODULEMD_IS_MODULE_STREAM (self), FALSE);
 
+  priv = modulemd_module_stream_get_instance_private (self);
+  if (priv->validated)
+    {
+      return TRUE;
+    }
+
   klass = MODULEMD_MODULE_STREAM_GET_CLASS (self);
   g_return_val_if_fail (klass->validate, FALSE);
 
-  return klass->validate (self, error);
+  if (!klass->validate (self, error))
+    {
+      return FALSE;
+    }
+
+  if (!priv->frozen && !priv->children_exposed)
+    {
+      priv->validated = TRUE;
+    }
+  return TRUE;
+}
+
+
+gboolean
+modulemd_module_stream_is_validated (ModulemdModuleStream *self)
+{
+  g_return_val_if_fail (MODULEMD_IS_MODULE_STREAM (self), FALSE);
+
+  ModulemdModuleStreamPrivate *priv =
+    modulemd_module_stream_get_instance_private (self);
+
+  return priv->validated;
+}
+
+
+void
+modulemd_module_stream_clear_validated (ModulemdModuleStream *self)
+{
+  g_return_if_fail (MODULEMD_IS_MODULE_STREAM (self));
+
+  ModulemdModuleStreamPrivate *priv =
+    modulemd_module_stream_get_instance_private (self);
+
+  g_return_if_fail (!priv->frozen);
+
+  stream_modified (priv);
+}
+
+
+void
+modulemd_module_stream_expose_child (ModulemdModuleStream *self)
+{
+  g_return_if_fail (MODULEMD_IS_MODULE_STREAM (self));
+
+  ModulemdModuleStreamPrivate *priv =
+    modulemd_module_stream_get_instance_private (self);
+
+  if (!priv->frozen)
+    {
+      priv->children_exposed = TRUE;
+      stream_modified (priv);
+    }
+}
+
+
+static gchar *
+compute_fingerprint (ModulemdModuleStream *self, GError **error)
+{
+  gboolean emitted = FALSE;
+  g_autoptr (GChecksum) checksum = g_checksum_new (G_CHECKSUM_SHA256);
+  MMD_INIT_YAML_EMITTER (emitter);
+  yaml_emitter_set_output (&emitter, write_yaml_checksum, checksum);
+
+  if (!mmd_emitter_start_stream (&emitter, error))
+    {
+      return NULL;
+    }
+
+  switch (modulemd_module_stream_get_mdversion (self))
+    {
+    case MD_MODULESTREAM_VERSION_ONE:
+      emitted = modulemd_module_stream_v1_emit_yaml (
+        MODULEMD_MODULE_STREAM_V1 (self), &emitter, error);
+      break;
+
+    case MD_MODULESTREAM_VERSION_TWO:
+      emitted = modulemd_module_stream_v2_emit_yaml (
+        MODULEMD_MODULE_STREAM_V2 (self), &emitter, error);
+      break;
+
+    default:
+      g_set_error_literal (error,
+                           MODULEMD_ERROR,
+                           MODULEMD_ERROR_VALIDATE,
+                           "Provided stream is not a recognized version");
+      break;
+    }
+
+  if (!emitted || !mmd_emitter_end_stream (&emitter, error))
+    {
+      return NULL;
+    }
+
+  return g_strdup (g_checksum_get_string (checksum));
+}
+
+
+gchar *
+modulemd_module_stream_get_fingerprint (ModulemdModuleStream *self,
+                                        GError **error)
+{
+  ModulemdModuleStreamPrivate *priv = NULL;
+
+  g_return_val_if_fail (MODULEMD_IS_MODULE_STREAM (self), NULL);
+
+  priv = modulemd_module_stream_get_instance_private (self);
+
+  if (priv->fingerprint)
+    {
+      return g_strdup (priv->fingerprint);
+    }
+
+  /* A frozen stream whose fingerprint could not be computed by
+   * modulemd_module_stream_freeze() must not be written to. Nor is the
+   * fingerprint remembered once a child that may still be modified has been
+   * handed out.
+   */
+  if (priv->frozen || priv->children_exposed)
+    {
+      return compute_fingerprint (self, error);
+    }
+
+  priv->fingerprint = compute_fingerprint (self, error);
+  return g_strdup (priv->fingerprint);
+}
+
+
+void
+modulemd_module_stream_cache_fingerprint (ModulemdModuleStream *self)
+{
+  g_return_if_fail (MODULEMD_IS_MODULE_STREAM (self));
+
+  ModulemdModuleStreamPrivate *priv =
+    modulemd_module_stream_get_instance_private (self);
+
+  if (priv->fingerprint || priv->frozen || priv->children_exposed)
+    {
+      return;
+    }
+
+  priv->fingerprint = compute_fingerprint (self, NULL);
+}
+
+
+const gchar *
+modulemd_module_stream_peek_fingerprint (ModulemdModuleStream *self)
+{
+  g_return_val_if_fail (MODULEMD_IS_MODULE_STREAM (self), NULL);
+
+  ModulemdModuleStreamPrivate *priv =
+    modulemd_module_stream_get_instance_private (self);
+
+  return priv->fingerprint;
+}
+
+
+void
+modulemd_module_stream_freeze (ModulemdModuleStream *self)
+{
+  g_return_if_fail (MODULEMD_IS_MODULE_STREAM (self));
+
+  ModulemdModuleStreamClass *klass = MODULEMD_MODULE_STREAM_GET_CLASS (self);
+  ModulemdModuleStreamPrivate *priv =
+    modulemd_module_stream_get_instance_private (self);
+
+  /* Validate now, so that later calls to modulemd_module_stream_validate()
+   * either return the cached result or fail again without writing to the
+   * stream. Children handed out earlier must not be modified any more either.
+   */
+  priv->children_exposed = FALSE;
+  modulemd_module_stream_validate (self, NULL);
+  if (klass->compact)
+    {
+      klass->compact (self);
+    }
+  if (priv->fingerprint == NULL)
+    {
+      priv->fingerprint = compute_fingerprint (self, NULL);
+    }
+  priv->frozen = TRUE;
+}
+
+
+gboolean
+modulemd_module_stream_is_frozen (ModulemdModuleStream *self)
+{
+  g_return_val_if_fail (MODULEMD_IS_MODULE_STREAM (self), FALSE);
+
+  ModulemdModuleStreamPrivate *priv =
+    modulemd_module_stream_get_instance_private (self);
+
+  return priv->frozen;
 }
 
 
@@ -841,6 +1115,9 @@ modulemd_module_stream_set_module_name (ModulemdModuleStream *self,
   ModulemdModuleStreamPrivate *priv =
     modulemd_module_stream_get_instance_private (self);
 
+  g_return_if_fail (!priv->frozen);
+
+  stream_modified (priv);
   g_clear_pointer (&priv->module_name, g_free);
   priv->module_name = g_strdup (module_name);
 
@@ -869,6 +1146,9 @@ modulemd_module_stream_set_stream_name (ModulemdModuleStream *self,
   ModulemdModuleStreamPrivate *priv =
     modulemd_module_stream_get_instance_private (self);
 
+  g_return_if_fail (!priv->frozen);
+
+  stream_modified (priv);
   g_clear_pointer (&priv->stream_name, g_free);
   priv->stream_name = g_strdup (stream_name);
 
@@ -897,6 +1177,9 @@ modulemd_module_stream_set_version (ModulemdModuleStream *self,
   ModulemdModuleStreamPrivate *priv =
     modulemd_module_stream_get_instance_private (self);
 
+  g_return_if_fail (!priv->frozen);
+
+  stream_modified (priv);
   priv->version = version;
 
   g_object_notify_by_pspec (G_OBJECT (self), properties[PROP_VERSION]);
@@ -924,6 +1207,9 @@ modulemd_module_stream_set_context (ModulemdModuleStream *self,
   ModulemdModuleStreamPrivate *priv =
     modulemd_module_stream_get_instance_private (self);
 
+  g_return_if_fail (!priv->frozen);
+
+  stream_modified (priv);
   g_clear_pointer (&priv->context, g_free);
   priv->context = g_strdup (context);
   g_object_notify_by_pspec (G_OBJECT (self), properties[PROP_CONTEXT]);
@@ -950,6 +1236,9 @@ modulemd_module_stream_set_arch (ModulemdModuleStream *self, const gchar *arch)
   ModulemdModuleStreamPrivate *priv =
     modulemd_module_stream_get_instance_private (self);
 
+  g_return_if_fail (!priv->frozen);
+
+  stream_modified (priv);
   g_clear_pointer (&priv->arch, g_free);
   priv->arch = g_strdup (arch);
   g_object_notify_by_pspec (G_OBJECT (self), properties[PROP_CONTEXT]);
@@ -1356,3 +1645,42 @@ modulemd_module_stream_build_depends_on_stream (ModulemdModuleStream *self,
 
   return klass->build_depends_on_stream (self, module_name, stream_name);
 }
+
+
+void
+modulemd_module_stream_add_memory_usage (ModulemdModuleStream *self,
+                                         ModulemdMemoryUsage *usage)
+{
+  ModulemdModuleStreamClass *klass;
+  ModulemdModuleStreamPrivate *priv =
+    modulemd_module_stream_get_instance_private (self);
+
+  klass = MODULEMD_MODULE_STREAM_GET_CLASS (self);
+  g_return_if_fail (klass->add_memory_usage);
+
+  /* The translation is a reference shared with the ModulemdModule that owns
+   * this stream, so it is counted there instead.
+   */
+  modulemd_memory_usage_add_object (usage,
+                                    sizeof (ModulemdModuleStreamPrivate));
+  modulemd_memory_usage_add_string (usage, priv->module_name);
+  modulemd_memory_usage_add_string (usage, priv->stream_name);
+  modulemd_memory_usage_add_string (usage, priv->context);
+  modulemd_memory_usage_add_string (usage, priv->arch);
+
+  klass->add_memory_usage (self, usage);
+}
+
+
+ModulemdMemoryUsage *
+modulemd_module_stream_get_memory_usage (ModulemdModuleStream *self)
+{
+  g_autoptr (ModulemdMemoryUsage) usage = NULL;
+
+  g_return_val_if_fail (MODULEMD_IS_MODULE_STREAM (self), NULL);
+
+  usage = modulemd_memory_usage_new ();
+  modulemd_module_stream_add_memory_usage (self, usage);
+
+  return g_steal_pointer (&usage);
+}
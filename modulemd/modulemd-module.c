@@ -17,6 +17,9 @@
 #include "modulemd-errors.h"
 #include "modulemd-module.h"
 #include "private/glib-extensions.h"
+#include "private/modulemd-defaults-private.h"
+#include "private/modulemd-defaults-v1-private.h"
+#include "private/modulemd-memory-usage-private.h"
 #include "private/modulemd-module-private.h"
 #include "private/modulemd-module-stream-private.h"
 #include "private/modulemd-translation-private.h"
@@ -32,6 +35,9 @@ struct _ModulemdModule
   GPtrArray *streams;
   ModulemdDefaults *defaults;
   GHashTable *translations;
+
+  /* TRUE once modulemd_module_freeze() has been called */
+  gboolean frozen;
 };
 
 G_DEFINE_TYPE (ModulemdModule, modulemd_module, G_TYPE_OBJECT)
@@ -193,6 +199,7 @@ modulemd_module_set_defaults (ModulemdModule *self,
   g_autoptr (ModulemdDefaults) upgraded_defaults = NULL;
   g_autoptr (GError) nested_error = NULL;
   g_return_val_if_fail (MODULEMD_IS_MODULE (self), MD_DEFAULTS_VERSION_ERROR);
+  g_return_val_if_fail (!self->frozen, MD_DEFAULTS_VERSION_ERROR);
 
   g_clear_object (&self->defaults);
   if (defaults == NULL)
@@ -268,6 +275,7 @@ modulemd_module_add_stream (ModulemdModule *self,
                             GError **error)
 {
   ModulemdModuleStream *old = NULL;
+  g_autoptr (ModulemdModuleStream) upgraded_old = NULL;
   ModulemdTranslation *translation = NULL;
   ModulemdModuleStream *newstream = NULL;
   g_autoptr (GError) nested_error = NULL;
@@ -276,6 +284,7 @@ modulemd_module_add_stream (ModulemdModule *self,
 
   g_return_val_if_fail (MODULEMD_IS_MODULE (self),
                         MD_MODULESTREAM_VERSION_ERROR);
+  g_return_val_if_fail (!self->frozen, MD_MODULESTREAM_VERSION_ERROR);
   g_return_val_if_fail (MODULEMD_IS_MODULE_STREAM (stream),
                         MD_MODULESTREAM_VERSION_ERROR);
 
@@ -332,7 +341,31 @@ modulemd_module_add_stream (ModulemdModule *self,
        * favor of the new one.
        */
 
-      if (!modulemd_module_stream_equals (old, stream))
+      if (modulemd_module_stream_get_mdversion (old) <
+          modulemd_module_stream_get_mdversion (stream))
+        {
+          /* The index defers upgrading the streams it already holds while it
+           * reads a file, so compare the new stream with an upgraded copy.
+           */
+          upgraded_old = modulemd_module_stream_upgrade (
+            old, modulemd_module_stream_get_mdversion (stream), &nested_error);
+          if (!upgraded_old)
+            {
+              g_propagate_error (error, g_steal_pointer (&nested_error));
+              return MD_MODULESTREAM_VERSION_ERROR;
+            }
+        }
+
+      /* Repositories that overlap repeat the same streams, so compare them
+       * by fingerprint. The fingerprint of @stream carries over to the copy
+       * kept below, ready for the next duplicate.
+       */
+      modulemd_module_stream_cache_fingerprint (upgraded_old ? upgraded_old :
+                                                               old);
+      modulemd_module_stream_cache_fingerprint (stream);
+
+      if (!modulemd_module_stream_equals (upgraded_old ? upgraded_old : old,
+                                          stream))
         {
           /* The two streams have matching NSVCA, but differ in content */
           g_set_error (error,
@@ -555,6 +588,60 @@ modulemd_module_search_streams (ModulemdModule *self,
 }
 
 
+GPtrArray *
+modulemd_module_search_streams_by_glob (ModulemdModule *self,
+                                        const gchar *stream_name,
+                                        const gchar *version,
+                                        const gchar *context,
+                                        const gchar *arch)
+{
+  g_autoptr (GPtrArray) matching_streams = NULL;
+  ModulemdModuleStream *under_consideration = NULL;
+  gchar version_str[G_ASCII_DTOSTR_BUF_SIZE];
+
+  g_return_val_if_fail (MODULEMD_IS_MODULE (self), NULL);
+
+  matching_streams = g_ptr_array_sized_new (self->streams->len);
+
+  for (guint i = 0; i < self->streams->len; i++)
+    {
+      under_consideration =
+        (ModulemdModuleStream *)g_ptr_array_index (self->streams, i);
+
+      if (!modulemd_glob_match (
+            stream_name,
+            modulemd_module_stream_get_stream_name (under_consideration)) ||
+          !modulemd_glob_match (
+            context,
+            modulemd_module_stream_get_context (under_consideration)) ||
+          !modulemd_glob_match (
+            arch, modulemd_module_stream_get_arch (under_consideration)))
+        {
+          continue;
+        }
+
+      if (version)
+        {
+          g_snprintf (
+            version_str,
+            sizeof (version_str),
+            "%" G_GUINT64_FORMAT,
+            modulemd_module_stream_get_version (under_consideration));
+          if (!g_pattern_match_simple (version, version_str))
+            {
+              continue;
+            }
+        }
+
+      g_ptr_array_add (matching_streams, under_consideration);
+    }
+
+  g_ptr_array_sort (matching_streams, compare_streams);
+
+  return g_steal_pointer (&matching_streams);
+}
+
+
 ModulemdModuleStream *
 modulemd_module_get_stream_by_NSVCA (ModulemdModule *self,
                                      const gchar *stream_name,
@@ -664,8 +751,12 @@ modulemd_module_remove_streams_by_NSVCA (ModulemdModule *self,
 {
   gboolean found = FALSE;
   guint index;
-  g_autoptr (modulemd_nsvca) nsvca = g_malloc0_n (1, sizeof (modulemd_nsvca));
+  g_autoptr (modulemd_nsvca) nsvca = NULL;
 
+  g_return_if_fail (MODULEMD_IS_MODULE (self));
+  g_return_if_fail (!self->frozen);
+
+  nsvca = g_malloc0_n (1, sizeof (modulemd_nsvca));
   nsvca->stream_name = stream_name;
   nsvca->version = version;
   nsvca->context = context;
@@ -687,6 +778,34 @@ modulemd_module_remove_streams_by_NSVCA (ModulemdModule *self,
 }
 
 
+void
+modulemd_module_remove_streams_in_set (ModulemdModule *self,
+                                       GHashTable *nsvcas)
+{
+  guint i = 0;
+  ModulemdModuleStream *stream = NULL;
+
+  g_return_if_fail (MODULEMD_IS_MODULE (self));
+  g_return_if_fail (!self->frozen);
+
+  while (i < self->streams->len)
+    {
+      g_autofree gchar *nsvca = NULL;
+
+      stream = (ModulemdModuleStream *)g_ptr_array_index (self->streams, i);
+      nsvca = modulemd_module_stream_get_NSVCA_as_string (stream);
+
+      if (g_hash_table_contains (nsvcas, nsvca))
+        {
+          g_ptr_array_remove_index (self->streams, i);
+          continue;
+        }
+
+      i++;
+    }
+}
+
+
 void
 modulemd_module_add_translation (ModulemdModule *self,
                                  ModulemdTranslation *translation)
@@ -695,6 +814,7 @@ modulemd_module_add_translation (ModulemdModule *self,
   ModulemdModuleStream *stream = NULL;
   ModulemdTranslation *newtrans = NULL;
 
+  g_return_if_fail (!self->frozen);
   g_return_if_fail (
     g_str_equal (modulemd_translation_get_module_name (translation),
                  modulemd_module_get_module_name (self)));
@@ -721,6 +841,36 @@ modulemd_module_add_translation (ModulemdModule *self,
 }
 
 
+gboolean
+modulemd_module_remove_translation (ModulemdModule *self,
+                                    const gchar *module_stream)
+{
+  gsize i;
+  ModulemdModuleStream *stream = NULL;
+
+  g_return_val_if_fail (MODULEMD_IS_MODULE (self), FALSE);
+  g_return_val_if_fail (!self->frozen, FALSE);
+
+  if (!g_hash_table_remove (self->translations, module_stream))
+    {
+      return FALSE;
+    }
+
+  for (i = 0; i < self->streams->len; i++)
+    {
+      stream = (ModulemdModuleStream *)g_ptr_array_index (self->streams, i);
+
+      if (g_str_equal (module_stream,
+                       modulemd_module_stream_get_stream_name (stream)))
+        {
+          modulemd_module_stream_associate_translation (stream, NULL);
+        }
+    }
+
+  return TRUE;
+}
+
+
 GPtrArray *
 modulemd_module_get_translated_streams (ModulemdModule *self)
 {
@@ -735,6 +885,35 @@ modulemd_module_get_translation (ModulemdModule *self, const gchar *stream)
 }
 
 
+void
+modulemd_module_freeze (ModulemdModule *self)
+{
+  g_return_if_fail (MODULEMD_IS_MODULE (self));
+
+  for (guint i = 0; i < self->streams->len; i++)
+    {
+      modulemd_module_stream_freeze (
+        (ModulemdModuleStream *)g_ptr_array_index (self->streams, i));
+    }
+
+  if (self->defaults)
+    {
+      modulemd_defaults_freeze (self->defaults);
+    }
+
+  self->frozen = TRUE;
+}
+
+
+gboolean
+modulemd_module_is_frozen (ModulemdModule *self)
+{
+  g_return_val_if_fail (MODULEMD_IS_MODULE (self), FALSE);
+
+  return self->frozen;
+}
+
+
 gboolean
 modulemd_module_upgrade_streams (ModulemdModule *self,
                                  ModulemdModuleStreamVersionEnum mdversion,
@@ -748,6 +927,7 @@ modulemd_module_upgrade_streams (ModulemdModule *self,
   g_autoptr (GError) nested_error = NULL;
 
   g_return_val_if_fail (MODULEMD_IS_MODULE (self), FALSE);
+  g_return_val_if_fail (!self->frozen, FALSE);
 
   new_streams = g_ptr_array_new_full (self->streams->len, g_object_unref);
 
@@ -798,3 +978,50 @@ modulemd_module_upgrade_streams (ModulemdModule *self,
 
   return TRUE;
 }
+
+
+void
+modulemd_module_add_memory_usage (ModulemdModule *self,
+                                  ModulemdMemoryUsage *usage)
+{
+  guint64 before_translations;
+  guint i;
+
+  modulemd_memory_usage_add_object (usage, sizeof (ModulemdModule));
+  modulemd_memory_usage_add_string (usage, self->module_name);
+
+  modulemd_memory_usage_add_ptr_array (usage, self->streams);
+  for (i = 0; i < self->streams->len; i++)
+    {
+      modulemd_module_stream_add_memory_usage (
+        g_ptr_array_index (self->streams, i), usage);
+    }
+
+  if (MODULEMD_IS_DEFAULTS_V1 (self->defaults))
+    {
+      modulemd_defaults_v1_add_memory_usage (
+        MODULEMD_DEFAULTS_V1 (self->defaults), usage);
+    }
+
+  before_translations = modulemd_memory_usage_get_total (usage);
+  modulemd_memory_usage_add_object_table (
+    usage,
+    self->translations,
+    (ModulemdMemoryUsageFunc)modulemd_translation_add_memory_usage);
+  modulemd_memory_usage_add_translations (
+    usage, modulemd_memory_usage_get_total (usage) - before_translations);
+}
+
+
+ModulemdMemoryUsage *
+modulemd_module_get_memory_usage (ModulemdModule *self)
+{
+  g_autoptr (ModulemdMemoryUsage) usage = NULL;
+
+  g_return_val_if_fail (MODULEMD_IS_MODULE (self), NULL);
+
+  usage = modulemd_memory_usage_new ();
+  modulemd_module_add_memory_usage (self, usage);
+
+  return g_steal_pointer (&usage);
+}
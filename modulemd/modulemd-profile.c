@@ -19,6 +19,7 @@
 #include "private/glib-extensions.h"
 #include "private/modulemd-module-stream-private.h"
 #include "private/modulemd-profile-private.h"
+#include "private/modulemd-memory-usage-private.h"
 #include "private/modulemd-util.h"
 #include "private/modulemd-yaml.h"
 
@@ -31,7 +32,7 @@ struct _ModulemdProfile
   gchar *name;
   gchar *description;
 
-  GHashTable *rpms;
+  ModulemdStringSet rpms;
 
   ModulemdModuleStream *owner;
 };
@@ -79,7 +80,7 @@ modulemd_profile_equals (ModulemdProfile *self_1, ModulemdProfile *self_2)
     }
 
   //Check rpms: size, set values
-  if (!modulemd_hash_table_sets_are_equal (self_1->rpms, self_2->rpms))
+  if (!modulemd_string_set_equals (&self_1->rpms, &self_2->rpms))
     {
       return FALSE;
     }
@@ -106,8 +107,7 @@ modulemd_profile_copy (ModulemdProfile *self)
   modulemd_profile_set_description (
     p, modulemd_profile_get_description (self, NULL));
 
-  g_hash_table_unref (p->rpms);
-  p->rpms = g_hash_table_ref (self->rpms);
+  modulemd_string_set_copy (&p->rpms, &self->rpms);
 
   return g_steal_pointer (&p);
 }
@@ -120,7 +120,7 @@ modulemd_profile_finalize (GObject *object)
 
   g_clear_pointer (&self->name, g_free);
   g_clear_pointer (&self->description, g_free);
-  g_clear_pointer (&self->rpms, g_hash_table_unref);
+  modulemd_string_set_clear (&self->rpms);
 
   G_OBJECT_CLASS (modulemd_profile_parent_class)->finalize (object);
 }
@@ -192,7 +192,7 @@ void
 modulemd_profile_add_rpm (ModulemdProfile *self, const gchar *rpm)
 {
   g_return_if_fail (MODULEMD_IS_PROFILE (self));
-  g_hash_table_add (self->rpms, g_strdup (rpm));
+  modulemd_string_set_add (&self->rpms, rpm);
 }
 
 
@@ -200,7 +200,7 @@ void
 modulemd_profile_remove_rpm (ModulemdProfile *self, const gchar *rpm)
 {
   g_return_if_fail (MODULEMD_IS_PROFILE (self));
-  g_hash_table_remove (self->rpms, rpm);
+  modulemd_string_set_remove (&self->rpms, rpm);
 }
 
 
@@ -208,7 +208,7 @@ void
 modulemd_profile_clear_rpms (ModulemdProfile *self)
 {
   g_return_if_fail (MODULEMD_IS_PROFILE (self));
-  g_hash_table_remove_all (self->rpms);
+  modulemd_string_set_remove_all (&self->rpms);
 }
 
 
@@ -217,7 +217,7 @@ modulemd_profile_get_rpms_as_strv (ModulemdProfile *self)
 {
   g_return_val_if_fail (MODULEMD_IS_PROFILE (self), NULL);
 
-  return modulemd_ordered_str_keys_as_strv (self->rpms);
+  return modulemd_string_set_as_strv (&self->rpms);
 }
 
 
@@ -290,7 +290,7 @@ modulemd_profile_class_init (ModulemdProfileClass *klass)
 static void
 modulemd_profile_init (ModulemdProfile *self)
 {
-  self->rpms = g_hash_table_new_full (g_str_hash, g_str_equal, g_free, NULL);
+  modulemd_string_set_init (&self->rpms);
 }
 
 
@@ -308,6 +308,7 @@ modulemd_profile_parse_yaml (yaml_parser_t *parser,
   gboolean in_map = FALSE;
   g_autofree gchar *value = NULL;
   g_autoptr (ModulemdProfile) p = NULL;
+  g_autoptr (GHashTable) rpms = NULL;
   g_autoptr (GError) nested_error = NULL;
 
   g_return_val_if_fail (error == NULL || *error == NULL, FALSE);
@@ -336,9 +337,8 @@ modulemd_profile_parse_yaml (yaml_parser_t *parser,
             }
           if (g_str_equal (event.data.scalar.value, "rpms"))
             {
-              g_hash_table_unref (p->rpms);
-              p->rpms = modulemd_yaml_parse_string_set (parser, &nested_error);
-              if (p->rpms == NULL)
+              rpms = modulemd_yaml_parse_string_set (parser, &nested_error);
+              if (rpms == NULL)
                 {
                   MMD_YAML_ERROR_EVENT_EXIT (
                     error,
@@ -346,6 +346,7 @@ modulemd_profile_parse_yaml (yaml_parser_t *parser,
                     "Failed to parse rpm list in profile: %s",
                     nested_error->message);
                 }
+              modulemd_string_set_take (&p->rpms, g_steal_pointer (&rpms));
             }
           else if (g_str_equal (event.data.scalar.value, "description"))
             {
@@ -379,6 +380,9 @@ modulemd_profile_parse_yaml (yaml_parser_t *parser,
 
       yaml_event_delete (&event);
     }
+
+  modulemd_string_set_compact (&p->rpms);
+
   return g_steal_pointer (&p);
 }
 
@@ -390,7 +394,6 @@ modulemd_profile_emit_yaml (ModulemdProfile *self,
 {
   MODULEMD_INIT_TRACE ();
   int ret;
-  g_auto (GStrv) rpms = NULL;
   g_autoptr (GError) nested_error = NULL;
   MMD_INIT_YAML_EVENT (event);
 
@@ -443,7 +446,7 @@ modulemd_profile_emit_yaml (ModulemdProfile *self,
         }
     }
 
-  if (g_hash_table_size (self->rpms) != 0)
+  if (modulemd_string_set_size (&self->rpms) != 0)
     {
       ret = mmd_emitter_scalar (
         emitter, "rpms", YAML_PLAIN_SCALAR_STYLE, &nested_error);
@@ -455,10 +458,8 @@ modulemd_profile_emit_yaml (ModulemdProfile *self,
           return FALSE;
         }
 
-      rpms = modulemd_profile_get_rpms_as_strv (self);
-
-      ret = mmd_emitter_strv (
-        emitter, YAML_BLOCK_SEQUENCE_STYLE, rpms, &nested_error);
+      ret = mmd_emitter_string_set (
+        emitter, YAML_BLOCK_SEQUENCE_STYLE, &self->rpms, &nested_error);
       if (!ret)
         {
           g_propagate_prefixed_error (error,
@@ -478,3 +479,24 @@ modulemd_profile_emit_yaml (ModulemdProfile *self,
     }
   return TRUE;
 }
+
+
+void
+modulemd_profile_add_memory_usage (ModulemdProfile *self,
+                                   ModulemdMemoryUsage *usage)
+{
+  /* The owner is not a reference, so it is not counted */
+  modulemd_memory_usage_add_object (usage, sizeof (ModulemdProfile));
+  modulemd_memory_usage_add_string (usage, self->name);
+  modulemd_memory_usage_add_string (usage, self->description);
+  modulemd_string_set_add_memory_usage (&self->rpms, usage);
+}
+
+
+void
+modulemd_profile_compact (ModulemdProfile *self)
+{
+  g_return_if_fail (MODULEMD_IS_PROFILE (self));
+
+  modulemd_string_set_compact (&self->rpms);
+}
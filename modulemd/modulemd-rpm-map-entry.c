@@ -13,10 +13,12 @@
 
 #include "yaml.h"
 #include <inttypes.h>
+#include <string.h>
 
 #include "modulemd-errors.h"
 #include "modulemd-rpm-map-entry.h"
 #include "private/modulemd-rpm-map-entry-private.h"
+#include "private/modulemd-memory-usage-private.h"
 #include "private/modulemd-util.h"
 #include "private/modulemd-yaml.h"
 
@@ -79,13 +81,6 @@ modulemd_rpm_map_entry_equals_wrapper (const void *a, const void *b)
                                         (ModulemdRpmMapEntry *)b);
 }
 
-gboolean
-modulemd_RpmMapEntry_hash_table_equals_wrapper (const void *a, const void *b)
-{
-  return modulemd_hash_table_equals (
-    (GHashTable *)a, (GHashTable *)b, modulemd_rpm_map_entry_equals_wrapper);
-}
-
 static void
 modulemd_rpm_map_entry_finalize (GObject *object)
 {
@@ -132,10 +127,10 @@ modulemd_rpm_map_entry_equals (ModulemdRpmMapEntry *self,
   return !g_strcmp0 (self_nevra, other_nevra);
 }
 
-gboolean
-modulemd_rpm_map_entry_validate (ModulemdRpmMapEntry *self, GError **error)
+static gboolean
+validate_fields (const ModulemdRpmMapEntryFields *fields, GError **error)
 {
-  if (!self->name)
+  if (!fields->name)
     {
       g_set_error_literal (error,
                            MODULEMD_ERROR,
@@ -143,7 +138,7 @@ modulemd_rpm_map_entry_validate (ModulemdRpmMapEntry *self, GError **error)
                            "Missing name attribute");
       return FALSE;
     }
-  if (!self->version)
+  if (!fields->version)
     {
       g_set_error_literal (error,
                            MODULEMD_ERROR,
@@ -151,7 +146,7 @@ modulemd_rpm_map_entry_validate (ModulemdRpmMapEntry *self, GError **error)
                            "Missing version attribute");
       return FALSE;
     }
-  if (!self->release)
+  if (!fields->release)
     {
       g_set_error_literal (error,
                            MODULEMD_ERROR,
@@ -159,7 +154,7 @@ modulemd_rpm_map_entry_validate (ModulemdRpmMapEntry *self, GError **error)
                            "Missing release attribute");
       return FALSE;
     }
-  if (!self->arch)
+  if (!fields->arch)
     {
       g_set_error_literal (error,
                            MODULEMD_ERROR,
@@ -173,6 +168,39 @@ modulemd_rpm_map_entry_validate (ModulemdRpmMapEntry *self, GError **error)
 }
 
 
+gboolean
+modulemd_rpm_map_entry_validate (ModulemdRpmMapEntry *self, GError **error)
+{
+  ModulemdRpmMapEntryFields fields;
+
+  modulemd_rpm_map_entry_get_fields (self, &fields);
+
+  return validate_fields (&fields, error);
+}
+
+
+void
+modulemd_rpm_map_entry_get_fields (ModulemdRpmMapEntry *self,
+                                   ModulemdRpmMapEntryFields *fields)
+{
+  fields->name = self->name;
+  fields->epoch = self->epoch;
+  fields->version = self->version;
+  fields->release = self->release;
+  fields->arch = self->arch;
+}
+
+
+gboolean
+modulemd_rpm_map_entry_fields_equal (const ModulemdRpmMapEntryFields *a,
+                                     const ModulemdRpmMapEntryFields *b)
+{
+  return a->epoch == b->epoch && !g_strcmp0 (a->name, b->name) &&
+         !g_strcmp0 (a->version, b->version) &&
+         !g_strcmp0 (a->release, b->release) && !g_strcmp0 (a->arch, b->arch);
+}
+
+
 MODULEMD_SETTER_GETTER_STRING (
   ModulemdRpmMapEntry, rpm_map_entry, RPM_MAP_ENTRY, name, NAME)
 
@@ -206,12 +234,10 @@ modulemd_rpm_map_entry_get_epoch (ModulemdRpmMapEntry *self)
 }
 
 
-gchar *
-modulemd_rpm_map_entry_get_nevra_as_string (ModulemdRpmMapEntry *self)
+static gchar *
+fields_get_nevra (const ModulemdRpmMapEntryFields *fields)
 {
-  g_return_val_if_fail (MODULEMD_IS_RPM_MAP_ENTRY (self), 0);
-
-  if (!modulemd_rpm_map_entry_validate (self, NULL))
+  if (!validate_fields (fields, NULL))
     {
       /* None of the strings are optional and if any are missing, we can't
        * generate a valid NEVRA
@@ -220,11 +246,60 @@ modulemd_rpm_map_entry_get_nevra_as_string (ModulemdRpmMapEntry *self)
     }
 
   return g_strdup_printf ("%s-%" PRIu64 ":%s-%s.%s",
-                          self->name,
-                          self->epoch,
-                          self->version,
-                          self->release,
-                          self->arch);
+                          fields->name,
+                          fields->epoch,
+                          fields->version,
+                          fields->release,
+                          fields->arch);
+}
+
+
+static gboolean
+nevra_part_equals (const gchar *part, gsize part_len, const gchar *str)
+{
+  return strncmp (part, str, part_len) == 0 && str[part_len] == '\0';
+}
+
+
+/* Checks whether @nevra is the NEVRA that fields_get_nevra() would return for
+ * @fields, without building that string. The epoch is compared as text, so a
+ * non-canonical epoch such as "00" does not match.
+ */
+static gboolean
+fields_match_nevra (const ModulemdRpmMapEntryFields *fields,
+                    const gchar *nevra)
+{
+  ModulemdNevra parsed;
+  gchar epoch[sizeof ("18446744073709551615")];
+
+  if (!validate_fields (fields, NULL) ||
+      !modulemd_nevra_parse (nevra, &parsed))
+    {
+      return FALSE;
+    }
+
+  g_snprintf (epoch, sizeof (epoch), "%" PRIu64, fields->epoch);
+
+  return nevra_part_equals (parsed.epoch_text, parsed.epoch_len, epoch) &&
+         nevra_part_equals (parsed.name, parsed.name_len, fields->name) &&
+         nevra_part_equals (
+           parsed.version, parsed.version_len, fields->version) &&
+         nevra_part_equals (
+           parsed.release, parsed.release_len, fields->release) &&
+         nevra_part_equals (parsed.arch, parsed.arch_len, fields->arch);
+}
+
+
+gchar *
+modulemd_rpm_map_entry_get_nevra_as_string (ModulemdRpmMapEntry *self)
+{
+  ModulemdRpmMapEntryFields fields;
+
+  g_return_val_if_fail (MODULEMD_IS_RPM_MAP_ENTRY (self), 0);
+
+  modulemd_rpm_map_entry_get_fields (self, &fields);
+
+  return fields_get_nevra (&fields);
 }
 
 
@@ -367,34 +442,71 @@ ModulemdRpmMapEntry *
 modulemd_rpm_map_entry_parse_yaml (yaml_parser_t *parser,
                                    gboolean strict,
                                    GError **error)
+{
+  g_autoptr (GStringChunk) strings = g_string_chunk_new (64);
+  ModulemdRpmMapEntryFields fields;
+
+  if (!modulemd_rpm_map_entry_parse_yaml_fields (
+        parser, strict, strings, &fields, error))
+    {
+      return NULL;
+    }
+
+  return modulemd_rpm_map_entry_new (
+    fields.name, fields.epoch, fields.version, fields.release, fields.arch);
+}
+
+
+static gboolean
+parse_field_string (yaml_parser_t *parser,
+                    GStringChunk *strings,
+                    const gchar **field,
+                    GError **error)
+{
+  g_autofree gchar *scalar = NULL;
+
+  scalar = modulemd_yaml_parse_string (parser, error);
+  if (!scalar)
+    {
+      return FALSE;
+    }
+
+  *field = g_string_chunk_insert_const (strings, scalar);
+  return TRUE;
+}
+
+
+gboolean
+modulemd_rpm_map_entry_parse_yaml_fields (yaml_parser_t *parser,
+                                          gboolean strict,
+                                          GStringChunk *strings,
+                                          ModulemdRpmMapEntryFields *fields,
+                                          GError **error)
 {
   MODULEMD_INIT_TRACE ();
   MMD_INIT_YAML_EVENT (event);
   gboolean done = FALSE;
   gboolean seen_epoch = FALSE;
-  g_autoptr (ModulemdRpmMapEntry) entry = NULL;
   g_autoptr (GError) nested_error = NULL;
-  guint64 epoch = 0;
-  g_autofree gchar *scalar = NULL;
   g_autofree gchar *nevra = NULL;
   g_autofree gchar *built_nevra = NULL;
 
   g_return_val_if_fail (error == NULL || *error == NULL, FALSE);
 
-  entry = g_object_new (MODULEMD_TYPE_RPM_MAP_ENTRY, NULL);
+  memset (fields, 0, sizeof (ModulemdRpmMapEntryFields));
 
 
-  YAML_PARSER_PARSE_WITH_EXIT (parser, &event, error);
+  YAML_PARSER_PARSE_WITH_EXIT_BOOL (parser, &event, error);
   if (event.type != YAML_MAPPING_START_EVENT)
     {
-      MMD_YAML_ERROR_EVENT_EXIT (
+      MMD_YAML_ERROR_EVENT_EXIT_BOOL (
         error, event, "Missing mapping in rpm-map entry");
     }
 
 
   while (!done)
     {
-      YAML_PARSER_PARSE_WITH_EXIT (parser, &event, error);
+      YAML_PARSER_PARSE_WITH_EXIT_BOOL (parser, &event, error);
       switch (event.type)
         {
         case YAML_MAPPING_END_EVENT: done = TRUE; break;
@@ -402,80 +514,72 @@ modulemd_rpm_map_entry_parse_yaml (yaml_parser_t *parser,
         case YAML_SCALAR_EVENT:
           if (g_str_equal (event.data.scalar.value, "name"))
             {
-              scalar = modulemd_yaml_parse_string (parser, &nested_error);
-              if (!scalar)
+              if (!parse_field_string (
+                    parser, strings, &fields->name, &nested_error))
                 {
-                  MMD_YAML_ERROR_EVENT_EXIT (
+                  MMD_YAML_ERROR_EVENT_EXIT_BOOL (
                     error,
                     event,
                     "Failed to parse package name: %s",
                     nested_error->message);
                 }
-              modulemd_rpm_map_entry_set_name (entry, scalar);
-              g_clear_pointer (&scalar, g_free);
             }
           else if (g_str_equal (event.data.scalar.value, "epoch"))
             {
-              epoch = modulemd_yaml_parse_uint64 (parser, &nested_error);
+              fields->epoch =
+                modulemd_yaml_parse_uint64 (parser, &nested_error);
               if (nested_error)
                 {
-                  MMD_YAML_ERROR_EVENT_EXIT (
+                  MMD_YAML_ERROR_EVENT_EXIT_BOOL (
                     error,
                     event,
                     "Failed to parse package epoch: %s",
                     nested_error->message);
                 }
-              modulemd_rpm_map_entry_set_epoch (entry, epoch);
               seen_epoch = TRUE;
             }
           else if (g_str_equal (event.data.scalar.value, "version"))
             {
-              scalar = modulemd_yaml_parse_string (parser, &nested_error);
-              if (!scalar)
+              if (!parse_field_string (
+                    parser, strings, &fields->version, &nested_error))
                 {
-                  MMD_YAML_ERROR_EVENT_EXIT (
+                  MMD_YAML_ERROR_EVENT_EXIT_BOOL (
                     error,
                     event,
                     "Failed to parse package version: %s",
                     nested_error->message);
                 }
-              modulemd_rpm_map_entry_set_version (entry, scalar);
-              g_clear_pointer (&scalar, g_free);
             }
           else if (g_str_equal (event.data.scalar.value, "release"))
             {
-              scalar = modulemd_yaml_parse_string (parser, &nested_error);
-              if (!scalar)
+              if (!parse_field_string (
+                    parser, strings, &fields->release, &nested_error))
                 {
-                  MMD_YAML_ERROR_EVENT_EXIT (
+                  MMD_YAML_ERROR_EVENT_EXIT_BOOL (
                     error,
                     event,
                     "Failed to parse package release: %s",
                     nested_error->message);
                 }
-              modulemd_rpm_map_entry_set_release (entry, scalar);
-              g_clear_pointer (&scalar, g_free);
             }
           else if (g_str_equal (event.data.scalar.value, "arch"))
             {
-              scalar = modulemd_yaml_parse_string (parser, &nested_error);
-              if (!scalar)
+              if (!parse_field_string (
+                    parser, strings, &fields->arch, &nested_error))
                 {
-                  MMD_YAML_ERROR_EVENT_EXIT (
+                  MMD_YAML_ERROR_EVENT_EXIT_BOOL (
                     error,
                     event,
                     "Failed to parse package architecture: %s",
                     nested_error->message);
                 }
-              modulemd_rpm_map_entry_set_arch (entry, scalar);
-              g_clear_pointer (&scalar, g_free);
             }
           else if (g_str_equal (event.data.scalar.value, "nevra"))
             {
               nevra = modulemd_yaml_parse_string (parser, &nested_error);
               if (!nevra)
                 {
-                  MMD_YAML_ERROR_EVENT_EXIT (
+                  MMD_YAML_ERROR_EVENT_EXIT_BOOL (
                     error,
                     event,
                     "Failed to parse package nevra: %s",
@@ -485,7 +589,7 @@ modulemd_rpm_map_entry_parse_yaml (yaml_parser_t *parser,
           else
             {
               SKIP_UNKNOWN (parser,
-                            NULL,
+                            FALSE,
                             "Unexpected key in rpm-map entry: %s",
                             (const gchar *)event.data.scalar.value);
               break;
@@ -493,7 +597,7 @@ modulemd_rpm_map_entry_parse_yaml (yaml_parser_t *parser,
           break;
 
         default:
-          MMD_YAML_ERROR_EVENT_EXIT (
+          MMD_YAML_ERROR_EVENT_EXIT_BOOL (
             error,
             event,
             "Unexpected YAML event %s in defaults data",
@@ -503,11 +607,11 @@ modulemd_rpm_map_entry_parse_yaml (yaml_parser_t *parser,
       yaml_event_delete (&event);
     }
 
-  if (!modulemd_rpm_map_entry_validate (entry, &nested_error))
+  if (!validate_fields (fields, &nested_error))
     {
       g_propagate_prefixed_error (
         error, g_steal_pointer (&nested_error), "Validation of entry failed");
-      return NULL;
+      return FALSE;
     }
 
   /* Check that we got the epoch */
@@ -517,7 +621,7 @@ modulemd_rpm_map_entry_parse_yaml (yaml_parser_t *parser,
                            MODULEMD_YAML_ERROR,
                            MODULEMD_YAML_ERROR_MISSING_REQUIRED,
                            "Missing 'epoch' in rpm-map entry");
-      return NULL;
+      return FALSE;
     }
 
   /* check that we got the NEVRA and that it matches the exploded version */
@@ -527,22 +631,22 @@ modulemd_rpm_map_entry_parse_yaml (yaml_parser_t *parser,
                            MODULEMD_YAML_ERROR,
                            MODULEMD_YAML_ERROR_MISSING_REQUIRED,
                            "Missing 'nevra' in rpm-map entry");
-      return NULL;
+      return FALSE;
     }
 
-  built_nevra = modulemd_rpm_map_entry_get_nevra_as_string (entry);
-  if (!g_str_equal (nevra, built_nevra))
+  if (!fields_match_nevra (fields, nevra))
     {
+      built_nevra = fields_get_nevra (fields);
       g_set_error (error,
                    MODULEMD_YAML_ERROR,
                    MODULEMD_YAML_ERROR_INCONSISTENT,
                    "'nevra' field (%s) differs from exploded version (%s)",
                    nevra,
                    built_nevra);
-      return NULL;
+      return FALSE;
     }
 
-  return g_steal_pointer (&entry);
+  return TRUE;
 }
 
 
@@ -550,32 +654,58 @@ gboolean
 modulemd_rpm_map_entry_emit_yaml (ModulemdRpmMapEntry *self,
                                   yaml_emitter_t *emitter,
                                   GError **error)
+{
+  ModulemdRpmMapEntryFields fields;
+
+  modulemd_rpm_map_entry_get_fields (self, &fields);
+
+  return modulemd_rpm_map_entry_emit_yaml_fields (&fields, emitter, error);
+}
+
+
+gboolean
+modulemd_rpm_map_entry_emit_yaml_fields (
+  const ModulemdRpmMapEntryFields *fields,
+  yaml_emitter_t *emitter,
+  GError **error)
 {
   MODULEMD_INIT_TRACE ();
   g_autoptr (GError) nested_error = NULL;
   g_autofree gchar *epoch = NULL;
   g_autofree gchar *nevra = NULL;
 
-  if (!modulemd_rpm_map_entry_validate (self, &nested_error))
+  if (!validate_fields (fields, &nested_error))
     {
       g_propagate_prefixed_error (error,
                                   g_steal_pointer (&nested_error),
                                   "rpm-map entry failed to validate: ");
       return FALSE;
     }
-  epoch = g_strdup_printf ("%" PRIu64, self->epoch);
-  nevra = modulemd_rpm_map_entry_get_nevra_as_string (self);
+  epoch = g_strdup_printf ("%" PRIu64, fields->epoch);
+  nevra = fields_get_nevra (fields);
 
   EMIT_MAPPING_START_WITH_STYLE (emitter, error, YAML_BLOCK_MAPPING_STYLE);
 
-  EMIT_KEY_VALUE (emitter, error, "name", self->name);
+  EMIT_KEY_VALUE (emitter, error, "name", fields->name);
   EMIT_KEY_VALUE (emitter, error, "epoch", epoch);
-  EMIT_KEY_VALUE (emitter, error, "version", self->version);
-  EMIT_KEY_VALUE (emitter, error, "release", self->release);
-  EMIT_KEY_VALUE (emitter, error, "arch", self->arch);
+  EMIT_KEY_VALUE (emitter, error, "version", fields->version);
+  EMIT_KEY_VALUE (emitter, error, "release", fields->release);
+  EMIT_KEY_VALUE (emitter, error, "arch", fields->arch);
   EMIT_KEY_VALUE (emitter, error, "nevra", nevra);
 
   EMIT_MAPPING_END (emitter, &nested_error);
 
   return TRUE;
 }
+
+
+void
+modulemd_rpm_map_entry_add_memory_usage (ModulemdRpmMapEntry *self,
+                                         ModulemdMemoryUsage *usage)
+{
+  modulemd_memory_usage_add_object (usage, sizeof (ModulemdRpmMapEntry));
+  modulemd_memory_usage_add_string (usage, self->name);
+  modulemd_memory_usage_add_string (usage, self->version);
+  modulemd_memory_usage_add_string (usage, self->release);
+  modulemd_memory_usage_add_string (usage, self->arch);
+}
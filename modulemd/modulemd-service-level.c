@@ -17,6 +17,7 @@
 #include "modulemd-service-level.h"
 #include "private/glib-extensions.h"
 #include "private/modulemd-service-level-private.h"
+#include "private/modulemd-memory-usage-private.h"
 #include "private/modulemd-util.h"
 #include "private/modulemd-yaml.h"
 
@@ -472,3 +473,17 @@ modulemd_service_level_emit_yaml (ModulemdServiceLevel *self,
 
   return TRUE;
 }
+
+
+void
+modulemd_service_level_add_memory_usage (ModulemdServiceLevel *self,
+                                         ModulemdMemoryUsage *usage)
+{
+  modulemd_memory_usage_add_object (usage, sizeof (ModulemdServiceLevel));
+  modulemd_memory_usage_add_string (usage, self->name);
+
+  if (self->eol)
+    {
+      modulemd_memory_usage_add_object (usage, sizeof (GDate));
+    }
+}
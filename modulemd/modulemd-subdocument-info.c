@@ -15,6 +15,7 @@
 #include <yaml.h>
 
 #include "modulemd-errors.h"
+#include "modulemd-index-stats.h"
 #include "modulemd-subdocument-info.h"
 #include "private/glib-extensions.h"
 #include "private/modulemd-subdocument-info-private.h"
@@ -31,6 +32,11 @@ struct _ModulemdSubdocumentInfo
   guint64 mdversion;
   GError *error;
   gchar *contents;
+
+  gsize line;
+  gsize offset;
+  gchar *nsvca;
+  gint64 phase_times[MODULEMD_INDEX_STATS_PHASE_MERGE + 1];
 };
 
 G_DEFINE_TYPE (ModulemdSubdocumentInfo,
@@ -60,6 +66,9 @@ modulemd_subdocument_info_copy (ModulemdSubdocumentInfo *self)
     s, modulemd_subdocument_info_get_gerror (self));
   modulemd_subdocument_info_set_yaml (
     s, modulemd_subdocument_info_get_yaml (self));
+  modulemd_subdocument_info_set_location (s, self->line, self->offset);
+  modulemd_subdocument_info_set_nsvca (s, self->nsvca);
+  memcpy (s->phase_times, self->phase_times, sizeof (self->phase_times));
 
   return g_steal_pointer (&s);
 }
@@ -72,6 +81,7 @@ modulemd_subdocument_info_finalize (GObject *object)
 
   g_clear_pointer (&self->error, g_error_free);
   g_clear_pointer (&self->contents, g_free);
+  g_clear_pointer (&self->nsvca, g_free);
 
   G_OBJECT_CLASS (modulemd_subdocument_info_parent_class)->finalize (object);
 }
@@ -165,6 +175,79 @@ modulemd_subdocument_info_get_mdversion (ModulemdSubdocumentInfo *self)
 }
 
 
+void
+modulemd_subdocument_info_set_location (ModulemdSubdocumentInfo *self,
+                                        gsize line,
+                                        gsize offset)
+{
+  g_return_if_fail (MODULEMD_IS_SUBDOCUMENT_INFO (self));
+
+  self->line = line;
+  self->offset = offset;
+}
+
+
+gsize
+modulemd_subdocument_info_get_line (ModulemdSubdocumentInfo *self)
+{
+  g_return_val_if_fail (MODULEMD_IS_SUBDOCUMENT_INFO (self), 0);
+
+  return self->line;
+}
+
+
+gsize
+modulemd_subdocument_info_get_offset (ModulemdSubdocumentInfo *self)
+{
+  g_return_val_if_fail (MODULEMD_IS_SUBDOCUMENT_INFO (self), 0);
+
+  return self->offset;
+}
+
+
+void
+modulemd_subdocument_info_set_nsvca (ModulemdSubdocumentInfo *self,
+                                     const gchar *nsvca)
+{
+  g_return_if_fail (MODULEMD_IS_SUBDOCUMENT_INFO (self));
+
+  g_clear_pointer (&self->nsvca, g_free);
+  self->nsvca = g_strdup (nsvca);
+}
+
+
+const gchar *
+modulemd_subdocument_info_get_nsvca (ModulemdSubdocumentInfo *self)
+{
+  g_return_val_if_fail (MODULEMD_IS_SUBDOCUMENT_INFO (self), NULL);
+
+  return self->nsvca;
+}
+
+
+void
+modulemd_subdocument_info_add_phase_time (ModulemdSubdocumentInfo *self,
+                                          ModulemdIndexStatsPhaseEnum phase,
+                                          gint64 start_time)
+{
+  g_return_if_fail (MODULEMD_IS_SUBDOCUMENT_INFO (self));
+  g_return_if_fail (phase <= MODULEMD_INDEX_STATS_PHASE_MERGE);
+
+  self->phase_times[phase] += g_get_monotonic_time () - start_time;
+}
+
+
+gint64
+modulemd_subdocument_info_get_phase_time (ModulemdSubdocumentInfo *self,
+                                          ModulemdIndexStatsPhaseEnum phase)
+{
+  g_return_val_if_fail (MODULEMD_IS_SUBDOCUMENT_INFO (self), 0);
+  g_return_val_if_fail (phase <= MODULEMD_INDEX_STATS_PHASE_MERGE, 0);
+
+  return self->phase_times[phase];
+}
+
+
 gboolean
 modulemd_subdocument_info_get_data_parser (ModulemdSubdocumentInfo *self,
                                            yaml_parser_t *parser,
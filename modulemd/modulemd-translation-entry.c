@@ -18,6 +18,7 @@
 #include "modulemd-translation-entry.h"
 #include "private/glib-extensions.h"
 #include "private/modulemd-translation-entry-private.h"
+#include "private/modulemd-memory-usage-private.h"
 #include "private/modulemd-util.h"
 #include "private/modulemd-yaml.h"
 
@@ -670,3 +671,15 @@ modulemd_translation_entry_emit_yaml (ModulemdTranslationEntry *self,
 
   return TRUE;
 }
+
+
+void
+modulemd_translation_entry_add_memory_usage (ModulemdTranslationEntry *self,
+                                             ModulemdMemoryUsage *usage)
+{
+  modulemd_memory_usage_add_object (usage, sizeof (ModulemdTranslationEntry));
+  modulemd_memory_usage_add_string (usage, self->locale);
+  modulemd_memory_usage_add_string (usage, self->summary);
+  modulemd_memory_usage_add_string (usage, self->description);
+  modulemd_memory_usage_add_string_map (usage, self->profile_descriptions);
+}
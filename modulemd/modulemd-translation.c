@@ -22,6 +22,7 @@
 #include "private/modulemd-subdocument-info-private.h"
 #include "private/modulemd-translation-entry-private.h"
 #include "private/modulemd-translation-private.h"
+#include "private/modulemd-memory-usage-private.h"
 #include "private/modulemd-util.h"
 #include "private/modulemd-yaml.h"
 
@@ -38,6 +39,18 @@ struct _ModulemdTranslation
   guint64 modified;
 
   GHashTable *translation_entries;
+
+  /* TRUE if the last call to modulemd_translation_validate() succeeded and
+   * the translation has not been modified since.
+   */
+  gboolean validated;
+
+  /* TRUE once a translation entry has been handed out by
+   * modulemd_translation_get_translation_entry(). Changes made through it
+   * cannot be seen here, so the result of a validation is no longer
+   * remembered.
+   */
+  gboolean entries_exposed;
 };
 
 G_DEFINE_TYPE (ModulemdTranslation, modulemd_translation, G_TYPE_OBJECT)
@@ -96,6 +109,8 @@ modulemd_translation_copy (ModulemdTranslation *self)
       modulemd_translation_set_translation_entry (t, value);
     }
 
+  t->validated = self->validated;
+
   return g_steal_pointer (&t);
 }
 
@@ -105,6 +120,11 @@ modulemd_translation_validate (ModulemdTranslation *self, GError **error)
 {
   g_return_val_if_fail (MODULEMD_IS_TRANSLATION (self), FALSE);
 
+  if (self->validated)
+    {
+      return TRUE;
+    }
+
   if (g_str_equal (modulemd_translation_get_module_name (self),
                    T_PLACEHOLDER_STRING))
     {
@@ -148,10 +168,20 @@ modulemd_translation_validate (ModulemdTranslation *self, GError **error)
       return FALSE;
     }
 
+  self->validated = !self->entries_exposed;
   return TRUE;
 }
 
 
+gboolean
+modulemd_translation_is_validated (ModulemdTranslation *self)
+{
+  g_return_val_if_fail (MODULEMD_IS_TRANSLATION (self), FALSE);
+
+  return self->validated;
+}
+
+
 static void
 modulemd_translation_finalize (GObject *object)
 {
@@ -199,6 +229,8 @@ modulemd_translation_set_version (ModulemdTranslation *self, guint64 version)
   g_return_if_fail (MODULEMD_IS_TRANSLATION (self));
   g_return_if_fail (version != 0);
 
+  self->validated = FALSE;
+
   self->version = version;
 
   g_object_notify_by_pspec (G_OBJECT (self), properties[PROP_VERSION]);
@@ -213,6 +245,8 @@ modulemd_translation_set_module_name (ModulemdTranslation *self,
   g_return_if_fail (module_name);
   g_return_if_fail (g_strcmp0 (module_name, T_DEFAULT_STRING));
 
+  self->validated = FALSE;
+
   g_clear_pointer (&self->module_name, g_free);
   self->module_name = g_strdup (module_name);
 
@@ -228,6 +262,8 @@ modulemd_translation_set_module_stream (ModulemdTranslation *self,
   g_return_if_fail (module_stream);
   g_return_if_fail (g_strcmp0 (module_stream, T_DEFAULT_STRING));
 
+  self->validated = FALSE;
+
   g_clear_pointer (&self->module_stream, g_free);
   self->module_stream = g_strdup (module_stream);
 
@@ -240,6 +276,8 @@ modulemd_translation_set_modified (ModulemdTranslation *self, guint64 modified)
 {
   g_return_if_fail (MODULEMD_IS_TRANSLATION (self));
 
+  self->validated = FALSE;
+
   self->modified = modified;
 
   g_object_notify_by_pspec (G_OBJECT (self), properties[PROP_MODIFIED]);
@@ -261,6 +299,8 @@ modulemd_translation_set_translation_entry (
 {
   g_return_if_fail (MODULEMD_IS_TRANSLATION (self));
 
+  self->validated = FALSE;
+
   g_hash_table_insert (
     self->translation_entries,
     g_strdup (modulemd_translation_entry_get_locale (translation_entry)),
@@ -274,6 +314,9 @@ modulemd_translation_get_translation_entry (ModulemdTranslation *self,
 {
   g_return_val_if_fail (MODULEMD_IS_TRANSLATION (self), NULL);
 
+  self->validated = FALSE;
+  self->entries_exposed = TRUE;
+
   return g_hash_table_lookup (self->translation_entries, locale);
 }
 
@@ -764,3 +807,17 @@ modulemd_translation_emit_yaml (ModulemdTranslation *self,
 
   return TRUE;
 }
+
+
+void
+modulemd_translation_add_memory_usage (ModulemdTranslation *self,
+                                       ModulemdMemoryUsage *usage)
+{
+  modulemd_memory_usage_add_object (usage, sizeof (ModulemdTranslation));
+  modulemd_memory_usage_add_string (usage, self->module_name);
+  modulemd_memory_usage_add_string (usage, self->module_stream);
+  modulemd_memory_usage_add_object_table (
+    usage,
+    self->translation_entries,
+    (ModulemdMemoryUsageFunc)modulemd_translation_entry_add_memory_usage);
+}
@@ -13,8 +13,13 @@
 
 #include <string.h>
 
+#include "config.h"
 #include "private/modulemd-util.h"
 
+#ifdef HAVE_SYSPROF
+#include <sysprof-capture.h>
+#endif
+
 
 GQuark
 modulemd_error_quark (void)
@@ -23,24 +28,72 @@ modulemd_error_quark (void)
 }
 
 
-modulemd_tracer *
-modulemd_trace_init (const gchar *function_name)
+gint modulemd_trace_state = 0;
+
+
+gboolean
+modulemd_trace_read_state (void)
 {
-  modulemd_tracer *self = g_malloc0_n (1, sizeof (modulemd_tracer));
-  self->function_name = g_strdup (function_name);
+  const gchar *env = NULL;
+  gboolean enabled = FALSE;
 
-  g_debug ("TRACE: Entering %s", self->function_name);
+  env = g_getenv ("MMD_TRACE");
+  if (env != NULL && *env != '\0' && g_strcmp0 (env, "0") != 0)
+    {
+      enabled = TRUE;
+    }
 
-  return self;
+  env = g_getenv ("G_MESSAGES_DEBUG");
+  if (env != NULL)
+    {
+      g_auto (GStrv) domains = g_strsplit_set (env, ", ", -1);
+      if (g_strv_contains ((const gchar *const *)domains, "all") ||
+          g_strv_contains ((const gchar *const *)domains, G_LOG_DOMAIN))
+        {
+          enabled = TRUE;
+        }
+    }
+
+#ifdef HAVE_SYSPROF
+  if (sysprof_collector_is_active ())
+    {
+      enabled = TRUE;
+    }
+#endif
+
+  g_atomic_int_set (&modulemd_trace_state,
+                    enabled ? MODULEMD_TRACE_ENABLED :
+                              MODULEMD_TRACE_DISABLED);
+
+  return enabled;
+}
+
+
+gint64
+modulemd_trace_enter (const gchar *function_name)
+{
+  g_debug ("TRACE: Entering %s", function_name);
+
+  return g_get_monotonic_time ();
 }
 
 
 void
-modulemd_trace_free (modulemd_tracer *tracer)
+modulemd_trace_exit (const gchar *function_name, gint64 start_time)
 {
-  g_debug ("TRACE: Exiting %s", tracer->function_name);
-  g_clear_pointer (&tracer->function_name, g_free);
-  g_free (tracer);
+  gint64 duration = g_get_monotonic_time () - start_time;
+
+#ifdef HAVE_SYSPROF
+  /* sysprof uses CLOCK_MONOTONIC in nanoseconds, like
+   * g_get_monotonic_time() does in microseconds.
+   */
+  sysprof_collector_mark (
+    start_time * 1000, duration * 1000, "libmodulemd", function_name, NULL);
+#endif
+
+  g_debug ("TRACE: Exiting %s after %" G_GINT64_FORMAT " us",
+           function_name,
+           duration);
 }
 
 
@@ -300,121 +353,523 @@ modulemd_variant_deep_copy (GVariant *variant)
 
 
 gboolean
-modulemd_validate_nevra (const gchar *nevra)
+modulemd_nevra_parse (const gchar *nevra, ModulemdNevra *parsed)
 {
-  g_autofree gchar *tmp = g_strdup (nevra);
-  gsize len = strlen (nevra);
-  gchar *i;
-  gchar *endptr;
+  const gchar *i;
+  const gchar *dot = NULL;
+  const gchar *release_dash = NULL;
+  const gchar *colon = NULL;
+  const gchar *epoch_dash = NULL;
+  guint64 epoch = 0;
+  guint digit;
+
+  g_return_val_if_fail (nevra, FALSE);
 
   /* Since the "name" portion of a NEVRA can have an infinite number of
-   * hyphens, we need to parse from the end backwards.
+   * hyphens, we need to parse from the end backwards. All separators are
+   * found in this one pass.
    */
-  i = &tmp[len - 1];
-
-  /* Everything after the last '.' must be the architecture */
-  while (i >= tmp)
+  for (i = nevra + strlen (nevra); i > nevra && !epoch_dash;)
     {
-      if (*i == '.')
+      i--;
+
+      if (!dot)
         {
-          break;
+          /* Everything after the last '.' must be the architecture */
+          if (*i == '.')
+            {
+              dot = i;
+            }
+        }
+      else if (!release_dash)
+        {
+          /* No need to validate Release; it's fairly arbitrary */
+          if (*i == '-')
+            {
+              release_dash = i;
+            }
+        }
+      else if (!colon)
+        {
+          if (*i == ':')
+            {
+              colon = i;
+            }
+          else if (*i == '-')
+            {
+              /* '-' between version and epoch is not allowed */
+              return FALSE;
+            }
+        }
+      else if (*i == '-')
+        {
+          epoch_dash = i;
         }
-      i--;
     }
 
-  if (i < tmp)
+  /*
+   * TODO: Compare the architecture suffix with a list of known-valid ones
+   * This needs to come from an external source that's kept up to date or
+   * this will regularly break.
+   */
+
+  if (!epoch_dash)
     {
-      /* We hit the start of the string without hitting '.' */
+      /* We hit the start of the string before finding all of the separators */
       return FALSE;
     }
 
+  /* Validate that the epoch is a number */
+  if (epoch_dash + 1 == colon)
+    {
+      return FALSE;
+    }
+
+  for (i = epoch_dash + 1; i < colon; i++)
+    {
+      if (!g_ascii_isdigit (*i))
+        {
+          return FALSE;
+        }
+
+      digit = *i - '0';
+      if (epoch > (G_MAXUINT64 - digit) / 10)
+        {
+          return FALSE;
+        }
+      epoch = epoch * 10 + digit;
+    }
+
+  if (parsed)
+    {
+      parsed->name = nevra;
+      parsed->name_len = epoch_dash - nevra;
+      parsed->epoch = epoch;
+      parsed->epoch_text = epoch_dash + 1;
+      parsed->epoch_len = colon - (epoch_dash + 1);
+      parsed->version = colon + 1;
+      parsed->version_len = release_dash - (colon + 1);
+      parsed->release = release_dash + 1;
+      parsed->release_len = dot - (release_dash + 1);
+      parsed->arch = dot + 1;
+      parsed->arch_len = strlen (dot + 1);
+    }
+
+  return TRUE;
+}
+
+
+gboolean
+modulemd_validate_nevra (const gchar *nevra)
+{
+  return modulemd_nevra_parse (nevra, NULL);
+}
+
+
+gboolean
+modulemd_boolean_equals (gboolean a, gboolean b)
+{
   /*
-   * TODO: Compare the architecture suffix with a list of known-valid ones
-   * This needs to come from an external source that's kept up to date or
-   * this will regularly break.
+   * There is no validation when assigning to a gboolean variable and so it
+   * could contain any value represented by a gint. Thus, each value needs to
+   * be canonicalized before comparing for equality.
    */
+  if (!!a == !!b)
+    {
+      return TRUE;
+    }
+
+  return FALSE;
+}
+
+
+void
+modulemd_append_json_string (GString *json, const gchar *str)
+{
+  if (str == NULL)
+    {
+      g_string_append (json, "null");
+      return;
+    }
 
-  /* Process the "release" tag */
-  while (i >= tmp)
+  g_string_append_c (json, '"');
+  for (const gchar *c = str; *c; c++)
     {
-      if (*i == '-')
+      switch (*c)
         {
-          break;
+        case '"': g_string_append (json, "\\\""); break;
+        case '\\': g_string_append (json, "\\\\"); break;
+        case '\n': g_string_append (json, "\\n"); break;
+        case '\r': g_string_append (json, "\\r"); break;
+        case '\t': g_string_append (json, "\\t"); break;
+        default:
+          if ((guchar)*c < 0x20)
+            {
+              g_string_append_printf (json, "\\u%04x", (guchar)*c);
+            }
+          else
+            {
+              g_string_append_c (json, *c);
+            }
         }
-      i--;
+    }
+  g_string_append_c (json, '"');
+}
+
+
+gboolean
+modulemd_glob_match (const gchar *pattern, const gchar *value)
+{
+  if (pattern == NULL)
+    {
+      return TRUE;
     }
 
-  if (i < tmp)
+  if (value == NULL)
     {
-      /* We hit the start of the string without hitting '-' */
       return FALSE;
     }
 
-  /* No need to validate Release; it's fairly arbitrary */
+  return g_pattern_match_simple (pattern, value);
+}
+
+
+void
+modulemd_string_set_init (ModulemdStringSet *set)
+{
+  set->table = g_hash_table_new_full (g_str_hash, g_str_equal, g_free, NULL);
+  set->sorted = NULL;
+  set->n_sorted = 0;
+}
+
+
+void
+modulemd_string_set_clear (ModulemdStringSet *set)
+{
+  g_clear_pointer (&set->table, g_hash_table_unref);
+  g_clear_pointer (&set->sorted, g_strfreev);
+  set->n_sorted = 0;
+}
+
+
+/* Turns a compacted set back into a GHashTable so it can be modified */
+static void
+string_set_expand (ModulemdStringSet *set)
+{
+  if (set->table)
+    {
+      return;
+    }
+
+  set->table = g_hash_table_new_full (g_str_hash, g_str_equal, g_free, NULL);
+  for (guint i = 0; i < set->n_sorted; i++)
+    {
+      /* Hand the strings over to the table */
+      g_hash_table_add (set->table, set->sorted[i]);
+    }
+
+  g_clear_pointer (&set->sorted, g_free);
+  set->n_sorted = 0;
+}
+
+
+void
+modulemd_string_set_add (ModulemdStringSet *set, const gchar *str)
+{
+  string_set_expand (set);
+  g_hash_table_add (set->table, g_strdup (str));
+}
+
+
+void
+modulemd_string_set_remove (ModulemdStringSet *set, const gchar *str)
+{
+  string_set_expand (set);
+  g_hash_table_remove (set->table, str);
+}
+
+
+void
+modulemd_string_set_remove_all (ModulemdStringSet *set)
+{
+  string_set_expand (set);
+  g_hash_table_remove_all (set->table);
+}
+
+
+void
+modulemd_string_set_replace (ModulemdStringSet *set, GHashTable *table)
+{
+  if (!table)
+    {
+      modulemd_string_set_remove_all (set);
+      return;
+    }
+
+  modulemd_string_set_clear (set);
+  set->table = modulemd_hash_table_deep_set_copy (table);
+}
+
+
+void
+modulemd_string_set_take (ModulemdStringSet *set, GHashTable *table)
+{
+  modulemd_string_set_clear (set);
+  set->table = table;
+}
+
+
+void
+modulemd_string_set_copy (ModulemdStringSet *dest, ModulemdStringSet *src)
+{
+  if (dest == src)
+    {
+      return;
+    }
+
+  if (src->table)
+    {
+      modulemd_string_set_replace (dest, src->table);
+      return;
+    }
 
-  i--;
-  /* Process the version */
-  while (i >= tmp)
+  modulemd_string_set_clear (dest);
+  dest->sorted = g_strdupv (src->sorted);
+  dest->n_sorted = src->n_sorted;
+}
+
+
+static gint
+string_set_compare (gconstpointer a, gconstpointer b, gpointer user_data)
+{
+  return strcmp (*(const gchar **)a, *(const gchar **)b);
+}
+
+
+void
+modulemd_string_set_compact (ModulemdStringSet *set)
+{
+  GHashTableIter iter;
+  gpointer key;
+  guint i = 0;
+
+  if (!set->table)
+    {
+      return;
+    }
+
+  set->n_sorted = g_hash_table_size (set->table);
+  set->sorted = g_new (gchar *, set->n_sorted + 1);
+
+  g_hash_table_iter_init (&iter, set->table);
+  while (g_hash_table_iter_next (&iter, &key, NULL))
     {
-      if (*i == ':')
+      set->sorted[i++] = key;
+    }
+  set->sorted[i] = NULL;
+
+  g_qsort_with_data (
+    set->sorted, set->n_sorted, sizeof (gchar *), string_set_compare, NULL);
+
+  /* The strings now belong to the array */
+  g_hash_table_steal_all (set->table);
+  g_clear_pointer (&set->table, g_hash_table_unref);
+}
+
+
+gboolean
+modulemd_string_set_contains (ModulemdStringSet *set, const gchar *str)
+{
+  guint low = 0;
+  guint high;
+  guint middle;
+  gint cmp;
+
+  if (set->table)
+    {
+      return g_hash_table_contains (set->table, str);
+    }
+
+  high = set->n_sorted;
+  while (low < high)
+    {
+      middle = low + (high - low) / 2;
+      cmp = strcmp (set->sorted[middle], str);
+      if (cmp == 0)
         {
-          break;
+          return TRUE;
         }
-      if (*i == '-')
+      if (cmp < 0)
         {
-          /* '-' between version and epoch is not allowed */
-          return FALSE;
+          low = middle + 1;
         }
-      i--;
+      else
+        {
+          high = middle;
+        }
+    }
+
+  return FALSE;
+}
+
+
+guint
+modulemd_string_set_size (ModulemdStringSet *set)
+{
+  if (set->table)
+    {
+      return g_hash_table_size (set->table);
     }
-  if (i < tmp)
+
+  return set->n_sorted;
+}
+
+
+gboolean
+modulemd_string_set_equals (ModulemdStringSet *a, ModulemdStringSet *b)
+{
+  ModulemdStringSetIter iter;
+  const gchar *str = NULL;
+
+  if (modulemd_string_set_size (a) != modulemd_string_set_size (b))
     {
-      /* We hit the start of the string without hitting ':' */
       return FALSE;
     }
 
-  /* Process the epoch */
-  *i = '\0';
-  while (i >= tmp)
+  if (!a->table && !b->table)
     {
-      if (*i == '-')
+      for (guint i = 0; i < a->n_sorted; i++)
         {
-          break;
+          if (!g_str_equal (a->sorted[i], b->sorted[i]))
+            {
+              return FALSE;
+            }
         }
-      i--;
+      return TRUE;
     }
-  if (i < tmp)
+
+  modulemd_string_set_iter_init (&iter, a);
+  while (modulemd_string_set_iter_next (&iter, &str))
     {
-      /* We hit the start of the string without hitting '-' */
-      return FALSE;
+      if (!modulemd_string_set_contains (b, str))
+        {
+          return FALSE;
+        }
     }
 
-  /* Validate that this section is a number */
-  g_ascii_strtoll (i, &endptr, 10);
-  if (endptr == i)
+  return TRUE;
+}
+
+
+GStrv
+modulemd_string_set_as_strv (ModulemdStringSet *set)
+{
+  if (set->table)
     {
-      /* String conversion failed */
-      return FALSE;
+      return modulemd_ordered_str_keys_as_strv (set->table);
     }
 
-  /* No need to specifically parse the name section here */
+  return g_strdupv (set->sorted);
+}
 
-  return TRUE;
+
+void
+modulemd_string_set_iter_init (ModulemdStringSetIter *iter,
+                               ModulemdStringSet *set)
+{
+  iter->set = set;
+  iter->index = 0;
+  if (set->table)
+    {
+      g_hash_table_iter_init (&iter->table_iter, set->table);
+    }
 }
 
 
 gboolean
-modulemd_boolean_equals (gboolean a, gboolean b)
+modulemd_string_set_iter_next (ModulemdStringSetIter *iter, const gchar **str)
 {
-  /*
-   * There is no validation when assigning to a gboolean variable and so it
-   * could contain any value represented by a gint. Thus, each value needs to
-   * be canonicalized before comparing for equality.
-   */
-  if (!!a == !!b)
+  gpointer key;
+
+  if (iter->set->table)
     {
+      if (!g_hash_table_iter_next (&iter->table_iter, &key, NULL))
+        {
+          return FALSE;
+        }
+      *str = key;
       return TRUE;
     }
 
-  return FALSE;
+  if (iter->index >= iter->set->n_sorted)
+    {
+      return FALSE;
+    }
+
+  *str = iter->set->sorted[iter->index++];
+  return TRUE;
+}
+
+
+void
+modulemd_ordered_keys_invalidate (ModulemdOrderedKeys *cache)
+{
+  g_clear_pointer (&cache->keys, g_free);
+}
+
+
+const gchar *const *
+modulemd_ordered_keys_get (ModulemdOrderedKeys *cache, GHashTable *htable)
+{
+  const gchar **keys = g_atomic_pointer_get (&cache->keys);
+  guint length;
+
+  if (keys)
+    {
+      return keys;
+    }
+
+  keys = (const gchar **)g_hash_table_get_keys_as_array (htable, &length);
+  g_qsort_with_data (keys, length, sizeof (gchar *), string_set_compare, NULL);
+
+  /* Readers of a frozen object may get here at the same time. Keep the view
+   * that was stored first, since another reader may already be using it.
+   */
+  if (!g_atomic_pointer_compare_and_exchange (&cache->keys, NULL, keys))
+    {
+      g_free (keys);
+      keys = g_atomic_pointer_get (&cache->keys);
+    }
+
+  return keys;
+}
+
+
+GStrv
+modulemd_ordered_keys_as_strv (ModulemdOrderedKeys *cache, GHashTable *htable)
+{
+  return g_strdupv ((gchar **)modulemd_ordered_keys_get (cache, htable));
+}
+
+
+gboolean
+modulemd_validate_nevra_set (ModulemdStringSet *set, const gchar **invalid)
+{
+  ModulemdStringSetIter iter;
+  const gchar *nevra = NULL;
+
+  modulemd_string_set_iter_init (&iter, set);
+  while (modulemd_string_set_iter_next (&iter, &nevra))
+    {
+      if (!modulemd_nevra_parse (nevra, NULL))
+        {
+          if (invalid)
+            {
+              *invalid = nevra;
+            }
+          return FALSE;
+        }
+    }
+
+  return TRUE;
 }
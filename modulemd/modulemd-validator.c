@@ -14,6 +14,8 @@
 
 #include "modulemd.h"
 #include "private/modulemd-module-index-private.h"
+#include "private/modulemd-subdocument-info-private.h"
+#include "private/modulemd-util.h"
 #include "private/modulemd-yaml.h"
 
 #include <errno.h>
@@ -31,10 +33,14 @@ enum mmd_verbosity
 struct validator_options
 {
   enum mmd_verbosity verbosity;
+  gint jobs;
+  gboolean streaming;
+  gboolean check_duplicates;
+  gboolean json;
   gchar **filenames;
 };
 
-struct validator_options options = { 0, NULL };
+struct validator_options options = { 0, 1, FALSE, FALSE, FALSE, NULL };
 
 static gboolean
 set_verbosity (const gchar *option_name,
@@ -87,29 +93,87 @@ set_verbosity (const gchar *option_name,
   return TRUE;
 }
 
+
+static gboolean
+set_format (const gchar *option_name,
+            const gchar *value,
+            gpointer data,
+            GError **error)
+{
+  if (g_strcmp0 (value, "text") == 0)
+    {
+      options.json = FALSE;
+    }
+  else if (g_strcmp0 (value, "json") == 0)
+    {
+      options.json = TRUE;
+    }
+  else
+    {
+      g_set_error (error,
+                   G_OPTION_ERROR,
+                   G_OPTION_ERROR_BAD_VALUE,
+                   "Unknown output format \"%s\"",
+                   value);
+      return FALSE;
+    }
+  return TRUE;
+}
+
 // clang-format off
 static GOptionEntry entries[] = {
   { "quiet", 'q', G_OPTION_FLAG_NO_ARG, G_OPTION_ARG_CALLBACK, set_verbosity, "Print no output", NULL },
   { "verbose", 'v', G_OPTION_FLAG_NO_ARG, G_OPTION_ARG_CALLBACK, set_verbosity, "Be verbose", NULL },
   { "debug", 0, G_OPTION_FLAG_NO_ARG, G_OPTION_ARG_CALLBACK, set_verbosity, "Output debugging messages", NULL },
+  { "streaming", 's', 0, G_OPTION_ARG_NONE, &options.streaming, "Validate each document and discard it instead of building an index of the whole file. Uses much less memory, but skips checks between documents", NULL },
+  { "check-duplicates", 0, 0, G_OPTION_ARG_NONE, &options.check_duplicates, "Report module streams with the same NSVCA as an earlier stream in the same file. Implies --streaming", NULL },
+  { "jobs", 'j', 0, G_OPTION_ARG_INT, &options.jobs, "Validate up to N files concurrently. 0 uses one job per processor (default: 1)", "N" },
+  { "format", 0, 0, G_OPTION_ARG_CALLBACK, set_format, "Output format: \"text\" or \"json\", which prints one JSON object per file with the results and timings of each subdocument (default: text)", "FORMAT" },
   { G_OPTION_REMAINING, 0, 0, G_OPTION_ARG_FILENAME_ARRAY, &options.filenames, "Files to be validated", NULL },
   { NULL } };
 // clang-format on
 
 
+/* The outcome of validating one file. Results are filled in by the worker
+ * threads in any order, but they are always reported in the order the files
+ * were given on the command line.
+ */
+typedef struct _validation_result
+{
+  const gchar *filename;
+  gboolean done;
+
+  gboolean valid;
+  gchar *open_error;
+  GError *error;
+  GPtrArray *failures;
+
+  /* Only collected for --format=json, without the YAML of each document */
+  GPtrArray *documents;
+  gint64 elapsed;
+} validation_result;
+
+
+typedef struct _validation_queue
+{
+  GMutex lock;
+  GCond cond;
+} validation_queue;
+
+
 static gboolean
-parse_file (const gchar *filename, GPtrArray **failures, GError **error)
+parse_file (const gchar *filename,
+            gchar **open_error,
+            GPtrArray *documents,
+            GPtrArray **failures,
+            GError **error)
 {
   MMD_INIT_YAML_PARSER (parser);
   MMD_INIT_YAML_EVENT (event);
   g_autoptr (FILE) yaml_stream = NULL;
   int saved_errno;
   g_autoptr (ModulemdModuleIndex) index = NULL;
-
-  if (options.verbosity >= MMD_VERBOSE)
-    {
-      g_fprintf (stdout, "Validating %s\n", filename);
-    }
+  g_autoptr (GHashTable) seen_nsvcas = NULL;
 
   /* Parse documents */
   yaml_stream = g_fopen (filename, "rbe");
@@ -117,13 +181,7 @@ parse_file (const gchar *filename, GPtrArray **failures, GError **error)
 
   if (yaml_stream == NULL)
     {
-      if (options.verbosity >= MMD_DEFAULT)
-        {
-          g_fprintf (stdout,
-                     "Failed to open file %s: %s\n",
-                     filename,
-                     g_strerror (saved_errno));
-        }
+      *open_error = g_strdup (g_strerror (saved_errno));
       return FALSE;
     }
 
@@ -131,21 +189,224 @@ parse_file (const gchar *filename, GPtrArray **failures, GError **error)
   yaml_parser_set_input_file (&parser, yaml_stream);
 
   index = modulemd_module_index_new ();
-  return modulemd_module_index_update_from_parser (
-    index, &parser, TRUE, TRUE, failures, error);
+
+  if (options.streaming || options.check_duplicates)
+    {
+      if (options.check_duplicates)
+        {
+          seen_nsvcas =
+            g_hash_table_new_full (g_str_hash, g_str_equal, g_free, NULL);
+        }
+
+      return modulemd_module_index_validate_from_parser (
+        index, &parser, TRUE, seen_nsvcas, documents, failures, error);
+    }
+
+  return modulemd_module_index_update_from_parser_ext (
+    index, &parser, TRUE, TRUE, documents, failures, error);
+}
+
+
+static void
+validate_file (validation_result *result)
+{
+  gint64 start_time = g_get_monotonic_time ();
+
+  if (options.json && options.verbosity >= MMD_DEFAULT)
+    {
+      result->documents = g_ptr_array_new_with_free_func (g_object_unref);
+    }
+
+  result->valid = parse_file (result->filename,
+                              &result->open_error,
+                              result->documents,
+                              &result->failures,
+                              &result->error);
+
+  result->elapsed = g_get_monotonic_time () - start_time;
+}
+
+
+static void
+validate_file_thread (gpointer data, gpointer user_data)
+{
+  validation_result *result = (validation_result *)data;
+  validation_queue *queue = (validation_queue *)user_data;
+
+  validate_file (result);
+
+  g_mutex_lock (&queue->lock);
+  result->done = TRUE;
+  g_cond_broadcast (&queue->cond);
+  g_mutex_unlock (&queue->lock);
+}
+
+
+static const gchar *
+doctype_to_string (ModulemdYamlDocumentTypeEnum doctype)
+{
+  switch (doctype)
+    {
+    case MODULEMD_YAML_DOC_MODULESTREAM: return "modulemd";
+
+    case MODULEMD_YAML_DOC_DEFAULTS: return "modulemd-defaults";
+
+    case MODULEMD_YAML_DOC_TRANSLATIONS: return "modulemd-translations";
+
+    default: return NULL;
+    }
+}
+
+
+static void
+append_json_document (GString *json, ModulemdSubdocumentInfo *doc)
+{
+  const GError *doc_error = modulemd_subdocument_info_get_gerror (doc);
+
+  g_string_append_printf (json,
+                          "{\"line\": %" G_GSIZE_FORMAT
+                          ", \"offset\": %" G_GSIZE_FORMAT ", \"doctype\": ",
+                          modulemd_subdocument_info_get_line (doc),
+                          modulemd_subdocument_info_get_offset (doc));
+  modulemd_append_json_string (
+    json, doctype_to_string (modulemd_subdocument_info_get_doctype (doc)));
+  g_string_append_printf (json,
+                          ", \"mdversion\": %" G_GUINT64_FORMAT
+                          ", \"nsvca\": ",
+                          modulemd_subdocument_info_get_mdversion (doc));
+  modulemd_append_json_string (json,
+                               modulemd_subdocument_info_get_nsvca (doc));
+  g_string_append_printf (
+    json, ", \"valid\": %s, \"error\": ", doc_error ? "false" : "true");
+  modulemd_append_json_string (json, doc_error ? doc_error->message : NULL);
+  g_string_append_printf (json,
+                          ", \"scan_us\": %" G_GINT64_FORMAT
+                          ", \"parse_us\": %" G_GINT64_FORMAT
+                          ", \"validate_us\": %" G_GINT64_FORMAT "}",
+                          modulemd_subdocument_info_get_phase_time (
+                            doc, MODULEMD_INDEX_STATS_PHASE_SCAN),
+                          modulemd_subdocument_info_get_phase_time (
+                            doc, MODULEMD_INDEX_STATS_PHASE_PARSE),
+                          modulemd_subdocument_info_get_phase_time (
+                            doc, MODULEMD_INDEX_STATS_PHASE_VALIDATE));
+}
+
+
+/* Prints the result for one file as a single line of JSON, so the output of
+ * several files can be processed as a stream.
+ */
+static void
+report_result_json (validation_result *result)
+{
+  g_autoptr (GString) json = g_string_new ("{\"file\": ");
+  const gchar *error_message = result->open_error;
+
+  if (error_message == NULL && result->error != NULL)
+    {
+      error_message = result->error->message;
+    }
+
+  modulemd_append_json_string (json, result->filename);
+  g_string_append_printf (json,
+                          ", \"valid\": %s, \"time_us\": %" G_GINT64_FORMAT
+                          ", \"error\": ",
+                          result->valid ? "true" : "false",
+                          result->elapsed);
+  modulemd_append_json_string (json, error_message);
+  g_string_append (json, ", \"documents\": [");
+
+  for (guint i = 0; result->documents && i < result->documents->len; i++)
+    {
+      if (i > 0)
+        {
+          g_string_append (json, ", ");
+        }
+      append_json_document (
+        json,
+        MODULEMD_SUBDOCUMENT_INFO (g_ptr_array_index (result->documents, i)));
+    }
+
+  g_string_append (json, "]}\n");
+  fputs (json->str, stdout);
+}
+
+
+static void
+report_result (validation_result *result)
+{
+  ModulemdSubdocumentInfo *doc = NULL;
+
+  if (options.verbosity >= MMD_VERBOSE)
+    {
+      g_fprintf (stdout, "Validating %s\n", result->filename);
+    }
+
+  if (result->open_error && options.verbosity >= MMD_DEFAULT)
+    {
+      g_fprintf (stdout,
+                 "Failed to open file %s: %s\n",
+                 result->filename,
+                 result->open_error);
+    }
+
+  if (!result->valid)
+    {
+      if (options.verbosity >= MMD_DEFAULT)
+        {
+          g_fprintf (stderr, "%s failed to validate\n", result->filename);
+
+          if (result->error != NULL)
+            {
+              /* Unparseable content */
+              g_fprintf (stderr,
+                         "%s could not be read in its entirety: %s\n",
+                         result->filename,
+                         result->error->message);
+            }
+          if (result->failures)
+            {
+              for (gsize j = 0; j < result->failures->len; j++)
+                {
+                  doc = MODULEMD_SUBDOCUMENT_INFO (
+                    g_ptr_array_index (result->failures, j));
+                  g_printf (
+                    "\nFailed subdocument (%s): \n%s\n",
+                    modulemd_subdocument_info_get_gerror (doc)->message,
+                    modulemd_subdocument_info_get_yaml (doc));
+                }
+            }
+        }
+    }
+  else
+    {
+      if (options.verbosity >= MMD_DEFAULT)
+        {
+          g_printf ("%s validated successfully\n", result->filename);
+        }
+    }
+}
+
+
+static void
+clear_result (validation_result *result)
+{
+  g_clear_pointer (&result->open_error, g_free);
+  g_clear_error (&result->error);
+  g_clear_pointer (&result->failures, g_ptr_array_unref);
+  g_clear_pointer (&result->documents, g_ptr_array_unref);
 }
 
 
 int
 main (int argc, char *argv[])
 {
-  const char *filename;
   g_autoptr (GOptionContext) context = NULL;
   g_autoptr (GError) error = NULL;
+  g_autofree validation_result *results = NULL;
+  validation_queue queue;
+  GThreadPool *pool = NULL;
+  gsize num_files;
   gsize num_invalid = 0;
-  gboolean ret;
-  g_autoptr (GPtrArray) failures = NULL;
-  ModulemdSubdocumentInfo *doc = NULL;
 
   setlocale (LC_ALL, "");
 
@@ -164,50 +425,87 @@ main (int argc, char *argv[])
       return EXIT_FAILURE;
     }
 
-  for (gsize i = 0; options.filenames[i]; i++)
+  if (options.jobs < 0)
     {
-      filename = options.filenames[i];
+      g_fprintf (stderr, "--jobs must not be negative\n");
+      return EXIT_FAILURE;
+    }
+
+  if (options.jobs == 0)
+    {
+      options.jobs = (gint)g_get_num_processors ();
+    }
 
-      ret = parse_file (filename, &failures, &error);
-      if (!ret)
+  num_files = g_strv_length (options.filenames);
+  results = g_new0 (validation_result, num_files);
+
+  g_mutex_init (&queue.lock);
+  g_cond_init (&queue.cond);
+
+  if (options.jobs > 1 && num_files > 1)
+    {
+      pool = g_thread_pool_new (
+        validate_file_thread, &queue, options.jobs, TRUE, &error);
+      if (!pool)
         {
-          num_invalid++;
-          if (options.verbosity >= MMD_DEFAULT)
-            {
-              g_fprintf (stderr, "%s failed to validate\n", filename);
+          g_fprintf (stderr,
+                     "Could not start the worker threads: %s\n",
+                     error->message);
+          return EXIT_FAILURE;
+        }
+    }
 
-              if (error != NULL)
-                {
-                  /* Unparseable content */
-                  g_fprintf (stderr,
-                             "%s could not be read in its entirety: %s\n",
-                             filename,
-                             error->message);
-                }
-              if (failures)
-                {
-                  for (gsize j = 0; j < failures->len; j++)
-                    {
-                      doc = MODULEMD_SUBDOCUMENT_INFO (
-                        g_ptr_array_index (failures, i));
-                      g_printf (
-                        "\nFailed subdocument (%s): \n%s\n",
-                        modulemd_subdocument_info_get_gerror (doc)->message,
-                        modulemd_subdocument_info_get_yaml (doc));
-                    }
-                }
+  for (gsize i = 0; i < num_files; i++)
+    {
+      results[i].filename = options.filenames[i];
+
+      if (pool)
+        {
+          g_thread_pool_push (pool, &results[i], NULL);
+        }
+    }
+
+  for (gsize i = 0; i < num_files; i++)
+    {
+      if (pool)
+        {
+          g_mutex_lock (&queue.lock);
+          while (!results[i].done)
+            {
+              g_cond_wait (&queue.cond, &queue.lock);
             }
+          g_mutex_unlock (&queue.lock);
         }
       else
+        {
+          validate_file (&results[i]);
+        }
+
+      if (options.json)
         {
           if (options.verbosity >= MMD_DEFAULT)
             {
-              g_printf ("%s validated successfully\n", filename);
+              report_result_json (&results[i]);
             }
         }
-      g_clear_error (&error);
-      g_clear_pointer (&failures, g_ptr_array_unref);
+      else
+        {
+          report_result (&results[i]);
+        }
+      if (!results[i].valid)
+        {
+          num_invalid++;
+        }
+      clear_result (&results[i]);
     }
 
+  if (pool)
+    {
+      g_thread_pool_free (pool, FALSE, TRUE);
+    }
+
+  g_mutex_clear (&queue.lock);
+  g_cond_clear (&queue.cond);
+
   return num_invalid;
 }
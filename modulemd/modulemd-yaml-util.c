@@ -56,6 +56,15 @@ write_yaml_string (void *data, unsigned char *buffer, size_t size)
 }
 
 
+int
+write_yaml_checksum (void *data, unsigned char *buffer, size_t size)
+{
+  g_checksum_update ((GChecksum *)data, buffer, size);
+
+  return 1;
+}
+
+
 const gchar *
 mmd_yaml_get_event_name (yaml_event_type_t type)
 {
@@ -349,6 +358,25 @@ mmd_emitter_strv (yaml_emitter_t *emitter,
 }
 
 
+gboolean
+mmd_emitter_string_set (yaml_emitter_t *emitter,
+                        yaml_sequence_style_t seq_style,
+                        ModulemdStringSet *set,
+                        GError **error)
+{
+  g_auto (GStrv) list = NULL;
+
+  /* A compacted set is already in order */
+  if (set->sorted)
+    {
+      return mmd_emitter_strv (emitter, seq_style, set->sorted, error);
+    }
+
+  list = modulemd_string_set_as_strv (set);
+  return mmd_emitter_strv (emitter, seq_style, list, error);
+}
+
+
 GDate *
 modulemd_yaml_parse_date (yaml_parser_t *parser, GError **error)
 {
@@ -13,9 +13,314 @@
 
 #include "modulemd.h"
 #include "config.h"
+#include "private/modulemd-util.h"
+#include "private/modulemd-yaml.h"
 
 const gchar *
 modulemd_get_version (void)
 {
   return LIBMODULEMD_VERSION;
 }
+
+
+static GVariant *
+variant_from_json_event (yaml_parser_t *parser,
+                         yaml_event_t *event,
+                         GError **error);
+
+
+static GVariant *
+variant_from_json_scalar (yaml_event_t *event, GError **error)
+{
+  const gchar *scalar = (const gchar *)event->data.scalar.value;
+
+  if (event->data.scalar.style != YAML_PLAIN_SCALAR_STYLE)
+    {
+      return g_variant_new_string (scalar);
+    }
+
+  if (g_str_equal (scalar, "true"))
+    {
+      return g_variant_new_boolean (TRUE);
+    }
+  if (g_str_equal (scalar, "false"))
+    {
+      return g_variant_new_boolean (FALSE);
+    }
+  if (!g_str_equal (scalar, "null"))
+    {
+      MMD_YAML_ERROR_EVENT_EXIT (
+        error,
+        (*event),
+        "Unsupported value \"%s\": only strings, booleans, arrays and "
+        "objects are supported",
+        scalar);
+    }
+
+  /* Matches the Python bindings, which store None as an empty string */
+  return g_variant_new_string ("");
+}
+
+
+static GVariant *
+variant_from_json_object (yaml_parser_t *parser, GError **error)
+{
+  MMD_INIT_YAML_EVENT (event);
+  MMD_INIT_YAML_EVENT (value_event);
+  g_autoptr (GVariantDict) dict = g_variant_dict_new (NULL);
+  GVariant *value = NULL;
+
+  while (TRUE)
+    {
+      YAML_PARSER_PARSE_WITH_EXIT (parser, &event, error);
+
+      if (event.type == YAML_MAPPING_END_EVENT)
+        {
+          break;
+        }
+
+      if (event.type != YAML_SCALAR_EVENT)
+        {
+          MMD_YAML_ERROR_EVENT_EXIT (
+            error, event, "Object keys must be strings");
+        }
+
+      YAML_PARSER_PARSE_WITH_EXIT (parser, &value_event, error);
+      value = variant_from_json_event (parser, &value_event, error);
+      if (!value)
+        {
+          return NULL;
+        }
+
+      g_variant_dict_insert_value (
+        dict, (const gchar *)event.data.scalar.value, value);
+
+      yaml_event_delete (&value_event);
+      yaml_event_delete (&event);
+    }
+
+  return g_variant_dict_end (dict);
+}
+
+
+static GVariant *
+variant_from_json_array (yaml_parser_t *parser, GError **error)
+{
+  MMD_INIT_YAML_EVENT (event);
+  g_autoptr (GPtrArray) values =
+    g_ptr_array_new_with_free_func ((GDestroyNotify)g_variant_unref);
+  GVariant *value = NULL;
+  GVariant *first = NULL;
+
+  while (TRUE)
+    {
+      YAML_PARSER_PARSE_WITH_EXIT (parser, &event, error);
+
+      if (event.type == YAML_SEQUENCE_END_EVENT)
+        {
+          break;
+        }
+
+      value = variant_from_json_event (parser, &event, error);
+      if (!value)
+        {
+          return NULL;
+        }
+      g_ptr_array_add (values, g_variant_ref_sink (value));
+
+      first = g_ptr_array_index (values, 0);
+      if (!g_variant_type_equal (g_variant_get_type (first),
+                                 g_variant_get_type (value)))
+        {
+          MMD_YAML_ERROR_EVENT_EXIT (
+            error,
+            event,
+            "All the values of an array must have the same type");
+        }
+
+      yaml_event_delete (&event);
+    }
+
+  if (values->len == 0)
+    {
+      /* Empty arrays are stored as a zero-length array of GVariants, as when
+       * reading YAML
+       */
+      return g_variant_new ("av", NULL);
+    }
+
+  return g_variant_new_array (
+    NULL, (GVariant *const *)values->pdata, values->len);
+}
+
+
+static GVariant *
+variant_from_json_event (yaml_parser_t *parser,
+                         yaml_event_t *event,
+                         GError **error)
+{
+  switch (event->type)
+    {
+    case YAML_SCALAR_EVENT: return variant_from_json_scalar (event, error);
+
+    case YAML_MAPPING_START_EVENT:
+      return variant_from_json_object (parser, error);
+
+    case YAML_SEQUENCE_START_EVENT:
+      return variant_from_json_array (parser, error);
+
+    default: break;
+    }
+
+  g_set_error (error,
+               MODULEMD_YAML_ERROR,
+               MODULEMD_YAML_ERROR_PARSE,
+               "Unexpected YAML event in JSON value: %s [line %zu col %zu]",
+               mmd_yaml_get_event_name (event->type),
+               event->start_mark.line + 1,
+               event->start_mark.column + 1);
+  return NULL;
+}
+
+
+GVariant *
+modulemd_variant_from_json (const gchar *json, GError **error)
+{
+  MMD_INIT_YAML_PARSER (parser);
+  MMD_INIT_YAML_EVENT (event);
+  g_autoptr (GVariant) variant = NULL;
+
+  g_return_val_if_fail (json, NULL);
+  g_return_val_if_fail (error == NULL || *error == NULL, NULL);
+
+  yaml_parser_set_input_string (
+    &parser, (const unsigned char *)json, strlen (json));
+
+  YAML_PARSER_PARSE_WITH_EXIT (&parser, &event, error);
+  if (event.type != YAML_STREAM_START_EVENT)
+    {
+      MMD_YAML_ERROR_EVENT_EXIT (
+        error, event, "Did not encounter stream start");
+    }
+  yaml_event_delete (&event);
+
+  YAML_PARSER_PARSE_WITH_EXIT (&parser, &event, error);
+  if (event.type != YAML_DOCUMENT_START_EVENT)
+    {
+      MMD_YAML_ERROR_EVENT_EXIT (error, event, "No JSON value found");
+    }
+  yaml_event_delete (&event);
+
+  YAML_PARSER_PARSE_WITH_EXIT (&parser, &event, error);
+  variant = variant_from_json_event (&parser, &event, error);
+  if (!variant)
+    {
+      return NULL;
+    }
+  yaml_event_delete (&event);
+
+  YAML_PARSER_PARSE_WITH_EXIT (&parser, &event, error);
+  if (event.type != YAML_DOCUMENT_END_EVENT)
+    {
+      MMD_YAML_ERROR_EVENT_EXIT (
+        error, event, "Unexpected content after the JSON value");
+    }
+
+  return g_variant_ref_sink (g_steal_pointer (&variant));
+}
+
+
+static gboolean
+append_json_variant (GString *json, GVariant *variant, GError **error)
+{
+  GVariantIter iter;
+  const gchar *key = NULL;
+  g_autoptr (GVariant) value = NULL;
+  gboolean first = TRUE;
+
+  if (g_variant_is_of_type (variant, G_VARIANT_TYPE_STRING))
+    {
+      modulemd_append_json_string (json, g_variant_get_string (variant, NULL));
+    }
+  else if (g_variant_is_of_type (variant, G_VARIANT_TYPE_BOOLEAN))
+    {
+      g_string_append (json,
+                       g_variant_get_boolean (variant) ? "true" : "false");
+    }
+  else if (g_variant_is_of_type (variant, G_VARIANT_TYPE_VARIANT))
+    {
+      value = g_variant_get_variant (variant);
+      return append_json_variant (json, value, error);
+    }
+  else if (g_variant_is_of_type (variant, G_VARIANT_TYPE_VARDICT))
+    {
+      g_string_append_c (json, '{');
+      g_variant_iter_init (&iter, variant);
+      while (g_variant_iter_next (&iter, "{&sv}", &key, &value))
+        {
+          if (!first)
+            {
+              g_string_append (json, ", ");
+            }
+          first = FALSE;
+
+          modulemd_append_json_string (json, key);
+          g_string_append (json, ": ");
+          if (!append_json_variant (json, value, error))
+            {
+              return FALSE;
+            }
+          g_clear_pointer (&value, g_variant_unref);
+        }
+      g_string_append_c (json, '}');
+    }
+  else if (g_variant_is_of_type (variant, G_VARIANT_TYPE_ARRAY))
+    {
+      g_string_append_c (json, '[');
+      g_variant_iter_init (&iter, variant);
+      while ((value = g_variant_iter_next_value (&iter)))
+        {
+          if (!first)
+            {
+              g_string_append (json, ", ");
+            }
+          first = FALSE;
+
+          if (!append_json_variant (json, value, error))
+            {
+              return FALSE;
+            }
+          g_clear_pointer (&value, g_variant_unref);
+        }
+      g_string_append_c (json, ']');
+    }
+  else
+    {
+      g_set_error (error,
+                   MODULEMD_YAML_ERROR,
+                   MODULEMD_YAML_ERROR_EMIT,
+                   "Unhandled variant type: \"%s\"",
+                   g_variant_get_type_string (variant));
+      return FALSE;
+    }
+
+  return TRUE;
+}
+
+
+gchar *
+modulemd_variant_to_json (GVariant *variant, GError **error)
+{
+  g_autoptr (GString) json = NULL;
+
+  g_return_val_if_fail (variant, NULL);
+  g_return_val_if_fail (error == NULL || *error == NULL, NULL);
+
+  json = g_string_new (NULL);
+  if (!append_json_variant (json, variant, error))
+    {
+      return NULL;
+    }
+
+  return g_string_free (g_steal_pointer (&json), FALSE);
+}
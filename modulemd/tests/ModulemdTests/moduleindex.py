@@ -13,6 +13,7 @@
 # <https://www.gnu.org/philosophy/free-sw.en.html>.
 
 from os import path
+import json
 import sys
 
 try:
@@ -136,6 +137,238 @@ profiles:
             yaml = idx.dump_to_string()
             self.assertIsNone(yaml)
 
+    def test_dump_flags(self):
+        idx = Modulemd.ModuleIndex.new()
+        idx.update_from_file(path.join(self.test_data_path, "f29.yaml"), True)
+
+        expected = idx.dump_to_string()
+
+        self.assertEqual(
+            idx.dump_to_string_ext(Modulemd.DumpFlags.NONE), expected
+        )
+
+        unsorted = idx.dump_to_string_ext(Modulemd.DumpFlags.UNSORTED)
+        reread = Modulemd.ModuleIndex.new()
+        reread.update_from_string(unsorted, True)
+        self.assertEqual(reread.dump_to_string(), expected)
+
+    def test_dump_filtered(self):
+        idx = Modulemd.ModuleIndex.new()
+        idx.update_from_file(path.join(self.test_data_path, "f29.yaml"), True)
+
+        self.assertEqual(
+            idx.dump_to_string_filtered(
+                None, None, None, Modulemd.DumpFlags.NONE
+            ),
+            idx.dump_to_string(),
+        )
+
+        filtered = Modulemd.ModuleIndex.new()
+        filtered.update_from_string(
+            idx.dump_to_string_filtered(
+                "dwm", None, None, Modulemd.DumpFlags.NONE
+            ),
+            True,
+        )
+        self.assertListEqual(filtered.get_module_names(), ["dwm"])
+
+        with self.assertRaisesRegex(
+            gi.repository.GLib.GError, "matched the filter"
+        ):
+            idx.dump_to_string_filtered(
+                "nonexistent", None, None, Modulemd.DumpFlags.NONE
+            )
+
+    def test_dump_to_json(self):
+        idx = Modulemd.ModuleIndex.new()
+        idx.update_from_file(path.join(self.test_data_path, "f29.yaml"), True)
+
+        documents = json.loads(idx.dump_to_json(Modulemd.DumpFlags.NONE))
+        self.assertEqual(len(documents), 55)
+
+        streams = [d for d in documents if d["document"] == "modulemd"]
+        self.assertEqual(len(streams), 48)
+        self.assertTrue(all(d["version"] == "2" for d in streams))
+
+        data = streams[0]["data"]
+        stream = idx.get_module(data["name"]).get_stream_by_NSVCA(
+            data["stream"], int(data["version"]), data["context"], data["arch"]
+        )
+        self.assertEqual(
+            data.get("artifacts", {}).get("rpms", []),
+            stream.get_rpm_artifacts(),
+        )
+
+        if "_overrides_module" in dir(Modulemd):
+            self.assertEqual(idx.to_dicts(), documents)
+
+    def test_iter_streams(self):
+        if "_overrides_module" not in dir(Modulemd):
+            return
+
+        idx = Modulemd.ModuleIndex.new()
+        idx.update_from_file(path.join(self.test_data_path, "f29.yaml"), True)
+
+        self.assertListEqual(
+            [module.props.module_name for module in idx],
+            idx.get_module_names(),
+        )
+
+        streams = list(idx.iter_streams())
+        self.assertEqual(len(streams), 48)
+
+        self.assertListEqual(
+            [
+                stream.props.stream_name
+                for stream in idx.iter_streams("nodejs")
+            ],
+            ["10", "8"],
+        )
+        self.assertEqual(len(list(idx.iter_streams(arch="x86_64"))), 48)
+        self.assertEqual(len(list(idx.iter_streams(arch="aarch64"))), 0)
+
+        nodejs = list(
+            idx.iter_streams(
+                "node*", "8", 20180816123422, "6c81f848", "x86_64"
+            )
+        )
+        self.assertEqual(len(nodejs), 1)
+        self.assertEqual(
+            nodejs[0].get_NSVCA(), "nodejs:8:20180816123422:6c81f848:x86_64"
+        )
+
+        # Nothing is looked up before the iteration starts
+        iterator = idx.iter_streams("nonexistent")
+        self.assertRaises(StopIteration, next, iterator)
+
+    def test_update_from_file_async(self):
+        yaml_path = path.join(self.test_data_path, "f29.yaml")
+        idx = Modulemd.ModuleIndex.new()
+        loop = GLib.MainLoop()
+        progress = []
+        results = []
+
+        def on_progress(nbytes, documents, *args):
+            progress.append(documents)
+
+        def on_ready(index, result, *args):
+            results.append(index.update_from_file_finish(result))
+            loop.quit()
+
+        idx.update_from_file_async(
+            yaml_path, True, None, on_progress, None, on_ready, None
+        )
+        loop.run()
+
+        ret, failures = results[0]
+        self.assertTrue(ret)
+        self.assertEqual(len(failures), 0)
+        self.assertEqual(progress[-1], 55)
+        self.assertEqual(len(idx.get_module_names()), 33)
+
+    def test_stats(self):
+        yaml_path = path.join(self.test_data_path, "f29.yaml")
+        idx = Modulemd.ModuleIndex.new()
+        idx.update_from_file(yaml_path, True)
+
+        stats = idx.get_stats()
+        self.assertEqual(stats.get_stream_documents(2), 48)
+        self.assertEqual(stats.get_stream_documents(1), 0)
+        self.assertEqual(stats.get_defaults_documents(1), 7)
+        self.assertEqual(stats.get_translation_documents(), 0)
+        self.assertEqual(stats.get_failures(), 0)
+        self.assertEqual(stats.get_bytes_read(), path.getsize(yaml_path))
+        self.assertGreaterEqual(
+            stats.get_phase_time(Modulemd.IndexStatsPhaseEnum.PARSE), 0
+        )
+
+        snapshot = stats.copy()
+        stats.reset()
+        self.assertEqual(stats.get_bytes_read(), 0)
+        self.assertEqual(snapshot.get_bytes_read(), path.getsize(yaml_path))
+
+        # Reading the same file again replaces every stream
+        idx.update_from_file(yaml_path, True)
+        self.assertEqual(stats.get_streams_deduplicated(), 48)
+
+    def test_memory_usage(self):
+        idx = Modulemd.ModuleIndex.new()
+        idx.update_from_file(path.join(self.test_data_path, "f29.yaml"), True)
+
+        usage = idx.get_memory_usage()
+        self.assertGreater(usage.get_strings(), 0)
+        self.assertGreater(usage.get_containers(), 0)
+        self.assertGreater(usage.get_objects(), 0)
+        self.assertEqual(
+            usage.get_total(),
+            usage.get_strings()
+            + usage.get_containers()
+            + usage.get_objects()
+            + usage.get_xmd(),
+        )
+
+        modules_total = 0
+        for module_name in idx.get_module_names():
+            module = idx.get_module(module_name)
+            module_total = module.get_memory_usage().get_total()
+            streams_total = sum(
+                stream.get_memory_usage().get_total()
+                for stream in module.get_all_streams()
+            )
+            self.assertGreater(module_total, streams_total)
+            modules_total += module_total
+
+        self.assertGreater(usage.get_total(), modules_total)
+
+    def test_diff(self):
+        old_idx = Modulemd.ModuleIndex.new()
+        old_idx.update_from_file(
+            path.join(self.test_data_path, "f29.yaml"), True
+        )
+        new_idx = Modulemd.ModuleIndex.new()
+        new_idx.update_from_file(
+            path.join(self.test_data_path, "f29-updates.yaml"), True
+        )
+
+        self.assertTrue(old_idx.diff(old_idx).is_empty())
+
+        diff = old_idx.diff(new_idx)
+        self.assertFalse(diff.is_empty())
+        for stream in diff.get_added_streams():
+            module = old_idx.get_module(stream.props.module_name)
+            if module:
+                old_nsvcas = [
+                    s.get_NSVCA_as_string() for s in module.get_all_streams()
+                ]
+                self.assertNotIn(stream.get_NSVCA_as_string(), old_nsvcas)
+
+        # Publish only the changed documents and rebuild the diff from them
+        updates = Modulemd.ModuleIndex.new()
+        for stream in diff.get_added_streams() + diff.get_changed_streams():
+            updates.add_module_stream(stream)
+        for defaults in (
+            diff.get_added_defaults() + diff.get_changed_defaults()
+        ):
+            updates.add_defaults(defaults)
+
+        received = Modulemd.ModuleIndex.new()
+        received.update_from_string(updates.dump_to_string(), True)
+
+        rebuilt = Modulemd.IndexDiff.new()
+        for module_name in received.get_module_names():
+            module = received.get_module(module_name)
+            for stream in module.get_all_streams():
+                rebuilt.change_stream(stream)
+            if module.get_defaults():
+                rebuilt.change_defaults(module.get_defaults())
+        for nsvca in diff.get_removed_streams():
+            rebuilt.remove_stream(nsvca)
+        for module_name in diff.get_removed_defaults():
+            rebuilt.remove_defaults(module_name)
+
+        self.assertTrue(old_idx.apply_diff(rebuilt))
+        self.assertTrue(old_idx.diff(new_idx).is_empty())
+
     def test_update_from_defaults_directory(self):
         idx = Modulemd.ModuleIndex.new()
         self.assertIsNotNone(idx)
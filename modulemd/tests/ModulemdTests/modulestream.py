@@ -601,6 +601,50 @@ class TestModuleStream(TestBase):
 
             self.assertIsNotNone(out_yaml)
 
+            # Changing the returned dictionary does not change the stream
+            xmd_copy = stream.get_xmd()
+            xmd_copy["something"].append("baz")
+            assert stream.get_xmd()["something"] == ["foo", "bar"]
+
+            # Booleans are kept and None is stored as an empty string
+            stream.set_xmd({"flag": False, "nothing": None, "list": []})
+            assert stream.get_xmd() == {
+                "flag": False,
+                "nothing": "",
+                "list": [],
+            }
+
+            # Numbers cannot be stored
+            with self.assertRaises(TypeError):
+                stream.set_xmd({"number": 1})
+
+            # Neither can anything else that is not a string, boolean, list
+            # or dictionary with string keys
+            for bad_xmd in [None, ("a", "b"), {1: "one"}, {"a": ("b",)}]:
+                with self.assertRaises(TypeError):
+                    stream.set_xmd(bad_xmd)
+
+            # Keys too long to be read back from JSON are still supported
+            long_key = "k" * 2000
+            stream.set_xmd({long_key: {"inner": ["value"]}})
+            assert stream.get_xmd() == {long_key: {"inner": ["value"]}}
+
+    def test_xmd_json(self):
+        xmd = Modulemd.variant_from_json(
+            '{"outer_key": {"inner_key": ["scalar", "another_scalar"]}}'
+        )
+        self.assertEqual(
+            xmd.unpack(),
+            {"outer_key": {"inner_key": ["scalar", "another_scalar"]}},
+        )
+        self.assertEqual(
+            Modulemd.variant_to_json(xmd),
+            '{"outer_key": {"inner_key": ["scalar", "another_scalar"]}}',
+        )
+
+        with self.assertRaisesRegexp(gi.repository.GLib.GError, "Unsupported"):
+            Modulemd.variant_from_json('{"number": 1}')
+
     def test_upgrade(self):
         v1_stream = Modulemd.ModuleStreamV1.new("SuperModule", "latest")
         v1_stream.set_summary("Summary")
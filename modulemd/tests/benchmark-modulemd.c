@@ -0,0 +1,486 @@
+/*
+ * This file is part of libmodulemd
+ * Copyright (C) 2020 Red Hat, Inc.
+ *
+ * Fedora-License-Identifier: MIT
+ * SPDX-2.0-License-Identifier: MIT
+ * SPDX-3.0-License-Identifier: MIT
+ *
+ * This program is free software.
+ * For more information on the license, see COPYING.
+ * For more information on free software, see <https://www.gnu.org/philosophy/free-sw.en.html>.
+ */
+
+#include <errno.h>
+#include <glib.h>
+#include <glib/gprintf.h>
+#include <glib/gstdio.h>
+#include <locale.h>
+#include <string.h>
+#include <sys/resource.h>
+#include <sys/wait.h>
+#include <unistd.h>
+
+#include "modulemd.h"
+#include "private/modulemd-module-index-private.h"
+
+
+struct benchmark_options
+{
+  gchar *operation;
+  gchar *input;
+  gint modules;
+  gint streams;
+  gint components;
+  gint iterations;
+};
+
+struct benchmark_options options = { NULL, NULL, 200, 10, 20, 5 };
+
+// clang-format off
+static GOptionEntry entries[] = {
+  { "operation", 'o', 0, G_OPTION_ARG_STRING, &options.operation, "The operation to measure: parse, dump, merge, resolve, search, defaults or all (default: all)", "OPERATION" },
+  { "input", 'i', 0, G_OPTION_ARG_FILENAME, &options.input, "Read the index from a YAML file instead of generating one", "FILE" },
+  { "modules", 'm', 0, G_OPTION_ARG_INT, &options.modules, "Number of modules to generate (default: 200)", "N" },
+  { "streams", 's', 0, G_OPTION_ARG_INT, &options.streams, "Number of streams to generate per module (default: 10)", "N" },
+  { "components", 'c', 0, G_OPTION_ARG_INT, &options.components, "Number of components and artifacts to generate per stream (default: 20)", "N" },
+  { "iterations", 'n', 0, G_OPTION_ARG_INT, &options.iterations, "Number of times to repeat each operation (default: 5)", "N" },
+  { NULL } };
+// clang-format on
+
+
+typedef struct _benchmark_ctx
+{
+  ModulemdModuleIndex *index;
+  gchar *yaml;
+  gchar *yaml_path;
+  guint64 n_streams;
+} benchmark_ctx;
+
+
+/* Each operation runs once per iteration and returns the number of items it
+ * processed, which is used to compute the throughput.
+ */
+typedef guint64 (*benchmark_func) (benchmark_ctx *ctx);
+
+
+static ModulemdModuleStream *
+generate_stream (gint module, gint stream, guint64 version)
+{
+  g_autoptr (ModulemdModuleStreamV2) v2_stream = NULL;
+  g_autoptr (ModulemdProfile) profile = NULL;
+  g_autoptr (ModulemdDependencies) deps = NULL;
+  g_autofree gchar *module_name = g_strdup_printf ("module%04d", module);
+  g_autofree gchar *stream_name = g_strdup_printf ("stream%03d", stream);
+  g_autofree gchar *context = g_strdup_printf ("%08x", module * 1000 + stream);
+
+  v2_stream = modulemd_module_stream_v2_new (module_name, stream_name);
+  modulemd_module_stream_set_version (MODULEMD_MODULE_STREAM (v2_stream),
+                                      version);
+  modulemd_module_stream_set_context (MODULEMD_MODULE_STREAM (v2_stream),
+                                      context);
+  modulemd_module_stream_v2_set_arch (v2_stream, "x86_64");
+  modulemd_module_stream_v2_set_summary (v2_stream, "A synthetic module");
+  modulemd_module_stream_v2_set_description (
+    v2_stream, "A synthetic module stream generated for benchmarking.");
+  modulemd_module_stream_v2_add_module_license (v2_stream, "MIT");
+
+  profile = modulemd_profile_new ("default");
+
+  for (gint i = 0; i < options.components; i++)
+    {
+      g_autoptr (ModulemdComponentRpm) component = NULL;
+      g_autofree gchar *name = g_strdup_printf ("%s-pkg%03d", module_name, i);
+      g_autofree gchar *artifact = g_strdup_printf (
+        "%s-0:1.%d-%" G_GUINT64_FORMAT ".x86_64", name, stream, version);
+
+      component = modulemd_component_rpm_new (name);
+      modulemd_component_set_rationale (MODULEMD_COMPONENT (component),
+                                        "Synthetic component");
+      modulemd_module_stream_v2_add_component (v2_stream,
+                                               MODULEMD_COMPONENT (component));
+      modulemd_module_stream_v2_add_rpm_api (v2_stream, name);
+      modulemd_module_stream_v2_add_rpm_artifact (v2_stream, artifact);
+      modulemd_profile_add_rpm (profile, name);
+    }
+
+  modulemd_module_stream_v2_add_profile (v2_stream, profile);
+
+  deps = modulemd_dependencies_new ();
+  modulemd_dependencies_add_buildtime_stream (deps, "platform", "f32");
+  modulemd_dependencies_add_runtime_stream (deps, "platform", "f32");
+  modulemd_module_stream_v2_add_dependencies (v2_stream, deps);
+
+  return MODULEMD_MODULE_STREAM (g_steal_pointer (&v2_stream));
+}
+
+
+static ModulemdModuleIndex *
+generate_index (guint64 version)
+{
+  g_autoptr (ModulemdModuleIndex) index = modulemd_module_index_new ();
+  g_autoptr (GError) error = NULL;
+
+  for (gint i = 0; i < options.modules; i++)
+    {
+      g_autoptr (ModulemdDefaultsV1) defaults = NULL;
+      g_autofree gchar *module_name = g_strdup_printf ("module%04d", i);
+
+      for (gint j = 0; j < options.streams; j++)
+        {
+          g_autoptr (ModulemdModuleStream) stream =
+            generate_stream (i, j, version);
+
+          if (!modulemd_module_index_add_module_stream (index, stream, &error))
+            {
+              g_error ("Could not add stream: %s", error->message);
+            }
+        }
+
+      defaults = modulemd_defaults_v1_new (module_name);
+      modulemd_defaults_v1_set_default_stream (defaults, "stream000", NULL);
+      modulemd_defaults_v1_add_default_profile_for_stream (
+        defaults, "stream000", "default", NULL);
+
+      if (!modulemd_module_index_add_defaults (
+            index, MODULEMD_DEFAULTS (defaults), &error))
+        {
+          g_error ("Could not add defaults: %s", error->message);
+        }
+    }
+
+  return g_steal_pointer (&index);
+}
+
+
+static guint64
+count_streams (ModulemdModuleIndex *index)
+{
+  g_auto (GStrv) module_names = NULL;
+  guint64 n_streams = 0;
+
+  module_names = modulemd_module_index_get_module_names_as_strv (index);
+  for (guint i = 0; module_names[i]; i++)
+    {
+      n_streams += modulemd_module_get_all_streams (
+                     modulemd_module_index_get_module (index, module_names[i]))
+                     ->len;
+    }
+
+  return n_streams;
+}
+
+
+static guint64
+benchmark_parse (benchmark_ctx *ctx)
+{
+  g_autoptr (ModulemdModuleIndex) index = modulemd_module_index_new ();
+  g_autoptr (GPtrArray) failures = NULL;
+  g_autoptr (GError) error = NULL;
+
+  if (!modulemd_module_index_update_from_file (
+        index, ctx->yaml_path, TRUE, &failures, &error))
+    {
+      g_error ("Could not read %s", ctx->yaml_path);
+    }
+
+  return ctx->n_streams;
+}
+
+
+static guint64
+benchmark_dump (benchmark_ctx *ctx)
+{
+  g_autofree gchar *yaml = NULL;
+  g_autoptr (GError) error = NULL;
+
+  yaml = modulemd_module_index_dump_to_string (ctx->index, &error);
+  if (!yaml)
+    {
+      g_error ("Could not dump the index: %s", error->message);
+    }
+
+  return ctx->n_streams;
+}
+
+
+static guint64
+benchmark_merge (benchmark_ctx *ctx)
+{
+  g_autoptr (ModulemdModuleIndex) into = modulemd_module_index_new ();
+  g_autoptr (GError) error = NULL;
+
+  if (!modulemd_module_index_merge (ctx->index, into, FALSE, FALSE, &error))
+    {
+      g_error ("Could not merge the index: %s", error->message);
+    }
+
+  return ctx->n_streams;
+}
+
+
+static guint64
+benchmark_resolve (benchmark_ctx *ctx)
+{
+  g_autoptr (ModulemdModuleIndexMerger) merger = NULL;
+  g_autoptr (ModulemdModuleIndex) merged = NULL;
+  g_autoptr (GError) error = NULL;
+
+  /* Two repositories with the same content at different priorities, as when
+   * an updates repository overlays a base repository.
+   */
+  merger = modulemd_module_index_merger_new ();
+  modulemd_module_index_merger_associate_index (merger, ctx->index, 0);
+  modulemd_module_index_merger_associate_index (merger, ctx->index, 10);
+
+  merged = modulemd_module_index_merger_resolve (merger, &error);
+  if (!merged)
+    {
+      g_error ("Could not resolve the merger: %s", error->message);
+    }
+
+  return 2 * ctx->n_streams;
+}
+
+
+static guint64
+benchmark_search (benchmark_ctx *ctx)
+{
+  g_auto (GStrv) module_names = NULL;
+  guint64 n_searches = 0;
+
+  module_names = modulemd_module_index_get_module_names_as_strv (ctx->index);
+  for (guint i = 0; module_names[i]; i++)
+    {
+      ModulemdModule *module =
+        modulemd_module_index_get_module (ctx->index, module_names[i]);
+      g_auto (GStrv) stream_names =
+        modulemd_module_get_stream_names_as_strv (module);
+
+      for (guint j = 0; stream_names[j]; j++)
+        {
+          g_autoptr (GPtrArray) found = modulemd_module_search_streams (
+            module, stream_names[j], 0, NULL, "x86_64");
+          n_searches++;
+        }
+    }
+
+  return n_searches;
+}
+
+
+static guint64
+benchmark_defaults (benchmark_ctx *ctx)
+{
+  g_autoptr (GHashTable) defaults = NULL;
+
+  defaults =
+    modulemd_module_index_get_default_streams_as_hash_table (ctx->index, NULL);
+
+  return g_hash_table_size (defaults);
+}
+
+
+static glong
+get_peak_rss_kb (void)
+{
+  struct rusage usage;
+
+  if (getrusage (RUSAGE_SELF, &usage) != 0)
+    {
+      return -1;
+    }
+
+  /* ru_maxrss is reported in kilobytes on Linux */
+  return usage.ru_maxrss;
+}
+
+
+static void
+measure_benchmark (benchmark_ctx *ctx, const gchar *name, benchmark_func func)
+{
+  glong baseline_rss_kb = get_peak_rss_kb ();
+  gint64 start;
+  gint64 elapsed;
+  gint64 min_elapsed = G_MAXINT64;
+  gint64 total_elapsed = 0;
+  guint64 items = 0;
+  gdouble seconds;
+  gchar buf[G_ASCII_DTOSTR_BUF_SIZE];
+
+  for (gint i = 0; i < options.iterations; i++)
+    {
+      start = g_get_monotonic_time ();
+      items = func (ctx);
+      elapsed = g_get_monotonic_time () - start;
+
+      total_elapsed += elapsed;
+      min_elapsed = MIN (min_elapsed, elapsed);
+    }
+
+  /* Emit one JSON object per line so that results can be collected and
+   * compared between runs.
+   */
+  seconds = (gdouble)MAX (min_elapsed, 1) / G_USEC_PER_SEC;
+  g_printf (
+    "{\"operation\": \"%s\", \"iterations\": %d, ", name, options.iterations);
+  g_printf ("\"streams\": %" G_GUINT64_FORMAT ", ", ctx->n_streams);
+  g_printf ("\"items\": %" G_GUINT64_FORMAT ", ", items);
+  g_printf ("\"min_usec\": %" G_GINT64_FORMAT ", ", min_elapsed);
+  g_printf ("\"mean_usec\": %" G_GINT64_FORMAT ", ",
+            total_elapsed / options.iterations);
+  g_printf ("\"items_per_sec\": %s, ",
+            g_ascii_formatd (buf, sizeof (buf), "%.1f", items / seconds));
+  g_printf ("\"yaml_bytes\": %" G_GSIZE_FORMAT ", ", strlen (ctx->yaml));
+  g_printf ("\"peak_rss_delta_kb\": %ld}\n",
+            get_peak_rss_kb () - baseline_rss_kb);
+}
+
+
+static gboolean
+run_benchmark (benchmark_ctx *ctx, const gchar *name, benchmark_func func)
+{
+  pid_t pid;
+  gint status;
+
+  /* Measure each operation in a child process of its own. A new process
+   * starts with a peak RSS equal to its current RSS, so the reported growth
+   * leaves out generating the index and the operations that ran before.
+   */
+  fflush (stdout);
+  pid = fork ();
+  if (pid < 0)
+    {
+      g_fprintf (stderr, "Could not fork: %s\n", g_strerror (errno));
+      return FALSE;
+    }
+
+  if (pid == 0)
+    {
+      measure_benchmark (ctx, name, func);
+      fflush (stdout);
+      _exit (EXIT_SUCCESS);
+    }
+
+  if (waitpid (pid, &status, 0) < 0 || !WIFEXITED (status) ||
+      WEXITSTATUS (status) != EXIT_SUCCESS)
+    {
+      g_fprintf (stderr, "The %s benchmark failed\n", name);
+      return FALSE;
+    }
+
+  return TRUE;
+}
+
+
+int
+main (int argc, char *argv[])
+{
+  g_autoptr (GOptionContext) context = NULL;
+  g_autoptr (GError) error = NULL;
+  g_autoptr (GPtrArray) failures = NULL;
+  benchmark_ctx ctx = { NULL, NULL, NULL, 0 };
+  gboolean found = FALSE;
+  gboolean failed = FALSE;
+  gint fd;
+  struct
+  {
+    const gchar *name;
+    benchmark_func func;
+  } benchmarks[] = { { "parse", benchmark_parse },
+                     { "dump", benchmark_dump },
+                     { "merge", benchmark_merge },
+                     { "resolve", benchmark_resolve },
+                     { "search", benchmark_search },
+                     { "defaults", benchmark_defaults },
+                     { NULL, NULL } };
+
+  setlocale (LC_ALL, "");
+
+  context = g_option_context_new ("- Measure libmodulemd performance");
+  g_option_context_add_main_entries (context, entries, "benchmark-modulemd");
+  if (!g_option_context_parse (context, &argc, &argv, &error))
+    {
+      g_fprintf (stderr, "option parsing failed: %s\n", error->message);
+      return EXIT_FAILURE;
+    }
+
+  if (options.iterations < 1)
+    {
+      g_fprintf (stderr, "--iterations must be at least 1\n");
+      return EXIT_FAILURE;
+    }
+
+  if (options.input)
+    {
+      ctx.index = modulemd_module_index_new ();
+      if (!modulemd_module_index_update_from_file (
+            ctx.index, options.input, TRUE, &failures, &error))
+        {
+          g_fprintf (stderr, "Could not read %s\n", options.input);
+          return EXIT_FAILURE;
+        }
+      ctx.yaml_path = g_strdup (options.input);
+    }
+  else
+    {
+      ctx.index = generate_index (1);
+    }
+
+  ctx.n_streams = count_streams (ctx.index);
+  ctx.yaml = modulemd_module_index_dump_to_string (ctx.index, &error);
+  if (!ctx.yaml)
+    {
+      g_fprintf (stderr, "Could not dump the index: %s\n", error->message);
+      return EXIT_FAILURE;
+    }
+
+  if (!ctx.yaml_path)
+    {
+      fd = g_file_open_tmp (
+        "benchmark-modulemd-XXXXXX.yaml", &ctx.yaml_path, &error);
+      if (fd < 0 || !g_file_set_contents (ctx.yaml_path, ctx.yaml, -1, &error))
+        {
+          g_fprintf (stderr, "Could not write YAML: %s\n", error->message);
+          return EXIT_FAILURE;
+        }
+      g_close (fd, NULL);
+    }
+
+  for (gsize i = 0; benchmarks[i].name; i++)
+    {
+      if (options.operation && g_strcmp0 (options.operation, "all") != 0 &&
+          g_strcmp0 (options.operation, benchmarks[i].name) != 0)
+        {
+          continue;
+        }
+
+      if (!run_benchmark (&ctx, benchmarks[i].name, benchmarks[i].func))
+        {
+          failed = TRUE;
+        }
+      found = TRUE;
+    }
+
+  if (!options.input)
+    {
+      g_unlink (ctx.yaml_path);
+    }
+
+  g_clear_object (&ctx.index);
+  g_clear_pointer (&ctx.yaml, g_free);
+  g_clear_pointer (&ctx.yaml_path, g_free);
+
+  if (!found)
+    {
+      g_fprintf (stderr, "Unknown operation: %s\n", options.operation);
+      return EXIT_FAILURE;
+    }
+
+  if (failed)
+    {
+      return EXIT_FAILURE;
+    }
+
+  return EXIT_SUCCESS;
+}
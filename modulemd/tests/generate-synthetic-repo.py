@@ -0,0 +1,289 @@
+#!/usr/bin/python3
+
+# This file is part of libmodulemd
+# Copyright (C) 2020 Red Hat, Inc.
+#
+# Fedora-License-Identifier: MIT
+# SPDX-2.0-License-Identifier: MIT
+# SPDX-3.0-License-Identifier: MIT
+#
+# This program is free software.
+# For more information on the license, see COPYING.
+# For more information on free software, see
+# <https://www.gnu.org/philosophy/free-sw.en.html>.
+
+"""
+Generate a synthetic modules.yaml repository for scaling tests.
+
+The output contains module streams, defaults and translations with
+configurable sizes. The same seed and options always produce the same
+output, so a corpus can be regenerated instead of being stored.
+
+Example:
+    generate-synthetic-repo.py --modules 500 --streams 4 --versions 3 \\
+        --seed 42 --output modules.yaml
+"""
+
+import argparse
+import random
+import sys
+
+try:
+    import gi
+
+    gi.require_version("Modulemd", "2.0")
+    from gi.repository import Modulemd
+except ImportError:
+    # Return error 77 to skip this test on platforms without the necessary
+    # python modules
+    sys.exit(77)
+
+
+SYLLABLES = (
+    "ant bar cat dor el fin gul hex io jet kal lim mon nor ox pan qua ros "
+    "sil tor ul vex wil xan yor zen"
+).split()
+
+ARCHES = ["aarch64", "ppc64le", "s390x", "x86_64"]
+LICENSES = ["MIT", "GPLv2+", "GPLv3+", "LGPLv2+", "ASL 2.0", "BSD"]
+LOCALES = ["cs_CZ", "de_DE", "es_ES", "fr_FR", "ja_JP", "nl_NL", "zh_CN"]
+PROFILES = ["default", "client", "server", "devel", "minimal"]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Generate a synthetic modules.yaml repository."
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--modules", type=int, default=100)
+    parser.add_argument(
+        "--streams", type=int, default=3, help="Streams per module"
+    )
+    parser.add_argument(
+        "--versions", type=int, default=2, help="Versions per stream"
+    )
+    parser.add_argument(
+        "--components", type=int, default=20, help="Components per stream"
+    )
+    parser.add_argument(
+        "--artifacts",
+        type=int,
+        default=2,
+        help="Binary artifacts per component and architecture",
+    )
+    parser.add_argument(
+        "--rpm-map",
+        action="store_true",
+        help="Add an rpm-map entry for every artifact",
+    )
+    parser.add_argument(
+        "--profiles", type=int, default=2, help="Profiles per stream"
+    )
+    parser.add_argument(
+        "--translations",
+        type=int,
+        default=0,
+        help="Translated locales per stream",
+    )
+    parser.add_argument(
+        "--defaults",
+        type=float,
+        default=0.5,
+        help="Fraction of modules with a defaults document",
+    )
+    parser.add_argument(
+        "--output",
+        default="-",
+        help="The file to write to (default: standard output)",
+    )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Read the output back and check that it is complete",
+    )
+    return parser.parse_args()
+
+
+class Generator(object):
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.index = Modulemd.ModuleIndex.new()
+        self.n_streams = 0
+
+    def word(self, syllables):
+        return "".join(self.rng.choice(SYLLABLES) for i in range(syllables))
+
+    def hexdigits(self, length):
+        return "%0*x" % (length, self.rng.getrandbits(length * 4))
+
+    def generate(self):
+        module_names = set()
+        while len(module_names) < self.args.modules:
+            module_names.add(self.word(self.rng.randint(2, 4)))
+
+        for module_name in sorted(module_names):
+            stream_names = self.stream_names()
+            for stream_name in stream_names:
+                self.add_stream(module_name, stream_name)
+
+            if self.rng.random() < self.args.defaults:
+                self.add_defaults(module_name, stream_names)
+
+        return self.index
+
+    def stream_names(self):
+        names = set()
+        major = self.rng.randint(1, 20)
+        while len(names) < self.args.streams:
+            if self.rng.random() < 0.1:
+                names.add("latest")
+            else:
+                names.add("%d" % major)
+                major += self.rng.randint(1, 3)
+        return sorted(names)
+
+    def add_stream(self, module_name, stream_name):
+        packages = set()
+        while len(packages) < self.args.components:
+            syllables = 2 + len(packages) // 100
+            packages.add("%s-%s" % (module_name, self.word(syllables)))
+        packages = sorted(packages)
+
+        profiles = PROFILES[: self.args.profiles]
+        base_version = 3320200101000000 + self.rng.randint(0, 100000000)
+
+        for v in range(self.args.versions):
+            stream = Modulemd.ModuleStreamV2.new(module_name, stream_name)
+            stream.set_version(base_version + v * 1000000)
+            stream.set_context(self.hexdigits(8))
+            stream.set_arch(self.rng.choice(ARCHES))
+            stream.set_summary("The %s module" % module_name)
+            stream.set_description(
+                "The %s module, stream %s. It contains %s."
+                % (module_name, stream_name, ", ".join(packages))
+            )
+            stream.add_module_license("MIT")
+            stream.add_content_license(self.rng.choice(LICENSES))
+
+            deps = Modulemd.Dependencies.new()
+            deps.add_buildtime_stream("platform", "f32")
+            deps.add_runtime_stream("platform", "f32")
+            stream.add_dependencies(deps)
+
+            for i, package in enumerate(packages):
+                self.add_component(stream, package, i)
+
+            for profile_name in profiles:
+                profile = Modulemd.Profile.new(profile_name)
+                profile.set_description("The %s profile" % profile_name)
+                for package in self.rng.sample(
+                    packages, max(1, len(packages) // 2)
+                ):
+                    profile.add_rpm(package)
+                stream.add_profile(profile)
+
+            self.index.add_module_stream(stream)
+            self.n_streams += 1
+
+        if self.args.translations:
+            self.add_translation(module_name, stream_name, profiles)
+
+    def add_component(self, stream, package, buildorder):
+        component = Modulemd.ComponentRpm.new(package)
+        component.set_rationale("Provides %s" % package)
+        component.set_ref(self.hexdigits(40))
+        component.set_buildorder(buildorder // 5)
+        stream.add_component(component)
+        stream.add_rpm_api(package)
+
+        version = "%d.%d" % (self.rng.randint(0, 9), self.rng.randint(0, 30))
+        release = "%d.module_f32+%d" % (
+            self.rng.randint(1, 5),
+            self.rng.randint(1000, 9999),
+        )
+        for arch in ARCHES:
+            for i in range(self.args.artifacts):
+                name = package if i == 0 else "%s-sub%d" % (package, i)
+                stream.add_rpm_artifact(
+                    "%s-0:%s-%s.%s" % (name, version, release, arch)
+                )
+                if self.args.rpm_map:
+                    entry = Modulemd.RpmMapEntry.new(
+                        name, 0, version, release, arch
+                    )
+                    stream.set_rpm_artifact_map_entry(
+                        entry, "sha256", self.hexdigits(64)
+                    )
+
+    def add_defaults(self, module_name, stream_names):
+        defaults = Modulemd.DefaultsV1.new(module_name)
+        default_stream = self.rng.choice(stream_names)
+        defaults.set_default_stream(default_stream)
+        if self.args.profiles:
+            for stream_name in stream_names:
+                defaults.add_default_profile_for_stream(
+                    stream_name, PROFILES[0]
+                )
+        self.index.add_defaults(defaults)
+
+    def add_translation(self, module_name, stream_name, profiles):
+        translation = Modulemd.Translation.new(
+            1, module_name, stream_name, self.rng.randint(1, 1000000000000)
+        )
+        for locale in LOCALES[: self.args.translations]:
+            entry = Modulemd.TranslationEntry.new(locale)
+            entry.set_summary("%s: %s" % (locale, module_name))
+            entry.set_description(
+                "%s: The %s module, stream %s"
+                % (locale, module_name, stream_name)
+            )
+            for profile_name in profiles:
+                entry.set_profile_description(
+                    profile_name, "%s: %s" % (locale, profile_name)
+                )
+            translation.set_translation_entry(entry)
+        self.index.add_translation(translation)
+
+
+def verify(yaml, generator):
+    index = Modulemd.ModuleIndex.new()
+    ret, failures = index.update_from_string(yaml, True)
+    if not ret:
+        for failure in failures:
+            print(failure.get_gerror().message, file=sys.stderr)
+        return False
+
+    n_streams = 0
+    for module_name in index.get_module_names():
+        n_streams += len(index.get_module(module_name).get_all_streams())
+
+    if n_streams != generator.n_streams:
+        print(
+            "Expected %d streams, read %d" % (generator.n_streams, n_streams),
+            file=sys.stderr,
+        )
+        return False
+
+    return True
+
+
+def main():
+    args = parse_args()
+    generator = Generator(args)
+    yaml = generator.generate().dump_to_string()
+
+    if args.output == "-":
+        sys.stdout.write(yaml)
+    else:
+        with open(args.output, "w") as output:
+            output.write(yaml)
+
+    if args.verify and not verify(yaml, generator):
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
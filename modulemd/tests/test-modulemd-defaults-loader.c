@@ -0,0 +1,293 @@
+/*
+ * This file is part of libmodulemd
+ * Copyright (C) 2020 Red Hat, Inc.
+ *
+ * Fedora-License-Identifier: MIT
+ * SPDX-2.0-License-Identifier: MIT
+ * SPDX-3.0-License-Identifier: MIT
+ *
+ * This program is free software.
+ * For more information on the license, see COPYING.
+ * For more information on free software, see <https://www.gnu.org/philosophy/free-sw.en.html>.
+ */
+
+#include <glib.h>
+#include <glib/gstdio.h>
+#include <locale.h>
+#include <signal.h>
+
+#include "modulemd-defaults-loader.h"
+#include "modulemd-defaults-v1.h"
+#include "modulemd-errors.h"
+#include "modulemd-module-index.h"
+#include "private/glib-extensions.h"
+#include "private/modulemd-util.h"
+#include "private/test-utils.h"
+
+
+static void
+write_defaults_file (const gchar *dir,
+                     const gchar *filename,
+                     const gchar *module_name,
+                     const gchar *stream_name)
+{
+  g_autoptr (GError) error = NULL;
+  g_autofree gchar *filepath = g_build_path ("/", dir, filename, NULL);
+  g_autofree gchar *contents = g_strdup_printf (
+    "---\n"
+    "document: modulemd-defaults\n"
+    "version: 1\n"
+    "data:\n"
+    "  module: %s\n"
+    "  stream: %s\n"
+    "...\n",
+    module_name,
+    stream_name);
+
+  g_assert_true (g_file_set_contents (filepath, contents, -1, &error));
+  g_assert_no_error (error);
+}
+
+
+static void
+remove_defaults_file (const gchar *dir, const gchar *filename)
+{
+  g_autofree gchar *filepath = g_build_path ("/", dir, filename, NULL);
+
+  g_assert_cmpint (g_unlink (filepath), ==, 0);
+}
+
+
+static void
+remove_directory (const gchar *path)
+{
+  g_autoptr (GError) error = NULL;
+  g_autoptr (GDir) dir = g_dir_open (path, 0, &error);
+  const gchar *filename = NULL;
+
+  g_assert_no_error (error);
+  while ((filename = g_dir_read_name (dir)) != NULL)
+    {
+      remove_defaults_file (path, filename);
+    }
+  g_assert_cmpint (g_rmdir (path), ==, 0);
+}
+
+
+static const gchar *
+get_default_stream (ModulemdDefaultsLoader *loader, const gchar *module_name)
+{
+  ModulemdModule *module = modulemd_module_index_get_module (
+    modulemd_defaults_loader_get_index (loader), module_name);
+
+  if (!module || !modulemd_module_get_defaults (module))
+    {
+      return NULL;
+    }
+
+  return modulemd_defaults_v1_get_default_stream (
+    MODULEMD_DEFAULTS_V1 (modulemd_module_get_defaults (module)), NULL);
+}
+
+
+static void
+defaults_loader_test_refresh (void)
+{
+  g_autoptr (ModulemdDefaultsLoader) loader = NULL;
+  g_autoptr (GError) error = NULL;
+  g_auto (GStrv) changed = NULL;
+  g_auto (GStrv) module_names = NULL;
+  g_autofree gchar *tmpdir = NULL;
+  ModulemdModuleIndex *index = NULL;
+
+  tmpdir = g_dir_make_tmp ("modulemd-loader-XXXXXX", &error);
+  g_assert_no_error (error);
+
+  write_defaults_file (tmpdir, "bar.yaml", "bar", "stable");
+  write_defaults_file (tmpdir, "baz.yaml", "baz", "stable");
+  write_defaults_file (tmpdir, "foo.yaml", "foo", "stable");
+
+  loader = modulemd_defaults_loader_new (tmpdir, NULL, TRUE);
+  g_assert_nonnull (loader);
+  g_assert_true (MODULEMD_IS_DEFAULTS_LOADER (loader));
+
+  /* Nothing is read until the first refresh */
+  module_names = modulemd_module_index_get_module_names_as_strv (
+    modulemd_defaults_loader_get_index (loader));
+  g_assert_cmpint (g_strv_length (module_names), ==, 0);
+  g_clear_pointer (&module_names, g_strfreev);
+
+  /* The first refresh reads everything */
+  g_assert_true (modulemd_defaults_loader_refresh (loader, &error));
+  g_assert_no_error (error);
+
+  changed = modulemd_defaults_loader_get_changed_modules_as_strv (loader);
+  g_assert_cmpint (g_strv_length (changed), ==, 3);
+  g_clear_pointer (&changed, g_strfreev);
+
+  g_assert_cmpstr (get_default_stream (loader, "bar"), ==, "stable");
+  g_assert_cmpstr (get_default_stream (loader, "baz"), ==, "stable");
+  g_assert_cmpstr (get_default_stream (loader, "foo"), ==, "stable");
+
+  /* A refresh with no changes on disk merges nothing */
+  g_assert_true (modulemd_defaults_loader_refresh (loader, &error));
+  g_assert_no_error (error);
+
+  changed = modulemd_defaults_loader_get_changed_modules_as_strv (loader);
+  g_assert_cmpint (g_strv_length (changed), ==, 0);
+  g_clear_pointer (&changed, g_strfreev);
+
+  /* Change one file */
+  write_defaults_file (tmpdir, "foo.yaml", "foo", "rawhide");
+  g_assert_true (modulemd_defaults_loader_refresh (loader, &error));
+  g_assert_no_error (error);
+
+  changed = modulemd_defaults_loader_get_changed_modules_as_strv (loader);
+  g_assert_cmpint (g_strv_length (changed), ==, 1);
+  g_assert_cmpstr (changed[0], ==, "foo");
+  g_clear_pointer (&changed, g_strfreev);
+
+  g_assert_cmpstr (get_default_stream (loader, "bar"), ==, "stable");
+  g_assert_cmpstr (get_default_stream (loader, "foo"), ==, "rawhide");
+
+  /* Rewrite it right away with content of the same size. The filesystem may
+   * record the same modification time for both writes.
+   */
+  write_defaults_file (tmpdir, "foo.yaml", "foo", "testing");
+  g_assert_true (modulemd_defaults_loader_refresh (loader, &error));
+  g_assert_no_error (error);
+
+  changed = modulemd_defaults_loader_get_changed_modules_as_strv (loader);
+  g_assert_cmpint (g_strv_length (changed), ==, 1);
+  g_assert_cmpstr (changed[0], ==, "foo");
+  g_clear_pointer (&changed, g_strfreev);
+
+  g_assert_cmpstr (get_default_stream (loader, "foo"), ==, "testing");
+
+  /* Add a file and remove another */
+  write_defaults_file (tmpdir, "qux.yaml", "qux", "1.0");
+  remove_defaults_file (tmpdir, "baz.yaml");
+  g_assert_true (modulemd_defaults_loader_refresh (loader, &error));
+  g_assert_no_error (error);
+
+  changed = modulemd_defaults_loader_get_changed_modules_as_strv (loader);
+  g_assert_cmpint (g_strv_length (changed), ==, 2);
+  g_assert_cmpstr (changed[0], ==, "baz");
+  g_assert_cmpstr (changed[1], ==, "qux");
+  g_clear_pointer (&changed, g_strfreev);
+
+  module_names = modulemd_module_index_get_module_names_as_strv (
+    modulemd_defaults_loader_get_index (loader));
+  g_assert_cmpint (g_strv_length (module_names), ==, 3);
+  g_assert_false (g_strv_contains ((const gchar *const *)module_names, "baz"));
+  g_assert_true (g_strv_contains ((const gchar *const *)module_names, "qux"));
+  g_clear_pointer (&module_names, g_strfreev);
+
+  /* A conflicting file fails the refresh and leaves the state unchanged */
+  index = modulemd_defaults_loader_get_index (loader);
+  write_defaults_file (tmpdir, "foo-2.yaml", "foo", "stable");
+  g_assert_false (modulemd_defaults_loader_refresh (loader, &error));
+  g_assert_error (error, MODULEMD_ERROR, MODULEMD_ERROR_VALIDATE);
+  g_clear_error (&error);
+
+  g_assert_true (modulemd_defaults_loader_get_index (loader) == index);
+  g_assert_cmpstr (get_default_stream (loader, "foo"), ==, "testing");
+  g_assert_cmpstr (get_default_stream (loader, "bar"), ==, "stable");
+
+  /* Once the conflict is fixed, the module is merged again */
+  remove_defaults_file (tmpdir, "foo-2.yaml");
+  write_defaults_file (tmpdir, "foo.yaml", "foo", "stable");
+  g_assert_true (modulemd_defaults_loader_refresh (loader, &error));
+  g_assert_no_error (error);
+
+  changed = modulemd_defaults_loader_get_changed_modules_as_strv (loader);
+  g_assert_cmpint (g_strv_length (changed), ==, 1);
+  g_assert_cmpstr (changed[0], ==, "foo");
+  g_clear_pointer (&changed, g_strfreev);
+
+  g_assert_cmpstr (get_default_stream (loader, "foo"), ==, "stable");
+
+  remove_directory (tmpdir);
+}
+
+
+static void
+defaults_loader_test_overrides (void)
+{
+  g_autoptr (ModulemdDefaultsLoader) loader = NULL;
+  g_autoptr (ModulemdModuleIndex) idx = NULL;
+  g_autoptr (ModulemdModuleIndex) expected = NULL;
+  g_autoptr (GHashTable) defaultdict = NULL;
+  g_autoptr (GError) error = NULL;
+  g_auto (GStrv) changed = NULL;
+  g_autofree gchar *path =
+    g_build_path ("/", g_getenv ("TEST_DATA_PATH"), "defaults", NULL);
+  g_autofree gchar *overrides_path =
+    g_build_path ("/", path, "overrides", NULL);
+  g_autofree gchar *expected_yaml = NULL;
+  g_autofree gchar *yaml = NULL;
+
+  loader = modulemd_defaults_loader_new (path, overrides_path, TRUE);
+  g_assert_true (modulemd_defaults_loader_refresh (loader, &error));
+  g_assert_no_error (error);
+
+  changed = modulemd_defaults_loader_get_changed_modules_as_strv (loader);
+  g_assert_cmpint (g_strv_length (changed), ==, 4);
+
+  defaultdict = modulemd_module_index_get_default_streams_as_hash_table (
+    modulemd_defaults_loader_get_index (loader), NULL);
+  g_assert_cmpstr (g_hash_table_lookup (defaultdict, "meson"), ==, "latest");
+  g_assert_cmpstr (g_hash_table_lookup (defaultdict, "ninja"), ==, "latest");
+  g_assert_cmpstr (g_hash_table_lookup (defaultdict, "nodejs"), ==, "12");
+  g_assert_cmpstr (
+    g_hash_table_lookup (defaultdict, "testmodule"), ==, "teststream");
+
+  /* Updating an index must match update_from_defaults_directory() */
+  idx = modulemd_module_index_new ();
+  g_assert_true (modulemd_defaults_loader_update_index (loader, idx, &error));
+  g_assert_no_error (error);
+
+  expected = modulemd_module_index_new ();
+  g_assert_true (modulemd_module_index_update_from_defaults_directory (
+    expected, path, TRUE, overrides_path, &error));
+  g_assert_no_error (error);
+
+  yaml = modulemd_module_index_dump_to_string (idx, &error);
+  g_assert_no_error (error);
+  expected_yaml = modulemd_module_index_dump_to_string (expected, &error);
+  g_assert_no_error (error);
+  g_assert_cmpstr (yaml, ==, expected_yaml);
+
+  /* Nonexistent directories */
+  g_clear_object (&loader);
+  loader = modulemd_defaults_loader_new ("nonexistent", NULL, TRUE);
+  g_assert_false (modulemd_defaults_loader_refresh (loader, &error));
+  g_assert_error (error, G_FILE_ERROR, G_FILE_ERROR_NOENT);
+  g_clear_error (&error);
+
+  g_clear_object (&loader);
+  loader = modulemd_defaults_loader_new (path, "nonexistent", TRUE);
+  g_assert_false (modulemd_defaults_loader_refresh (loader, &error));
+  g_assert_error (error, G_FILE_ERROR, G_FILE_ERROR_NOENT);
+  g_clear_error (&error);
+}
+
+
+int
+main (int argc, char *argv[])
+{
+  setlocale (LC_ALL, "");
+
+  g_test_init (&argc, &argv, NULL);
+  g_test_bug_base ("https://bugzilla.redhat.com/show_bug.cgi?id=");
+
+  // Define the tests.
+
+  g_test_add_func ("/modulemd/v2/defaults/loader/refresh",
+                   defaults_loader_test_refresh);
+
+  g_test_add_func ("/modulemd/v2/defaults/loader/overrides",
+                   defaults_loader_test_overrides);
+
+  return g_test_run ();
+}
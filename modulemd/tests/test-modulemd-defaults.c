@@ -19,6 +19,7 @@
 #include "modulemd-defaults-v1.h"
 #include "modulemd-defaults.h"
 #include "private/glib-extensions.h"
+#include "private/modulemd-defaults-private.h"
 #include "private/modulemd-translation-entry-private.h"
 #include "private/modulemd-yaml.h"
 #include "private/test-utils.h"
@@ -121,6 +122,7 @@ static void
 defaults_test_validate (CommonMmdTestFixture *fixture, gconstpointer user_data)
 {
   g_autoptr (ModulemdDefaults) defaults = NULL;
+  g_autoptr (ModulemdDefaults) copy = NULL;
 
   defaults = modulemd_defaults_new (MD_DEFAULTS_VERSION_ONE, "foo");
   g_assert_true (MODULEMD_IS_DEFAULTS (defaults));
@@ -130,6 +132,23 @@ defaults_test_validate (CommonMmdTestFixture *fixture, gconstpointer user_data)
    * This will need to be updated once the subclasses have reimplimented this.
    */
   g_assert_true (modulemd_defaults_validate (defaults, NULL));
+  g_assert_true (modulemd_defaults_is_validated (defaults));
+
+  /* Copies of validated defaults are also validated */
+  copy = modulemd_defaults_copy (defaults);
+  g_assert_true (modulemd_defaults_is_validated (copy));
+
+  /* Any modification requires validating again */
+  modulemd_defaults_v1_set_default_stream (
+    MODULEMD_DEFAULTS_V1 (copy), "stable", NULL);
+  g_assert_false (modulemd_defaults_is_validated (copy));
+  g_assert_true (modulemd_defaults_is_validated (defaults));
+
+  g_assert_true (modulemd_defaults_validate (copy, NULL));
+  g_assert_true (modulemd_defaults_is_validated (copy));
+
+  modulemd_defaults_set_modified (copy, 5);
+  g_assert_false (modulemd_defaults_is_validated (copy));
 }
 
 
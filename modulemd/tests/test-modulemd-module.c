@@ -490,6 +490,64 @@ modulemd_test_remove_streams (void)
 }
 
 
+static void
+module_test_search_streams_by_glob (void)
+{
+  g_autoptr (ModulemdModuleIndex) index = NULL;
+  g_autoptr (GError) error = NULL;
+  g_autoptr (GPtrArray) failures = NULL;
+  g_autoptr (GPtrArray) streams = NULL;
+  g_autofree gchar *yaml_path = NULL;
+  ModulemdModule *nodejs_module = NULL;
+
+  index = modulemd_module_index_new ();
+  yaml_path = g_strdup_printf ("%s/f29.yaml", g_getenv ("TEST_DATA_PATH"));
+  g_assert_true (modulemd_module_index_update_from_file (
+    index, yaml_path, TRUE, &failures, &error));
+  g_assert_no_error (error);
+  g_assert_cmpint (failures->len, ==, 0);
+
+  nodejs_module = modulemd_module_index_get_module (index, "nodejs");
+  g_assert_nonnull (nodejs_module);
+
+  /* NULL matches everything */
+  streams = modulemd_module_search_streams_by_glob (
+    nodejs_module, NULL, NULL, NULL, NULL);
+  g_assert_nonnull (streams);
+  g_assert_cmpuint (streams->len, ==, 2);
+  g_assert_cmpstr (
+    modulemd_module_stream_get_stream_name (g_ptr_array_index (streams, 0)),
+    ==,
+    "10");
+  g_assert_cmpstr (
+    modulemd_module_stream_get_stream_name (g_ptr_array_index (streams, 1)),
+    ==,
+    "8");
+  g_clear_pointer (&streams, g_ptr_array_unref);
+
+  streams = modulemd_module_search_streams_by_glob (
+    nodejs_module, "1*", "2018*", "6c81f848", "x86_64");
+  g_assert_nonnull (streams);
+  g_assert_cmpuint (streams->len, ==, 1);
+  g_assert_cmpuint (
+    modulemd_module_stream_get_version (g_ptr_array_index (streams, 0)),
+    ==,
+    20180920144631);
+  g_clear_pointer (&streams, g_ptr_array_unref);
+
+  streams = modulemd_module_search_streams_by_glob (
+    nodejs_module, NULL, "20180816123422", NULL, NULL);
+  g_assert_nonnull (streams);
+  g_assert_cmpuint (streams->len, ==, 1);
+  g_clear_pointer (&streams, g_ptr_array_unref);
+
+  streams = modulemd_module_search_streams_by_glob (
+    nodejs_module, NULL, NULL, NULL, "aarch64");
+  g_assert_nonnull (streams);
+  g_assert_cmpuint (streams->len, ==, 0);
+}
+
+
 int
 main (int argc, char *argv[])
 {
@@ -531,5 +589,8 @@ main (int argc, char *argv[])
   g_test_add_func ("/modulemd/v2/module/streams/remove",
                    modulemd_test_remove_streams);
 
+  g_test_add_func ("/modulemd/v2/module/streams/search_by_glob",
+                   module_test_search_streams_by_glob);
+
   return g_test_run ();
 }
@@ -15,16 +15,22 @@
 #include <glib/gstdio.h>
 #include <locale.h>
 #include <signal.h>
+#include <unistd.h>
 #include <yaml.h>
 
 #include "config.h"
+#include "modulemd-defaults-v1.h"
 #include "modulemd-defaults.h"
+#include "modulemd-module-index-merger.h"
 #include "modulemd-module-index.h"
 #include "modulemd-module-stream-v1.h"
 #include "modulemd-module-stream-v2.h"
 #include "modulemd-module.h"
 #include "private/glib-extensions.h"
+#include "private/modulemd-module-index-private.h"
 #include "private/modulemd-module-private.h"
+#include "private/modulemd-module-stream-private.h"
+#include "private/modulemd-subdocument-info-private.h"
 #include "private/modulemd-util.h"
 #include "private/modulemd-yaml.h"
 #include "private/test-utils.h"
@@ -662,6 +668,8 @@ module_index_test_remove_module (ModuleIndexFixture *fixture,
   g_autofree gchar *yaml_path = NULL;
   g_autoptr (GPtrArray) failures = NULL;
   g_autoptr (GError) error = NULL;
+  g_auto (GStrv) module_names = NULL;
+  guint n_modules;
 
   index = modulemd_module_index_new ();
 
@@ -677,12 +685,21 @@ module_index_test_remove_module (ModuleIndexFixture *fixture,
 
   /* Verify that the 'reviewboard' module exists in the index */
   g_assert_nonnull (modulemd_module_index_get_module (index, "reviewboard"));
+  module_names = modulemd_module_index_get_module_names_as_strv (index);
+  g_assert_true (
+    g_strv_contains ((const gchar *const *)module_names, "reviewboard"));
+  n_modules = g_strv_length (module_names);
+  g_clear_pointer (&module_names, g_strfreev);
 
   /* Remove the 'reviewboard' module from the index */
   g_assert_true (modulemd_module_index_remove_module (index, "reviewboard"));
 
   /* Verify that the 'reviewboard' module no longer exists in the index */
   g_assert_null (modulemd_module_index_get_module (index, "reviewboard"));
+  module_names = modulemd_module_index_get_module_names_as_strv (index);
+  g_assert_false (
+    g_strv_contains ((const gchar *const *)module_names, "reviewboard"));
+  g_assert_cmpint (g_strv_length (module_names), ==, n_modules - 1);
 
   /* Remove a nonexistent module from the index */
   g_assert_null (modulemd_module_index_get_module (index, "nosuchmodule"));
@@ -1019,6 +1036,1220 @@ module_index_test_dump_empty_index (void)
 }
 
 
+static void
+module_index_test_dump_flags (void)
+{
+  g_autofree gchar *yaml_path = NULL;
+  g_autoptr (ModulemdModuleIndex) index = NULL;
+  g_autoptr (ModulemdModuleIndex) reread = NULL;
+  g_autoptr (GPtrArray) failures = NULL;
+  g_autoptr (GError) error = NULL;
+  g_autofree gchar *expected = NULL;
+  g_autofree gchar *yaml = NULL;
+  g_autofree gchar *resorted = NULL;
+  ModulemdDumpFlags perf_flags[] = {
+    MODULEMD_DUMP_FLAG_NONE,
+    MODULEMD_DUMP_FLAG_UNSORTED,
+  };
+  gsize iterations = 20;
+  gsize i;
+  gsize j;
+  gdouble elapsed;
+
+  yaml_path =
+    g_strdup_printf ("%s/f29-updates.yaml", g_getenv ("TEST_DATA_PATH"));
+
+  index = modulemd_module_index_new ();
+  g_assert_true (modulemd_module_index_update_from_file (
+    index, yaml_path, TRUE, &failures, &error));
+  g_assert_no_error (error);
+  g_assert_cmpint (failures->len, ==, 0);
+  g_clear_pointer (&failures, g_ptr_array_unref);
+
+  expected = modulemd_module_index_dump_to_string (index, &error);
+  g_assert_no_error (error);
+  g_assert_nonnull (expected);
+
+  /* Without flags, the output must be unchanged */
+  yaml = modulemd_module_index_dump_to_string_ext (
+    index, MODULEMD_DUMP_FLAG_NONE, &error);
+  g_assert_no_error (error);
+  g_assert_cmpstr (yaml, ==, expected);
+  g_clear_pointer (&yaml, g_free);
+
+  /* Unsorted output must contain the same documents */
+  yaml = modulemd_module_index_dump_to_string_ext (
+    index, MODULEMD_DUMP_FLAG_UNSORTED, &error);
+  g_assert_no_error (error);
+  g_assert_nonnull (yaml);
+
+  reread = modulemd_module_index_new ();
+  g_assert_true (modulemd_module_index_update_from_string (
+    reread, yaml, TRUE, &failures, &error));
+  g_assert_no_error (error);
+  g_assert_cmpint (failures->len, ==, 0);
+
+  resorted = modulemd_module_index_dump_to_string (reread, &error);
+  g_assert_no_error (error);
+  g_assert_cmpstr (resorted, ==, expected);
+  g_clear_pointer (&yaml, g_free);
+
+  /* Report the dump throughput of each mode when run with "-m perf" */
+  if (!g_test_perf ())
+    {
+      return;
+    }
+
+  for (i = 0; i < G_N_ELEMENTS (perf_flags); i++)
+    {
+      g_test_timer_start ();
+      for (j = 0; j < iterations; j++)
+        {
+          yaml = modulemd_module_index_dump_to_string_ext (
+            index, perf_flags[i], &error);
+          g_assert_no_error (error);
+          g_clear_pointer (&yaml, g_free);
+        }
+      elapsed = g_test_timer_elapsed ();
+
+      g_test_message ("Dump flags 0x%x: %.2f MiB/s",
+                      perf_flags[i],
+                      (strlen (expected) * iterations) / elapsed /
+                        (1024.0 * 1024.0));
+    }
+}
+
+
+static void
+add_filter_test_stream (ModulemdModuleIndex *index,
+                        const gchar *module_name,
+                        const gchar *stream_name,
+                        const gchar *arch)
+{
+  g_autoptr (GError) error = NULL;
+  g_autoptr (ModulemdModuleStreamV2) stream =
+    modulemd_module_stream_v2_new (module_name, stream_name);
+
+  modulemd_module_stream_set_version (MODULEMD_MODULE_STREAM (stream), 1);
+  modulemd_module_stream_set_context (MODULEMD_MODULE_STREAM (stream), "c0");
+  modulemd_module_stream_v2_set_arch (stream, arch);
+  modulemd_module_stream_v2_set_summary (stream, "Summary");
+  modulemd_module_stream_v2_set_description (stream, "Description");
+  modulemd_module_stream_v2_add_module_license (stream, "MIT");
+
+  g_assert_true (modulemd_module_index_add_module_stream (
+    index, MODULEMD_MODULE_STREAM (stream), &error));
+  g_assert_no_error (error);
+}
+
+
+static ModulemdModuleIndex *
+reread_filtered (ModulemdModuleIndex *index,
+                 const gchar *module_name,
+                 const gchar *stream_name,
+                 const gchar *arch)
+{
+  g_autoptr (GError) error = NULL;
+  g_autoptr (GPtrArray) failures = NULL;
+  g_autofree gchar *yaml = NULL;
+  g_autoptr (ModulemdModuleIndex) filtered = modulemd_module_index_new ();
+
+  yaml = modulemd_module_index_dump_to_string_filtered (
+    index, module_name, stream_name, arch, MODULEMD_DUMP_FLAG_NONE, &error);
+  g_assert_no_error (error);
+  g_assert_nonnull (yaml);
+
+  g_assert_true (modulemd_module_index_update_from_string (
+    filtered, yaml, TRUE, &failures, &error));
+  g_assert_no_error (error);
+  g_assert_cmpint (failures->len, ==, 0);
+
+  return g_steal_pointer (&filtered);
+}
+
+
+static void
+module_index_test_dump_filtered (void)
+{
+  g_autoptr (ModulemdModuleIndex) index = modulemd_module_index_new ();
+  g_autoptr (ModulemdModuleIndex) filtered = NULL;
+  g_autoptr (ModulemdDefaultsV1) defaults = NULL;
+  g_autoptr (GError) error = NULL;
+  g_autofree gchar *yaml = NULL;
+  g_autofree gchar *unfiltered = NULL;
+  g_autoptr (modulemd_yaml_string) yaml_string =
+    g_malloc0_n (1, sizeof (modulemd_yaml_string));
+  ModulemdModule *module = NULL;
+  GPtrArray *streams = NULL;
+
+  add_filter_test_stream (index, "foo", "1.0", "x86_64");
+  add_filter_test_stream (index, "foo", "1.0", "aarch64");
+  add_filter_test_stream (index, "foo", "2.0", "x86_64");
+  add_filter_test_stream (index, "foobar", "1.0", "aarch64");
+  add_filter_test_stream (index, "bar", "1.0", "x86_64");
+
+  defaults = modulemd_defaults_v1_new ("foobar");
+  modulemd_defaults_v1_set_default_stream (defaults, "1.0", NULL);
+  g_assert_true (modulemd_module_index_add_defaults (
+    index, MODULEMD_DEFAULTS (defaults), &error));
+  g_assert_no_error (error);
+  g_clear_object (&defaults);
+
+  defaults = modulemd_defaults_v1_new ("baz");
+  modulemd_defaults_v1_set_default_stream (defaults, "1.0", NULL);
+  g_assert_true (modulemd_module_index_add_defaults (
+    index, MODULEMD_DEFAULTS (defaults), &error));
+  g_assert_no_error (error);
+
+  /* With no patterns, the output matches the unfiltered dump */
+  unfiltered = modulemd_module_index_dump_to_string (index, &error);
+  g_assert_no_error (error);
+  yaml = modulemd_module_index_dump_to_string_filtered (
+    index, NULL, NULL, NULL, MODULEMD_DUMP_FLAG_NONE, &error);
+  g_assert_no_error (error);
+  g_assert_cmpstr (yaml, ==, unfiltered);
+
+  /* Filter on architecture. Modules without matching streams are skipped,
+   * including their defaults.
+   */
+  filtered = reread_filtered (index, NULL, NULL, "x86_64");
+  g_assert_null (modulemd_module_index_get_module (filtered, "foobar"));
+  g_assert_null (modulemd_module_index_get_module (filtered, "baz"));
+  g_assert_nonnull (modulemd_module_index_get_module (filtered, "bar"));
+
+  module = modulemd_module_index_get_module (filtered, "foo");
+  g_assert_nonnull (module);
+  streams = modulemd_module_get_all_streams (module);
+  g_assert_cmpint (streams->len, ==, 2);
+  g_assert_cmpstr (
+    modulemd_module_stream_get_arch (g_ptr_array_index (streams, 0)),
+    ==,
+    "x86_64");
+  g_assert_cmpstr (
+    modulemd_module_stream_get_arch (g_ptr_array_index (streams, 1)),
+    ==,
+    "x86_64");
+  g_clear_object (&filtered);
+
+  /* Filter on a module name glob. Defaults are kept without stream or
+   * architecture patterns.
+   */
+  filtered = reread_filtered (index, "foo*", NULL, NULL);
+  g_assert_nonnull (modulemd_module_index_get_module (filtered, "foo"));
+  g_assert_null (modulemd_module_index_get_module (filtered, "bar"));
+  module = modulemd_module_index_get_module (filtered, "foobar");
+  g_assert_nonnull (module);
+  g_assert_nonnull (modulemd_module_get_defaults (module));
+  g_clear_object (&filtered);
+
+  /* Combine all three patterns */
+  filtered = reread_filtered (index, "foo", "1.?", "aarch64");
+  module = modulemd_module_index_get_module (filtered, "foo");
+  g_assert_nonnull (module);
+  g_assert_cmpint (modulemd_module_get_all_streams (module)->len, ==, 1);
+  g_assert_null (modulemd_module_index_get_module (filtered, "foobar"));
+  g_clear_object (&filtered);
+
+  /* A custom writer receives the same output */
+  g_clear_pointer (&yaml, g_free);
+  yaml = modulemd_module_index_dump_to_string_filtered (
+    index, "foo", NULL, "x86_64", MODULEMD_DUMP_FLAG_NONE, &error);
+  g_assert_no_error (error);
+  g_assert_true (
+    modulemd_module_index_dump_to_custom_filtered (index,
+                                                   write_yaml_string,
+                                                   yaml_string,
+                                                   "foo",
+                                                   NULL,
+                                                   "x86_64",
+                                                   MODULEMD_DUMP_FLAG_NONE,
+                                                   &error));
+  g_assert_no_error (error);
+  g_assert_cmpstr (yaml_string->str, ==, yaml);
+
+  /* Nothing matches */
+  g_clear_pointer (&yaml, g_free);
+  yaml = modulemd_module_index_dump_to_string_filtered (
+    index, "nonexistent", NULL, NULL, MODULEMD_DUMP_FLAG_NONE, &error);
+  g_assert_null (yaml);
+  g_assert_error (error, MODULEMD_ERROR, MODULEMD_ERROR_VALIDATE);
+}
+
+
+static void
+module_index_test_stats (void)
+{
+  g_autoptr (ModulemdModuleIndex) index = NULL;
+  g_autoptr (ModulemdModuleIndex) other = NULL;
+  g_autoptr (ModulemdModuleIndex) merged = NULL;
+  g_autoptr (ModulemdModuleIndexMerger) merger = NULL;
+  g_autoptr (ModulemdIndexStats) snapshot = NULL;
+  g_autoptr (GPtrArray) failures = NULL;
+  g_autoptr (GError) error = NULL;
+  g_autofree gchar *yaml_path = NULL;
+  ModulemdIndexStats *stats = NULL;
+  const gchar *stream_b =
+    "---\n"
+    "document: modulemd\n"
+    "version: 2\n"
+    "data:\n"
+    "  name: foo\n"
+    "  stream: b\n"
+    "  version: 1\n"
+    "  context: c0ffee42\n"
+    "  summary: Stream b\n"
+    "  description: >-\n"
+    "    Stream b of foo\n"
+    "  license:\n"
+    "    module:\n"
+    "    - MIT\n"
+    "...\n";
+  g_autofree gchar *yaml = g_strconcat (
+    "---\n"
+    "document: modulemd\n"
+    "version: 1\n"
+    "data:\n"
+    "  name: foo\n"
+    "  stream: a\n"
+    "  version: 1\n"
+    "  summary: Stream a\n"
+    "  description: >-\n"
+    "    Stream a of foo\n"
+    "  license:\n"
+    "    module:\n"
+    "    - MIT\n"
+    "...\n",
+    stream_b,
+    stream_b,
+    "---\n"
+    "document: modulemd-defaults\n"
+    "version: 1\n"
+    "data:\n"
+    "  module: foo\n"
+    "  stream: b\n"
+    "...\n"
+    "---\n"
+    "document: modulemd-translations\n"
+    "version: 1\n"
+    "data:\n"
+    "  module: foo\n"
+    "  stream: b\n"
+    "  modified: 42\n"
+    "  translations:\n"
+    "    nl_NL:\n"
+    "      summary: Stroom b\n"
+    "...\n",
+    NULL);
+
+  index = modulemd_module_index_new ();
+  stats = modulemd_module_index_get_stats (index);
+  g_assert_true (MODULEMD_IS_INDEX_STATS (stats));
+  g_assert_cmpuint (modulemd_index_stats_get_bytes_read (stats), ==, 0);
+
+  g_assert_true (modulemd_module_index_update_from_string (
+    index, yaml, TRUE, &failures, &error));
+  g_assert_no_error (error);
+  g_assert_cmpint (failures->len, ==, 0);
+  g_clear_pointer (&failures, g_ptr_array_unref);
+
+  g_assert_cmpuint (modulemd_index_stats_get_stream_documents (
+                      stats, MD_MODULESTREAM_VERSION_ONE),
+                    ==,
+                    1);
+  g_assert_cmpuint (modulemd_index_stats_get_stream_documents (
+                      stats, MD_MODULESTREAM_VERSION_TWO),
+                    ==,
+                    2);
+  g_assert_cmpuint (modulemd_index_stats_get_defaults_documents (
+                      stats, MD_DEFAULTS_VERSION_ONE),
+                    ==,
+                    1);
+  g_assert_cmpuint (
+    modulemd_index_stats_get_translation_documents (stats), ==, 1);
+  g_assert_cmpuint (modulemd_index_stats_get_failures (stats), ==, 0);
+  g_assert_cmpuint (
+    modulemd_index_stats_get_bytes_read (stats), ==, strlen (yaml));
+
+  /* The second copy of stream b replaced the first */
+  g_assert_cmpuint (
+    modulemd_index_stats_get_streams_deduplicated (stats), ==, 1);
+
+  /* Stream a was upgraded to v2 once the whole string was read */
+  g_assert_cmpuint (modulemd_index_stats_get_upgrades (stats), ==, 1);
+
+  for (ModulemdIndexStatsPhaseEnum phase = MODULEMD_INDEX_STATS_PHASE_SCAN;
+       phase <= MODULEMD_INDEX_STATS_PHASE_MERGE;
+       phase++)
+    {
+      g_assert_cmpint (
+        modulemd_index_stats_get_phase_time (stats, phase), >=, 0);
+    }
+
+  /* A snapshot is not affected by a reset */
+  snapshot = modulemd_index_stats_copy (stats);
+  modulemd_index_stats_reset (stats);
+  g_assert_cmpuint (modulemd_index_stats_get_bytes_read (stats), ==, 0);
+  g_assert_cmpuint (modulemd_index_stats_get_stream_documents (
+                      stats, MD_MODULESTREAM_VERSION_TWO),
+                    ==,
+                    0);
+  g_assert_cmpuint (
+    modulemd_index_stats_get_bytes_read (snapshot), ==, strlen (yaml));
+
+  /* Failures are counted */
+  yaml_path =
+    g_strdup_printf ("%s/broken_stream.yaml", g_getenv ("TEST_DATA_PATH"));
+  g_assert_false (modulemd_module_index_update_from_file (
+    index, yaml_path, TRUE, &failures, &error));
+  g_assert_no_error (error);
+  g_assert_cmpint (failures->len, ==, 1);
+  g_assert_cmpuint (modulemd_index_stats_get_failures (stats), ==, 1);
+  g_clear_pointer (&failures, g_ptr_array_unref);
+
+  /* The merger reports the work done by the merges only */
+  other = modulemd_module_index_new ();
+  g_assert_true (modulemd_module_index_update_from_string (
+    other, stream_b, TRUE, &failures, &error));
+  g_assert_no_error (error);
+  g_clear_pointer (&failures, g_ptr_array_unref);
+
+  merger = modulemd_module_index_merger_new ();
+  modulemd_module_index_merger_associate_index (merger, index, 0);
+  modulemd_module_index_merger_associate_index (merger, other, 0);
+  merged = modulemd_module_index_merger_resolve (merger, &error);
+  g_assert_no_error (error);
+  g_assert_nonnull (merged);
+
+  stats = modulemd_module_index_get_stats (merged);
+  g_assert_cmpuint (modulemd_index_stats_get_stream_documents (
+                      stats, MD_MODULESTREAM_VERSION_TWO),
+                    ==,
+                    0);
+  g_assert_cmpuint (
+    modulemd_index_stats_get_streams_deduplicated (stats), ==, 1);
+  g_assert_cmpint (modulemd_index_stats_get_phase_time (
+                     stats, MODULEMD_INDEX_STATS_PHASE_MERGE),
+                   >=,
+                   0);
+}
+
+
+static void
+module_index_test_deferred_upgrade (void)
+{
+  g_autoptr (ModulemdModuleIndex) index = NULL;
+  g_autoptr (GPtrArray) failures = NULL;
+  g_autoptr (GError) error = NULL;
+  ModulemdIndexStats *stats = NULL;
+  ModulemdModule *module = NULL;
+  GPtrArray *streams = NULL;
+  const gchar *stream_a =
+    "---\n"
+    "document: modulemd\n"
+    "version: 1\n"
+    "data:\n"
+    "  name: foo\n"
+    "  stream: a\n"
+    "  version: 1\n"
+    "  summary: Stream a\n"
+    "  description: >-\n"
+    "    Stream a of foo\n"
+    "  license:\n"
+    "    module:\n"
+    "    - MIT\n"
+    "...\n";
+  g_autofree gchar *yaml = g_strconcat (stream_a,
+                                        "---\n"
+                                        "document: modulemd\n"
+                                        "version: 2\n"
+                                        "data:\n"
+                                        "  name: foo\n"
+                                        "  stream: b\n"
+                                        "  version: 1\n"
+                                        "  context: c0ffee42\n"
+                                        "  summary: Stream b\n"
+                                        "  description: >-\n"
+                                        "    Stream b of foo\n"
+                                        "  license:\n"
+                                        "    module:\n"
+                                        "    - MIT\n"
+                                        "...\n"
+                                        "---\n"
+                                        "document: modulemd\n"
+                                        "version: 1\n"
+                                        "data:\n"
+                                        "  name: foo\n"
+                                        "  stream: c\n"
+                                        "  version: 1\n"
+                                        "  summary: Stream c\n"
+                                        "  description: >-\n"
+                                        "    Stream c of foo\n"
+                                        "  license:\n"
+                                        "    module:\n"
+                                        "    - MIT\n"
+                                        "...\n",
+                                        stream_a,
+                                        NULL);
+
+  index = modulemd_module_index_new ();
+  stats = modulemd_module_index_get_stats (index);
+
+  g_assert_true (modulemd_module_index_update_from_string (
+    index, yaml, TRUE, &failures, &error));
+  g_assert_no_error (error);
+  g_assert_cmpint (failures->len, ==, 0);
+
+  /* Every stream ends up at the highest mdversion that was read */
+  g_assert_cmpint (modulemd_module_index_get_stream_mdversion (index),
+                   ==,
+                   MD_MODULESTREAM_VERSION_TWO);
+  module = modulemd_module_index_get_module (index, "foo");
+  g_assert_nonnull (module);
+  streams = modulemd_module_get_all_streams (module);
+  g_assert_cmpuint (streams->len, ==, 3);
+  for (guint i = 0; i < streams->len; i++)
+    {
+      g_assert_cmpint (
+        modulemd_module_stream_get_mdversion (g_ptr_array_index (streams, i)),
+        ==,
+        MD_MODULESTREAM_VERSION_TWO);
+    }
+
+  /* The first copy of stream a was replaced by the second before the
+   * deferred upgrade, so it was never upgraded itself.
+   */
+  g_assert_cmpuint (
+    modulemd_index_stats_get_streams_deduplicated (stats), ==, 1);
+  g_assert_cmpuint (modulemd_index_stats_get_upgrades (stats), ==, 2);
+}
+
+
+static void
+module_index_test_memory_usage (void)
+{
+  g_autoptr (ModulemdModuleIndex) index = NULL;
+  g_autoptr (ModulemdModuleStream) stream = NULL;
+  g_autoptr (ModulemdTranslation) translation = NULL;
+  g_autoptr (ModulemdTranslationEntry) entry = NULL;
+  g_autoptr (ModulemdMemoryUsage) usage = NULL;
+  g_autoptr (ModulemdMemoryUsage) module_usage = NULL;
+  g_autoptr (ModulemdMemoryUsage) stream_usage = NULL;
+  g_autoptr (GPtrArray) failures = NULL;
+  g_autoptr (GError) error = NULL;
+  g_autofree gchar *yaml_path = NULL;
+  g_auto (GStrv) module_names = NULL;
+  ModulemdModule *module = NULL;
+  GPtrArray *streams = NULL;
+  guint64 modules_total = 0;
+  guint64 streams_total = 0;
+  guint64 before;
+
+  /* An empty index only holds its own structures */
+  index = modulemd_module_index_new ();
+  usage = modulemd_module_index_get_memory_usage (index);
+  g_assert_true (MODULEMD_IS_MEMORY_USAGE (usage));
+  g_assert_cmpuint (modulemd_memory_usage_get_objects (usage), >, 0);
+  g_assert_cmpuint (modulemd_memory_usage_get_strings (usage), ==, 0);
+  g_assert_cmpuint (modulemd_memory_usage_get_xmd (usage), ==, 0);
+  g_clear_object (&usage);
+
+  yaml_path = g_strdup_printf ("%s/f29.yaml", g_getenv ("TEST_DATA_PATH"));
+  g_assert_true (modulemd_module_index_update_from_file (
+    index, yaml_path, TRUE, &failures, &error));
+  g_assert_no_error (error);
+  g_assert_cmpint (failures->len, ==, 0);
+
+  usage = modulemd_module_index_get_memory_usage (index);
+  g_assert_cmpuint (modulemd_memory_usage_get_strings (usage), >, 0);
+  g_assert_cmpuint (modulemd_memory_usage_get_containers (usage), >, 0);
+  g_assert_cmpuint (modulemd_memory_usage_get_objects (usage), >, 0);
+  g_assert_cmpuint (modulemd_memory_usage_get_total (usage),
+                    ==,
+                    modulemd_memory_usage_get_strings (usage) +
+                      modulemd_memory_usage_get_containers (usage) +
+                      modulemd_memory_usage_get_objects (usage) +
+                      modulemd_memory_usage_get_xmd (usage));
+  g_assert_cmpuint (modulemd_memory_usage_get_translations (usage), ==, 0);
+
+  /* The index is made up of its modules, which are made up of streams */
+  module_names = modulemd_module_index_get_module_names_as_strv (index);
+  for (guint i = 0; module_names[i]; i++)
+    {
+      module = modulemd_module_index_get_module (index, module_names[i]);
+      module_usage = modulemd_module_get_memory_usage (module);
+      modules_total += modulemd_memory_usage_get_total (module_usage);
+
+      streams_total = 0;
+      streams = modulemd_module_get_all_streams (module);
+      for (guint j = 0; j < streams->len; j++)
+        {
+          stream_usage = modulemd_module_stream_get_memory_usage (
+            g_ptr_array_index (streams, j));
+          streams_total += modulemd_memory_usage_get_total (stream_usage);
+          g_clear_object (&stream_usage);
+        }
+
+      g_assert_cmpuint (
+        modulemd_memory_usage_get_total (module_usage), >, streams_total);
+      g_clear_object (&module_usage);
+    }
+  g_assert_cmpuint (modulemd_memory_usage_get_total (usage), >, modules_total);
+
+  /* Translations are attributed to the module that owns them */
+  before = modulemd_memory_usage_get_total (usage);
+  g_clear_object (&usage);
+
+  translation = modulemd_translation_new (1, "nodejs", "8", 42);
+  entry = modulemd_translation_entry_new ("nl_NL");
+  modulemd_translation_entry_set_summary (entry, "Een samenvatting");
+  modulemd_translation_set_translation_entry (translation, entry);
+  g_assert_true (
+    modulemd_module_index_add_translation (index, translation, &error));
+  g_assert_no_error (error);
+
+  usage = modulemd_module_index_get_memory_usage (index);
+  g_assert_cmpuint (modulemd_memory_usage_get_translations (usage), >, 0);
+  g_assert_cmpuint (modulemd_memory_usage_get_total (usage),
+                    ==,
+                    before + modulemd_memory_usage_get_translations (usage));
+
+  /* The rpm artifact map and xmd of a stream are measured */
+  g_clear_pointer (&yaml_path, g_free);
+  yaml_path =
+    g_strdup_printf ("%s/spec.v2.yaml", g_getenv ("MESON_SOURCE_ROOT"));
+  stream =
+    modulemd_module_stream_read_file (yaml_path, TRUE, NULL, NULL, &error);
+  g_assert_no_error (error);
+  g_assert_nonnull (stream);
+
+  stream_usage = modulemd_module_stream_get_memory_usage (stream);
+  g_assert_cmpuint (modulemd_memory_usage_get_xmd (stream_usage), >, 0);
+  g_assert_cmpuint (
+    modulemd_memory_usage_get_rpm_artifact_map (stream_usage), >, 0);
+  g_assert_cmpuint (modulemd_memory_usage_get_rpm_artifact_map (stream_usage),
+                    <,
+                    modulemd_memory_usage_get_total (stream_usage));
+  g_assert_cmpuint (
+    modulemd_memory_usage_get_translations (stream_usage), ==, 0);
+}
+
+
+static void
+module_index_test_validate_from_parser (void)
+{
+  g_autoptr (ModulemdModuleIndex) index = NULL;
+  g_autoptr (GHashTable) seen_nsvcas = NULL;
+  g_autoptr (GPtrArray) documents = NULL;
+  g_autoptr (GPtrArray) failures = NULL;
+  g_autoptr (GError) error = NULL;
+  g_auto (GStrv) module_names = NULL;
+  ModulemdSubdocumentInfo *doc = NULL;
+  const gchar *stream =
+    "---\n"
+    "document: modulemd\n"
+    "version: 2\n"
+    "data:\n"
+    "  name: foo\n"
+    "  stream: a\n"
+    "  version: 1\n"
+    "  context: c0ffee42\n"
+    "  summary: Stream a\n"
+    "  description: >-\n"
+    "    Stream a of foo\n"
+    "  license:\n"
+    "    module:\n"
+    "    - MIT\n"
+    "...\n";
+  g_autofree gchar *yaml = g_strconcat (stream, stream, NULL);
+
+  index = modulemd_module_index_new ();
+
+  /* Without duplicate checking, both documents are valid */
+  {
+    MMD_INIT_YAML_PARSER (parser);
+    yaml_parser_set_input_string (
+      &parser, (const unsigned char *)yaml, strlen (yaml));
+    g_assert_true (modulemd_module_index_validate_from_parser (
+      index, &parser, TRUE, NULL, NULL, &failures, &error));
+    g_assert_no_error (error);
+    g_assert_cmpint (failures->len, ==, 0);
+    g_clear_pointer (&failures, g_ptr_array_unref);
+  }
+
+  /* The documents were discarded, but counted */
+  module_names = modulemd_module_index_get_module_names_as_strv (index);
+  g_assert_cmpint (g_strv_length (module_names), ==, 0);
+  g_assert_cmpuint (
+    modulemd_index_stats_get_stream_documents (
+      modulemd_module_index_get_stats (index), MD_MODULESTREAM_VERSION_TWO),
+    ==,
+    2);
+
+  /* The second copy is reported as a duplicate */
+  seen_nsvcas = g_hash_table_new_full (g_str_hash, g_str_equal, g_free, NULL);
+  documents = g_ptr_array_new_with_free_func (g_object_unref);
+  {
+    MMD_INIT_YAML_PARSER (parser);
+    yaml_parser_set_input_string (
+      &parser, (const unsigned char *)yaml, strlen (yaml));
+    g_assert_false (modulemd_module_index_validate_from_parser (
+      index, &parser, TRUE, seen_nsvcas, documents, &failures, &error));
+    g_assert_no_error (error);
+    g_assert_cmpint (failures->len, ==, 1);
+    g_assert_error (
+      modulemd_subdocument_info_get_gerror (g_ptr_array_index (failures, 0)),
+      MODULEMD_ERROR,
+      MODULEMD_ERROR_VALIDATE);
+  }
+  g_assert_cmpint (g_hash_table_size (seen_nsvcas), ==, 1);
+
+  /* Both documents are reported, whether they passed or not */
+  g_assert_cmpint (documents->len, ==, 2);
+  doc = g_ptr_array_index (documents, 0);
+  g_assert_cmpuint (modulemd_subdocument_info_get_line (doc), ==, 1);
+  g_assert_cmpuint (modulemd_subdocument_info_get_offset (doc), ==, 0);
+  g_assert_cmpstr (
+    modulemd_subdocument_info_get_nsvca (doc), ==, "foo:a:1:c0ffee42");
+  g_assert_null (modulemd_subdocument_info_get_gerror (doc));
+
+  /* Only the failures keep their YAML contents */
+  doc = g_ptr_array_index (documents, 1);
+  g_assert_error (modulemd_subdocument_info_get_gerror (doc),
+                  MODULEMD_ERROR,
+                  MODULEMD_ERROR_VALIDATE);
+  g_assert_null (modulemd_subdocument_info_get_yaml (doc));
+  g_assert_nonnull (
+    modulemd_subdocument_info_get_yaml (g_ptr_array_index (failures, 0)));
+  g_assert_cmpuint (modulemd_subdocument_info_get_line (doc), ==, 15);
+  g_assert_cmpuint (
+    modulemd_subdocument_info_get_offset (doc), ==, strlen (stream));
+  g_assert_cmpstr (
+    modulemd_subdocument_info_get_nsvca (doc), ==, "foo:a:1:c0ffee42");
+  g_assert_cmpint (modulemd_subdocument_info_get_phase_time (
+                     doc, MODULEMD_INDEX_STATS_PHASE_INSERT),
+                   ==,
+                   0);
+}
+
+
+static void
+module_index_test_dump_to_json (void)
+{
+  g_autoptr (ModulemdModuleIndex) index = modulemd_module_index_new ();
+  g_autoptr (ModulemdModuleStreamV2) stream = NULL;
+  g_autoptr (GError) error = NULL;
+  g_autofree gchar *json = NULL;
+
+  /* An empty index cannot be dumped */
+  json = modulemd_module_index_dump_to_json (
+    index, MODULEMD_DUMP_FLAG_NONE, &error);
+  g_assert_null (json);
+  g_assert_error (error, MODULEMD_ERROR, MODULEMD_ERROR_VALIDATE);
+  g_clear_error (&error);
+
+  stream = modulemd_module_stream_v2_new ("foo", "2.10");
+  modulemd_module_stream_set_version (MODULEMD_MODULE_STREAM (stream), 1);
+  modulemd_module_stream_v2_set_summary (stream, "summary");
+  modulemd_module_stream_v2_set_description (stream, "A \"quoted\" desc");
+  modulemd_module_stream_v2_add_module_license (stream, "MIT");
+  modulemd_module_stream_v2_add_rpm_artifact (stream, "foo-0:1.0-1.x86_64");
+  g_assert_true (modulemd_module_index_add_module_stream (
+    index, MODULEMD_MODULE_STREAM (stream), &error));
+  g_assert_no_error (error);
+
+  json = modulemd_module_index_dump_to_json (
+    index, MODULEMD_DUMP_FLAG_NONE, &error);
+  g_assert_no_error (error);
+
+  /* Scalars are kept as strings, so the stream name is not a number */
+  g_assert_cmpstr (json,
+                   ==,
+                   "[{\"document\": \"modulemd\", \"version\": \"2\", "
+                   "\"data\": {\"name\": \"foo\", \"stream\": \"2.10\", "
+                   "\"version\": \"1\", \"summary\": \"summary\", "
+                   "\"description\": \"A \\\"quoted\\\" desc\", "
+                   "\"license\": {\"module\": [\"MIT\"]}, "
+                   "\"artifacts\": {\"rpms\": [\"foo-0:1.0-1.x86_64\"]}}}]");
+}
+
+
+typedef struct
+{
+  GAsyncResult *result;
+  guint progress_calls;
+  guint documents;
+} AsyncTestData;
+
+
+static void
+async_test_progress (guint64 bytes, guint documents, gpointer user_data)
+{
+  AsyncTestData *data = user_data;
+
+  g_assert_cmpuint (documents, >=, data->documents);
+  data->progress_calls++;
+  data->documents = documents;
+}
+
+
+static void
+async_test_ready (GObject *source, GAsyncResult *result, gpointer user_data)
+{
+  AsyncTestData *data = user_data;
+
+  data->result = g_object_ref (result);
+}
+
+
+static void
+async_test_wait (AsyncTestData *data)
+{
+  while (data->result == NULL)
+    {
+      g_main_context_iteration (NULL, TRUE);
+    }
+}
+
+
+static void
+module_index_test_async (void)
+{
+  g_autoptr (ModulemdModuleIndex) index = modulemd_module_index_new ();
+  g_autoptr (ModulemdModuleIndex) cancelled = modulemd_module_index_new ();
+  g_autoptr (GCancellable) cancellable = g_cancellable_new ();
+  g_autoptr (GPtrArray) failures = NULL;
+  g_autoptr (GError) error = NULL;
+  g_auto (GStrv) module_names = NULL;
+  g_autofree gchar *yaml_path = NULL;
+  g_autofree gchar *tmpdir = NULL;
+  g_autofree gchar *output_path = NULL;
+  g_autofree gchar *link_path = NULL;
+  g_autofree gchar *expected = NULL;
+  g_autofree gchar *contents = NULL;
+  GStatBuf statbuf;
+  AsyncTestData data = { NULL, 0, 0 };
+
+  yaml_path = g_strdup_printf ("%s/f29.yaml", g_getenv ("TEST_DATA_PATH"));
+
+  modulemd_module_index_update_from_file_async (index,
+                                                yaml_path,
+                                                TRUE,
+                                                NULL,
+                                                async_test_progress,
+                                                &data,
+                                                NULL,
+                                                async_test_ready,
+                                                &data);
+  async_test_wait (&data);
+
+  g_assert_true (modulemd_module_index_update_from_file_finish (
+    index, data.result, &failures, &error));
+  g_assert_no_error (error);
+  g_assert_cmpuint (failures->len, ==, 0);
+  g_assert_cmpuint (data.progress_calls, >, 0);
+  g_assert_cmpuint (data.documents, ==, 55);
+  g_clear_object (&data.result);
+  g_clear_pointer (&failures, g_ptr_array_unref);
+
+  /* A cancelled update stops before the first subdocument */
+  g_cancellable_cancel (cancellable);
+  modulemd_module_index_update_from_file_async (cancelled,
+                                                yaml_path,
+                                                TRUE,
+                                                cancellable,
+                                                NULL,
+                                                NULL,
+                                                NULL,
+                                                async_test_ready,
+                                                &data);
+  async_test_wait (&data);
+
+  g_assert_false (modulemd_module_index_update_from_file_finish (
+    cancelled, data.result, &failures, &error));
+  g_assert_error (error, G_IO_ERROR, G_IO_ERROR_CANCELLED);
+  g_clear_error (&error);
+  g_clear_object (&data.result);
+  module_names = modulemd_module_index_get_module_names_as_strv (cancelled);
+  g_assert_cmpuint (g_strv_length (module_names), ==, 0);
+
+  /* Dump what was read and compare it with the synchronous output */
+  tmpdir = g_dir_make_tmp ("modulemd-dump-XXXXXX", &error);
+  g_assert_no_error (error);
+  output_path = g_build_filename (tmpdir, "modules.yaml", NULL);
+  link_path = g_build_filename (tmpdir, "link.yaml", NULL);
+
+  data.progress_calls = 0;
+  data.documents = 0;
+  modulemd_module_index_dump_to_file_async (index,
+                                            output_path,
+                                            MODULEMD_DUMP_FLAG_NONE,
+                                            NULL,
+                                            async_test_progress,
+                                            &data,
+                                            NULL,
+                                            async_test_ready,
+                                            &data);
+  async_test_wait (&data);
+
+  g_assert_true (
+    modulemd_module_index_dump_to_file_finish (index, data.result, &error));
+  g_assert_no_error (error);
+  g_assert_cmpuint (data.progress_calls, >, 0);
+  g_assert_cmpuint (data.documents, ==, 55);
+  g_clear_object (&data.result);
+
+  expected = modulemd_module_index_dump_to_string (index, &error);
+  g_assert_no_error (error);
+  g_assert_true (g_file_get_contents (output_path, &contents, NULL, &error));
+  g_assert_no_error (error);
+  g_assert_cmpstr (contents, ==, expected);
+
+  /* A cancelled dump leaves the existing file alone */
+  g_clear_pointer (&contents, g_free);
+  modulemd_module_index_dump_to_file_async (index,
+                                            output_path,
+                                            MODULEMD_DUMP_FLAG_NONE,
+                                            cancellable,
+                                            NULL,
+                                            NULL,
+                                            NULL,
+                                            async_test_ready,
+                                            &data);
+  async_test_wait (&data);
+
+  g_assert_false (
+    modulemd_module_index_dump_to_file_finish (index, data.result, &error));
+  g_assert_error (error, G_IO_ERROR, G_IO_ERROR_CANCELLED);
+  g_clear_object (&data.result);
+  g_assert_true (g_file_get_contents (output_path, &contents, NULL, &error));
+  g_assert_no_error (error);
+  g_assert_cmpstr (contents, ==, expected);
+
+  /* Dumping through a symbolic link replaces its target, keeping the link
+   * and the permissions of the file it replaces.
+   */
+  g_assert_cmpint (g_chmod (output_path, 0640), ==, 0);
+  g_assert_cmpint (symlink ("modules.yaml", link_path), ==, 0);
+  modulemd_module_index_dump_to_file_async (index,
+                                            link_path,
+                                            MODULEMD_DUMP_FLAG_NONE,
+                                            NULL,
+                                            NULL,
+                                            NULL,
+                                            NULL,
+                                            async_test_ready,
+                                            &data);
+  async_test_wait (&data);
+
+  g_assert_true (
+    modulemd_module_index_dump_to_file_finish (index, data.result, &error));
+  g_assert_no_error (error);
+  g_clear_object (&data.result);
+  g_assert_true (g_file_test (link_path, G_FILE_TEST_IS_SYMLINK));
+  g_assert_cmpint (g_stat (output_path, &statbuf), ==, 0);
+  g_assert_cmpint (statbuf.st_mode & 0777, ==, 0640);
+  g_clear_pointer (&contents, g_free);
+  g_assert_true (g_file_get_contents (output_path, &contents, NULL, &error));
+  g_assert_no_error (error);
+  g_assert_cmpstr (contents, ==, expected);
+
+  /* The temporary files the dumps were written to are gone as well */
+  g_assert_cmpint (g_unlink (link_path), ==, 0);
+  g_assert_cmpint (g_unlink (output_path), ==, 0);
+  g_assert_cmpint (g_rmdir (tmpdir), ==, 0);
+}
+
+
+typedef struct
+{
+  ModulemdModuleIndex *index;
+  const gchar *expected_yaml;
+} FrozenReadData;
+
+
+static gpointer
+frozen_index_reader (gpointer user_data)
+{
+  FrozenReadData *data = user_data;
+
+  for (guint i = 0; i < 10; i++)
+    {
+      g_autoptr (GError) error = NULL;
+      g_autoptr (GPtrArray) streams = NULL;
+      g_autoptr (GHashTable) defaults = NULL;
+      g_autofree gchar *yaml = NULL;
+      ModulemdModule *module = NULL;
+      ModulemdModuleStream *stream = NULL;
+
+      module = modulemd_module_index_get_module (data->index, "dwm");
+      g_assert_nonnull (module);
+
+      streams = modulemd_module_search_streams (module, "6.1", 0, NULL, NULL);
+      g_assert_cmpuint (streams->len, ==, 1);
+
+      /* Getters that hand out mutable children used to reset the
+       * validation flag on the stream.
+       */
+      stream = g_ptr_array_index (streams, 0);
+      g_assert_nonnull (modulemd_module_stream_v2_get_profile (
+        MODULEMD_MODULE_STREAM_V2 (stream), "default"));
+      g_assert_true (modulemd_module_stream_validate (stream, &error));
+      g_assert_no_error (error);
+
+      defaults = modulemd_module_index_get_default_streams_as_hash_table (
+        data->index, NULL);
+      g_assert_cmpstr (g_hash_table_lookup (defaults, "dwm"), ==, "6.1");
+
+      yaml = modulemd_module_index_dump_to_string (data->index, &error);
+      g_assert_no_error (error);
+      g_assert_cmpstr (yaml, ==, data->expected_yaml);
+    }
+
+  return NULL;
+}
+
+
+static void
+module_index_test_freeze (void)
+{
+  g_autoptr (ModulemdModuleIndex) index = modulemd_module_index_new ();
+  g_autoptr (ModulemdModuleStreamV2) stream = NULL;
+  g_autoptr (GPtrArray) failures = NULL;
+  g_autoptr (GError) error = NULL;
+  g_autofree gchar *yaml_path = NULL;
+  g_autofree gchar *expected_yaml = NULL;
+  GThread *threads[4];
+  FrozenReadData data;
+  ModulemdModule *module = NULL;
+  ModulemdModuleStream *frozen_stream = NULL;
+  g_autofree gchar *summary = NULL;
+
+  yaml_path = g_strdup_printf ("%s/f29.yaml", g_getenv ("TEST_DATA_PATH"));
+  g_assert_true (modulemd_module_index_update_from_file (
+    index, yaml_path, TRUE, &failures, &error));
+  g_assert_no_error (error);
+
+  expected_yaml = modulemd_module_index_dump_to_string (index, &error);
+  g_assert_no_error (error);
+
+  g_assert_false (modulemd_module_index_is_frozen (index));
+  modulemd_module_index_freeze (index);
+  g_assert_true (modulemd_module_index_is_frozen (index));
+
+  module = modulemd_module_index_get_module (index, "nodejs");
+  g_assert_true (modulemd_module_is_frozen (module));
+  frozen_stream =
+    g_ptr_array_index (modulemd_module_get_all_streams (module), 0);
+  g_assert_true (modulemd_module_stream_is_frozen (frozen_stream));
+  g_assert_true (modulemd_module_stream_is_validated (frozen_stream));
+
+  /* Read the index from several threads at once */
+  data.index = index;
+  data.expected_yaml = expected_yaml;
+  for (guint i = 0; i < G_N_ELEMENTS (threads); i++)
+    {
+      threads[i] = g_thread_new ("reader", frozen_index_reader, &data);
+    }
+  for (guint i = 0; i < G_N_ELEMENTS (threads); i++)
+    {
+      g_thread_join (threads[i]);
+    }
+
+  /* Modifying a frozen index is a programming error */
+  stream = modulemd_module_stream_v2_new ("nodejs", "12");
+  modulemd_test_signal = 0;
+  signal (SIGTRAP, modulemd_test_signal_handler);
+  g_assert_false (modulemd_module_index_add_module_stream (
+    index, MODULEMD_MODULE_STREAM (stream), &error));
+  g_assert_cmpint (modulemd_test_signal, ==, SIGTRAP);
+  g_assert_cmpuint (modulemd_module_get_all_streams (module)->len, ==, 2);
+
+  modulemd_test_signal = 0;
+  signal (SIGTRAP, modulemd_test_signal_handler);
+  modulemd_module_stream_set_arch (frozen_stream, "s390x");
+  g_assert_cmpint (modulemd_test_signal, ==, SIGTRAP);
+  g_assert_cmpstr (
+    modulemd_module_stream_get_arch (frozen_stream), ==, "x86_64");
+
+  /* The same applies to the setters of the subclasses */
+  summary = g_strdup (modulemd_module_stream_v2_get_summary (
+    MODULEMD_MODULE_STREAM_V2 (frozen_stream), "C"));
+  modulemd_test_signal = 0;
+  signal (SIGTRAP, modulemd_test_signal_handler);
+  modulemd_module_stream_v2_set_summary (
+    MODULEMD_MODULE_STREAM_V2 (frozen_stream), "A changed summary");
+  g_assert_cmpint (modulemd_test_signal, ==, SIGTRAP);
+  g_assert_cmpstr (modulemd_module_stream_v2_get_summary (
+                     MODULEMD_MODULE_STREAM_V2 (frozen_stream), "C"),
+                   ==,
+                   summary);
+  g_assert_true (modulemd_module_stream_is_validated (frozen_stream));
+}
+
+
+static ModulemdModuleIndex *
+read_f29_index (void)
+{
+  g_autoptr (ModulemdModuleIndex) index = modulemd_module_index_new ();
+  g_autoptr (GPtrArray) failures = NULL;
+  g_autoptr (GError) error = NULL;
+  g_autofree gchar *yaml_path = NULL;
+
+  yaml_path = g_strdup_printf ("%s/f29.yaml", g_getenv ("TEST_DATA_PATH"));
+  g_assert_true (modulemd_module_index_update_from_file (
+    index, yaml_path, TRUE, &failures, &error));
+  g_assert_no_error (error);
+
+  return g_steal_pointer (&index);
+}
+
+
+static void
+module_index_test_diff (void)
+{
+  g_autoptr (ModulemdModuleIndex) old_index = read_f29_index ();
+  g_autoptr (ModulemdModuleIndex) new_index = read_f29_index ();
+  g_autoptr (ModulemdIndexDiff) diff = NULL;
+  g_autoptr (ModulemdModuleStream) added = NULL;
+  g_autoptr (ModulemdDefaults) defaults = NULL;
+  g_autoptr (ModulemdTranslation) translation = NULL;
+  g_autoptr (ModulemdTranslationEntry) entry = NULL;
+  g_autoptr (GError) error = NULL;
+  g_autofree gchar *changed_nsvca = NULL;
+  g_autofree gchar *added_nsvca = NULL;
+  g_autofree gchar *diff_nsvca = NULL;
+  g_auto (GStrv) removed = NULL;
+  ModulemdModule *module = NULL;
+  ModulemdModuleStream *stream = NULL;
+  GPtrArray *objects = NULL;
+
+  /* Identical indexes have an empty diff */
+  diff = modulemd_module_index_diff (old_index, new_index, &error);
+  g_assert_no_error (error);
+  g_assert_nonnull (diff);
+  g_assert_true (modulemd_index_diff_is_empty (diff));
+  g_clear_object (&diff);
+
+  /* Remove nodejs:8, change nodejs:10 and add a newer build of it */
+  module = modulemd_module_index_get_module (new_index, "nodejs");
+  modulemd_module_remove_streams_by_NSVCA (module, "8", 0, NULL, NULL);
+  g_assert_cmpuint (modulemd_module_get_all_streams (module)->len, ==, 1);
+
+  stream = g_ptr_array_index (modulemd_module_get_all_streams (module), 0);
+  modulemd_module_stream_v2_set_summary (MODULEMD_MODULE_STREAM_V2 (stream),
+                                         "A changed summary");
+  changed_nsvca = modulemd_module_stream_get_NSVCA_as_string (stream);
+
+  added = modulemd_module_stream_copy (stream, NULL, NULL);
+  modulemd_module_stream_set_version (
+    added, modulemd_module_stream_get_version (stream) + 1);
+  added_nsvca = modulemd_module_stream_get_NSVCA_as_string (added);
+  g_assert_true (
+    modulemd_module_index_add_module_stream (new_index, added, &error));
+  g_assert_no_error (error);
+
+  /* Give nodejs defaults and change those of dwm */
+  defaults = modulemd_defaults_new (MD_DEFAULTS_VERSION_ONE, "nodejs");
+  modulemd_defaults_v1_set_default_stream (
+    MODULEMD_DEFAULTS_V1 (defaults), "10", NULL);
+  g_assert_true (
+    modulemd_module_index_add_defaults (new_index, defaults, &error));
+  g_assert_no_error (error);
+
+  modulemd_defaults_v1_set_default_stream (
+    MODULEMD_DEFAULTS_V1 (modulemd_module_get_defaults (
+      modulemd_module_index_get_module (new_index, "dwm"))),
+    "6.0",
+    NULL);
+
+  /* Translate nodejs:10 */
+  translation = modulemd_translation_new (1, "nodejs", "10", 42);
+  entry = modulemd_translation_entry_new ("ja_JP");
+  modulemd_translation_entry_set_summary (entry, "Translated summary");
+  modulemd_translation_set_translation_entry (translation, entry);
+  g_assert_true (
+    modulemd_module_index_add_translation (new_index, translation, &error));
+  g_assert_no_error (error);
+
+  diff = modulemd_module_index_diff (old_index, new_index, &error);
+  g_assert_no_error (error);
+  g_assert_nonnull (diff);
+  g_assert_false (modulemd_index_diff_is_empty (diff));
+
+  objects = modulemd_index_diff_get_added_streams (diff);
+  g_assert_cmpuint (objects->len, ==, 1);
+  diff_nsvca = modulemd_module_stream_get_NSVCA_as_string (
+    g_ptr_array_index (objects, 0));
+  g_assert_cmpstr (diff_nsvca, ==, added_nsvca);
+  g_clear_pointer (&diff_nsvca, g_free);
+
+  objects = modulemd_index_diff_get_changed_streams (diff);
+  g_assert_cmpuint (objects->len, ==, 1);
+  diff_nsvca = modulemd_module_stream_get_NSVCA_as_string (
+    g_ptr_array_index (objects, 0));
+  g_assert_cmpstr (diff_nsvca, ==, changed_nsvca);
+
+  removed = modulemd_index_diff_get_removed_streams_as_strv (diff);
+  g_assert_cmpuint (g_strv_length (removed), ==, 1);
+  g_assert_true (g_str_has_prefix (removed[0], "nodejs:8:"));
+  g_clear_pointer (&removed, g_strfreev);
+
+  g_assert_cmpuint (modulemd_index_diff_get_added_defaults (diff)->len, ==, 1);
+  objects = modulemd_index_diff_get_changed_defaults (diff);
+  g_assert_cmpuint (objects->len, ==, 1);
+  g_assert_cmpstr (
+    modulemd_defaults_get_module_name (g_ptr_array_index (objects, 0)),
+    ==,
+    "dwm");
+  removed = modulemd_index_diff_get_removed_defaults_as_strv (diff);
+  g_assert_cmpuint (g_strv_length (removed), ==, 0);
+  g_clear_pointer (&removed, g_strfreev);
+
+  g_assert_cmpuint (
+    modulemd_index_diff_get_added_translations (diff)->len, ==, 1);
+  g_assert_cmpuint (
+    modulemd_index_diff_get_changed_translations (diff)->len, ==, 0);
+
+  /* Applying the diff turns the old index into the new one */
+  g_assert_true (modulemd_module_index_apply_diff (old_index, diff, &error));
+  g_assert_no_error (error);
+  g_clear_object (&diff);
+
+  diff = modulemd_module_index_diff (old_index, new_index, &error);
+  g_assert_no_error (error);
+  g_assert_true (modulemd_index_diff_is_empty (diff));
+  g_clear_object (&diff);
+
+  /* Removing a module removes all of its documents */
+  g_assert_true (modulemd_module_index_remove_module (new_index, "dwm"));
+  diff = modulemd_module_index_diff (old_index, new_index, &error);
+  g_assert_no_error (error);
+  removed = modulemd_index_diff_get_removed_defaults_as_strv (diff);
+  g_assert_cmpuint (g_strv_length (removed), ==, 1);
+  g_assert_cmpstr (removed[0], ==, "dwm");
+  g_clear_pointer (&removed, g_strfreev);
+
+  g_assert_true (modulemd_module_index_apply_diff (old_index, diff, &error));
+  g_assert_no_error (error);
+  g_assert_null (modulemd_module_index_get_module (old_index, "dwm"));
+  g_clear_object (&diff);
+
+  diff = modulemd_module_index_diff (old_index, new_index, &error);
+  g_assert_no_error (error);
+  g_assert_true (modulemd_index_diff_is_empty (diff));
+
+  /* A stream without a name is refused before anything is changed */
+  g_clear_object (&added);
+  added = MODULEMD_MODULE_STREAM (modulemd_module_stream_v2_new (NULL, NULL));
+  modulemd_index_diff_add_stream (diff, added);
+  modulemd_index_diff_remove_stream (diff, changed_nsvca);
+  g_assert_false (modulemd_module_index_apply_diff (old_index, diff, &error));
+  g_assert_error (error, MODULEMD_ERROR, MODULEMD_YAML_ERROR_MISSING_REQUIRED);
+  module = modulemd_module_index_get_module (old_index, "nodejs");
+  g_assert_cmpuint (modulemd_module_get_all_streams (module)->len, ==, 2);
+}
+
+
 struct expected_compressed_read_t
 {
   const gchar *filename;
@@ -1348,6 +2579,201 @@ test_module_index_read_def_dir (void)
 }
 
 
+static void
+write_defaults_file (const gchar *dir,
+                     const gchar *filename,
+                     const gchar *module_name,
+                     const gchar *stream_name)
+{
+  g_autoptr (GError) error = NULL;
+  g_autofree gchar *filepath = g_build_path ("/", dir, filename, NULL);
+  g_autofree gchar *contents = g_strdup_printf (
+    "---\n"
+    "document: modulemd-defaults\n"
+    "version: 1\n"
+    "data:\n"
+    "  module: %s\n"
+    "  stream: %s\n"
+    "...\n",
+    module_name,
+    stream_name);
+
+  g_assert_true (g_file_set_contents (filepath, contents, -1, &error));
+  g_assert_no_error (error);
+}
+
+
+static void
+test_module_index_read_def_dir_many (void)
+{
+  g_autoptr (ModulemdModuleIndex) idx = NULL;
+  g_autoptr (GError) error = NULL;
+  g_autoptr (GDir) dir = NULL;
+  g_autoptr (GHashTable) defaultdict = NULL;
+  g_auto (GStrv) module_names = NULL;
+  g_autofree gchar *tmpdir = NULL;
+  g_autofree gchar *filename = NULL;
+  g_autofree gchar *filepath = NULL;
+  g_autofree gchar *module_name = NULL;
+  g_autofree gchar *stream_name = NULL;
+  const gchar *entry = NULL;
+  guint i;
+
+  tmpdir = g_dir_make_tmp ("modulemd-defaults-XXXXXX", &error);
+  g_assert_no_error (error);
+  g_assert_nonnull (tmpdir);
+
+  /* Enough files to need several passes of the reduction. The last few
+   * repeat the defaults of earlier modules, which must merge cleanly.
+   */
+  for (i = 0; i < 37; i++)
+    {
+      filename = g_strdup_printf ("%03u.yaml", i);
+      module_name = g_strdup_printf ("module%u", i % 29);
+      stream_name = g_strdup_printf ("stream%u", i % 29);
+
+      write_defaults_file (tmpdir, filename, module_name, stream_name);
+
+      g_clear_pointer (&filename, g_free);
+      g_clear_pointer (&module_name, g_free);
+      g_clear_pointer (&stream_name, g_free);
+    }
+
+  idx = modulemd_module_index_new ();
+  g_assert_true (modulemd_module_index_update_from_defaults_directory (
+    idx, tmpdir, TRUE, NULL, &error));
+  g_assert_no_error (error);
+
+  module_names = modulemd_module_index_get_module_names_as_strv (idx);
+  g_assert_cmpint (g_strv_length (module_names), ==, 29);
+
+  defaultdict =
+    modulemd_module_index_get_default_streams_as_hash_table (idx, NULL);
+  for (i = 0; i < 29; i++)
+    {
+      module_name = g_strdup_printf ("module%u", i);
+      stream_name = g_strdup_printf ("stream%u", i);
+      g_assert_cmpstr (
+        g_hash_table_lookup (defaultdict, module_name), ==, stream_name);
+      g_clear_pointer (&module_name, g_free);
+      g_clear_pointer (&stream_name, g_free);
+    }
+
+  g_clear_pointer (&module_names, g_strfreev);
+  g_clear_pointer (&defaultdict, g_hash_table_unref);
+  g_clear_object (&idx);
+
+  /* Add a file that conflicts with the default stream of module7 */
+  write_defaults_file (tmpdir, "conflict.yaml", "module7", "other");
+
+  idx = modulemd_module_index_new ();
+  g_assert_false (modulemd_module_index_update_from_defaults_directory (
+    idx, tmpdir, TRUE, NULL, &error));
+  g_assert_error (error, MODULEMD_ERROR, MODULEMD_ERROR_VALIDATE);
+  g_clear_error (&error);
+
+  module_names = modulemd_module_index_get_module_names_as_strv (idx);
+  g_assert_cmpint (g_strv_length (module_names), ==, 0);
+  g_clear_pointer (&module_names, g_strfreev);
+  g_clear_object (&idx);
+
+  /* In non-strict mode, the conflicting default stream is unset */
+  idx = modulemd_module_index_new ();
+  g_assert_true (modulemd_module_index_update_from_defaults_directory (
+    idx, tmpdir, FALSE, NULL, &error));
+  g_assert_no_error (error);
+
+  defaultdict =
+    modulemd_module_index_get_default_streams_as_hash_table (idx, NULL);
+  g_assert_cmpint (g_hash_table_size (defaultdict), ==, 28);
+  g_assert_null (g_hash_table_lookup (defaultdict, "module7"));
+  g_assert_cmpstr (
+    g_hash_table_lookup (defaultdict, "module8"), ==, "stream8");
+
+  /* Clean up the temporary directory */
+  dir = g_dir_open (tmpdir, 0, &error);
+  g_assert_no_error (error);
+  while ((entry = g_dir_read_name (dir)) != NULL)
+    {
+      filepath = g_build_path ("/", tmpdir, entry, NULL);
+      g_assert_cmpint (g_unlink (filepath), ==, 0);
+      g_clear_pointer (&filepath, g_free);
+    }
+  g_assert_cmpint (g_rmdir (tmpdir), ==, 0);
+}
+
+
+static void
+module_index_test_merge_fingerprints (void)
+{
+  g_autoptr (ModulemdModuleIndex) f29 = NULL;
+  g_autoptr (ModulemdModuleIndex) f29_updates = NULL;
+  g_autoptr (GPtrArray) failures = NULL;
+  g_autoptr (GError) error = NULL;
+  g_autofree gchar *yaml_path = NULL;
+  ModulemdModuleStream *stream = NULL;
+
+  f29 = modulemd_module_index_new ();
+  yaml_path = g_strdup_printf ("%s/f29.yaml", g_getenv ("TEST_DATA_PATH"));
+  g_assert_true (modulemd_module_index_update_from_file (
+    f29, yaml_path, TRUE, &failures, &error));
+  g_assert_no_error (error);
+  g_clear_pointer (&yaml_path, g_free);
+  g_clear_pointer (&failures, g_ptr_array_unref);
+
+  f29_updates = modulemd_module_index_new ();
+  yaml_path =
+    g_strdup_printf ("%s/f29-updates.yaml", g_getenv ("TEST_DATA_PATH"));
+  g_assert_true (modulemd_module_index_update_from_file (
+    f29_updates, yaml_path, TRUE, &failures, &error));
+  g_assert_no_error (error);
+
+  /* Nothing is fingerprinted while reading a single repository */
+  stream = modulemd_module_get_stream_by_NSVCA (
+    modulemd_module_index_get_module (f29, "nodejs"),
+    "8",
+    20180816123422,
+    "6c81f848",
+    "x86_64",
+    &error);
+  g_assert_no_error (error);
+  g_assert_nonnull (stream);
+  g_assert_false (modulemd_module_stream_is_frozen (stream));
+  g_assert_null (modulemd_module_stream_peek_fingerprint (stream));
+
+  g_assert_true (
+    modulemd_module_index_merge (f29_updates, f29, FALSE, FALSE, &error));
+  g_assert_no_error (error);
+
+  /* A stream present in both was compared by fingerprint, and the stream
+   * kept in its place still has it for the next duplicate.
+   */
+  stream = modulemd_module_get_stream_by_NSVCA (
+    modulemd_module_index_get_module (f29, "nodejs"),
+    "8",
+    20180816123422,
+    "6c81f848",
+    "x86_64",
+    &error);
+  g_assert_no_error (error);
+  g_assert_nonnull (stream);
+  g_assert_false (modulemd_module_stream_is_frozen (stream));
+  g_assert_nonnull (modulemd_module_stream_peek_fingerprint (stream));
+
+  /* Streams that were only added were not fingerprinted */
+  stream = modulemd_module_get_stream_by_NSVCA (
+    modulemd_module_index_get_module (f29, "nodejs"),
+    "10",
+    20181101171344,
+    "6c81f848",
+    "x86_64",
+    &error);
+  g_assert_no_error (error);
+  g_assert_nonnull (stream);
+  g_assert_null (modulemd_module_stream_peek_fingerprint (stream));
+}
+
+
 int
 main (int argc, char *argv[])
 {
@@ -1427,11 +2853,44 @@ main (int argc, char *argv[])
   g_test_add_func ("/modulemd/v2/module/index/empty",
                    module_index_test_dump_empty_index);
 
+  g_test_add_func ("/modulemd/v2/module/index/dump/flags",
+                   module_index_test_dump_flags);
+
+  g_test_add_func ("/modulemd/v2/module/index/dump/filtered",
+                   module_index_test_dump_filtered);
+
+  g_test_add_func ("/modulemd/v2/module/index/stats", module_index_test_stats);
+
+  g_test_add_func ("/modulemd/v2/module/index/upgrade/deferred",
+                   module_index_test_deferred_upgrade);
+
+  g_test_add_func ("/modulemd/v2/module/index/memory_usage",
+                   module_index_test_memory_usage);
+
+  g_test_add_func ("/modulemd/v2/module/index/validate_from_parser",
+                   module_index_test_validate_from_parser);
+
+  g_test_add_func ("/modulemd/v2/module/index/dump_to_json",
+                   module_index_test_dump_to_json);
+
+  g_test_add_func ("/modulemd/v2/module/index/async", module_index_test_async);
+
+  g_test_add_func ("/modulemd/v2/module/index/freeze",
+                   module_index_test_freeze);
+
+  g_test_add_func ("/modulemd/v2/module/index/diff", module_index_test_diff);
+
+  g_test_add_func ("/modulemd/v2/module/index/merge/fingerprints",
+                   module_index_test_merge_fingerprints);
+
   g_test_add_func ("/modulemd/v2/module/index/compressed",
                    test_module_index_read_compressed);
 
   g_test_add_func ("/modulemd/v2/module/index/defaultdir",
                    test_module_index_read_def_dir);
 
+  g_test_add_func ("/modulemd/v2/module/index/defaultdir/many",
+                   test_module_index_read_def_dir_many);
+
   return g_test_run ();
 }
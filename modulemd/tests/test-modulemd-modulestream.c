@@ -2,9 +2,11 @@
 #include <glib/gstdio.h>
 #include <locale.h>
 #include <signal.h>
+#include <string.h>
 
 #include "modulemd-module-index.h"
 #include "modulemd-module-stream.h"
+#include "modulemd.h"
 #include "private/glib-extensions.h"
 #include "private/modulemd-module-stream-private.h"
 #include "private/modulemd-module-stream-v1-private.h"
@@ -2215,6 +2217,92 @@ module_stream_v2_test_rpm_map (ModuleStreamFixture *fixture,
   g_assert_true (modulemd_rpm_map_entry_equals (entry, retrieved_entry));
 }
 
+
+static void
+module_stream_v2_test_rpm_map_order (void)
+{
+  g_autoptr (ModulemdModuleStreamV2) stream = NULL;
+  g_autoptr (ModulemdModuleStream) copy = NULL;
+  g_autoptr (ModulemdModuleIndex) index = NULL;
+  g_autoptr (ModulemdRpmMapEntry) entry = NULL;
+  g_autoptr (GError) error = NULL;
+  g_autofree gchar *yaml_str = NULL;
+  ModulemdRpmMapEntry *retrieved_entry = NULL;
+  const gchar *sha1_pos = NULL;
+  const gchar *aaa_pos = NULL;
+  const gchar *bbb_pos = NULL;
+
+  stream = modulemd_module_stream_v2_new ("foo", "bar");
+  modulemd_module_stream_set_version (MODULEMD_MODULE_STREAM (stream), 1);
+  modulemd_module_stream_set_context (MODULEMD_MODULE_STREAM (stream), "c0");
+  modulemd_module_stream_v2_set_summary (stream, "Summary");
+  modulemd_module_stream_v2_set_description (stream, "Description");
+  modulemd_module_stream_v2_add_module_license (stream, "MIT");
+
+  /* Add the entries out of order and set one of them twice */
+  entry = modulemd_rpm_map_entry_new ("bar", 0, "1.0", "1", "x86_64");
+  modulemd_module_stream_v2_set_rpm_artifact_map_entry (
+    stream, entry, "sha256", "bbb");
+  modulemd_module_stream_v2_set_rpm_artifact_map_entry (
+    stream, entry, "sha256", "aaa");
+  modulemd_module_stream_v2_set_rpm_artifact_map_entry (
+    stream, entry, "sha1", "ccc");
+  g_clear_object (&entry);
+
+  entry = modulemd_rpm_map_entry_new ("bar", 0, "2.0", "1", "x86_64");
+  modulemd_module_stream_v2_set_rpm_artifact_map_entry (
+    stream, entry, "sha256", "bbb");
+  g_clear_object (&entry);
+
+  retrieved_entry = modulemd_module_stream_v2_get_rpm_artifact_map_entry (
+    stream, "sha256", "bbb");
+  g_assert_nonnull (retrieved_entry);
+  g_assert_cmpstr (
+    modulemd_rpm_map_entry_get_version (retrieved_entry), ==, "2.0");
+  g_assert_true (retrieved_entry ==
+                 modulemd_module_stream_v2_get_rpm_artifact_map_entry (
+                   stream, "sha256", "bbb"));
+  g_assert_null (modulemd_module_stream_v2_get_rpm_artifact_map_entry (
+    stream, "sha1", "bbb"));
+
+  /* Changes to a retrieved entry are part of the stream */
+  modulemd_rpm_map_entry_set_release (retrieved_entry, "2");
+
+  copy = modulemd_module_stream_copy (MODULEMD_MODULE_STREAM (stream), NULL);
+  g_assert_true (
+    modulemd_module_stream_equals (MODULEMD_MODULE_STREAM (stream), copy));
+  retrieved_entry = modulemd_module_stream_v2_get_rpm_artifact_map_entry (
+    MODULEMD_MODULE_STREAM_V2 (copy), "sha256", "bbb");
+  g_assert_nonnull (retrieved_entry);
+  g_assert_cmpstr (
+    modulemd_rpm_map_entry_get_release (retrieved_entry), ==, "2");
+
+  modulemd_rpm_map_entry_set_release (retrieved_entry, "3");
+  g_assert_false (
+    modulemd_module_stream_equals (MODULEMD_MODULE_STREAM (stream), copy));
+
+  /* The rpm-map is emitted in order */
+  index = modulemd_module_index_new ();
+  g_assert_true (modulemd_module_index_add_module_stream (
+    index, MODULEMD_MODULE_STREAM (stream), &error));
+  g_assert_no_error (error);
+  yaml_str = modulemd_module_index_dump_to_string (index, &error);
+  g_assert_no_error (error);
+  g_assert_nonnull (yaml_str);
+
+  sha1_pos = strstr (yaml_str, "sha1:");
+  aaa_pos = strstr (yaml_str, "aaa:");
+  bbb_pos = strstr (yaml_str, "bbb:");
+  g_assert_nonnull (sha1_pos);
+  g_assert_nonnull (aaa_pos);
+  g_assert_nonnull (bbb_pos);
+  g_assert_true (sha1_pos < aaa_pos);
+  g_assert_true (aaa_pos < bbb_pos);
+  g_assert_nonnull (strstr (yaml_str, "nevra: bar-0:2.0-2.x86_64"));
+  g_assert_null (strstr (yaml_str, "bar-0:2.0-1.x86_64"));
+}
+
+
 static void
 module_stream_v2_test_unicode_desc (void)
 {
@@ -2356,6 +2444,165 @@ module_stream_v2_test_xmd_issue_290_with_example (void)
   g_assert_no_error (error);
 }
 
+static void
+module_stream_v2_test_xmd_json (void)
+{
+  g_autoptr (ModulemdModuleStreamV2) stream = NULL;
+  g_autoptr (ModulemdModuleIndex) index = modulemd_module_index_new ();
+  g_autoptr (GVariant) xmd = NULL;
+  g_autoptr (GVariant) other = NULL;
+  g_autoptr (GError) error = NULL;
+  g_autofree gchar *json = NULL;
+  g_autofree gchar *yaml_str = NULL;
+  g_autofree gchar *yaml_str2 = NULL;
+  const gchar *value = NULL;
+  gboolean flag;
+
+  xmd = modulemd_variant_from_json (
+    "{\"something\": [\"foo\", \"bar\"], \"flag\": true, "
+    "\"nested\": {\"quote\": \"\\\"true\\\"\", "
+    "\"empty\": []}}",
+    &error);
+  g_assert_no_error (error);
+  g_assert_nonnull (xmd);
+  g_assert_true (g_variant_is_of_type (xmd, G_VARIANT_TYPE_VARDICT));
+
+  g_assert_true (g_variant_lookup (xmd, "flag", "b", &flag));
+  g_assert_true (flag);
+
+  stream = modulemd_module_stream_v2_new ("foo", "bar");
+  modulemd_module_stream_v2_set_summary (stream, "summary");
+  modulemd_module_stream_v2_set_description (stream, "desc");
+  modulemd_module_stream_v2_add_module_license (stream, "MIT");
+  modulemd_module_stream_v2_set_xmd (stream, xmd);
+
+  g_assert_true (modulemd_module_index_add_module_stream (
+    index, MODULEMD_MODULE_STREAM (stream), &error));
+  g_assert_no_error (error);
+
+  yaml_str = modulemd_module_index_dump_to_string (index, &error);
+  g_assert_no_error (error);
+
+  // clang-format off
+  g_assert_cmpstr (yaml_str, ==,
+"---\n"
+"document: modulemd\n"
+"version: 2\n"
+"data:\n"
+"  name: foo\n"
+"  stream: bar\n"
+"  summary: summary\n"
+"  description: >-\n"
+"    desc\n"
+"  license:\n"
+"    module:\n"
+"    - MIT\n"
+"  xmd:\n"
+"    flag: TRUE\n"
+"    nested:\n"
+"      empty: []\n"
+"      quote: '\"true\"'\n"
+"    something:\n"
+"    - foo\n"
+"    - bar\n"
+"...\n");
+  // clang-format on
+
+  /* Converting back and forth gives the same xmd */
+  json = modulemd_variant_to_json (modulemd_module_stream_v2_get_xmd (stream),
+                                   &error);
+  g_assert_no_error (error);
+  g_assert_nonnull (json);
+  g_clear_pointer (&xmd, g_variant_unref);
+  xmd = modulemd_variant_from_json (json, &error);
+  g_assert_no_error (error);
+  g_assert_nonnull (xmd);
+
+  modulemd_module_stream_v2_set_xmd (stream, xmd);
+  yaml_str2 = modulemd_module_index_dump_to_string (index, &error);
+  g_assert_no_error (error);
+  g_assert_cmpstr (yaml_str2, ==, yaml_str);
+
+  g_assert_true (g_variant_lookup (xmd, "nested", "@a{sv}", &other));
+  g_assert_true (g_variant_lookup (other, "quote", "&s", &value));
+  g_assert_cmpstr (value, ==, "\"true\"");
+  g_clear_pointer (&other, g_variant_unref);
+
+  /* null is stored as an empty string */
+  other = modulemd_variant_from_json ("null", &error);
+  g_assert_no_error (error);
+  g_assert_cmpstr (g_variant_get_string (other, NULL), ==, "");
+  g_clear_pointer (&other, g_variant_unref);
+
+  /* Numbers and arrays of mixed types cannot be stored */
+  other = modulemd_variant_from_json ("{\"a\": 1}", &error);
+  g_assert_null (other);
+  g_assert_error (error, MODULEMD_YAML_ERROR, MODULEMD_YAML_ERROR_PARSE);
+  g_clear_error (&error);
+
+  other = modulemd_variant_from_json ("[\"a\", false]", &error);
+  g_assert_null (other);
+  g_assert_error (error, MODULEMD_YAML_ERROR, MODULEMD_YAML_ERROR_PARSE);
+  g_clear_error (&error);
+
+  other = modulemd_variant_from_json ("{\"a\": ", &error);
+  g_assert_null (other);
+  g_assert_nonnull (error);
+}
+
+
+static void
+module_stream_v2_test_validated (void)
+{
+  g_autoptr (ModulemdModuleStream) stream = NULL;
+  g_autoptr (ModulemdModuleStream) copy = NULL;
+  g_autofree gchar *path = NULL;
+  g_autoptr (GError) error = NULL;
+
+  path = g_strdup_printf ("%s/spec.v2.yaml", g_getenv ("MESON_SOURCE_ROOT"));
+  stream = modulemd_module_stream_read_file (path, TRUE, NULL, NULL, &error);
+  g_assert_nonnull (stream);
+  g_assert_no_error (error);
+
+  /* Reading a stream validates it */
+  g_assert_true (modulemd_module_stream_is_validated (stream));
+
+  /* Copies of a validated stream are also validated */
+  copy = modulemd_module_stream_copy (stream, NULL, NULL);
+  g_assert_true (modulemd_module_stream_is_validated (copy));
+
+  /* Setters require validating again */
+  modulemd_module_stream_v2_set_summary (MODULEMD_MODULE_STREAM_V2 (copy),
+                                         "A new summary");
+  g_assert_false (modulemd_module_stream_is_validated (copy));
+  g_assert_true (modulemd_module_stream_is_validated (stream));
+
+  g_assert_true (modulemd_module_stream_validate (copy, &error));
+  g_assert_no_error (error);
+  g_assert_true (modulemd_module_stream_is_validated (copy));
+
+  /* So does handing out a child object that could be modified */
+  g_assert_nonnull (modulemd_module_stream_v2_get_buildopts (
+    MODULEMD_MODULE_STREAM_V2 (copy)));
+  g_assert_false (modulemd_module_stream_is_validated (copy));
+
+  /* The child may still be modified later, so the result of validating the
+   * stream is no longer remembered.
+   */
+  g_assert_true (modulemd_module_stream_validate (copy, &error));
+  g_assert_no_error (error);
+  g_assert_false (modulemd_module_stream_is_validated (copy));
+
+  /* Invalid changes are not hidden by an earlier successful validation */
+  modulemd_module_stream_v2_clear_module_licenses (
+    MODULEMD_MODULE_STREAM_V2 (copy));
+  g_assert_false (modulemd_module_stream_validate (copy, &error));
+  g_assert_error (
+    error, MODULEMD_YAML_ERROR, MODULEMD_YAML_ERROR_MISSING_REQUIRED);
+  g_assert_false (modulemd_module_stream_is_validated (copy));
+}
+
+
 static void
 module_stream_v1_test_community (void)
 {
@@ -2454,6 +2701,78 @@ module_stream_v2_test_community (void)
   g_clear_object (&stream);
 }
 
+static void
+module_stream_v2_test_fingerprint (void)
+{
+  g_autoptr (ModulemdModuleStream) stream = NULL;
+  g_autoptr (ModulemdModuleStream) copy = NULL;
+  g_autoptr (ModulemdModuleStream) renamed = NULL;
+  ModulemdBuildopts *buildopts = NULL;
+  g_autofree gchar *path = NULL;
+  g_autofree gchar *fingerprint = NULL;
+  g_autofree gchar *copy_fingerprint = NULL;
+  g_autofree gchar *changed_fingerprint = NULL;
+  g_autofree gchar *renamed_fingerprint = NULL;
+  g_autoptr (GError) error = NULL;
+
+  path = g_strdup_printf ("%s/spec.v2.yaml", g_getenv ("MESON_SOURCE_ROOT"));
+  stream = modulemd_module_stream_read_file (path, TRUE, NULL, NULL, &error);
+  g_assert_nonnull (stream);
+  g_assert_no_error (error);
+
+  fingerprint = modulemd_module_stream_get_fingerprint (stream, &error);
+  g_assert_no_error (error);
+  g_assert_cmpuint (strlen (fingerprint), ==, 64);
+
+  /* An exact copy shares the fingerprint and compares equal by it */
+  copy = modulemd_module_stream_copy (stream, NULL, NULL);
+  copy_fingerprint = modulemd_module_stream_get_fingerprint (copy, &error);
+  g_assert_no_error (error);
+  g_assert_cmpstr (copy_fingerprint, ==, fingerprint);
+  g_assert_true (modulemd_module_stream_equals (stream, copy));
+
+  /* Modifying the copy computes a new fingerprint */
+  modulemd_module_stream_v2_set_summary (MODULEMD_MODULE_STREAM_V2 (copy),
+                                         "A new summary");
+  changed_fingerprint = modulemd_module_stream_get_fingerprint (copy, &error);
+  g_assert_no_error (error);
+  g_assert_cmpstr (changed_fingerprint, !=, fingerprint);
+  g_assert_false (modulemd_module_stream_equals (stream, copy));
+
+  /* Renaming the stream changes the emitted document */
+  renamed = modulemd_module_stream_copy (stream, NULL, "renamed");
+  renamed_fingerprint =
+    modulemd_module_stream_get_fingerprint (renamed, &error);
+  g_assert_no_error (error);
+  g_assert_cmpstr (renamed_fingerprint, !=, fingerprint);
+
+  /* Freezing keeps the fingerprint */
+  modulemd_module_stream_freeze (stream);
+  g_clear_pointer (&copy_fingerprint, g_free);
+  copy_fingerprint = modulemd_module_stream_get_fingerprint (stream, &error);
+  g_assert_no_error (error);
+  g_assert_cmpstr (copy_fingerprint, ==, fingerprint);
+
+  /* Changes made through a child handed out earlier are not missed */
+  g_clear_object (&copy);
+  copy = modulemd_module_stream_copy (stream, NULL, NULL);
+  buildopts =
+    modulemd_module_stream_v2_get_buildopts (MODULEMD_MODULE_STREAM_V2 (copy));
+  g_assert_nonnull (buildopts);
+  g_clear_pointer (&changed_fingerprint, g_free);
+  changed_fingerprint = modulemd_module_stream_get_fingerprint (copy, &error);
+  g_assert_no_error (error);
+  g_assert_cmpstr (changed_fingerprint, ==, fingerprint);
+
+  modulemd_buildopts_set_rpm_macros (buildopts, "%demomacro 2");
+  g_clear_pointer (&changed_fingerprint, g_free);
+  changed_fingerprint = modulemd_module_stream_get_fingerprint (copy, &error);
+  g_assert_no_error (error);
+  g_assert_cmpstr (changed_fingerprint, !=, fingerprint);
+  g_assert_false (modulemd_module_stream_equals (stream, copy));
+}
+
+
 int
 main (int argc, char *argv[])
 {
@@ -2694,6 +3013,9 @@ main (int argc, char *argv[])
               module_stream_v2_test_rpm_map,
               NULL);
 
+  g_test_add_func ("/modulemd/v2/modulestream/v2/rpm_map/order",
+                   module_stream_v2_test_rpm_map_order);
+
   g_test_add_func ("/modulemd/v2/modulestream/v1/community",
                    module_stream_v1_test_community);
 
@@ -2712,5 +3034,14 @@ main (int argc, char *argv[])
   g_test_add_func ("/modulemd/v2/modulestream/v2/xmd/issue290plus",
                    module_stream_v2_test_xmd_issue_290_with_example);
 
+  g_test_add_func ("/modulemd/v2/modulestream/v2/xmd/json",
+                   module_stream_v2_test_xmd_json);
+
+  g_test_add_func ("/modulemd/v2/modulestream/v2/validated",
+                   module_stream_v2_test_validated);
+
+  g_test_add_func ("/modulemd/v2/modulestream/v2/fingerprint",
+                   module_stream_v2_test_fingerprint);
+
   return g_test_run ();
 }
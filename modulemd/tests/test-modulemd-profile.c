@@ -390,6 +390,46 @@ profile_test_rpms (ProfileFixture *fixture, gconstpointer user_data)
 }
 
 
+static void
+profile_test_rpms_compact (ProfileFixture *fixture, gconstpointer user_data)
+{
+  g_autoptr (ModulemdProfile) p = NULL;
+  g_autoptr (ModulemdProfile) p_copy = NULL;
+  g_auto (GStrv) rpms = NULL;
+
+  p = modulemd_profile_new ("testprofile");
+  modulemd_profile_add_rpm (p, "test2");
+  modulemd_profile_add_rpm (p, "test3");
+  modulemd_profile_add_rpm (p, "test1");
+
+  /* Compacting keeps the contents and their order */
+  modulemd_profile_compact (p);
+  rpms = modulemd_profile_get_rpms_as_strv (p);
+  g_assert_cmpint (g_strv_length (rpms), ==, 3);
+  g_assert_cmpstr (rpms[0], ==, "test1");
+  g_assert_cmpstr (rpms[1], ==, "test2");
+  g_assert_cmpstr (rpms[2], ==, "test3");
+  g_clear_pointer (&rpms, g_strfreev);
+
+  /* A compacted profile equals its uncompacted copy */
+  p_copy = modulemd_profile_copy (p);
+  modulemd_profile_add_rpm (p_copy, "test0");
+  modulemd_profile_remove_rpm (p_copy, "test0");
+  g_assert_true (modulemd_profile_equals (p, p_copy));
+
+  /* It can still be modified afterwards */
+  modulemd_profile_add_rpm (p, "test0");
+  modulemd_profile_remove_rpm (p, "test2");
+  modulemd_profile_add_rpm (p, "test3");
+  rpms = modulemd_profile_get_rpms_as_strv (p);
+  g_assert_cmpint (g_strv_length (rpms), ==, 3);
+  g_assert_cmpstr (rpms[0], ==, "test0");
+  g_assert_cmpstr (rpms[1], ==, "test1");
+  g_assert_cmpstr (rpms[2], ==, "test3");
+  g_assert_false (modulemd_profile_equals (p, p_copy));
+}
+
+
 static void
 profile_test_parse_yaml (ProfileFixture *fixture, gconstpointer user_data)
 {
@@ -532,6 +572,13 @@ main (int argc, char *argv[])
               profile_test_rpms,
               NULL);
 
+  g_test_add ("/modulemd/v2/profile/rpms/compact",
+              ProfileFixture,
+              NULL,
+              NULL,
+              profile_test_rpms_compact,
+              NULL);
+
   g_test_add ("/modulemd/v2/profile/yaml/parse",
               ProfileFixture,
               NULL,
@@ -15,6 +15,7 @@
 #include <glib/gstdio.h>
 #include <locale.h>
 #include <signal.h>
+#include <string.h>
 
 #include "modulemd-rpm-map-entry.h"
 #include "private/modulemd-rpm-map-entry-private.h"
@@ -207,6 +208,30 @@ test_parse_yaml_mismatch (CommonMmdTestFixture *fixture,
   g_assert_null (entry);
   g_assert_error (
     error, MODULEMD_YAML_ERROR, MODULEMD_YAML_ERROR_INCONSISTENT);
+  g_clear_error (&error);
+
+  /* The epoch must be written exactly as the exploded version has it */
+  {
+    MMD_INIT_YAML_PARSER (string_parser);
+    const gchar *yaml =
+      "---\n"
+      "name: n\n"
+      "epoch: 0\n"
+      "version: 1\n"
+      "release: 1\n"
+      "arch: x86_64\n"
+      "nevra: n-00:1-1.x86_64\n"
+      "...\n";
+
+    yaml_parser_set_input_string (
+      &string_parser, (const unsigned char *)yaml, strlen (yaml));
+    parser_skip_document_start (&string_parser);
+
+    entry = modulemd_rpm_map_entry_parse_yaml (&string_parser, TRUE, &error);
+    g_assert_null (entry);
+    g_assert_error (
+      error, MODULEMD_YAML_ERROR, MODULEMD_YAML_ERROR_INCONSISTENT);
+  }
 }
 
 static void
@@ -266,6 +291,51 @@ test_emit_yaml_invalid (CommonMmdTestFixture *fixture, gconstpointer user_data)
 }
 
 
+static void
+test_parse_nevra (CommonMmdTestFixture *fixture, gconstpointer user_data)
+{
+  ModulemdNevra parsed;
+  ModulemdStringSet set;
+  const gchar *invalid = NULL;
+
+  g_assert_true (modulemd_nevra_parse (
+    "python3-dnf-plugins-core-12:4.0.9-1.module_deadbeef.noarch", &parsed));
+  g_assert_cmpint (parsed.name_len, ==, strlen ("python3-dnf-plugins-core"));
+  g_assert_true (
+    g_str_has_prefix (parsed.name, "python3-dnf-plugins-core-12:"));
+  g_assert_cmpuint (parsed.epoch, ==, 12);
+  g_assert_cmpint (parsed.epoch_len, ==, 2);
+  g_assert_true (g_str_has_prefix (parsed.epoch_text, "12:"));
+  g_assert_cmpint (parsed.version_len, ==, strlen ("4.0.9"));
+  g_assert_true (g_str_has_prefix (parsed.version, "4.0.9-"));
+  g_assert_cmpint (parsed.release_len, ==, strlen ("1.module_deadbeef"));
+  g_assert_true (g_str_has_prefix (parsed.release, "1.module_deadbeef."));
+  g_assert_cmpint (parsed.arch_len, ==, strlen ("noarch"));
+  g_assert_cmpstr (parsed.arch, ==, "noarch");
+
+  g_assert_true (modulemd_validate_nevra ("bar-0:1.23-1.x86_64"));
+  g_assert_false (modulemd_validate_nevra ("bar-1.23-1.x86_64"));
+  g_assert_false (modulemd_validate_nevra ("bar-0:1.23-1"));
+  g_assert_false (modulemd_validate_nevra ("bar-0:1-23-1.x86_64"));
+  g_assert_false (modulemd_validate_nevra ("bar-x:1.23-1.x86_64"));
+  g_assert_false (modulemd_validate_nevra ("bar-:1.23-1.x86_64"));
+  g_assert_false (modulemd_validate_nevra ("0:1.23-1.x86_64"));
+  g_assert_false (modulemd_validate_nevra (""));
+
+  modulemd_string_set_init (&set);
+  modulemd_string_set_add (&set, "bar-0:1.23-1.x86_64");
+  modulemd_string_set_add (&set, "baz-2:2.18-3.s390x");
+  g_assert_true (modulemd_validate_nevra_set (&set, &invalid));
+  g_assert_null (invalid);
+
+  modulemd_string_set_add (&set, "quux-1.0-1.noarch");
+  modulemd_string_set_compact (&set);
+  g_assert_false (modulemd_validate_nevra_set (&set, &invalid));
+  g_assert_cmpstr (invalid, ==, "quux-1.0-1.noarch");
+  modulemd_string_set_clear (&set);
+}
+
+
 int
 main (int argc, char *argv[])
 {
@@ -288,6 +358,13 @@ main (int argc, char *argv[])
               test_compare,
               NULL);
 
+  g_test_add ("/modulemd/v2/rpm_map/nevra/parse",
+              CommonMmdTestFixture,
+              NULL,
+              NULL,
+              test_parse_nevra,
+              NULL);
+
   g_test_add ("/modulemd/v2/rpm_map/yaml/parse/valid",
               CommonMmdTestFixture,
               NULL,
@@ -207,6 +207,27 @@ translation_test_validate (TranslationFixture *fixture,
   g_assert_false (modulemd_translation_validate (t, &error));
   g_assert_nonnull (error);
   g_assert_error (error, MODULEMD_ERROR, MODULEMD_ERROR_VALIDATE);
+  g_assert_false (modulemd_translation_is_validated (t));
+  g_clear_error (&error);
+
+  /* A successful validation is remembered until the next modification */
+  modulemd_translation_set_modified (t, 5);
+  g_assert_true (modulemd_translation_validate (t, &error));
+  g_assert_no_error (error);
+  g_assert_true (modulemd_translation_is_validated (t));
+
+  modulemd_translation_set_modified (t, 0);
+  g_assert_false (modulemd_translation_is_validated (t));
+  g_assert_false (modulemd_translation_validate (t, &error));
+  g_assert_error (error, MODULEMD_ERROR, MODULEMD_ERROR_VALIDATE);
+  g_clear_error (&error);
+
+  /* Not once an entry that could be modified later has been handed out */
+  modulemd_translation_set_modified (t, 5);
+  g_assert_null (modulemd_translation_get_translation_entry (t, "en_US"));
+  g_assert_true (modulemd_translation_validate (t, &error));
+  g_assert_no_error (error);
+  g_assert_false (modulemd_translation_is_validated (t));
   g_clear_object (&t);
 }
 